@@ -0,0 +1,123 @@
+"""Backend layer that supplies Excel application objects to ExcelHandler.
+
+ExcelHandler only talks to the xlwings object model (App, Book, Sheet,
+Range) and the COM objects reachable through their ``.api`` attribute.
+A backend decides where those objects come from: the live Excel process
+via xlwings (the default), or the pure-Python stand-in in
+:mod:`mcp_server_xlwings.memory` used for tests and COM call accounting.
+
+The protocols below document the surface ExcelHandler relies on. Anything
+returned from ``.api`` is a COM dispatch object and is typed as ``Any``.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Iterator, Protocol
+
+
+class RangeLike(Protocol):
+    """xlwings ``Range`` surface used by ExcelHandler."""
+
+    api: Any
+    value: Any
+    formula: Any
+    number_format: Any
+    color: Any
+    wrap_text: Any
+
+    @property
+    def address(self) -> str: ...
+    @property
+    def row(self) -> int: ...
+    @property
+    def column(self) -> int: ...
+    @property
+    def rows(self) -> Any: ...
+    @property
+    def columns(self) -> Any: ...
+    @property
+    def size(self) -> int: ...
+    @property
+    def font(self) -> Any: ...
+    @property
+    def sheet(self) -> SheetLike: ...
+    def expand(self, mode: str = "table") -> RangeLike: ...
+    def __iter__(self) -> Iterator[RangeLike]: ...
+    def __getitem__(self, key: Any) -> RangeLike: ...
+
+
+class SheetLike(Protocol):
+    """xlwings ``Sheet`` surface used by ExcelHandler."""
+
+    api: Any
+    name: str
+
+    @property
+    def index(self) -> int: ...
+    @property
+    def book(self) -> BookLike: ...
+    @property
+    def used_range(self) -> RangeLike: ...
+    @property
+    def pictures(self) -> Any: ...
+    def range(self, cell1: Any, cell2: Any = None) -> RangeLike: ...
+    def activate(self) -> None: ...
+    def delete(self) -> None: ...
+    def copy(self, before: Any = None, after: Any = None) -> Any: ...
+
+
+class BookLike(Protocol):
+    """xlwings ``Book`` surface used by ExcelHandler."""
+
+    api: Any
+
+    @property
+    def name(self) -> str: ...
+    @property
+    def fullname(self) -> str: ...
+    @property
+    def sheets(self) -> Any: ...
+    @property
+    def app(self) -> AppLike: ...
+    def save(self, path: str | None = None) -> None: ...
+    def close(self) -> None: ...
+
+
+class AppLike(Protocol):
+    """xlwings ``App`` surface used by ExcelHandler."""
+
+    api: Any
+    display_alerts: bool
+
+    @property
+    def books(self) -> Any: ...
+    @property
+    def selection(self) -> RangeLike | None: ...
+    def calculate(self) -> None: ...
+    def macro(self, name: str) -> Any: ...
+
+
+class Backend(Protocol):
+    """Source of Excel application objects."""
+
+    def active_app(self) -> AppLike | None:
+        """Return the running Excel instance, or None if there is none."""
+        ...
+
+    def new_app(self) -> AppLike:
+        """Start a new visible Excel instance."""
+        ...
+
+
+class XlwingsBackend:
+    """Backend that drives the live Excel process through xlwings COM."""
+
+    def active_app(self) -> AppLike | None:
+        import xlwings as xw
+
+        return xw.apps.active
+
+    def new_app(self) -> AppLike:
+        import xlwings as xw
+
+        return xw.App(visible=True)
@@ -0,0 +1,239 @@
+"""Bounded LRU cache of range snapshots.
+
+Agents re-read the same header block or sheet summary many times in one
+conversation, and each read crosses the COM boundary again. The cache
+keeps recent snapshots -- value grids, formula listings, sheet summaries
+-- keyed by workbook path, sheet name, kind and rectangle, and evicts the
+least recently used once their estimated size passes ``max_bytes``.
+
+Snapshots stay valid until something may have changed them:
+
+- every ExcelHandler write path invalidates the entries it touches. A
+  write overlapping an entry drops it; a write that changes values also
+  drops every entry of that workbook that holds formulas, since a
+  recalculation can change them anywhere.
+- on Windows an Excel event sink (``SheetChange``, ``SheetCalculate``)
+  does the same for edits made by hand. Events are delivered when the
+  COM thread pumps messages, which happens before every lookup.
+
+Without the event sink, edits made directly in Excel show up once a write
+tool touches the sheet or the entry is evicted.
+"""
+
+from __future__ import annotations
+
+import collections
+import json
+from typing import Any, Callable
+
+from . import geometry
+from .geometry import Rect
+
+try:  # pywin32 is only present on Windows
+    import pythoncom
+    import win32com.client
+except ImportError:  # pragma: no cover - exercised on non-Windows only
+    pythoncom = None
+
+
+class _Entry:
+    __slots__ = ("rect", "value", "size", "formulas")
+
+    def __init__(self, rect: Rect | None, value: Any, size: int, formulas: bool) -> None:
+        self.rect = rect
+        self.value = value
+        self.size = size
+        self.formulas = formulas
+
+
+class RangeCache:
+    """LRU cache of range snapshots with a memory cap.
+
+    Args:
+        max_bytes: Estimated size (serialized JSON) the entries may take
+            together; 0 disables the cache.
+    """
+
+    def __init__(self, max_bytes: int = 0) -> None:
+        self.max_bytes = max_bytes
+        self._entries: collections.OrderedDict[tuple, _Entry] = collections.OrderedDict()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._sink: Any = None
+        self._watched: Any = None
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_bytes > 0
+
+    def get(
+        self, path: str, sheet: str, kind: str, rect: Rect | None = None,
+    ) -> Any:
+        """The cached snapshot, or None.
+
+        Value grids are also served from a cached grid that contains
+        ``rect``, sliced to it.
+        """
+        self.pump()
+        key = (path.lower(), sheet.lower(), kind, rect)
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry.value
+        if rect is not None and kind == "values":
+            for key, entry in reversed(self._entries.items()):
+                if (
+                    key[:3] == (path.lower(), sheet.lower(), kind)
+                    and entry.rect is not None
+                    and geometry.intersect(entry.rect, rect) == rect
+                ):
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    r0, c0 = entry.rect[0], entry.rect[1]
+                    return [
+                        row[rect[1] - c0:rect[3] - c0 + 1]
+                        for row in entry.value[rect[0] - r0:rect[2] - r0 + 1]
+                    ]
+        self.misses += 1
+        return None
+
+    def put(
+        self,
+        path: str,
+        sheet: str,
+        kind: str,
+        rect: Rect | None,
+        value: Any,
+        formulas: bool = True,
+    ) -> None:
+        """Store a snapshot; ``formulas`` marks one a recalculation may change."""
+        size = len(json.dumps(value, ensure_ascii=False, default=str).encode("utf-8"))
+        if size > self.max_bytes:
+            return
+        key = (path.lower(), sheet.lower(), kind, rect)
+        old = self._entries.pop(key, None)
+        if old is not None:
+            self._bytes -= old.size
+        self._entries[key] = _Entry(rect, value, size, formulas)
+        self._bytes += size
+        while self._bytes > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self._bytes -= evicted.size
+            self.evictions += 1
+
+    def invalidate(
+        self,
+        path: str | None = None,
+        sheet: str | None = None,
+        rect: Rect | None = None,
+        recalc: bool = False,
+    ) -> None:
+        """Drop entries a change may have affected.
+
+        Everything when ``path`` is None, the workbook when ``sheet`` is
+        None, otherwise the sheet's entries overlapping ``rect`` (all of
+        them when ``rect`` is None). ``recalc`` also drops every entry of
+        the workbook that holds formulas.
+        """
+        if not self._entries:
+            return
+        if path is None:
+            self.clear()
+            return
+        name = sheet.lower() if sheet is not None else None
+
+        def affected(key: tuple, entry: _Entry) -> bool:
+            if (recalc and entry.formulas) or name is None:
+                return True
+            if key[1] != name:
+                return False
+            return rect is None or entry.rect is None or geometry.overlaps(entry.rect, rect)
+
+        self._drop(path, affected)
+
+    def recalculated(self, path: str, sheet: str) -> None:
+        """Drop the sheet's entries that hold formulas."""
+        name = sheet.lower()
+        self._drop(path, lambda key, entry: entry.formulas and key[1] == name)
+
+    def _drop(self, path: str, match: Callable[[tuple, _Entry], bool]) -> None:
+        book = path.lower()
+        for key, entry in list(self._entries.items()):
+            if key[0] == book and match(key, entry):
+                del self._entries[key]
+                self._bytes -= entry.size
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._bytes = 0
+
+    def stats(self) -> dict[str, Any]:
+        """Hit/miss counters and current size."""
+        return {
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "events": self._sink is not None,
+        }
+
+    # -- Excel events ------------------------------------------------- #
+
+    def watch(self, get_app: Callable[[], Any]) -> None:
+        """Invalidate on edits made in Excel (Windows only).
+
+        ``get_app`` returns the current Excel instance; it is only called
+        where events are available. The sink is created once per instance,
+        and a new instance (Excel restarted) starts with an empty cache.
+        """
+        if pythoncom is None:
+            return
+        app = get_app()
+        if app is self._watched:
+            return
+        self.clear()
+        self._watched = app
+        try:
+            sink = win32com.client.WithEvents(app.api, ExcelEvents)
+        except Exception:
+            self._sink = None
+            return
+        sink.cache = self
+        self._sink = sink
+
+    def pump(self) -> None:
+        """Deliver pending Excel events before the cache is consulted."""
+        if self._sink is not None:
+            pythoncom.PumpWaitingMessages()
+
+
+class ExcelEvents:
+    """Application event handlers that invalidate the cache.
+
+    ``cache`` is set after :func:`win32com.client.WithEvents` creates the
+    sink. Handlers never raise: an event Excel cannot deliver is not worth
+    breaking the tool call that pumped it.
+    """
+
+    cache: RangeCache | None = None
+
+    def OnSheetChange(self, Sh: Any, Target: Any) -> None:
+        try:
+            path, name = Sh.Parent.FullName, Sh.Name
+            for rect in geometry.parse(Target.Address):
+                self.cache.invalidate(path, name, rect, recalc=True)
+        except Exception:
+            if self.cache is not None:
+                self.cache.clear()
+
+    def OnSheetCalculate(self, Sh: Any) -> None:
+        try:
+            self.cache.recalculated(Sh.Parent.FullName, Sh.Name)
+        except Exception:
+            if self.cache is not None:
+                self.cache.clear()
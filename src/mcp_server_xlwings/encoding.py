@@ -0,0 +1,119 @@
+"""Compact wire encodings for ``read_data`` results.
+
+``read_data`` returns row-major ``list[list]`` by default. The encodings
+below trade that simplicity for size on the shapes that waste the most
+bytes: repeated category strings, long runs of empty cells and sparse
+sheets.
+
+``rows``
+    The default row-major list of rows.
+
+``columnar``
+    ``{"columns": [col, ...]}``. Each ``col`` is either a plain list of
+    values, or an object with:
+
+    - ``values``: the column's values;
+    - ``dict`` (optional): distinct strings; ``values`` then holds indexes
+      into ``dict``;
+    - ``nulls`` (optional): ``[[start, length], ...]`` runs of empty cells
+      removed from ``values``; re-insert ``null`` at those row positions.
+
+    Each column uses whichever form serializes smallest.
+
+``sparse``
+    ``{"cells": [[row, col, value], ...]}`` for non-empty cells only, with
+    0-based positions relative to the first data row and column.
+
+``auto``
+    Whichever of the three is smallest.
+"""
+
+from __future__ import annotations
+
+import json
+from typing import Any
+
+ENCODINGS = ("rows", "columnar", "sparse", "auto")
+
+
+def json_size(obj: Any) -> int:
+    """Bytes of ``obj`` serialized as compact JSON."""
+    return len(json.dumps(obj, separators=(",", ":"), ensure_ascii=False).encode())
+
+
+def encode(data: list[list[Any]], encoding: str) -> tuple[Any, dict[str, Any]]:
+    """Encode row-major ``data``; returns the payload and a size report."""
+    plain = json_size(data)
+    if encoding == "rows":
+        return data, {"type": "rows", "bytes": plain, "plain_bytes": plain}
+    if encoding == "auto":
+        candidates = [("rows", data, plain)]
+        for name in ("columnar", "sparse"):
+            payload = _ENCODERS[name](data)
+            candidates.append((name, payload, json_size(payload)))
+        name, payload, size = min(candidates, key=lambda c: c[2])
+    else:
+        name = encoding
+        payload = _ENCODERS[name](data)
+        size = json_size(payload)
+    return payload, {"type": name, "bytes": size, "plain_bytes": plain}
+
+
+def encode_columnar(data: list[list[Any]]) -> dict[str, Any]:
+    columns = [list(col) for col in zip(*data)] if data else []
+    return {"columns": [_encode_column(col) for col in columns]}
+
+
+def encode_sparse(data: list[list[Any]]) -> dict[str, Any]:
+    return {"cells": [
+        [i, j, v]
+        for i, row in enumerate(data)
+        for j, v in enumerate(row)
+        if v is not None
+    ]}
+
+
+_ENCODERS = {"columnar": encode_columnar, "sparse": encode_sparse}
+
+
+def _null_runs(col: list[Any]) -> list[list[int]]:
+    runs: list[list[int]] = []
+    for i, v in enumerate(col):
+        if v is None:
+            if runs and runs[-1][0] + runs[-1][1] == i:
+                runs[-1][1] += 1
+            else:
+                runs.append([i, 1])
+    return runs
+
+
+def _dictionary(values: list[Any]) -> tuple[list[str], list[int]] | None:
+    """Dictionary-encode ``values`` if they are repeated strings."""
+    if not values or not all(type(v) is str for v in values):
+        return None
+    index: dict[str, int] = {}
+    codes = [index.setdefault(v, len(index)) for v in values]
+    if len(index) * 2 > len(values):
+        return None
+    return list(index), codes
+
+
+def _encode_column(col: list[Any]) -> Any:
+    best, best_size = col, json_size(col)
+    runs = _null_runs(col)
+    for drop_nulls in (False, True) if runs else (False,):
+        values = [v for v in col if v is not None] if drop_nulls else col
+        options: list[dict[str, Any]] = []
+        if drop_nulls:
+            options.append({"values": values, "nulls": runs})
+        coded = _dictionary(values)
+        if coded is not None:
+            option: dict[str, Any] = {"dict": coded[0], "values": coded[1]}
+            if drop_nulls:
+                option["nulls"] = runs
+            options.append(option)
+        for option in options:
+            size = json_size(option)
+            if size < best_size:
+                best, best_size = option, size
+    return best
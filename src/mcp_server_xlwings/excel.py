@@ -2,11 +2,30 @@
 
 from __future__ import annotations
 
+import base64
+import binascii
+import contextlib
+import copy
 import datetime
+import inspect
+import json
+import math
+import time
 from pathlib import Path
-from typing import Any
-
-import xlwings as xw
+from typing import Any, Callable, Iterator
+
+from . import export, geometry, search, source, xlsx
+from .backend import AppLike, Backend, BookLike, SheetLike, XlwingsBackend
+from .cache import RangeCache
+from .encoding import ENCODINGS, encode
+from .geometry import Rect, col_letter as _col_letter
+from .handles import HandleRegistry
+from .regions import find_tables
+from .transfer import DEFAULT_CHUNK_CELLS, Transfer, combine
+from .value2 import convert as _convert_value2, date_kind
+from .worker import Cancelled, check_cancelled
+from .writer import XlsxWriter
+from .xlsx import XlsxBook, XlsxError, XlsxSheet
 
 
 class ExcelError(Exception):
@@ -34,24 +53,105 @@ def _serialize_row(row: list[Any]) -> list[Any]:
     return [_serialize_value(v) for v in row]
 
 
-def _to_2d(raw: Any) -> list[list[Any]]:
-    """Normalise raw xlwings value to a serialized 2D list."""
+def _to_2d(raw: Any, columns: int | None = None) -> list[list[Any]]:
+    """Normalise raw xlwings value to a serialized 2D list.
+
+    xlwings returns a flat list for both a single row and a single column;
+    pass ``columns=1`` to rebuild the column shape.
+    """
     if raw is None:
         return []
-    if not isinstance(raw, list):
-        return [[_serialize_value(raw)]]
-    if raw and not isinstance(raw[0], list):
-        return [_serialize_row(raw)]
-    return [_serialize_row(row) for row in raw]
+    return [_serialize_row(row) for row in _as_grid(raw, columns)]
+
+
+def _as_grid(raw: Any, columns: int | None = None) -> list[list[Any]]:
+    """Normalise a raw scalar / 1D / 2D read (lists or COM tuples) to 2D."""
+    if not isinstance(raw, (list, tuple)):
+        return [[raw]]
+    if raw and not isinstance(raw[0], (list, tuple)):
+        if columns == 1:
+            return [[v] for v in raw]
+        return [list(raw)]
+    return [list(row) for row in raw]
+
+
+def _parse_address(address: str) -> Rect:
+    """Parse an address Excel reported; multi-area addresses give the first area."""
+    try:
+        return geometry.parse(address)[0]
+    except ValueError:
+        raise ExcelError(f"Cannot parse range address '{address}'.")
+
+
+def _range_rect(ws: SheetLike, cell_range: str, rng: Any = None) -> Rect:
+    """Rectangle of ``cell_range``, without a COM round trip when possible.
+
+    A1 references are parsed locally. Named ranges and other references
+    only Excel can resolve cost one ``Address`` read.
+    """
+    try:
+        return geometry.parse_a1(cell_range)
+    except ValueError:
+        pass
+    if rng is None:
+        rng = ws.range(cell_range)
+    return _parse_address(rng.address)
+
+
+def _encode_cursor(state: dict) -> str:
+    """Pack pagination state into an opaque URL-safe token."""
+    raw = json.dumps(state, separators=(",", ":"), ensure_ascii=False)
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+_INVALID_CURSOR = "Invalid cursor. Pass the next_cursor value from a previous read_data call."
+
+
+def _decode_cursor(cursor: str) -> dict:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        state = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except (ValueError, binascii.Error, UnicodeError):
+        raise ExcelError(_INVALID_CURSOR) from None
+    if not _valid_cursor(state):
+        raise ExcelError(_INVALID_CURSOR)
+    return state
+
+
+def _valid_cursor(state: Any) -> bool:
+    """Whether ``state`` has every field a page read uses, of the right type."""
+
+    def whole(value: Any) -> bool:
+        # bool is an int subclass, but never a row or column
+        return type(value) is int
+
+    if not isinstance(state, dict) or state.get("v") != 1:
+        return False
+    rect = state.get("rect")
+    if not (isinstance(rect, list) and len(rect) == 4 and all(map(whole, rect))):
+        return False
+    r0, c0, r1, c1 = rect
+    if not (1 <= r0 <= r1 <= geometry.MAX_ROWS and 1 <= c0 <= c1 <= geometry.MAX_COLS):
+        return False
+    following, header_row = state.get("next"), state.get("header_row")
+    budget = state.get("budget")
+    return (
+        isinstance(state.get("wb"), str)
+        and isinstance(state.get("sheet"), str)
+        and whole(following) and r0 <= following <= r1
+        and (header_row is None or whole(header_row) and r0 <= header_row <= r1)
+        and "headers" in state and isinstance(state["headers"], (list, type(None)))
+        and isinstance(budget, dict)
+        and all(v is None or whole(v) and v > 0 for v in budget.values())
+        and state.get("encoding", "rows") in ENCODINGS
+        and isinstance(state.get("dates", []), list)
+        and whole(state.get("row_bytes", 1))
+    )
 
 
-def _col_letter(col_num: int) -> str:
-    """Convert 1-based column number to Excel column letter(s)."""
-    result = ""
-    while col_num > 0:
-        col_num, remainder = divmod(col_num - 1, 26)
-        result = chr(65 + remainder) + result
-    return result
+def _row_bytes(row: list[Any]) -> int:
+    """Serialized JSON size of one row, including the separating comma."""
+    return len(json.dumps(row, ensure_ascii=False, default=str).encode("utf-8")) + 1
 
 
 def _ole_color_to_hex(color: Any) -> str | None:
@@ -67,38 +167,645 @@ def _ole_color_to_hex(color: Any) -> str | None:
     return f"#{r:02X}{g:02X}{b:02X}"
 
 
+# ---------------------------------------------------------------------- #
+#  Range-level style probing
+# ---------------------------------------------------------------------- #
+
+# Excel answers a style query on a whole range with one value when the
+# property is uniform and Null (None) when it is mixed. Blocks are probed
+# whole and only split where a property is mixed, so the number of COM
+# calls follows the number of style boundaries rather than the cell count.
+
+_MIXED = object()
+
+_FONT_PROPS = {
+    "bold": "Bold",
+    "italic": "Italic",
+    "underline": "Underline",
+    "font_name": "Name",
+    "font_size": "Size",
+    "font_color": "Color",
+}
+
+_STYLE_ORDER = (
+    "bold", "italic", "underline", "font_name", "font_size",
+    "font_color", "bg_color", "number_format", "alignment", "border",
+)
+
+
+def _block_address(r0: int, c0: int, r1: int, c1: int) -> str:
+    return geometry.format_a1((r0, c0, r1, c1), absolute=False)
+
+
+def _uniform_getter(value: Any) -> Any:
+    if value is None:
+        return _MIXED
+    return lambda i, j: value
+
+
+def _border_getter(blk: Any, rect: tuple[int, int, int, int]) -> Any:
+    """Derive each cell's border flag from the block's six edge styles.
+
+    A cell's left edge is the block's left edge (xlEdgeLeft) in the first
+    column and an inside vertical line (xlInsideVertical) elsewhere; the
+    other three sides follow the same rule.
+    """
+    r0, c0, r1, c1 = rect
+    edges = [7, 8, 9, 10]
+    if c1 > c0:
+        edges.append(11)
+    if r1 > r0:
+        edges.append(12)
+    styles: dict[int, Any] = {11: None, 12: None}
+    for edge in edges:
+        try:
+            style = blk.Borders(edge).LineStyle
+        except Exception:
+            style = None
+        if style is None:
+            return _MIXED
+        styles[edge] = style
+
+    def has_border(i: int, j: int) -> bool:
+        sides = (
+            styles[7] if j == c0 else styles[11],
+            styles[10] if j == c1 else styles[11],
+            styles[8] if i == r0 else styles[12],
+            styles[9] if i == r1 else styles[12],
+        )
+        return any(side == 1 for side in sides)
+
+    return has_border
+
+
+def _probe_block(
+    blk: Any, rect: tuple[int, int, int, int], props: list[str]
+) -> dict[str, Any]:
+    """Query every property once for a block.
+
+    Returns, per property, a ``(i, j) -> raw value`` getter for the cells
+    of the block, or ``_MIXED`` when Excel reports a mixed result.
+    """
+    probed: dict[str, Any] = {}
+    font_props = [p for p in props if p in _FONT_PROPS]
+    if font_props:
+        font = blk.Font
+        for p in font_props:
+            probed[p] = _uniform_getter(getattr(font, _FONT_PROPS[p]))
+    if "bg_color" in props:
+        try:
+            probed["bg_color"] = _uniform_getter(blk.Interior.Color)
+        except Exception:
+            probed["bg_color"] = _MIXED
+    if "number_format" in props:
+        probed["number_format"] = _uniform_getter(blk.NumberFormat)
+    if "alignment" in props:
+        probed["alignment"] = _uniform_getter(blk.HorizontalAlignment)
+    if "border" in props:
+        probed["border"] = _border_getter(blk, rect)
+    return probed
+
+
+def _resolve_styles(
+    sheet_api: Any,
+    base_row: int,
+    base_col: int,
+    mask: list[list[bool]],
+    props: list[str],
+) -> dict[str, dict[tuple[int, int], Any]]:
+    """Resolve raw style values for every cell flagged in ``mask``.
+
+    Blocks are shrunk to the bounding box of their non-empty cells and
+    probed whole. Each property that comes back mixed is halved along the
+    longer axis, or along the other axis when neither longer half resolves,
+    so row bands such as headers and column bands such as number formats
+    both resolve in a few probes per boundary. A
+    single cell that still reports a mixed value (e.g. partially bold rich
+    text) resolves to None, which is what a per-cell query returns.
+    """
+    resolved: dict[str, dict[tuple[int, int], Any]] = {p: {} for p in props}
+    Box = tuple[int, int, int, int]
+
+    def shrink(r0: int, c0: int, r1: int, c1: int) -> tuple[Box, list] | None:
+        cells = [
+            (i, j)
+            for i in range(r0, r1 + 1)
+            for j in range(c0, c1 + 1)
+            if mask[i][j]
+        ]
+        if not cells:
+            return None
+        box = (
+            min(i for i, _ in cells), min(j for _, j in cells),
+            max(i for i, _ in cells), max(j for _, j in cells),
+        )
+        return box, cells
+
+    def probe(box: Box, todo: list[str]) -> dict[str, Any]:
+        blk = sheet_api.Range(_block_address(
+            base_row + box[0], base_col + box[1],
+            base_row + box[2], base_col + box[3],
+        ))
+        return _probe_block(blk, box, todo)
+
+    def halves(box: Box, by_rows: bool) -> list[tuple[Box, list]]:
+        r0, c0, r1, c1 = box
+        if by_rows:
+            mid = (r0 + r1) // 2
+            parts = [shrink(r0, c0, mid, c1), shrink(mid + 1, c0, r1, c1)]
+        else:
+            mid = (c0 + c1) // 2
+            parts = [shrink(r0, c0, r1, mid), shrink(r0, mid + 1, r1, c1)]
+        return [part for part in parts if part is not None]
+
+    def visit(box: Box, cells: list, todo: list[str], probed: dict) -> None:
+        check_cancelled()
+        mixed: list[str] = []
+        for p in todo:
+            getter = probed[p]
+            if getter is not _MIXED:
+                for i, j in cells:
+                    resolved[p][(i, j)] = getter(i, j)
+            elif box[0] == box[2] and box[1] == box[3]:
+                resolved[p][cells[0]] = None
+            else:
+                mixed.append(p)
+
+        # Each mixed property is split on its own: a bold header row and a
+        # number-formatted column need different axes.
+        r0, c0, r1, c1 = box
+        axes = []
+        if r1 > r0:
+            axes.append(True)
+        if c1 > c0:
+            axes.append(False)
+        axes.sort(key=lambda by_rows: -(r1 - r0 if by_rows else c1 - c0))
+        for p in mixed:
+            best = None
+            for by_rows in axes:
+                parts = halves(box, by_rows)
+                probes = [probe(part_box, [p]) for part_box, _ in parts]
+                score = sum(1 for pr in probes if pr[p] is _MIXED)
+                if best is None or score < best[0]:
+                    best = (score, parts, probes)
+                if score < len(probes):
+                    break
+            for (part_box, part_cells), pr in zip(best[1], best[2]):
+                visit(part_box, part_cells, [p], pr)
+
+    root = shrink(0, 0, len(mask) - 1, len(mask[0]) - 1) if mask and mask[0] else None
+    if root is not None:
+        box, cells = root
+        visit(box, cells, props, probe(box, props))
+    return resolved
+
+
+# ---------------------------------------------------------------------- #
+#  Value2 date detection
+# ---------------------------------------------------------------------- #
+
+
+def _date_kinds(
+    sheet_api: Any, r0: int, c0: int, r1: int, c1: int,
+) -> list[str | None]:
+    """Date kind of each column in a block, for ``Value2`` conversion.
+
+    One ``NumberFormat`` probe covers the block when all columns share a
+    format; otherwise each column is probed once, falling back to its first
+    cell when the column itself is mixed.
+    """
+    columns = c1 - c0 + 1
+    if r1 < r0:
+        return [None] * columns
+    fmt = sheet_api.Range(_block_address(r0, c0, r1, c1)).NumberFormat
+    if fmt is not None:
+        return [date_kind(fmt)] * columns
+    kinds: list[str | None] = []
+    for c in range(c0, c1 + 1):
+        fmt = sheet_api.Range(_block_address(r0, c, r1, c)).NumberFormat
+        if fmt is None:
+            fmt = sheet_api.Cells(r0, c).NumberFormat
+        kinds.append(date_kind(fmt))
+    return kinds
+
+
+# ---------------------------------------------------------------------- #
+#  Merged-cell discovery
+# ---------------------------------------------------------------------- #
+
+
+_UNPROBED = object()
+
+
+def _find_merge_areas(
+    sheet_api: Any,
+    rect: tuple[int, int, int, int],
+    flag: Any = _UNPROBED,
+) -> list[tuple[str, tuple[int, int, int, int], Any]]:
+    """Find every merge area overlapping ``rect`` by recursive bisection.
+
+    ``Range.MergeCells`` is tri-state: False (no merged cells), True (every
+    cell merged) or None (mixed). Merge-free blocks are dismissed with one
+    probe, mixed blocks are halved, and fully merged blocks are resolved
+    through ``MergeArea`` of their first uncovered cell. Pass the already
+    known ``flag`` of ``rect`` to skip the first probe.
+
+    Returns ``(address, (r0, c0, r1, c1), merge_area_api)`` tuples in
+    row-major order of each area's first cell inside ``rect``.
+    """
+    found: dict[tuple[int, int, int, int], tuple[str, Any]] = {}
+
+    def block(r0: int, c0: int, r1: int, c1: int) -> Any:
+        return sheet_api.Range(_block_address(r0, c0, r1, c1))
+
+    def visit(r0: int, c0: int, r1: int, c1: int, state: Any) -> None:
+        check_cancelled()
+        if state is False:
+            return
+        if state is True:
+            # Fully merged: peel off the merge area at the top-left corner
+            # and cover the rest of the block with up to three remainders.
+            ma = sheet_api.Cells(r0, c0).MergeArea
+            addr = ma.Address
+            m = _parse_address(addr)
+            found.setdefault(m, (addr, ma))
+            bottom, right = min(m[2], r1), min(m[3], c1)
+            if right < c1:
+                visit(r0, right + 1, bottom, c1, True)
+            if bottom < r1:
+                visit(bottom + 1, c0, r1, c1, True)
+            return
+        if r1 - r0 >= c1 - c0:
+            mid = (r0 + r1) // 2
+            parts = [(r0, c0, mid, c1), (mid + 1, c0, r1, c1)]
+        else:
+            mid = (c0 + c1) // 2
+            parts = [(r0, c0, r1, mid), (r0, mid + 1, r1, c1)]
+        for part in parts:
+            visit(*part, block(*part).MergeCells)
+
+    if flag is _UNPROBED:
+        flag = block(*rect).MergeCells
+    visit(*rect, flag)
+
+    def first_inside(m: tuple[int, int, int, int]) -> tuple[int, int]:
+        return max(m[0], rect[0]), max(m[1], rect[1])
+
+    return [
+        (addr, m, ma)
+        for m, (addr, ma) in sorted(found.items(), key=lambda kv: first_inside(kv[0]))
+    ]
+
+
+# ---------------------------------------------------------------------- #
+#  Data extent
+# ---------------------------------------------------------------------- #
+
+# xlFormulas (Find's LookIn) and xlCellTypeFormulas share one value
+_XL_FORMULAS = -4123
+_XL_PART = 2
+_XL_BY_ROWS = 1
+_XL_BY_COLUMNS = 2
+_XL_PREVIOUS = 2
+
+
+def _data_extent(used_api: Any, used_rect: Rect) -> Rect | None:
+    """The part of the used range that holds values or formulas.
+
+    UsedRange also counts cells that only ever carried formatting, so one
+    formatted cell on row 1,048,576 makes a sheet a million rows tall.
+    Searching backwards for "*" from the first cell (Find's default start)
+    wraps around to the last non-empty cell: by rows that is on the last
+    data row, by columns on the last data column. Returns None when the
+    range holds nothing.
+    """
+    last = []
+    for order in (_XL_BY_ROWS, _XL_BY_COLUMNS):
+        found = used_api.Find(
+            What="*", LookIn=_XL_FORMULAS, LookAt=_XL_PART,
+            SearchOrder=order, SearchDirection=_XL_PREVIOUS,
+        )
+        if found is None:
+            return None
+        last.append(found)
+    return used_rect[0], used_rect[1], last[0].Row, last[1].Column
+
+
+# ---------------------------------------------------------------------- #
+#  Append point
+# ---------------------------------------------------------------------- #
+
+_XL_UP = -4162
+
+
+def _last_row(api: Any, col: int) -> int | None:
+    """Last row of column ``col`` that holds a value or formula, or None.
+
+    ``End(xlUp)`` from the column's bottom cell jumps to its last non-empty
+    cell in one call however tall the data is, where reading the column
+    would move every row. It also stops on row 1 when the column is empty,
+    so only then is that cell read to tell the two apart.
+    """
+    found = api.Cells(api.Rows.Count, col).End(_XL_UP)
+    row = found.Row
+    if row == 1 and found.Formula == "":
+        return None
+    return row
+
+
+# ---------------------------------------------------------------------- #
+#  Formula areas
+# ---------------------------------------------------------------------- #
+
+# Range.Address of a multi-area range is cut off at this many characters
+_ADDRESS_MAX = 255
+
+
+def _formula_areas(api: Any, rect: Rect, limit: int) -> list[Rect] | None:
+    """Rectangles of ``rect`` that hold formulas, or None to read it all.
+
+    ``HasFormula`` answers for the whole range in one call: False when it
+    holds no formulas, True when it holds nothing else. Only a mixed range
+    asks ``SpecialCells`` for its formula areas, whose address is parsed
+    locally unless Excel may have cut it short. More than ``limit`` areas,
+    or a failing ``SpecialCells``, mean reading the whole range instead.
+    """
+    has_formula = api.HasFormula
+    if has_formula is False:
+        return []
+    if has_formula is True:
+        return [rect]
+    try:
+        found = api.SpecialCells(_XL_FORMULAS)
+        address = found.Address
+        if len(address) < _ADDRESS_MAX:
+            areas = geometry.parse(address)
+        else:
+            items = found.Areas
+            count = items.Count
+            if count > limit:
+                return None
+            areas = [
+                geometry.parse_a1(items.Item(i).Address) for i in range(1, count + 1)
+            ]
+    except Cancelled:
+        raise
+    except Exception:
+        return None
+    return areas if len(areas) <= limit else None
+
+
+# ---------------------------------------------------------------------- #
+#  Application state
+# ---------------------------------------------------------------------- #
+
+XL_CALCULATION_MANUAL = -4135
+
+# Application property -> value while suspended
+_SUSPENDED_STATE = {
+    "ScreenUpdating": False,
+    "EnableEvents": False,
+    "Calculation": XL_CALCULATION_MANUAL,
+}
+
+
+@contextlib.contextmanager
+def _suspended(app: AppLike) -> Iterator[dict[str, Any]]:
+    """Turn off repainting, events and automatic calculation for a block.
+
+    Only properties that are not already in the suspended state are
+    changed, and those are restored on exit even if the block raises.
+    Yields the changed properties with their previous values.
+    """
+    api = app.api
+    saved: dict[str, Any] = {}
+    try:
+        for prop, value in _SUSPENDED_STATE.items():
+            current = getattr(api, prop)
+            if current != value:
+                setattr(api, prop, value)
+                saved[prop] = current
+        yield saved
+    finally:
+        # In _SUSPENDED_STATE order, so Calculation goes last: switching
+        # back to automatic recalculates, with events and repainting on
+        for prop in list(saved):
+            try:
+                setattr(api, prop, saved[prop])
+            except Exception:
+                pass
+
+
+def _recalc(api: Any, scope: str) -> dict[str, Any]:
+    """Run ``Calculate`` on a Range or Worksheet and time it."""
+    t0 = time.perf_counter()
+    api.Calculate()
+    return {"scope": scope, "ms": round((time.perf_counter() - t0) * 1000, 1)}
+
+
+# ---------------------------------------------------------------------- #
+#  Diff writes
+# ---------------------------------------------------------------------- #
+
+WRITE_MODES = ("full", "diff")
+
+
+def _same_value(a: Any, b: Any) -> bool:
+    """Whether two values are the same cell content."""
+    # True == 1 in Python, but not in a cell
+    if isinstance(a, bool) or isinstance(b, bool):
+        return type(a) is type(b) and a == b
+    return a == b
+
+
+def _unchanged(value: Any, formula: Any, new: Any) -> bool:
+    """Whether writing ``new`` over a cell would leave it as it is."""
+    if isinstance(formula, str) and formula.startswith("="):
+        return new == formula
+    if isinstance(new, str) and new.startswith("="):
+        return False
+    if new == "":
+        new = None
+    return _same_value(value, new)
+
+
+def _write_blocks(
+    ws: SheetLike, blocks: list[Rect], value_at: Callable[[int, int], Any],
+) -> int:
+    """Write the cells of ``blocks`` and nothing else; returns the writes made.
+
+    Blocks whose cells all take one value are grouped by that value into
+    multi-area ranges (addresses kept under 255 characters), each filled
+    with a single assignment. Any other block is written as its own array.
+    Cells between the blocks are never written back, so their types, rich
+    text and dependents stay as they are.
+    """
+    writes = 0
+    groups: dict[tuple[bool, Any], list[Rect]] = {}
+    for block in blocks:
+        r0, c0, r1, c1 = block
+        part = [[value_at(r, c) for c in range(c0, c1 + 1)] for r in range(r0, r1 + 1)]
+        first = part[0][0]
+        if all(_same_value(v, first) for row in part for v in row):
+            try:
+                groups.setdefault((isinstance(first, bool), first), []).append(block)
+                continue
+            except TypeError:
+                pass
+        ws.range(block[:2], block[2:]).value = part
+        writes += 1
+    for (_, value), rects in groups.items():
+        address = ""
+        for rect in rects:
+            a1 = geometry.format_a1(rect, absolute=False)
+            if address and len(address) + len(a1) + 1 >= _ADDRESS_MAX:
+                ws.api.Range(address).Value = value
+                writes += 1
+                address = ""
+            address = f"{address},{a1}" if address else a1
+        ws.api.Range(address).Value = value
+        writes += 1
+    return writes
+
+
+def _retyped(old: Any, text: str | None) -> Any:
+    """Replacement ``text`` for a constant cell, keeping a number or date type.
+
+    Matching works on the cell's text (ISO for dates), but a number or date
+    whose new text still reads as one is written back as a number or date.
+    """
+    if text is None or isinstance(old, bool):
+        return text
+    try:
+        if isinstance(old, datetime.datetime):
+            return datetime.datetime.fromisoformat(text)
+        if isinstance(old, (int, float)):
+            number = float(text)
+            if math.isfinite(number):
+                return int(number) if number.is_integer() else number
+    except ValueError:
+        pass
+    return text
+
+
+def _changed_cells(
+    ws: Any, rect: Rect, data: list[list[Any]],
+) -> list[tuple[int, int]]:
+    """Cells of ``rect`` whose content differs from ``data``.
+
+    Two bulk reads (values and formulas) cover the whole block, so a cell
+    holding a formula is only "unchanged" by the same formula text.
+    """
+    rng = ws.range(_block_address(*rect))
+    rows, cols = geometry.shape(rect)
+    values = _as_grid(rng.value, cols)
+    formulas = _as_grid(rng.formula, cols)
+    r0, c0 = rect[0], rect[1]
+    return [
+        (r0 + i, c0 + j)
+        for i in range(rows)
+        for j in range(cols)
+        if not _unchanged(
+            _serialize_value(values[i][j]), formulas[i][j], data[i][j]
+        )
+    ]
+
+
 class ExcelHandler:
-    """Stateless wrapper around xlwings for Excel COM automation."""
+    """Stateless wrapper around xlwings for Excel COM automation.
+
+    Args:
+        backend: Source of Excel application objects. Defaults to the live
+            Excel process via xlwings; tests pass a
+            :class:`~mcp_server_xlwings.memory.MemoryBackend`.
+        bulk_write: Default for the ``bulk`` parameter of write tools.
+        chunk_cells: Blocks larger than this are read and written in row
+            bands (see :mod:`~mcp_server_xlwings.transfer`); 0 disables.
+        cache_bytes: Memory cap of the range snapshot cache (see
+            :mod:`~mcp_server_xlwings.cache`); 0 disables it.
+        offline: Serve reads of closed .xlsx files from the file itself
+            (see :mod:`~mcp_server_xlwings.xlsx`) instead of opening them
+            in Excel, and write new .xlsx files without Excel (see
+            :mod:`~mcp_server_xlwings.writer`).
+    """
+
+    # Maximum merge areas listed in a sheet summary
+    SUMMARY_MERGE_LIMIT = 100
+
+    # Tables listed in a sheet summary, and the cells read to find them
+    # (spread over this many row bands when the data range is larger)
+    SUMMARY_REGION_LIMIT = 50
+    REGION_SCAN_CELLS = 250_000
+    REGION_SCAN_BANDS = 8
+
+    # Workbook metadata levels, cheapest first
+    METADATA_LEVELS = ("names", "active", "full")
+
+    # Tools a batch may run; those in BATCH_SHEET_TOOLS default to the
+    # batch's sheet (manage_sheets uses 'sheet' as its target instead)
+    BATCH_TOOLS = (
+        "read_data", "write_data", "manage_sheets", "find_replace",
+        "format_range", "get_formulas", "get_cell_styles", "get_objects",
+    )
+    BATCH_SHEET_TOOLS = (
+        "read_data", "write_data", "find_replace", "format_range",
+        "get_formulas", "get_cell_styles", "get_objects",
+    )
+
+    def __init__(
+        self,
+        backend: Backend | None = None,
+        bulk_write: bool = False,
+        chunk_cells: int = DEFAULT_CHUNK_CELLS,
+        cache_bytes: int = 0,
+        offline: bool = True,
+    ) -> None:
+        self.backend = backend if backend is not None else XlwingsBackend()
+        self.bulk_write = bulk_write
+        self.transfer = Transfer(chunk_cells)
+        self.cache = RangeCache(cache_bytes)
+        self.offline = offline
+        self.handles = HandleRegistry(self.backend)
+        # (workbook path, sheet name) -> used-range dimensions
+        self._dimensions: dict[tuple[str, str], dict] = {}
+        # Lower-cased full path -> new workbook being written without Excel
+        self._drafts: dict[str, XlsxWriter] = {}
+        # The draft created last, which calls without a workbook write to,
+        # as Excel makes a newly opened workbook the active one
+        self._active_draft: XlsxWriter | None = None
 
     # ------------------------------------------------------------------ #
     #  Internal helpers
     # ------------------------------------------------------------------ #
 
-    def _get_app(self) -> xw.App:
+    def _get_app(self) -> AppLike:
         """Return the running Excel App instance, or create one."""
-        try:
-            app = xw.apps.active
-            if app is None:
-                app = xw.App(visible=True)
-            return app
-        except Exception:
-            return xw.App(visible=True)
+        return self.handles.app()
 
-    def _get_workbook(self, workbook: str) -> xw.Book:
+    def _get_workbook(self, workbook: str) -> BookLike:
         """Find an open workbook by name or full path, or open it."""
-        app = self._get_app()
-        for wb in app.books:
-            if wb.name == workbook or wb.fullname == workbook:
-                return wb
+        if self._draft(workbook) is not None:
+            raise ExcelError(
+                f"Workbook '{workbook}' is a new file written without Excel. Until it "
+                "is saved, use write_data, format_range, manage_sheets (list, add) "
+                "and manage_workbooks (save, close) on it."
+            )
+        wb = self.handles.book(workbook)
+        if wb is not None:
+            return wb
         path = Path(workbook)
         if path.exists():
-            return app.books.open(str(path))
+            wb = self._get_app().books.open(str(path))
+            self.handles.remember_book(wb.fullname, wb)
+            return wb
         raise ExcelError(
             f"Workbook '{workbook}' is not open and the path does not exist."
         )
 
-    def _get_workbook_or_active(self, workbook: str | None) -> xw.Book:
+    def _get_workbook_or_active(self, workbook: str | None) -> BookLike:
         """Return the specified workbook, or the active workbook if None."""
+        if workbook is None and self._active_draft is not None:
+            workbook = self._active_draft.fullname
         if workbook is not None:
             return self._get_workbook(workbook)
         app = self._get_app()
@@ -107,51 +814,241 @@ class ExcelHandler:
             raise ExcelError("No active workbook found.")
         return wb
 
-    def _get_sheet(self, wb: xw.Book, sheet: str | None) -> xw.Sheet:
+    def _get_sheet(self, wb: BookLike, sheet: str | None) -> SheetLike:
         """Return the requested sheet or the active sheet."""
         if sheet is None:
             return wb.sheets.active
         try:
-            return wb.sheets[sheet]
+            return self.handles.sheet(wb, sheet)
         except Exception:
             names = [s.name for s in wb.sheets]
             raise ExcelError(
                 f"Sheet '{sheet}' not found. Available sheets: {names}"
             )
 
+    @contextlib.contextmanager
+    def _bulk_scope(self, bulk: bool | None) -> Iterator[bool]:
+        """Suspend screen updating, events and calculation for one write.
+
+        ``bulk`` overrides the handler's ``bulk_write`` default. Yields True
+        when calculation was switched to manual here, i.e. the caller owes
+        a targeted recalculation before the scope ends.
+        """
+        if not (self.bulk_write if bulk is None else bulk):
+            yield False
+            return
+        with _suspended(self._get_app()) as changed:
+            yield "Calculation" in changed
+
+    def _check_metadata(self, metadata: str) -> None:
+        if metadata not in self.METADATA_LEVELS:
+            raise ExcelError(
+                f"Unknown metadata level '{metadata}'. "
+                f"Use: {', '.join(self.METADATA_LEVELS)}."
+            )
+
+    def _used_and_extent(self, ws: SheetLike) -> tuple[str, Rect | None]:
+        """UsedRange address and the data extent inside it (None if empty)."""
+        used = ws.used_range
+        address = used.address
+        return address, _data_extent(used.api, _parse_address(address))
+
+    def _sheets_meta(self, wb: BookLike, path: str, metadata: str) -> list[dict]:
+        """Sheet entries for a workbook listing at the given metadata level.
+
+        Dimensions (rows and columns of the data extent) are computed on
+        first request and memoized per sheet until a write tool touches it
+        (see :meth:`_forget_dimensions`).
+        """
+        sheets_meta = []
+        for s in wb.sheets:
+            name = s.name
+            if metadata != "full":
+                sheets_meta.append({"name": name})
+                continue
+            meta = self._dimensions.get((path, name))
+            if meta is None:
+                address, extent = self._used_and_extent(s)
+                rows, cols = geometry.shape(extent) if extent else (0, 0)
+                meta = {
+                    "name": name,
+                    "used_range": address,
+                    "data_range": geometry.format_a1(extent) if extent else None,
+                    "rows": rows,
+                    "columns": cols,
+                }
+                self._dimensions[(path, name)] = meta
+            sheets_meta.append(dict(meta))
+        return sheets_meta
+
+    def _forget_dimensions(
+        self, wb: BookLike | None = None, ws: SheetLike | None = None,
+    ) -> None:
+        """Drop memoized dimensions after a write.
+
+        Clears everything when ``wb`` is None, the whole workbook when ``ws``
+        is None, otherwise a single sheet. Costs no COM calls while nothing
+        is memoized.
+        """
+        if not self._dimensions:
+            return
+        if wb is None:
+            self._dimensions.clear()
+            return
+        path = wb.fullname
+        name = ws.name if ws is not None else None
+        for key in [
+            k for k in self._dimensions
+            if k[0] == path and (name is None or k[1] == name)
+        ]:
+            del self._dimensions[key]
+
+    def _invalidate(
+        self,
+        wb: BookLike | None = None,
+        ws: SheetLike | None = None,
+        rect: Rect | None = None,
+        recalc: bool = False,
+    ) -> None:
+        """Forget dimensions and cached snapshots a write may have changed.
+
+        Scoped like :meth:`_forget_dimensions`, narrowed to ``rect`` within
+        a sheet. ``recalc`` marks a write that changes values, so cached
+        formula results anywhere in the workbook are dropped too.
+        """
+        self._forget_dimensions(wb, ws)
+        if self.cache.enabled:
+            self.cache.invalidate(
+                wb.fullname if wb is not None else None,
+                ws.name if ws is not None else None,
+                rect,
+                recalc,
+            )
+
+    def _cache_key(self, wb: BookLike, ws: SheetLike) -> tuple[str, str] | None:
+        """(workbook path, sheet name) for cache lookups; None while disabled."""
+        if not self.cache.enabled:
+            return None
+        self.cache.watch(self._get_app)
+        return wb.fullname, ws.name
+
+    def _offline_book(
+        self, workbook: str | None, cell_range: str | None = None,
+    ) -> XlsxBook | None:
+        """The closed .xlsx file ``workbook`` names, opened for streaming reads.
+
+        None, so the caller goes through Excel, unless offline reads are
+        on, ``workbook`` is an explicit path (absolute, or with a folder) of
+        an .xlsx-family file that Excel does not have open, and
+        ``cell_range`` (if any) is a plain A1 reference. A bare name such as
+        'report.xlsx' always means the open workbook. Files that are not zip
+        packages -- encrypted or DRM-protected ones -- return None as well.
+        """
+        if not self.offline or workbook is None:
+            return None
+        # Workbooks already resolved skip the file check and the walk over
+        # open books, so batches and repeat calls cost what they did
+        if self.handles.known(workbook):
+            return None
+        path = Path(workbook)
+        if not (path.is_absolute() or "/" in workbook or "\\" in workbook):
+            return None
+        if path.suffix.lower() not in xlsx.SUFFIXES or not path.is_file():
+            return None
+        if cell_range is not None:
+            try:
+                geometry.parse_a1(cell_range)
+            except ValueError:
+                return None
+        if self.handles.running_book(str(path.resolve())) is not None:
+            return None
+        try:
+            return XlsxBook(path)
+        except XlsxError:
+            return None
+
+    def _offline_sheet(self, book: XlsxBook, sheet: str | None) -> XlsxSheet:
+        ws = book.sheet(sheet)
+        if ws is None:
+            raise ExcelError(
+                f"Sheet '{sheet}' not found. Available sheets: {book.sheet_names}"
+            )
+        return ws
+
+    def _draft(self, workbook: str | None) -> XlsxWriter | None:
+        """The new workbook written without Excel that ``workbook`` names.
+
+        With no ``workbook``, the draft created last, until a workbook is
+        opened in Excel. A bare name only matches a draft when Excel has
+        no open workbook of that name.
+        """
+        if workbook is None:
+            return self._active_draft
+        if not self._drafts:
+            return None
+        draft = self._drafts.get(str(Path(workbook).resolve()).lower())
+        if draft is not None:
+            return draft
+        key = workbook.lower()
+        for draft in self._drafts.values():
+            if draft.name.lower() == key:
+                if self.handles.named_book(workbook) is not None:
+                    return None
+                return draft
+        return None
+
+    def _new_draft(self, filepath: str) -> XlsxWriter | None:
+        """A workbook to write without Excel, if ``filepath`` is a new .xlsx file.
+
+        None, so the caller goes through Excel, unless offline writes are
+        on and the file does not exist yet.
+        """
+        path = Path(filepath)
+        if not self.offline or path.suffix.lower() != ".xlsx" or path.exists():
+            return None
+        draft = self._drafts.get(str(path.resolve()).lower())
+        if draft is None:
+            draft = XlsxWriter(path)
+            self._drafts[draft.fullname.lower()] = draft
+        return draft
+
+    def _draft_sheet(self, draft: XlsxWriter, sheet: str | None) -> str:
+        try:
+            return draft.sheet(sheet)
+        except KeyError:
+            raise ExcelError(
+                f"Sheet '{sheet}' not found. Available sheets: {draft.sheet_names}"
+            ) from None
+
     # ------------------------------------------------------------------ #
     #  Tool 1: get_active_workbook (includes selection data)
     # ------------------------------------------------------------------ #
 
-    def get_active_workbook(self) -> dict:
+    def get_active_workbook(self, metadata: str = "full") -> dict:
+        self._check_metadata(metadata)
         app = self._get_app()
         wb = app.books.active
         if wb is None:
             raise ExcelError("No active workbook found.")
 
-        ws = wb.sheets.active
-        sheets_meta = []
-        for s in wb.sheets:
-            used = s.used_range
-            sheets_meta.append({
-                "name": s.name,
-                "used_range": used.address,
-                "rows": used.rows.count,
-                "columns": used.columns.count,
-            })
+        path = wb.fullname
         info: dict[str, Any] = {
             "name": wb.name,
-            "path": wb.fullname,
-            "sheets": sheets_meta,
-            "active_sheet": ws.name,
+            "path": path,
+            "sheets": self._sheets_meta(wb, path, metadata),
         }
+        if metadata == "names":
+            return info
+        info["active_sheet"] = wb.sheets.active.name
 
         try:
             sel = app.selection
             if sel is not None:
-                sel_data = _to_2d(sel.value)
+                address = sel.address
+                _, cols = geometry.shape(_parse_address(address))
+                sel_data = _to_2d(sel.value, cols)
                 info["selection"] = {
-                    "address": sel.address,
+                    "address": address,
                     "sheet": sel.sheet.name,
                     "data": sel_data,
                     "rows": len(sel_data),
@@ -160,6 +1057,8 @@ class ExcelHandler:
         except Exception:
             pass
 
+        if self.cache.enabled:
+            info["cache"] = self.cache.stats()
         return info
 
     # ------------------------------------------------------------------ #
@@ -173,25 +1072,38 @@ class ExcelHandler:
         filepath: str | None = None,
         read_only: bool = True,
         save: bool = False,
+        metadata: str = "full",
+        create: bool = False,
     ) -> dict | list[dict]:
         if action == "list":
+            self._check_metadata(metadata)
             app = self._get_app()
+            active_path = None
+            if metadata != "names" and self._active_draft is None:
+                active = app.books.active
+                active_path = active.fullname if active is not None else None
             result = []
             for wb in app.books:
-                sheets_meta = []
-                for s in wb.sheets:
-                    used = s.used_range
-                    sheets_meta.append({
-                        "name": s.name,
-                        "used_range": used.address,
-                        "rows": used.rows.count,
-                        "columns": used.columns.count,
-                    })
-                result.append({
+                path = wb.fullname
+                entry: dict[str, Any] = {
                     "name": wb.name,
-                    "path": wb.fullname,
-                    "sheets": sheets_meta,
-                })
+                    "path": path,
+                    "sheets": self._sheets_meta(wb, path, metadata),
+                }
+                if metadata != "names":
+                    entry["active"] = path == active_path
+                    entry["active_sheet"] = wb.sheets.active.name
+                result.append(entry)
+            for draft in self._drafts.values():
+                entry = {
+                    "name": draft.name,
+                    "path": draft.fullname,
+                    "sheets": [{"name": name} for name in draft.sheet_names],
+                    "offline": True,
+                }
+                if metadata != "names":
+                    entry["active"] = draft is self._active_draft
+                result.append(entry)
             return result
 
         if action == "open":
@@ -200,11 +1112,29 @@ class ExcelHandler:
                     "Parameter 'filepath' is required for open action. "
                     "Use 'new' to create a blank workbook."
                 )
+            path = Path(filepath)
+            if create and not path.exists():
+                if not path.parent.is_dir():
+                    raise ExcelError(f"Folder not found: {path.parent}")
+                # A new .xlsx path is written without Excel until it is saved
+                draft = self._new_draft(filepath)
+                if draft is not None:
+                    self._active_draft = draft
+                    return {
+                        "name": draft.name,
+                        "path": draft.fullname,
+                        "sheets": draft.sheet_names,
+                        "offline": True,
+                    }
             app = self._get_app()
+            # The workbook opened in Excel becomes the active one
+            self._active_draft = None
             if filepath.lower() == "new":
                 wb = app.books.add()
+            elif create and not path.exists():
+                wb = app.books.add()
+                wb.save(str(path))
             else:
-                path = Path(filepath)
                 if not path.exists():
                     raise ExcelError(f"File not found: {filepath}")
                 for wb in app.books:
@@ -221,9 +1151,30 @@ class ExcelHandler:
                 "sheets": [s.name for s in wb.sheets],
             }
 
+        draft = self._draft(workbook)
+        if draft is not None and action in ("save", "close"):
+            if action == "save" or save:
+                try:
+                    saved = draft.save(filepath if action == "save" else None)
+                except OSError as exc:
+                    raise ExcelError(f"Could not save '{draft.name}': {exc}") from None
+            if action == "save":
+                return {
+                    "message": f"Workbook '{draft.name}' saved to '{saved}'.",
+                    "offline": True,
+                }
+            draft.close()
+            del self._drafts[draft.fullname.lower()]
+            if draft is self._active_draft:
+                self._active_draft = None
+            return {"message": f"Workbook '{draft.name}' closed (save={save})."}
+
         if action == "save":
             wb = self._get_workbook_or_active(workbook)
             if filepath:
+                self._invalidate(wb)
+                # Cached sheets are keyed by the path the book is leaving
+                self.handles.forget_book(wb)
                 wb.save(filepath)
                 return {"message": f"Workbook saved as '{filepath}'."}
             wb.save()
@@ -234,16 +1185,22 @@ class ExcelHandler:
             name = wb.name
             if save:
                 wb.save()
+            self._invalidate(wb)
+            self.handles.forget_book(wb)
             wb.close()
             return {"message": f"Workbook '{name}' closed (save={save})."}
 
         if action == "recalculate":
             app = self._get_app()
+            # Application.Calculate covers every open workbook, so cached
+            # formula results anywhere may have changed
             if workbook:
                 wb = self._get_workbook(workbook)
                 wb.app.calculate()
+                self._invalidate()
                 return {"message": f"Workbook '{wb.name}' recalculated."}
             app.calculate()
+            self._invalidate()
             return {"message": "All open workbooks recalculated."}
 
         raise ExcelError(
@@ -263,17 +1220,56 @@ class ExcelHandler:
         detail: bool = False,
         merge_info: bool = False,
         header_row: int | None = None,
+        max_rows: int | None = None,
+        max_cells: int | None = None,
+        max_bytes: int | None = None,
+        cursor: str | None = None,
+        fast: bool = False,
+        encoding: str = "rows",
     ) -> dict:
+        if cursor is not None:
+            state = _decode_cursor(cursor)
+            wb = self._get_workbook(state["wb"])
+            ws = self._get_sheet(wb, state["sheet"])
+            return self._read_page(ws, state)
+
+        if encoding not in ENCODINGS:
+            raise ExcelError(
+                f"Unknown encoding '{encoding}'. Use: {', '.join(ENCODINGS)}."
+            )
+        for name, limit in (
+            ("max_rows", max_rows), ("max_cells", max_cells), ("max_bytes", max_bytes),
+        ):
+            if limit is not None and limit < 1:
+                raise ExcelError(f"{name} must be >= 1.")
+        paged = any(v is not None for v in (max_rows, max_cells, max_bytes))
+
+        # Closed .xlsx files are read from disk; paging and cell details
+        # need Excel
+        if not (paged or detail or merge_info):
+            book = self._offline_book(workbook, cell_range)
+            if book is not None:
+                with book:
+                    try:
+                        return self._read_offline(
+                            book, sheet, cell_range, headers, header_row, encoding,
+                        )
+                    except XlsxError as exc:
+                        raise ExcelError(str(exc)) from None
+
         wb = self._get_workbook_or_active(workbook)
 
         # Batch read all sheets
         if sheet == "*":
             sheets_data: dict[str, Any] = {}
             for s in wb.sheets:
+                check_cancelled()
                 sheets_data[s.name] = self.read_data(
                     workbook=wb.name, sheet=s.name,
                     cell_range=cell_range, headers=headers, detail=detail,
                     merge_info=merge_info, header_row=header_row,
+                    max_rows=max_rows, max_cells=max_cells, max_bytes=max_bytes,
+                    fast=fast, encoding=encoding,
                 )
             return {"sheet_count": len(sheets_data), "sheets": sheets_data}
 
@@ -281,140 +1277,138 @@ class ExcelHandler:
 
         # No range specified: return sheet summary without reading data
         if cell_range is None:
+            where = self._cache_key(wb, ws)
+            cached = self.cache.get(*where, "summary") if where else None
+            if cached is not None:
+                return {**copy.deepcopy(cached), "cached": True}
+            # The summary re-reads the used range; refresh listings too
+            self._forget_dimensions(wb, ws)
             used = ws.used_range
-            total_rows = used.rows.count
-            total_cols = used.columns.count
+            address = used.address
+            used_rect = _parse_address(address)
+            # Rows and columns count actual data, not formatting left behind
+            extent = _data_extent(used.api, used_rect)
+            total_rows, total_cols = geometry.shape(extent) if extent else (0, 0)
             result: dict[str, Any] = {
                 "sheet": ws.name,
-                "used_range": used.address,
+                "used_range": address,
+                "data_range": geometry.format_a1(extent) if extent else None,
                 "total_rows": total_rows,
                 "total_columns": total_cols,
             }
             # Include first-row headers for context
-            if total_rows >= 1:
-                first_row = ws.range(
-                    (used.row, used.column),
-                    (used.row, used.column + total_cols - 1),
-                ).value
+            if extent:
+                first_row = ws.range(extent[:2], (extent[0], extent[3])).value
                 if not isinstance(first_row, list):
                     first_row = [first_row]
                 result["headers"] = [_serialize_value(v) for v in first_row]
 
-            # Merged cells - scan header area (first 20 rows) for performance
+            # Merged cells anywhere in the used range (merge-free blocks cost
+            # one probe each, so this stays cheap on large sheets)
             try:
-                merge_flag = ws.api.UsedRange.MergeCells
+                merge_flag = used.api.MergeCells
                 # False = no merges, True/None = some or all merged
                 if merge_flag is not False:
+                    areas = _find_merge_areas(ws.api, used_rect, merge_flag)
                     merged: list[dict] = []
-                    visited_addrs: set[str] = set()
-                    scan_rows = min(20, total_rows)
-                    header_rng = ws.range(
-                        (used.row, used.column),
-                        (used.row + scan_rows - 1, used.column + total_cols - 1),
-                    )
-                    for cell in header_rng:
-                        if cell.api.MergeCells:
-                            ma = cell.api.MergeArea
-                            addr = ma.Address
-                            if addr not in visited_addrs:
-                                visited_addrs.add(addr)
-                                merged.append({
-                                    "range": addr,
-                                    "value": _serialize_value(ma.Cells(1, 1).Value),
-                                    "rows": ma.Rows.Count,
-                                    "columns": ma.Columns.Count,
-                                })
+                    for addr, m, ma in areas[:self.SUMMARY_MERGE_LIMIT]:
+                        merged.append({
+                            "range": addr,
+                            "value": _serialize_value(ma.Cells(1, 1).Value),
+                            "rows": m[2] - m[0] + 1,
+                            "columns": m[3] - m[1] + 1,
+                        })
                     if merged:
                         result["merged_cells"] = merged
+                    if len(areas) > len(merged):
+                        result["merged_cells_total"] = len(areas)
             except Exception:
                 pass
 
-            # Region detection - probe strategic cells (fast, max ~5 COM calls)
+            # Tables: one occupancy read of the data range (sampled bands
+            # on huge sheets), labelled locally
             try:
-                api_used = ws.api.UsedRange
-                first_cr = api_used.Cells(1, 1).CurrentRegion
-                regions: list[dict] = [{
-                    "range": first_cr.Address,
-                    "rows": first_cr.Rows.Count,
-                    "columns": first_cr.Columns.Count,
-                }]
-                seen: set[str] = {first_cr.Address}
-
-                for probe_row in [total_rows, total_rows // 2]:
-                    if probe_row < 2:
-                        continue
-                    probe = api_used.Cells(probe_row, 1)
-                    if probe.Value is not None:
-                        cr = probe.CurrentRegion
-                        if cr.Address not in seen:
-                            seen.add(cr.Address)
-                            regions.append({
-                                "range": cr.Address,
-                                "rows": cr.Rows.Count,
-                                "columns": cr.Columns.Count,
-                            })
-                if len(regions) > 1:
-                    result["regions"] = regions
+                if extent is not None:
+                    tables, sampled = self._find_tables(ws, extent)
+                    result["regions"] = tables[:self.SUMMARY_REGION_LIMIT]
+                    if len(tables) > self.SUMMARY_REGION_LIMIT:
+                        result["regions_total"] = len(tables)
+                    if sampled:
+                        result["regions_sampled"] = True
+            except Cancelled:
+                raise
             except Exception:
                 pass
 
+            if where:
+                self.cache.put(*where, "summary", None, copy.deepcopy(result))
             return result
 
+        if paged:
+            return self._start_pages(
+                wb, ws, cell_range, headers, merge_info, header_row,
+                {"rows": max_rows, "cells": max_cells, "bytes": max_bytes},
+                fast, encoding,
+            )
+
         rng = ws.range(cell_range)
-        raw = rng.value
-        if raw is None:
+        rect = _range_rect(ws, cell_range, rng)
+        address = geometry.format_a1(rect)
+        transfer = None
+        # Plain value grids are cached; fast reads convert per request
+        where = None if fast else self._cache_key(wb, ws)
+        cached = self.cache.get(*where, "values", rect) if where else None
+        if cached is not None:
+            data = [list(row) for row in cached]
+        elif fast:
+            data, transfer = self._read_value2(
+                ws, rng.api, rect,
+                (header_row - 1 if header_row else 0) if headers else None,
+            )
+        elif self.transfer.needed(rect):
+            cols = geometry.shape(rect)[1]
+            data, transfer = self.transfer.read(rect, lambda band: [
+                _serialize_row(row)
+                for row in _as_grid(ws.range(band[:2], band[2:]).value, cols)
+            ])
+        else:
+            raw = rng.value
+            data = _to_2d(raw, geometry.shape(rect)[1]) if raw is not None else []
+        if where and cached is None:
+            self.cache.put(
+                *where, "values", rect, [list(row) for row in data],
+                formulas=rng.api.HasFormula is not False,
+            )
+        if not data:
             return {
                 "data": [],
-                "range": rng.address,
+                "range": address,
                 "sheet": ws.name,
                 "rows": 0,
                 "columns": 0,
             }
 
-        data = _to_2d(raw)
-
         # Fill merged cells with the merge area's first-cell value
         merged_ranges_list: list[dict] = []
         if merge_info:
             merge_flag = rng.api.MergeCells
             if merge_flag is not False:  # True or None (mixed)
-                visited: set[str] = set()
-                for i in range(rng.rows.count):
-                    for j in range(rng.columns.count):
-                        cell_api = rng[i, j].api
-                        if cell_api.MergeCells:
-                            ma = cell_api.MergeArea
-                            addr = ma.Address
-                            val = _serialize_value(ma.Cells(1, 1).Value)
-                            if addr not in visited:
-                                visited.add(addr)
-                                merged_ranges_list.append({
-                                    "range": addr,
-                                    "value": val,
-                                })
-                            data[i][j] = val
-
-        result: dict[str, Any] = {
-            "range": rng.address,
-            "sheet": ws.name,
-            "rows": len(data),
-            "columns": len(data[0]) if data else 0,
-        }
+                merged_ranges_list = self._fill_merged(
+                    ws, rect[0], rect[1], data, merge_flag,
+                )
 
-        if headers and len(data) > 1:
-            hdr_idx = (header_row - 1) if header_row else 0
-            if 0 <= hdr_idx < len(data):
-                result["headers"] = data[hdr_idx]
-                result["data"] = data[hdr_idx + 1:]
-            else:
-                result["data"] = data
-        else:
-            result["data"] = data
+        result = self._rows_result(
+            address, ws.name, data, headers, header_row, encoding,
+        )
 
         if merged_ranges_list:
             result["merged_ranges"] = merged_ranges_list
+        if transfer:
+            result["transfer"] = transfer
+        if cached is not None:
+            result["cached"] = True
 
-        if detail and rng.size == 1:
+        if detail and geometry.area(rect) == 1:
             raw_val = rng.value
             formula = rng.formula if rng.formula != rng.value else None
 
@@ -451,6 +1445,356 @@ class ExcelHandler:
 
         return result
 
+    def _find_tables(self, ws: SheetLike, extent: Rect) -> tuple[list[dict], bool]:
+        """Tables in ``extent`` and whether they come from sampled rows.
+
+        Up to ``REGION_SCAN_CELLS`` cells are read in one ``Value2`` call.
+        Larger extents are covered by ``REGION_SCAN_BANDS`` evenly spaced
+        row bands within the same budget, the last ending on the last row,
+        so the COM cost stays bounded however many tables there are. Table
+        ends that fall between bands are then approximate.
+        """
+        cols = geometry.shape(extent)[1]
+        bands = self._region_bands(extent)
+        grid: list[list[Any]] = []
+        row_numbers: list[int] = []
+        for band in bands:
+            check_cancelled()
+            raw = ws.api.Range(_block_address(*band)).Value2
+            grid.extend(_as_grid(raw, cols))
+            row_numbers.extend(range(band[0], band[2] + 1))
+        return find_tables(grid, row_numbers, extent[1]), len(bands) > 1
+
+    def _region_bands(self, extent: Rect) -> list[Rect]:
+        """Row bands of ``extent`` a table scan reads (see :meth:`_find_tables`)."""
+        r0, c0, r1, c1 = extent
+        rows, cols = geometry.shape(extent)
+        budget = max(1, self.REGION_SCAN_CELLS // cols)
+        if rows <= budget:
+            return [extent]
+        n = self.REGION_SCAN_BANDS
+        height = max(1, budget // n)
+        step = (rows - height) // (n - 1)
+        return [
+            (r0 + k * step, c0, r0 + k * step + height - 1, c1)
+            for k in range(n - 1)
+        ] + [(r1 - height + 1, c0, r1, c1)]
+
+    @staticmethod
+    def _rows_result(
+        address: str,
+        sheet: str,
+        data: list[list[Any]],
+        headers: bool,
+        header_row: int | None,
+        encoding: str,
+    ) -> dict[str, Any]:
+        """read_data result for a block of rows: split headers, encode."""
+        result: dict[str, Any] = {
+            "range": address,
+            "sheet": sheet,
+            "rows": len(data),
+            "columns": len(data[0]) if data else 0,
+        }
+
+        if headers and len(data) > 1:
+            hdr_idx = (header_row - 1) if header_row else 0
+            if 0 <= hdr_idx < len(data):
+                result["headers"] = data[hdr_idx]
+                result["data"] = data[hdr_idx + 1:]
+            else:
+                result["data"] = data
+        else:
+            result["data"] = data
+        if encoding != "rows":
+            result["data"], result["encoding"] = encode(result["data"], encoding)
+        return result
+
+    def _read_offline(
+        self,
+        book: XlsxBook,
+        sheet: str | None,
+        cell_range: str | None,
+        headers: bool,
+        header_row: int | None,
+        encoding: str,
+    ) -> dict:
+        """read_data from a closed .xlsx file, shaped like the COM result."""
+        if sheet == "*":
+            sheets_data: dict[str, Any] = {}
+            for name in book.sheet_names:
+                check_cancelled()
+                sheets_data[name] = self._read_offline(
+                    book, name, cell_range, headers, header_row, encoding,
+                )
+            return {"sheet_count": len(sheets_data), "sheets": sheets_data}
+
+        ws = self._offline_sheet(book, sheet)
+        if cell_range is None:
+            return self._offline_summary(ws)
+
+        rect = geometry.parse_a1(cell_range)
+        address = geometry.format_a1(rect)
+        (data,) = ws.read([rect])
+        if geometry.area(rect) == 1 and data[0][0] is None:
+            data = []
+        if not data:
+            return {
+                "data": [], "range": address, "sheet": ws.name,
+                "rows": 0, "columns": 0, "offline": True,
+            }
+        result = self._rows_result(
+            address, ws.name, data, headers, header_row, encoding,
+        )
+        result["offline"] = True
+        return result
+
+    def _offline_summary(self, ws: XlsxSheet) -> dict:
+        """Sheet summary of a closed .xlsx file, in two streamed passes.
+
+        The first finds the used range, data extent and merge areas; the
+        second reads the header row, merge anchors and the cells the
+        table scan needs, within the same budget as over COM.
+        """
+        used, extent, merges = ws.survey()
+        total_rows, total_cols = geometry.shape(extent) if extent else (0, 0)
+        result: dict[str, Any] = {
+            "sheet": ws.name,
+            "used_range": geometry.format_a1(used),
+            "data_range": geometry.format_a1(extent) if extent else None,
+            "total_rows": total_rows,
+            "total_columns": total_cols,
+        }
+        listed = merges[:self.SUMMARY_MERGE_LIMIT]
+        bands = self._region_bands(extent) if extent else []
+        rects = [(m[0], m[1], m[0], m[1]) for m in listed] + bands
+        if extent:
+            rects.append((extent[0], extent[1], extent[0], extent[3]))
+        grids = ws.read(rects)
+
+        if extent:
+            result["headers"] = grids[-1][0]
+        if listed:
+            result["merged_cells"] = [
+                {
+                    "range": geometry.format_a1(m),
+                    "value": grid[0][0],
+                    "rows": m[2] - m[0] + 1,
+                    "columns": m[3] - m[1] + 1,
+                }
+                for m, grid in zip(listed, grids)
+            ]
+        if len(merges) > len(listed):
+            result["merged_cells_total"] = len(merges)
+        if extent:
+            grid: list[list[Any]] = []
+            row_numbers: list[int] = []
+            for band, rows in zip(bands, grids[len(listed):]):
+                grid.extend(rows)
+                row_numbers.extend(range(band[0], band[2] + 1))
+            tables = find_tables(grid, row_numbers, extent[1])
+            result["regions"] = tables[:self.SUMMARY_REGION_LIMIT]
+            if len(tables) > self.SUMMARY_REGION_LIMIT:
+                result["regions_total"] = len(tables)
+            if len(bands) > 1:
+                result["regions_sampled"] = True
+        result["offline"] = True
+        return result
+
+    def _read_value2(
+        self, ws: SheetLike, api: Any, rect: Rect, header_index: int | None,
+    ) -> tuple[list[list[Any]], dict | None]:
+        """Bulk-read a range through ``Value2`` and convert it column-wise.
+
+        Rows up to ``header_index`` are converted as plain values; date
+        columns are detected from the number format of the rows below it.
+        Large blocks are read and converted band by band; the transfer
+        stats are returned alongside the rows (None for a single read).
+        """
+        r0, c0, r1, c1 = rect
+        rows, cols = geometry.shape(rect)
+        plain = 0
+        if header_index is not None and rows > 1 and header_index < rows:
+            plain = header_index + 1
+        if self.transfer.needed(rect):
+            kinds = _date_kinds(ws.api, r0 + plain, c0, r1, c1)
+            return self.transfer.read(rect, lambda band: _convert_value2(
+                _as_grid(ws.range(band[:2], band[2:]).api.Value2, cols),
+                kinds, max(0, plain - (band[0] - r0)),
+            ))
+
+        raw = api.Value2
+        if raw is None:
+            return [], None
+        grid = _as_grid(raw)
+        kinds = _date_kinds(
+            ws.api, r0 + plain, c0, r0 + len(grid) - 1, c0 + len(grid[0]) - 1,
+        )
+        return _convert_value2(grid, kinds, plain), None
+
+    def _fill_merged(
+        self,
+        ws: SheetLike,
+        top: int,
+        left: int,
+        data: list[list[Any]],
+        flag: Any,
+    ) -> list[dict]:
+        """Fill merged cells in ``data`` (anchored at top/left) in place."""
+        rect = (top, left, top + len(data) - 1, left + len(data[0]) - 1)
+        merged: list[dict] = []
+        for addr, m, ma in _find_merge_areas(ws.api, rect, flag):
+            if rect[0] <= m[0] and rect[1] <= m[1]:
+                val = data[m[0] - top][m[1] - left]
+            else:
+                val = _serialize_value(ma.Cells(1, 1).Value)
+            merged.append({"range": addr, "value": val})
+            for r in range(max(m[0], rect[0]), min(m[2], rect[2]) + 1):
+                for c in range(max(m[1], rect[1]), min(m[3], rect[3]) + 1):
+                    data[r - top][c - left] = val
+        return merged
+
+    # Rows fetched per page when only max_bytes is given and no row size
+    # has been measured yet
+    PAGE_ROWS_FALLBACK = 1000
+
+    def _start_pages(
+        self,
+        wb: BookLike,
+        ws: SheetLike,
+        cell_range: str,
+        headers: bool,
+        merge_info: bool,
+        header_row: int | None,
+        budget: dict[str, int | None],
+        fast: bool = False,
+        encoding: str = "rows",
+    ) -> dict:
+        """Set up pagination over ``cell_range`` and return the first page."""
+        r0, c0, r1, c1 = _range_rect(ws, cell_range)
+        # Clip whole-column/row references to the data, not the used range;
+        # an explicit range is paged as given
+        whole_columns = r0 == 1 and r1 == geometry.MAX_ROWS
+        whole_rows = c0 == 1 and c1 == geometry.MAX_COLS
+        if whole_columns or whole_rows:
+            used = ws.api.UsedRange
+            used_rect = _parse_address(used.Address)
+            _, _, u1, v1 = _data_extent(used, used_rect) or used_rect
+            if whole_columns:
+                r1 = min(r1, u1)
+            if whole_rows:
+                c1 = min(c1, v1)
+        state: dict[str, Any] = {
+            "v": 1,
+            "wb": wb.fullname,
+            "sheet": ws.name,
+            "rect": [r0, c0, max(r0, r1), max(c0, c1)],
+            "next": r0,
+            "headers": None,
+            "header_row": None,
+            "budget": budget,
+            "merge": merge_info,
+        }
+        if encoding != "rows":
+            state["encoding"] = encoding
+        if headers and r1 > r0:
+            hdr = r0 + (header_row - 1 if header_row else 0)
+            if hdr <= r1:
+                state["header_row"] = hdr
+        if fast:
+            # Date columns are sampled once and carried in the cursor
+            hdr = state["header_row"]
+            data_top = hdr + 1 if hdr is not None else r0
+            state["dates"] = _date_kinds(ws.api, data_top, c0, r1, c1)
+        return self._read_page(ws, state)
+
+    def _page_rows(self, state: dict, columns: int) -> int:
+        """Rows to fetch for the next page from the row/cell/byte budget."""
+        budget = state["budget"]
+        limits = []
+        if budget.get("rows"):
+            limits.append(budget["rows"])
+        if budget.get("cells"):
+            limits.append(max(1, budget["cells"] // columns))
+        if budget.get("bytes"):
+            per_row = state.get("row_bytes") or columns * 12 + 2
+            limits.append(max(1, budget["bytes"] // per_row + 1))
+        return min(limits) if limits else self.PAGE_ROWS_FALLBACK
+
+    def _read_page(self, ws: SheetLike, state: dict) -> dict:
+        """Read one window with a single bulk read and build the page."""
+        r0, c0, r1, c1 = state["rect"]
+        columns = c1 - c0 + 1
+        start = state["next"]
+        header_row = state.get("header_row")
+        take = self._page_rows(state, columns)
+
+        # The first page also carries the header row in the same read
+        first = start
+        if header_row is not None and state["headers"] is None:
+            first = header_row
+            start = header_row + 1
+        last = min(r1, start + take - 1)
+
+        if last < first:
+            data: list[list[Any]] = []
+        else:
+            window = ws.range((first, c0), (last, c1))
+            if "dates" in state:
+                data = _convert_value2(
+                    _as_grid(window.api.Value2), state["dates"], start - first,
+                )
+            else:
+                data = _to_2d(window.value, columns)
+            if state.get("merge") and data:
+                flag = window.api.MergeCells
+                if flag is not False:
+                    self._fill_merged(ws, first, c0, data, flag)
+        if first < start:
+            state["headers"] = data[0] if data else []
+            data = data[1:]
+
+        max_bytes = state["budget"].get("bytes")
+        if max_bytes and data:
+            used = 0
+            keep = 0
+            for row in data:
+                size = _row_bytes(row)
+                if keep and used + size > max_bytes:
+                    break
+                used += size
+                keep += 1
+            state["row_bytes"] = max(1, used // keep)
+            data = data[:keep]
+
+        page_first = start
+        page_last = start + len(data) - 1
+        next_row = page_last + 1
+        result: dict[str, Any] = {
+            "range": (
+                geometry.format_a1((page_first, c0, page_last, c1))
+                if data else None
+            ),
+            "sheet": state["sheet"],
+            "rows": len(data),
+            "columns": columns,
+        }
+        if state["headers"] is not None:
+            result["headers"] = state["headers"]
+        if "encoding" in state:
+            result["data"], result["encoding"] = encode(data, state["encoding"])
+        else:
+            result["data"] = data
+        data_top = (header_row + 1) if header_row is not None else r0
+        result["row_offset"] = page_first - data_top
+        result["total_rows"] = r1 - data_top + 1
+        if next_row <= r1 and data:
+            state["next"] = next_row
+            result["next_cursor"] = _encode_cursor(state)
+        else:
+            result["next_cursor"] = None
+        return result
+
     # ------------------------------------------------------------------ #
     #  Tool 4: write_data
     # ------------------------------------------------------------------ #
@@ -462,38 +1806,163 @@ class ExcelHandler:
         formula: str | None = None,
         workbook: str | None = None,
         sheet: str | None = None,
+        bulk: bool | None = None,
+        mode: str = "full",
     ) -> dict:
         if data is not None and formula is not None:
             raise ExcelError("Provide either 'data' or 'formula', not both.")
         if data is None and formula is None:
             raise ExcelError("Either 'data' or 'formula' must be provided.")
+        if mode not in WRITE_MODES:
+            raise ExcelError(
+                f"Unknown mode '{mode}'. Use: {', '.join(WRITE_MODES)}."
+            )
+        rows = len(data) if data is not None else 0
+        cols = len(data[0]) if data else 0
+        if mode == "diff" and any(len(row) != cols for row in data or ()):
+            raise ExcelError(
+                "mode='diff' needs all rows of 'data' to be the same length."
+            )
+
+        draft = self._draft(workbook)
+        if draft is not None:
+            return self._write_draft(draft, sheet, start_cell, data, formula, mode)
 
         wb = self._get_workbook_or_active(workbook)
         ws = self._get_sheet(wb, sheet)
+        rng = ws.range(start_cell)
+        rect = _range_rect(ws, start_cell, rng)
+        if rows and cols:
+            rect = geometry.resize(rect, rows, cols)
+        # Rows longer than the first still land in the sheet
+        width = max((len(row) for row in data or ()), default=0)
+        touched = geometry.resize(rect, rows, width) if rows and width else rect
+        self._invalidate(wb, ws, touched, recalc=True)
 
         if formula is not None:
-            rng = ws.range(start_cell)
-            rng.formula = formula
-            calculated = _serialize_value(rng.value)
-            return {
-                "cell": rng.address,
+            write = mode == "full" or rng.formula != formula
+            recalc = None
+            with self._bulk_scope(bulk) as deferred:
+                if write:
+                    rng.formula = formula
+                    # Only the new cell needs a value before we read it back
+                    if deferred:
+                        recalc = _recalc(rng.api, "range")
+                calculated = _serialize_value(rng.value)
+            result = {
+                "cell": geometry.format_a1(rect),
                 "sheet": ws.name,
                 "formula": formula,
                 "calculated_value": calculated,
             }
+            if mode == "diff":
+                result["changed_cells"] = int(write)
+            if recalc:
+                result["recalc"] = recalc
+            return result
 
-        rng = ws.range(start_cell)
-        rng.value = data
+        if mode == "diff":
+            return self._write_diff(ws, start_cell, rect, data, bulk)
+
+        def store(band: Rect, part: list[list[Any]]) -> None:
+            ws.range(band[:2], band[2:]).value = part
+
+        transfer = None
+        with self._bulk_scope(bulk) as deferred:
+            if rows and cols and self.transfer.needed(rect):
+                transfer = self.transfer.write(rect, data, store)
+            else:
+                rng.value = data
+            recalc = _recalc(ws.api, "sheet") if deferred else None
+        result = {
+            "message": f"Data written successfully to {ws.name}",
+            "start_cell": start_cell,
+            "written_range": geometry.format_a1(rect),
+            "rows": rows,
+            "columns": cols,
+        }
+        if transfer:
+            result["transfer"] = transfer
+        if recalc:
+            result["recalc"] = recalc
+        return result
+
+    def _write_draft(
+        self,
+        draft: XlsxWriter,
+        sheet: str | None,
+        start_cell: str,
+        data: list[list] | None,
+        formula: str | None,
+        mode: str,
+    ) -> dict:
+        """write_data into a new workbook; every cell is new, so diff is full."""
+        name = self._draft_sheet(draft, sheet)
+        try:
+            top, left = geometry.parse_a1(start_cell)[:2]
+            rect = draft.write(name, top, left, [[formula]] if data is None else data)
+        except ValueError as exc:
+            raise ExcelError(str(exc)) from None
+        if formula is not None:
+            # Excel calculates the formula when the file is first opened
+            return {
+                "cell": geometry.format_a1(rect),
+                "sheet": name,
+                "formula": formula,
+                "calculated_value": None,
+                "offline": True,
+            }
         rows = len(data)
         cols = len(data[0]) if data else 0
-        end_cell = rng.expand().address if rows and cols else rng.address
-        return {
-            "message": f"Data written successfully to {ws.name}",
+        if rows and cols:
+            rect = geometry.resize(rect, rows, cols)
+        result = {
+            "message": f"Data written to {name}; the file is written when it is saved",
             "start_cell": start_cell,
-            "written_range": end_cell,
+            "written_range": geometry.format_a1(rect),
             "rows": rows,
             "columns": cols,
+            "offline": True,
         }
+        if mode == "diff":
+            result["changed_cells"] = sum(v is not None for row in data for v in row)
+        return result
+
+    def _write_diff(
+        self,
+        ws: Any,
+        start_cell: str,
+        rect: Rect,
+        data: list[list[Any]],
+        bulk: bool | None,
+    ) -> dict:
+        """Write only the rectangles of ``rect`` whose cells differ from ``data``."""
+        rows, cols = len(data), len(data[0]) if data else 0
+        changed = _changed_cells(ws, rect, data) if rows and cols else []
+        blocks = geometry.compact(changed)
+
+        recalc = None
+        if blocks:
+            r0, c0 = rect[0], rect[1]
+            with self._bulk_scope(bulk) as deferred:
+                _write_blocks(ws, blocks, lambda r, c: data[r - r0][c - c0])
+                if deferred:
+                    recalc = _recalc(ws.api, "sheet")
+        result = {
+            "message": (
+                f"Data written successfully to {ws.name}" if blocks
+                else f"No changes to write in {ws.name}"
+            ),
+            "start_cell": start_cell,
+            "written_range": geometry.format_a1(rect),
+            "rows": rows,
+            "columns": cols,
+            "changed_cells": len(changed),
+            "blocks_written": len(blocks),
+        }
+        if recalc:
+            result["recalc"] = recalc
+        return result
 
     # ------------------------------------------------------------------ #
     #  Tool 5: manage_sheets
@@ -507,8 +1976,27 @@ class ExcelHandler:
         new_name: str | None = None,
         position: int = 1,
         count: int = 1,
+        bulk: bool | None = None,
     ) -> dict:
+        draft = self._draft(workbook)
+        if draft is not None and action in ("list", "add"):
+            if action == "add":
+                name = new_name or sheet
+                if not name:
+                    number = len(draft.sheet_names) + 1
+                    while f"sheet{number}" in (n.lower() for n in draft.sheet_names):
+                        number += 1
+                    name = f"Sheet{number}"
+                try:
+                    draft.add_sheet(name)
+                except ValueError as exc:
+                    raise ExcelError(str(exc)) from None
+                return {"message": f"Sheet '{name}' added.", "sheets": draft.sheet_names}
+            return {"sheets": draft.sheet_names, "active_sheet": draft.sheet_names[0]}
+
         wb = self._get_workbook_or_active(workbook)
+        if action not in ("list", "activate"):
+            self._invalidate(wb)
 
         if action == "list":
             return {
@@ -533,6 +2021,7 @@ class ExcelHandler:
             app.display_alerts = False
             try:
                 wb.sheets[sheet].delete()
+                self.handles.forget_sheet(wb, sheet)
             finally:
                 app.display_alerts = True
             return {
@@ -546,6 +2035,7 @@ class ExcelHandler:
                     "Both 'sheet' and 'new_name' are required for rename action."
                 )
             wb.sheets[sheet].name = new_name
+            self.handles.forget_sheet(wb, sheet)
             return {
                 "message": f"Sheet '{sheet}' renamed to '{new_name}'.",
                 "sheets": [s.name for s in wb.sheets],
@@ -556,7 +2046,7 @@ class ExcelHandler:
                 raise ExcelError("Parameter 'sheet' is required for copy action.")
             source = wb.sheets[sheet]
             source.copy(after=source)
-            copied = wb.sheets[source.index + 1]
+            copied = wb.sheets[source.index]  # 0-based: the slot after source
             if new_name:
                 copied.name = new_name
             return {
@@ -581,25 +2071,28 @@ class ExcelHandler:
             if count < 1:
                 raise ExcelError("count must be >= 1.")
 
-            if action == "insert_rows":
-                rng_str = f"{position}:{position + count - 1}"
-                ws.range(rng_str).api.EntireRow.Insert()
-                return {"message": f"Inserted {count} row(s) at row {position}.", "sheet": ws.name}
-
-            if action == "delete_rows":
-                rng_str = f"{position}:{position + count - 1}"
-                ws.range(rng_str).api.EntireRow.Delete()
-                return {"message": f"Deleted {count} row(s) starting at row {position}.", "sheet": ws.name}
-
-            if action == "insert_columns":
-                rng = ws.range((1, position), (1, position + count - 1))
-                rng.api.EntireColumn.Insert()
-                return {"message": f"Inserted {count} column(s) at column {position}.", "sheet": ws.name}
-
-            if action == "delete_columns":
-                rng = ws.range((1, position), (1, position + count - 1))
-                rng.api.EntireColumn.Delete()
-                return {"message": f"Deleted {count} column(s) starting at column {position}.", "sheet": ws.name}
+            with self._bulk_scope(bulk) as deferred:
+                if action == "insert_rows":
+                    rng_str = f"{position}:{position + count - 1}"
+                    ws.range(rng_str).api.EntireRow.Insert()
+                    message = f"Inserted {count} row(s) at row {position}."
+                elif action == "delete_rows":
+                    rng_str = f"{position}:{position + count - 1}"
+                    ws.range(rng_str).api.EntireRow.Delete()
+                    message = f"Deleted {count} row(s) starting at row {position}."
+                elif action == "insert_columns":
+                    rng = ws.range((1, position), (1, position + count - 1))
+                    rng.api.EntireColumn.Insert()
+                    message = f"Inserted {count} column(s) at column {position}."
+                else:
+                    rng = ws.range((1, position), (1, position + count - 1))
+                    rng.api.EntireColumn.Delete()
+                    message = f"Deleted {count} column(s) starting at column {position}."
+                recalc = _recalc(ws.api, "sheet") if deferred else None
+            result = {"message": message, "sheet": ws.name}
+            if recalc:
+                result["recalc"] = recalc
+            return result
 
         raise ExcelError(
             f"Unknown action '{action}'. Use: list, add, delete, rename, copy, "
@@ -610,6 +2103,9 @@ class ExcelHandler:
     #  Tool 6: find_replace
     # ------------------------------------------------------------------ #
 
+    # Matches returned by a search unless a smaller limit is given
+    SEARCH_LIMIT = 1000
+
     def find_replace(
         self,
         find: str,
@@ -617,44 +2113,198 @@ class ExcelHandler:
         sheet: str | None = None,
         replace: str | None = None,
         match_case: bool = False,
+        match: str = "contains",
+        look_in: str = "values",
+        limit: int | None = None,
+        cell_range: str | None = None,
+        include_formulas: bool = False,
     ) -> dict:
-        wb = self._get_workbook_or_active(workbook)
-        ws = self._get_sheet(wb, sheet)
-
-        rng = ws.used_range
-        if rng is None:
-            return {"matches": [], "count": 0}
-
-        api = rng.api
+        try:
+            if replace is not None:
+                change = search.replacer(find, replace, match, match_case)
+            predicate = search.matcher(find, match, match_case)
+            areas = geometry.parse(cell_range) if cell_range else None
+        except ValueError as exc:
+            raise ExcelError(str(exc))
+        if look_in not in ("values", "formulas"):
+            raise ExcelError(f"Unknown look_in '{look_in}'. Use: values, formulas.")
+        if limit is not None and limit < 1:
+            raise ExcelError("limit must be >= 1.")
+        limit = limit or self.SEARCH_LIMIT
 
         if replace is not None:
-            count = api.Replace(
-                What=find,
-                Replacement=replace,
-                MatchCase=match_case,
+            return self._replace(
+                find, replace, change, workbook, sheet, areas, include_formulas, limit,
             )
-            return {
-                "message": f"Replaced occurrences of '{find}' with '{replace}'.",
-                "replaced": bool(count),
-            }
 
+        key = "formula" if look_in == "formulas" else "value"
         matches: list[dict] = []
-        first = api.Find(What=find, MatchCase=match_case)
-        if first is None:
-            return {"matches": [], "count": 0}
-
-        current = first
-        while True:
-            matches.append({
-                "cell": current.Address,
-                "value": _serialize_value(current.Value),
-                "sheet": ws.name,
-            })
-            current = api.FindNext(current)
-            if current is None or current.Address == first.Address:
+        truncated = False
+        for wb, ws in self._search_targets(workbook, sheet):
+            check_cancelled()
+            where = {"sheet": ws.name}
+            if workbook == "*":
+                where["workbook"] = wb.name
+            for rect in self._search_rects(ws, areas):
+                grid = self._read_grid(ws, rect, formulas=look_in == "formulas")
+                r0, c0 = rect[0], rect[1]
+                for i, j, value in search.scan(grid, predicate):
+                    if len(matches) == limit:
+                        truncated = True
+                        break
+                    matches.append({
+                        "cell": geometry.format_a1((r0 + i, c0 + j, r0 + i, c0 + j)),
+                        key: value,
+                        **where,
+                    })
+                if truncated:
+                    break
+            if truncated:
                 break
 
-        return {"matches": matches, "count": len(matches)}
+        result: dict[str, Any] = {"matches": matches, "count": len(matches)}
+        if truncated:
+            result["truncated"] = True
+        return result
+
+    def _replace(
+        self,
+        find: str,
+        replace: str,
+        change: Callable[[Any], str | None],
+        workbook: str | None,
+        sheet: str | None,
+        areas: list[Rect] | None,
+        include_formulas: bool,
+        limit: int,
+    ) -> dict:
+        """Replace over bulk snapshots, writing back only the changed cells.
+
+        Each target block is read once (values and formulas); new text is
+        computed in Python and the changed cells are written as compacted
+        rectangles. Formula cells are skipped unless ``include_formulas``,
+        in which case their formula text is rewritten.
+        """
+        changes: list[dict] = []
+        replaced = skipped = blocks_written = 0
+        for wb, ws in self._search_targets(workbook, sheet):
+            check_cancelled()
+            where = {"sheet": ws.name}
+            if workbook == "*":
+                where["workbook"] = wb.name
+            for rect in self._search_rects(ws, areas):
+                grid = self._read_cells(ws, rect)
+                r0, c0 = rect[0], rect[1]
+                new_values: dict[tuple[int, int], Any] = {}
+                for i, row in enumerate(grid):
+                    for j, (value, formula) in enumerate(row):
+                        if isinstance(formula, str) and formula.startswith("="):
+                            old = formula
+                            new = change(formula)
+                            if new is not None and not include_formulas:
+                                skipped += 1
+                                continue
+                            written: Any = new
+                        else:
+                            old = _serialize_value(value)
+                            new = change(old)
+                            written = _retyped(value, new)
+                        if new is None:
+                            continue
+                        new_values[(r0 + i, c0 + j)] = written
+                        if len(changes) < limit:
+                            changes.append({
+                                "cell": geometry.format_a1((r0 + i, c0 + j, r0 + i, c0 + j)),
+                                "old": old,
+                                "new": new,
+                                **where,
+                            })
+                if new_values:
+                    self._invalidate(wb, ws, rect, recalc=True)
+                    blocks = geometry.compact(new_values)
+                    _write_blocks(ws, blocks, lambda r, c: new_values[(r, c)])
+                    blocks_written += len(blocks)
+                    replaced += len(new_values)
+
+        result: dict[str, Any] = {
+            "message": (
+                f"Replaced '{find}' with '{replace}' in {replaced} cell(s)."
+            ),
+            "replaced": replaced,
+            "changes": changes,
+            "blocks_written": blocks_written,
+        }
+        if replaced > len(changes):
+            result["truncated"] = True
+        if skipped:
+            result["skipped_formulas"] = skipped
+        return result
+
+    def _read_cells(self, ws: SheetLike, rect: Rect) -> list[list[tuple[Any, Any]]]:
+        """``(value, formula)`` pairs of ``rect``: two bulk reads per band."""
+        cols = geometry.shape(rect)[1]
+
+        def fetch(band: Rect) -> list[list[tuple[Any, Any]]]:
+            block = ws.range(band[:2], band[2:])
+            values = _as_grid(block.value, cols)
+            formulas = _as_grid(block.formula, cols)
+            return [list(zip(v, f)) for v, f in zip(values, formulas)]
+
+        if self.transfer.needed(rect):
+            return self.transfer.read(rect, fetch)[0]
+        return fetch(rect)
+
+    def _search_rects(self, ws: SheetLike, areas: list[Rect] | None) -> list[Rect]:
+        """Parts of the sheet's data range a search covers (all of it by default)."""
+        _, extent = self._used_and_extent(ws)
+        if extent is None:
+            return []
+        if areas is None:
+            return [extent]
+        return [
+            rect for rect in (geometry.intersect(area, extent) for area in areas)
+            if rect is not None
+        ]
+
+    def _search_targets(
+        self, workbook: str | None, sheet: str | None,
+    ) -> Iterator[tuple[BookLike, SheetLike]]:
+        """Sheets a search covers; '*' expands to every open book or sheet.
+
+        Across all workbooks a named sheet is searched where it exists.
+        """
+        if workbook == "*":
+            books = list(self._get_app().books)
+        else:
+            books = [self._get_workbook_or_active(workbook)]
+        for wb in books:
+            if sheet == "*":
+                for ws in wb.sheets:
+                    yield wb, ws
+                continue
+            try:
+                ws = self._get_sheet(wb, sheet)
+            except ExcelError:
+                if workbook == "*":
+                    continue
+                raise
+            yield wb, ws
+
+    def _read_grid(
+        self, ws: SheetLike, rect: Rect, formulas: bool = False,
+    ) -> list[list[Any]]:
+        """Serialized values (or formula text) of ``rect``, chunked if large."""
+        cols = geometry.shape(rect)[1]
+
+        def fetch(band: Rect) -> list[list[Any]]:
+            block = ws.range(band[:2], band[2:])
+            if formulas:
+                return _as_grid(block.formula, cols)
+            return [_serialize_row(row) for row in _as_grid(block.value, cols)]
+
+        if self.transfer.needed(rect):
+            return self.transfer.read(rect, fetch)[0]
+        return fetch(rect)
 
     # ------------------------------------------------------------------ #
     #  Tool 7: format_range
@@ -675,72 +2325,101 @@ class ExcelHandler:
         alignment: str | None = None,
         wrap_text: bool | None = None,
         border: bool | None = None,
+        bulk: bool | None = None,
     ) -> dict:
+        draft = self._draft(workbook)
+        if draft is not None:
+            spec = {
+                key: value for key, value in (
+                    ("bold", bold), ("italic", italic), ("underline", underline),
+                    ("font_size", font_size), ("font_color", font_color),
+                    ("bg_color", bg_color), ("number_format", number_format),
+                    ("alignment", alignment), ("wrap_text", wrap_text),
+                    ("border", border or None),
+                ) if value is not None
+            }
+            name = self._draft_sheet(draft, sheet)
+            try:
+                rect = geometry.parse_a1(cell_range)
+                draft.format(name, rect, spec)
+            except ValueError as exc:
+                raise ExcelError(str(exc)) from None
+            return {
+                "range": geometry.format_a1(rect),
+                "sheet": name,
+                "applied": [f"{key}={value}" for key, value in spec.items()],
+                "offline": True,
+            }
+
         wb = self._get_workbook_or_active(workbook)
         ws = self._get_sheet(wb, sheet)
         rng = ws.range(cell_range)
+        # Number formats change how values read back (e.g. as dates)
+        self._invalidate(wb, ws, _range_rect(ws, cell_range, rng))
 
         applied: list[str] = []
 
-        if bold is not None:
-            rng.font.bold = bold
-            applied.append(f"bold={bold}")
-
-        if italic is not None:
-            rng.font.italic = italic
-            applied.append(f"italic={italic}")
-
-        if underline is not None:
-            rng.api.Font.Underline = 2 if underline else -4142
-            applied.append(f"underline={underline}")
-
-        if font_size is not None:
-            rng.font.size = font_size
-            applied.append(f"font_size={font_size}")
-
-        if font_color is not None:
-            rng.font.color = font_color
-            applied.append(f"font_color={font_color}")
-
-        if bg_color is not None:
-            rng.color = bg_color
-            applied.append(f"bg_color={bg_color}")
-
-        if number_format is not None:
-            rng.number_format = number_format
-            applied.append(f"number_format={number_format}")
-
-        if alignment is not None:
-            align_map = {
-                "left": -4131,
-                "center": -4108,
-                "right": -4152,
-                "justify": -4130,
-            }
-            xl_align = align_map.get(alignment.lower())
-            if xl_align is None:
-                raise ExcelError(
-                    f"Unknown alignment '{alignment}'. "
-                    "Use: left, center, right, justify."
-                )
-            rng.api.HorizontalAlignment = xl_align
-            applied.append(f"alignment={alignment}")
+        # Formatting changes no values, so there is nothing to recalculate
+        with self._bulk_scope(bulk):
+            if bold is not None:
+                rng.font.bold = bold
+                applied.append(f"bold={bold}")
+
+            if italic is not None:
+                rng.font.italic = italic
+                applied.append(f"italic={italic}")
+
+            if underline is not None:
+                rng.api.Font.Underline = 2 if underline else -4142
+                applied.append(f"underline={underline}")
+
+            if font_size is not None:
+                rng.font.size = font_size
+                applied.append(f"font_size={font_size}")
+
+            if font_color is not None:
+                rng.font.color = font_color
+                applied.append(f"font_color={font_color}")
+
+            if bg_color is not None:
+                rng.color = bg_color
+                applied.append(f"bg_color={bg_color}")
+
+            if number_format is not None:
+                rng.number_format = number_format
+                applied.append(f"number_format={number_format}")
+
+            if alignment is not None:
+                align_map = {
+                    "left": -4131,
+                    "center": -4108,
+                    "right": -4152,
+                    "justify": -4130,
+                }
+                xl_align = align_map.get(alignment.lower())
+                if xl_align is None:
+                    raise ExcelError(
+                        f"Unknown alignment '{alignment}'. "
+                        "Use: left, center, right, justify."
+                    )
+                rng.api.HorizontalAlignment = xl_align
+                applied.append(f"alignment={alignment}")
 
-        if wrap_text is not None:
-            rng.wrap_text = wrap_text
-            applied.append(f"wrap_text={wrap_text}")
+            if wrap_text is not None:
+                rng.wrap_text = wrap_text
+                applied.append(f"wrap_text={wrap_text}")
 
-        if border is not None and border:
-            for edge in range(7, 13):
-                try:
-                    rng.api.Borders(edge).LineStyle = 1
-                    rng.api.Borders(edge).Weight = 2
-                except Exception:
-                    pass
-            applied.append("border=True")
+            if border is not None and border:
+                for edge in range(7, 13):
+                    try:
+                        rng.api.Borders(edge).LineStyle = 1
+                        rng.api.Borders(edge).Weight = 2
+                    except Exception:
+                        pass
+                applied.append("border=True")
 
         return {
-            "range": rng.address,
+            "range": geometry.format_a1(_range_rect(ws, cell_range, rng)),
             "sheet": ws.name,
             "applied": applied,
         }
@@ -756,6 +2435,8 @@ class ExcelHandler:
         args: list | None = None,
     ) -> dict:
         app = self._get_app()
+        # A macro can change any sheet of any workbook
+        self._invalidate()
 
         if workbook:
             wb = self._get_workbook(workbook)
@@ -780,52 +2461,182 @@ class ExcelHandler:
     #  Tool 9: get_formulas
     # ------------------------------------------------------------------ #
 
+    # get_formulas output: one entry per cell, or per block of cells
+    # sharing one R1C1 formula (a formula filled down or across)
+    FORMULA_MODES = ("cells", "grouped")
+
+    # Ranges larger than this read only their formula areas, unless the
+    # formulas are scattered over more than FORMULA_AREA_LIMIT areas
+    FORMULA_PROBE_CELLS = 10_000
+    FORMULA_AREA_LIMIT = 64
+
     def get_formulas(
         self,
         cell_range: str,
         workbook: str | None = None,
         sheet: str | None = None,
         values_too: bool = False,
+        mode: str = "cells",
     ) -> dict:
+        if mode not in self.FORMULA_MODES:
+            raise ExcelError(
+                f"Unknown mode '{mode}'. Use: {', '.join(self.FORMULA_MODES)}."
+            )
+        grouped = mode == "grouped"
+        book = self._offline_book(workbook, cell_range)
+        if book is not None:
+            with book:
+                try:
+                    return self._formulas_offline(
+                        book, sheet, cell_range, values_too, grouped,
+                    )
+                except XlsxError as exc:
+                    raise ExcelError(str(exc)) from None
         wb = self._get_workbook_or_active(workbook)
         ws = self._get_sheet(wb, sheet)
         rng = ws.range(cell_range)
-
-        # Bulk read formulas and values
-        raw_formulas = rng.formula
-        raw_values = rng.value if values_too else None
-
-        # Normalise to 2D
-        if not isinstance(raw_formulas, list):
-            raw_formulas = [[raw_formulas]]
-        elif raw_formulas and not isinstance(raw_formulas[0], list):
-            raw_formulas = [raw_formulas]
-
-        if values_too:
-            if not isinstance(raw_values, list):
-                raw_values = [[raw_values]]
-            elif raw_values and not isinstance(raw_values[0], list):
-                raw_values = [raw_values]
-
-        base_row = rng.row
-        base_col = rng.column
+        rect = _range_rect(ws, cell_range, rng)
+        where = self._cache_key(wb, ws)
+        kind = f"formulas:{mode}" + (":values" if values_too else "")
+        cached = self.cache.get(*where, kind, rect) if where else None
+        if cached is not None:
+            return {**copy.deepcopy(cached), "cached": True}
+        letters = [_col_letter(c) for c in range(rect[1], rect[3] + 1)]
         formulas: list[dict] = []
-
-        for i, row in enumerate(raw_formulas):
-            for j, f in enumerate(row):
-                if isinstance(f, str) and f.startswith("="):
-                    addr = f"{_col_letter(base_col + j)}{base_row + i}"
+        # Grouped mode: R1C1 text -> cells, and each cell's A1 formula/value
+        shared: dict[str, list[tuple[int, int]]] = {}
+        cells: dict[tuple[int, int], tuple[str, Any]] = {}
+
+        def collect(block: Any, band: Rect) -> None:
+            # Bulk read formulas and values, normalised to 2D (COM returns
+            # formulas as nested tuples)
+            cols = geometry.shape(band)[1]
+            raw_formulas = _as_grid(block.formula, cols)
+            raw_values = _as_grid(block.value, cols) if values_too else None
+            raw_r1c1 = _as_grid(block.api.FormulaR1C1, cols) if grouped else None
+            for i, row in enumerate(raw_formulas):
+                for j, f in enumerate(row):
+                    if not (isinstance(f, str) and f.startswith("=")):
+                        continue
+                    value = _serialize_value(raw_values[i][j]) if raw_values else None
+                    if raw_r1c1:
+                        pos = (band[0] + i, band[1] + j)
+                        shared.setdefault(raw_r1c1[i][j], []).append(pos)
+                        cells[pos] = (f, value)
+                        continue
+                    addr = f"{letters[band[1] - rect[1] + j]}{band[0] + i}"
                     entry: dict[str, Any] = {"cell": addr, "formula": f}
-                    if values_too and raw_values:
-                        entry["value"] = _serialize_value(raw_values[i][j])
+                    if raw_values:
+                        entry["value"] = value
                     formulas.append(entry)
 
-        return {
+        areas = [rect]
+        if geometry.area(rect) > self.FORMULA_PROBE_CELLS:
+            found = _formula_areas(rng.api, rect, self.FORMULA_AREA_LIMIT)
+            if found is not None:
+                areas = found
+        stats = []
+        for area in areas:
+            if self.transfer.needed(area):
+                stats.append(self.transfer.run(
+                    area, lambda band: collect(ws.range(band[:2], band[2:]), band),
+                ))
+            elif area == rect:
+                collect(rng, rect)
+            else:
+                collect(ws.range(area[:2], area[2:]), area)
+        if len(areas) > 1 and not grouped:
+            # Areas come back in Excel's order; list cells row by row
+            formulas.sort(key=lambda e: geometry.parse_a1(e["cell"])[:2])
+
+        if grouped:
+            formulas = self._formula_groups(shared, cells, values_too)
+        result = {
             "formulas": formulas,
-            "total_formula_cells": len(formulas),
-            "range": rng.address,
+            "total_formula_cells": len(cells) if grouped else len(formulas),
+            "range": geometry.format_a1(rect),
             "sheet": ws.name,
         }
+        if grouped:
+            result["groups"] = len(formulas)
+        if areas != [rect]:
+            result["areas_read"] = len(areas)
+        if stats:
+            result["transfer"] = combine(stats)
+        if where:
+            # Formula text only changes with writes to the range itself
+            self.cache.put(*where, kind, rect, copy.deepcopy(result), formulas=values_too)
+        return result
+
+    def _formulas_offline(
+        self,
+        book: XlsxBook,
+        sheet: str | None,
+        cell_range: str,
+        values_too: bool,
+        grouped: bool,
+    ) -> dict:
+        """get_formulas from a closed .xlsx file, in one streamed pass.
+
+        Values are the results Excel saved with the file.
+        """
+        ws = self._offline_sheet(book, sheet)
+        rect = geometry.parse_a1(cell_range)
+        found = ws.formulas(rect, values_too)
+        if grouped:
+            shared: dict[str, list[tuple[int, int]]] = {}
+            cells: dict[tuple[int, int], tuple[str, Any]] = {}
+            for r, c, f, value in found:
+                shared.setdefault(geometry.formula_r1c1(f, r, c), []).append((r, c))
+                cells[(r, c)] = (f, value)
+            formulas = self._formula_groups(shared, cells, values_too)
+        else:
+            formulas = []
+            for r, c, f, value in found:
+                entry: dict[str, Any] = {"cell": f"{_col_letter(c)}{r}", "formula": f}
+                if values_too:
+                    entry["value"] = value
+                formulas.append(entry)
+        result: dict[str, Any] = {
+            "formulas": formulas,
+            "total_formula_cells": len(found),
+            "range": geometry.format_a1(rect),
+            "sheet": ws.name,
+        }
+        if grouped:
+            result["groups"] = len(formulas)
+        result["offline"] = True
+        return result
+
+    @staticmethod
+    def _formula_groups(
+        shared: dict[str, list[tuple[int, int]]],
+        cells: dict[tuple[int, int], tuple[str, Any]],
+        values_too: bool,
+    ) -> list[dict]:
+        """One entry per rectangle of cells sharing an R1C1 formula.
+
+        Each entry shows the A1 formula of its top-left (anchor) cell;
+        the other cells hold the same formula shifted with them.
+        """
+        groups = []
+        for r1c1, positions in shared.items():
+            for block in geometry.compact(positions):
+                r0, c0, r1, c1 = block
+                entry: dict[str, Any] = {
+                    "range": geometry.format_a1(block, absolute=False),
+                    "formula": cells[(r0, c0)][0],
+                    "r1c1": r1c1,
+                    "cells": geometry.area(block),
+                }
+                if values_too:
+                    entry["values"] = [
+                        [cells[(r, c)][1] for c in range(c0, c1 + 1)]
+                        for r in range(r0, r1 + 1)
+                    ]
+                groups.append((block, entry))
+        groups.sort(key=lambda item: item[0])
+        return [entry for _, entry in groups]
 
     # ------------------------------------------------------------------ #
     #  Tool 10: get_cell_styles
@@ -850,9 +2661,11 @@ class ExcelHandler:
         ws = self._get_sheet(wb, sheet)
         rng = ws.range(cell_range)
 
-        total_cells = rng.rows.count * rng.columns.count
+        rect = _range_rect(ws, cell_range, rng)
+        rows, cols = geometry.shape(rect)
+        total_cells = rows * cols
         result: dict[str, Any] = {
-            "range": rng.address,
+            "range": geometry.format_a1(rect),
             "sheet": ws.name,
         }
         if total_cells > 1000:
@@ -861,76 +2674,59 @@ class ExcelHandler:
                 "Consider using 'properties' filter or a smaller range."
             )
 
-        all_props = {
-            "bold", "italic", "underline", "font_name", "font_size",
-            "font_color", "bg_color", "number_format", "alignment", "border",
-        }
-        wanted = set(properties) & all_props if properties else all_props
+        wanted = [
+            p for p in _STYLE_ORDER if not properties or p in properties
+        ]
+
+        # One bulk read tells which cells are non-empty (Formula is "" only
+        # for empty cells); style queries then run on whole blocks.
+        formulas = _as_grid(rng.formula, cols)
+        mask = [[f != "" and f is not None for f in row] for row in formulas]
+        base_row, base_col = rect[0], rect[1]
+        letters = [_col_letter(base_col + j) for j in range(cols)]
+        resolved = _resolve_styles(ws.api, base_row, base_col, mask, wanted)
 
         styles: list[dict] = []
-        base_row = rng.row
-        base_col = rng.column
-
-        for i in range(rng.rows.count):
-            for j in range(rng.columns.count):
-                cell = rng[i, j]
-                cell_api = cell.api
-                if cell_api.Value is None and cell_api.Formula == "":
+        for i, row in enumerate(mask):
+            for j, non_empty in enumerate(row):
+                if not non_empty:
                     continue
-
+                raw = {p: resolved[p].get((i, j)) for p in wanted}
                 info: dict[str, Any] = {}
-                addr = f"{_col_letter(base_col + j)}{base_row + i}"
-
-                if "bold" in wanted:
-                    v = cell_api.Font.Bold
-                    if v:
-                        info["bold"] = True
-                if "italic" in wanted:
-                    v = cell_api.Font.Italic
-                    if v:
-                        info["italic"] = True
-                if "underline" in wanted:
-                    v = cell_api.Font.Underline
+
+                if "bold" in raw and raw["bold"]:
+                    info["bold"] = True
+                if "italic" in raw and raw["italic"]:
+                    info["italic"] = True
+                if "underline" in raw:
+                    v = raw["underline"]
                     if v and v != -4142:  # xlUnderlineStyleNone
                         info["underline"] = True
-                if "font_name" in wanted:
-                    info["font_name"] = cell_api.Font.Name
-                if "font_size" in wanted:
-                    info["font_size"] = cell_api.Font.Size
-                if "font_color" in wanted:
-                    c = _ole_color_to_hex(cell_api.Font.Color)
+                if "font_name" in raw:
+                    info["font_name"] = raw["font_name"]
+                if "font_size" in raw:
+                    info["font_size"] = raw["font_size"]
+                if "font_color" in raw:
+                    c = _ole_color_to_hex(raw["font_color"])
                     if c and c != "#000000":
                         info["font_color"] = c
-                if "bg_color" in wanted:
-                    try:
-                        c = _ole_color_to_hex(cell_api.Interior.Color)
-                        if c and c != "#000000":
-                            info["bg_color"] = c
-                    except Exception:
-                        pass
-                if "number_format" in wanted:
-                    nf = cell_api.NumberFormat
+                if "bg_color" in raw:
+                    c = _ole_color_to_hex(raw["bg_color"])
+                    if c and c != "#000000":
+                        info["bg_color"] = c
+                if "number_format" in raw:
+                    nf = raw["number_format"]
                     if nf and nf != "General":
                         info["number_format"] = nf
-                if "alignment" in wanted:
-                    ha = cell_api.HorizontalAlignment
-                    label = self._ALIGN_REVERSE.get(ha)
+                if "alignment" in raw:
+                    label = self._ALIGN_REVERSE.get(raw["alignment"])
                     if label and label != "general":
                         info["alignment"] = label
-                if "border" in wanted:
-                    has_border = False
-                    for edge in range(7, 13):
-                        try:
-                            if cell_api.Borders(edge).LineStyle == 1:
-                                has_border = True
-                                break
-                        except Exception:
-                            pass
-                    if has_border:
-                        info["border"] = True
+                if "border" in raw and raw["border"]:
+                    info["border"] = True
 
                 if info:
-                    info["cell"] = addr
+                    info["cell"] = f"{letters[j]}{base_row + i}"
                     styles.append(info)
 
         result["styles"] = styles
@@ -1001,3 +2797,325 @@ class ExcelHandler:
             "images": images,
             "shapes": shapes,
         }
+
+    # ------------------------------------------------------------------ #
+    #  Tool 12: batch
+    # ------------------------------------------------------------------ #
+
+    def batch(
+        self,
+        operations: list[dict],
+        workbook: str | None = None,
+        sheet: str | None = None,
+        stop_on_error: bool = True,
+    ) -> dict:
+        """Run several tool operations in one call.
+
+        Each operation is ``{"tool": name, **arguments}``. Operations that
+        omit ``workbook``/``sheet`` use the batch's, resolved once up front.
+        Screen updating, events and automatic calculation are off for the
+        whole batch and restored afterwards, even on failure.
+        """
+        if not operations:
+            raise ExcelError("operations must contain at least one operation.")
+        calls = []
+        for i, op in enumerate(operations):
+            if not isinstance(op, dict) or op.get("tool") not in self.BATCH_TOOLS:
+                tool = op.get("tool") if isinstance(op, dict) else op
+                raise ExcelError(
+                    f"Operation {i}: unknown tool '{tool}'. "
+                    f"Use: {', '.join(self.BATCH_TOOLS)}."
+                )
+            tool = op["tool"]
+            kwargs = {k: v for k, v in op.items() if k != "tool"}
+            method = getattr(self, tool)
+            try:
+                inspect.signature(method).bind(**kwargs)
+            except TypeError as exc:
+                raise ExcelError(f"Operation {i} ({tool}): {exc}.")
+            calls.append((tool, method, kwargs))
+
+        start = time.perf_counter()
+        wb = self._get_workbook_or_active(workbook)
+        book_key = wb.fullname
+        self.handles.remember_book(book_key, wb)
+        if sheet is None:
+            ws = wb.sheets.active
+            sheet = ws.name
+            self.handles.remember_sheet(wb, sheet, ws)
+        else:
+            self._get_sheet(wb, sheet)
+        # Everything was just resolved and checked; skip re-checks per op
+        with self.handles.pinned():
+            results = self._run_batch(
+                self._get_app(), calls, book_key, sheet, stop_on_error,
+            )
+
+        failed = sum(1 for r in results if not r["ok"])
+        return {
+            "results": results,
+            "completed": len(results) - failed,
+            "failed": failed,
+            "skipped": len(calls) - len(results),
+            "total_ms": round((time.perf_counter() - start) * 1000, 1),
+        }
+
+    def _run_batch(
+        self,
+        app: AppLike,
+        calls: list[tuple[str, Any, dict]],
+        book_key: str,
+        sheet: str,
+        stop_on_error: bool,
+    ) -> list[dict]:
+        results: list[dict] = []
+        with _suspended(app):
+            for i, (tool, method, kwargs) in enumerate(calls):
+                check_cancelled()
+                kwargs.setdefault("workbook", book_key)
+                if tool in self.BATCH_SHEET_TOOLS:
+                    kwargs.setdefault("sheet", sheet)
+                entry: dict[str, Any] = {"index": i, "tool": tool}
+                t0 = time.perf_counter()
+                try:
+                    result = method(**kwargs)
+                except Cancelled:
+                    raise
+                except Exception as exc:
+                    entry["ok"] = False
+                    entry["error"] = (
+                        str(exc) if isinstance(exc, ExcelError)
+                        else f"Excel COM error: {exc}"
+                    )
+                else:
+                    entry["ok"] = True
+                    entry["result"] = result
+                entry["ms"] = round((time.perf_counter() - t0) * 1000, 1)
+                results.append(entry)
+                if not entry["ok"] and stop_on_error:
+                    break
+        return results
+
+    # ------------------------------------------------------------------ #
+    #  Tool 13: export_range
+    # ------------------------------------------------------------------ #
+
+    # Largest row band read per COM call while exporting; bands shrink
+    # and grow within it with the measured transfer rate
+    EXPORT_CHUNK_CELLS = 250_000
+
+    def export_range(
+        self,
+        path: str,
+        workbook: str | None = None,
+        sheet: str | None = None,
+        cell_range: str | None = None,
+        format: str | None = None,
+        headers: bool = True,
+        overwrite: bool = False,
+    ) -> dict:
+        try:
+            kind = export.file_format(path, format)
+        except ValueError as exc:
+            raise ExcelError(str(exc)) from None
+        target = Path(path)
+        if target.exists() and not overwrite:
+            raise ExcelError(f"'{path}' already exists. Pass overwrite=true to replace it.")
+        if not target.parent.is_dir():
+            raise ExcelError(f"Folder not found: {target.parent}")
+
+        wb = self._get_workbook_or_active(workbook)
+        ws = self._get_sheet(wb, sheet)
+        _, extent = self._used_and_extent(ws)
+        rect = extent
+        if cell_range is not None and extent is not None:
+            # Rows and columns past the data hold nothing worth exporting
+            r0, c0, r1, c1 = _range_rect(ws, cell_range)
+            r1, c1 = min(r1, extent[2]), min(c1, extent[3])
+            rect = (r0, c0, r1, c1) if r0 <= r1 and c0 <= c1 else None
+        elif cell_range is not None:
+            rect = None
+
+        width = geometry.shape(rect)[1] if rect is not None else 0
+        # Written beside the target and moved over it once complete
+        partial = target.with_name(target.name + ".part")
+        sink: export.Sink | None = None
+        stats = None
+        failure: Exception | None = None
+
+        def step(band: Rect) -> None:
+            nonlocal sink, failure
+            # Transfer retries a failed band in halves, which suits COM
+            # reads but would write rows twice; file errors end the export
+            if failure is not None:
+                return
+            rows = _as_grid(ws.range(band[:2], band[2:]).value, width)
+            first = band[0]
+            try:
+                if sink is None:
+                    header = rows[0] if headers else None
+                    names = export.column_names(header, rect[1], width)
+                    sink = export.open_sink(partial, kind, names, headers)
+                    if headers:
+                        rows, first = rows[1:], first + 1
+                sink.write(rows, first)
+            except (ValueError, OSError) as exc:
+                failure = exc
+
+        try:
+            if rect is not None:
+                stats = Transfer(self.EXPORT_CHUNK_CELLS).run(rect, step)
+            if failure is not None:
+                raise failure
+            if sink is None:
+                sink = export.open_sink(partial, kind, [], headers)
+            sink.close()
+            partial.replace(target)
+        except ValueError as exc:
+            raise ExcelError(str(exc)) from None
+        except OSError as exc:
+            raise ExcelError(f"Could not write '{path}': {exc}") from None
+        finally:
+            if partial.exists():
+                if sink is not None:
+                    with contextlib.suppress(Exception):
+                        sink.close()
+                partial.unlink()
+
+        result = {
+            "path": str(target.resolve()),
+            "format": kind,
+            "sheet": ws.name,
+            "range": geometry.format_a1(rect) if rect is not None else None,
+            "rows": sink.rows,
+            "columns": width,
+            "bytes": target.stat().st_size,
+            "schema": sink.schema(),
+        }
+        if stats is not None and stats["chunks"] > 1:
+            result["transfer"] = stats
+        return result
+
+    # ------------------------------------------------------------------ #
+    #  Tool 14: import_file
+    # ------------------------------------------------------------------ #
+
+    # Largest row band written per COM call while importing; bands shrink
+    # and grow within it with the measured transfer rate
+    IMPORT_CHUNK_CELLS = 250_000
+
+    def import_file(
+        self,
+        path: str,
+        workbook: str | None = None,
+        sheet: str | None = None,
+        start_cell: str = "A1",
+        append: bool = False,
+        format: str | None = None,
+        headers: bool = True,
+    ) -> dict:
+        try:
+            kind = source.file_format(path, format)
+            top, left = geometry.parse_a1(start_cell)[:2]
+        except ValueError as exc:
+            raise ExcelError(str(exc)) from None
+        file = Path(path)
+        if not file.is_file():
+            raise ExcelError(f"File not found: {path}")
+        src = source.Source(file, kind, headers)
+        try:
+            src.scan()
+        except UnicodeDecodeError:
+            raise ExcelError(f"'{file.name}' is not UTF-8 text.") from None
+        except ValueError as exc:
+            raise ExcelError(str(exc)) from None
+        except OSError as exc:
+            raise ExcelError(f"Could not read '{path}': {exc}") from None
+
+        draft = self._draft(workbook)
+        if draft is not None:
+            name = self._draft_sheet(draft, sheet)
+            extent = draft.extent(name)
+            last = extent[2] if append and extent is not None else None
+        else:
+            wb = self._get_workbook_or_active(workbook)
+            ws = self._get_sheet(wb, sheet)
+            name = ws.name
+            last = _last_row(ws.api, left) if append else None
+        # Rows appended below existing data leave out the file's header
+        below = last is not None and last >= top
+        if below:
+            top = last + 1
+        header = None if below or src.header is None else list(src.header)
+        width = src.width
+        total = src.rows_count + (header is not None)
+        if header is not None:
+            header.extend([None] * (width - len(header)))
+
+        result: dict[str, Any] = {
+            "message": f"Imported {src.rows_count:,} rows from {file.name} to {name}",
+            "sheet": name,
+            "written_range": None,
+            "rows": src.rows_count,
+            "columns": width,
+            "header": header is not None,
+        }
+        if draft is not None:
+            result["offline"] = True
+        if not total or not width:
+            result["message"] = f"No rows to import from {file.name}"
+            return result
+        rect = (top, left, top + total - 1, left + width - 1)
+        if rect[2] > geometry.MAX_ROWS or rect[3] > geometry.MAX_COLS:
+            raise ExcelError(
+                f"The {total:,} rows and {width} columns of '{file.name}' run past the "
+                f"last cell of the sheet from {_col_letter(left)}{top}."
+            )
+
+        pending: list[list[Any]] = [header] if header is not None else []
+        rows = src.rows()
+        failure: ExcelError | None = None
+
+        def step(band: Rect) -> None:
+            nonlocal failure
+            # Transfer retries a failed band in halves, so rows are only
+            # dropped from pending once they are written. A file that no
+            # longer matches its scan ends the import instead of a retry
+            if failure is not None:
+                return
+            height = band[2] - band[0] + 1
+            try:
+                while len(pending) < height:
+                    row = next(rows, None)
+                    if row is None:
+                        raise ValueError
+                    pending.append(row)
+            except ValueError:
+                failure = ExcelError(f"'{file.name}' changed while it was imported.")
+                return
+            except OSError as exc:
+                failure = ExcelError(f"Could not read '{path}': {exc}")
+                return
+            part = pending[:height]
+            if draft is not None:
+                draft.write(name, band[0], band[1], part)
+            else:
+                ws.range(band[:2], band[2:]).value = part
+            del pending[:height]
+
+        transfer = Transfer(self.IMPORT_CHUNK_CELLS)
+        try:
+            if draft is not None:
+                stats = transfer.run(rect, step)
+            else:
+                self._invalidate(wb, ws, rect, recalc=True)
+                # Excel recalculates once, when calculation is restored
+                with _suspended(self._get_app()):
+                    stats = transfer.run(rect, step)
+        finally:
+            rows.close()
+        if failure is not None:
+            raise failure
+        result["written_range"] = geometry.format_a1(rect)
+        result["transfer"] = stats
+        return result
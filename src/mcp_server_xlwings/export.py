@@ -0,0 +1,267 @@
+"""File sinks for ``export_range``: CSV, JSON Lines and Parquet.
+
+Returning a large table inline sends every cell through the MCP message
+channel, and the client still has to write it somewhere. ``export_range``
+instead reads the range in row bands and hands each band to a sink here,
+which appends it to the file, so memory holds one band at a time and the
+response carries only the path, counts and schema.
+
+Values are written as ``read_data`` returns them: whole numbers without
+``.0``, dates and times as ISO text. Parquet keeps numbers, booleans and
+datetimes typed; it needs ``pyarrow`` (the ``parquet`` extra).
+
+Each column's schema type is the kind of its values -- ``number``,
+``string``, ``boolean``, ``datetime``, ``time`` -- ``mixed`` when kinds
+differ, or ``empty`` when it holds no values.
+"""
+
+from __future__ import annotations
+
+import csv
+import datetime
+import json
+from pathlib import Path
+from typing import IO, Any, Sequence
+
+from .geometry import col_letter
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # pragma: no cover - exercised without the extra
+    pa = pq = None
+
+FORMATS = ("csv", "jsonl", "parquet")
+
+_SUFFIXES = {".csv": "csv", ".jsonl": "jsonl", ".ndjson": "jsonl", ".parquet": "parquet"}
+
+
+def file_format(path: str, format: str | None = None) -> str:
+    """``format``, or the one the file suffix implies. Raises ValueError."""
+    if format is not None:
+        kind = format.lower()
+        if kind not in FORMATS:
+            raise ValueError(f"Unknown format '{format}'. Use: {', '.join(FORMATS)}.")
+    else:
+        kind = _SUFFIXES.get(Path(path).suffix.lower())
+        if kind is None:
+            raise ValueError(
+                f"Cannot tell the format from '{Path(path).name}'. Use a .csv, .jsonl "
+                "or .parquet file, or pass format."
+            )
+    if kind == "parquet" and pa is None:
+        raise ValueError(
+            "Parquet export needs pyarrow: pip install 'mcp-server-xlwings[parquet]'."
+        )
+    return kind
+
+
+def column_names(header: Sequence[Any] | None, first_col: int, width: int) -> list[str]:
+    """Unique column names from a header row; blanks take the column letter."""
+    names: list[str] = []
+    seen: set[str] = set()
+    for j in range(width):
+        value = header[j] if header is not None and j < len(header) else None
+        name = _plain(value)
+        name = str(name).strip() if name is not None else ""
+        if not name:
+            name = col_letter(first_col + j)
+        unique, n = name, 1
+        while unique.lower() in seen:
+            n += 1
+            unique = f"{name}_{n}"
+        seen.add(unique.lower())
+        names.append(unique)
+    return names
+
+
+def kind(value: Any) -> str | None:
+    """Schema type of one cell value; None for an empty cell."""
+    if value is None or value == "":
+        return None
+    if isinstance(value, bool):
+        return "boolean"
+    if isinstance(value, (int, float)):
+        return "number"
+    if isinstance(value, datetime.datetime):
+        return "datetime"
+    if isinstance(value, datetime.date):
+        return "datetime"
+    if isinstance(value, datetime.time):
+        return "time"
+    return "string"
+
+
+def _plain(value: Any) -> Any:
+    """A value as read_data returns it."""
+    if isinstance(value, (datetime.date, datetime.time)):
+        return value.isoformat()
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    return value
+
+
+class Sink:
+    """Appends row bands to a file and tracks the columns' kinds.
+
+    Args:
+        path: File to write.
+        names: Column names.
+    """
+
+    def __init__(self, path: Path, names: list[str]) -> None:
+        self.path = path
+        self.names = names
+        self.kinds: list[str | None] = [None] * len(names)
+        self.rows = 0
+
+    def write(self, rows: list[list[Any]], first_row: int) -> None:
+        """Append ``rows``; ``first_row`` is the sheet row of the first one."""
+        kinds = self.kinds
+        width = len(kinds)
+        for row in rows:
+            for j, value in enumerate(row[:width]):
+                k = kind(value)
+                if k is not None and kinds[j] != k:
+                    kinds[j] = k if kinds[j] is None else "mixed"
+        self._write(rows, first_row)
+        self.rows += len(rows)
+
+    def _write(self, rows: list[list[Any]], first_row: int) -> None:
+        raise NotImplementedError
+
+    def close(self) -> None:
+        raise NotImplementedError
+
+    def schema(self) -> list[dict[str, str]]:
+        return [
+            {"name": name, "type": k or "empty"} for name, k in zip(self.names, self.kinds)
+        ]
+
+
+class CsvSink(Sink):
+    def __init__(self, path: Path, names: list[str], header: bool) -> None:
+        super().__init__(path, names)
+        self._file: IO[str] = open(path, "w", encoding="utf-8", newline="")
+        self._csv = csv.writer(self._file)
+        if header and names:
+            self._csv.writerow(names)
+
+    def _write(self, rows: list[list[Any]], first_row: int) -> None:
+        self._csv.writerows([
+            ["" if value is None else _text(value) for value in row] for row in rows
+        ])
+
+    def close(self) -> None:
+        self._file.close()
+
+
+def _text(value: Any) -> Any:
+    if isinstance(value, bool):
+        return "TRUE" if value else "FALSE"
+    return _plain(value)
+
+
+class JsonlSink(Sink):
+    """One JSON object per row, keyed by column name."""
+
+    def __init__(self, path: Path, names: list[str]) -> None:
+        super().__init__(path, names)
+        self._file: IO[str] = open(path, "w", encoding="utf-8", newline="\n")
+
+    def _write(self, rows: list[list[Any]], first_row: int) -> None:
+        names = self.names
+        self._file.writelines([
+            json.dumps(
+                {name: _plain(value) for name, value in zip(names, row)},
+                ensure_ascii=False, default=str,
+            ) + "\n"
+            for row in rows
+        ])
+
+    def close(self) -> None:
+        self._file.close()
+
+
+class ParquetSink(Sink):
+    """Row groups of typed columns; the first band fixes the column types.
+
+    A column whose values all share one kind keeps it (numbers as
+    float64); mixed and empty columns are strings. A later value that
+    does not fit its column's type raises ValueError.
+    """
+
+    def __init__(self, path: Path, names: list[str]) -> None:
+        super().__init__(path, names)
+        self._writer: Any = None
+        self._types: list[str] = []
+
+    def _write(self, rows: list[list[Any]], first_row: int) -> None:
+        if self._writer is None:
+            self._types = [
+                k if k in ("number", "boolean", "datetime") else "string"
+                for k in self.kinds
+            ]
+            arrow = {
+                "number": pa.float64(), "boolean": pa.bool_(),
+                "datetime": pa.timestamp("us"), "string": pa.string(),
+            }
+            schema = pa.schema(
+                [(name, arrow[t]) for name, t in zip(self.names, self._types)]
+            )
+            self._writer = pq.ParquetWriter(str(self.path), schema)
+        columns = []
+        for j, (name, t) in enumerate(zip(self.names, self._types)):
+            values = [row[j] if j < len(row) else None for row in rows]
+            columns.append(self._column(values, name, t, first_row))
+        self._writer.write_table(
+            pa.Table.from_arrays(columns, schema=self._writer.schema),
+        )
+
+    @staticmethod
+    def _column(values: list[Any], name: str, t: str, first_row: int) -> Any:
+        out: list[Any] = []
+        for i, value in enumerate(values):
+            k = kind(value)
+            if k is None:
+                out.append(None)
+            elif t == "string":
+                out.append(str(_text(value)))
+            elif k == t:
+                if t == "datetime" and not isinstance(value, datetime.datetime):
+                    value = datetime.datetime.combine(value, datetime.time())
+                out.append(value)
+            else:
+                raise ValueError(
+                    f"Column '{name}' holds {t} values but row {first_row + i} is "
+                    f"{k}; export it as CSV or JSON Lines."
+                )
+        if t == "number":
+            return pa.array(out, type=pa.float64())
+        if t == "boolean":
+            return pa.array(out, type=pa.bool_())
+        if t == "datetime":
+            return pa.array(out, type=pa.timestamp("us"))
+        return pa.array(out, type=pa.string())
+
+    def schema(self) -> list[dict[str, str]]:
+        # The types the file holds, fixed by the first band
+        types = self._types or ["string"] * len(self.names)
+        return [{"name": name, "type": t} for name, t in zip(self.names, types)]
+
+    def close(self) -> None:
+        if self._writer is None:
+            # No rows: still write the columns, as strings
+            schema = pa.schema([(name, pa.string()) for name in self.names])
+            pq.write_table(schema.empty_table(), str(self.path))
+            return
+        self._writer.close()
+
+
+def open_sink(path: Path, format: str, names: list[str], header: bool) -> Sink:
+    """A sink writing ``format`` to ``path``."""
+    if format == "csv":
+        return CsvSink(path, names, header)
+    if format == "jsonl":
+        return JsonlSink(path, names)
+    return ParquetSink(path, names)
@@ -0,0 +1,383 @@
+"""Pure-Python range algebra for A1 and R1C1 references.
+
+Everything Excel would tell us about a range's shape -- its address, first
+row and column, row and column counts -- follows from the reference text.
+Computing it here saves a COM round trip per question and keeps the
+geometry testable without Excel.
+
+A rectangle is a ``(first_row, first_col, last_row, last_col)`` tuple of
+1-based, inclusive indexes. Whole columns (``A:C``) span rows
+``1..MAX_ROWS`` and whole rows (``1:3``) span columns ``1..MAX_COLS``.
+Parsers raise :class:`ValueError` on malformed input.
+"""
+
+from __future__ import annotations
+
+import re
+from typing import Callable, Iterable
+
+MAX_ROWS = 1_048_576
+MAX_COLS = 16_384
+
+Rect = tuple[int, int, int, int]
+
+
+# ---------------------------------------------------------------------- #
+#  Columns
+# ---------------------------------------------------------------------- #
+
+
+def col_letter(col_num: int) -> str:
+    """Convert a 1-based column number to Excel column letter(s)."""
+    result = ""
+    while col_num > 0:
+        col_num, remainder = divmod(col_num - 1, 26)
+        result = chr(65 + remainder) + result
+    return result
+
+
+def col_number(letters: str) -> int:
+    """Convert Excel column letter(s) to a 1-based column number."""
+    n = 0
+    for ch in letters.upper():
+        n = n * 26 + ord(ch) - 64
+    return n
+
+
+# ---------------------------------------------------------------------- #
+#  A1
+# ---------------------------------------------------------------------- #
+
+_A1_PART_RE = re.compile(r"\$?([A-Z]{0,3})\$?(\d*)")
+
+
+def _strip_sheet(ref: str) -> str:
+    return ref.rsplit("!", 1)[-1].strip()
+
+
+def parse_a1(ref: str) -> Rect:
+    """Parse one A1 area: 'B5', '$A$1:$C$3', 'A:C', '2:4', 'Sheet1!A1'."""
+    text = _strip_sheet(ref).upper()
+    parts = text.split(":")
+    if len(parts) not in (1, 2):
+        raise ValueError(f"Invalid A1 reference: {ref!r}")
+    coords = []
+    for part in parts:
+        m = _A1_PART_RE.fullmatch(part)
+        if m is None or not (m.group(1) or m.group(2)):
+            raise ValueError(f"Invalid A1 reference: {ref!r}")
+        coords.append((
+            int(m.group(2)) if m.group(2) else None,
+            col_number(m.group(1)) if m.group(1) else None,
+        ))
+    (r0, c0), (r1, c1) = coords[0], coords[-1]
+    if (r0 is None) != (r1 is None) or (c0 is None) != (c1 is None):
+        raise ValueError(f"Invalid A1 reference: {ref!r}")
+    if r0 is None or c0 is None:
+        # Whole rows and columns need both ends, as in Excel: '3:3', 'B:B'
+        if len(parts) == 1:
+            raise ValueError(f"Invalid A1 reference: {ref!r}")
+        if c0 is None:
+            c0, c1 = 1, MAX_COLS
+        else:
+            r0, r1 = 1, MAX_ROWS
+    rect = (min(r0, r1), min(c0, c1), max(r0, r1), max(c0, c1))
+    _check_bounds(rect, ref)
+    return rect
+
+
+def format_a1(rect: Rect, absolute: bool = True) -> str:
+    """Format a rectangle the way Excel reports ``Range.Address``."""
+    r0, c0, r1, c1 = rect
+    d = "$" if absolute else ""
+    if c0 == 1 and c1 == MAX_COLS:
+        return f"{d}{r0}:{d}{r1}"
+    if r0 == 1 and r1 == MAX_ROWS:
+        return f"{d}{col_letter(c0)}:{d}{col_letter(c1)}"
+    first = f"{d}{col_letter(c0)}{d}{r0}"
+    if (r0, c0) == (r1, c1):
+        return first
+    return f"{first}:{d}{col_letter(c1)}{d}{r1}"
+
+
+# ---------------------------------------------------------------------- #
+#  R1C1
+# ---------------------------------------------------------------------- #
+
+_R1C1_PART_RE = re.compile(
+    r"(?:R(?:\[(-?\d+)\]|(\d+))?)?(?:C(?:\[(-?\d+)\]|(\d+))?)?"
+)
+
+
+def _r1c1_axis(rel: str | None, abs_: str | None, base: int) -> int:
+    if abs_:
+        return int(abs_)
+    return base + int(rel or 0)
+
+
+def parse_r1c1(ref: str, base: tuple[int, int] = (1, 1)) -> Rect:
+    """Parse one R1C1 area: 'R2C3', 'R1C1:R10C4', 'R[1]C[-1]', 'C2:C4', 'R5'.
+
+    Relative parts are resolved against ``base`` (row, column).
+    """
+    text = _strip_sheet(ref).upper()
+    parts = text.split(":")
+    if len(parts) not in (1, 2):
+        raise ValueError(f"Invalid R1C1 reference: {ref!r}")
+    coords = []
+    for part in parts:
+        m = _R1C1_PART_RE.fullmatch(part)
+        if m is None or not part:
+            raise ValueError(f"Invalid R1C1 reference: {ref!r}")
+        has_r = part.startswith("R")
+        has_c = "C" in part
+        coords.append((
+            _r1c1_axis(m.group(1), m.group(2), base[0]) if has_r else None,
+            _r1c1_axis(m.group(3), m.group(4), base[1]) if has_c else None,
+        ))
+    (r0, c0), (r1, c1) = coords[0], coords[-1]
+    if (r0 is None) != (r1 is None) or (c0 is None) != (c1 is None):
+        raise ValueError(f"Invalid R1C1 reference: {ref!r}")
+    if c0 is None:
+        c0, c1 = 1, MAX_COLS
+    if r0 is None:
+        r0, r1 = 1, MAX_ROWS
+    rect = (min(r0, r1), min(c0, c1), max(r0, r1), max(c0, c1))
+    _check_bounds(rect, ref)
+    return rect
+
+
+def format_r1c1(rect: Rect, base: tuple[int, int] | None = None) -> str:
+    """Format a rectangle in R1C1 notation, relative to ``base`` if given."""
+
+    def axis(tag: str, n: int, origin: int | None) -> str:
+        if origin is None:
+            return f"{tag}{n}"
+        return tag if n == origin else f"{tag}[{n - origin}]"
+
+    r0, c0, r1, c1 = rect
+    br, bc = base if base is not None else (None, None)
+    if c0 == 1 and c1 == MAX_COLS:
+        first, last = axis("R", r0, br), axis("R", r1, br)
+    elif r0 == 1 and r1 == MAX_ROWS:
+        first, last = axis("C", c0, bc), axis("C", c1, bc)
+    else:
+        first = axis("R", r0, br) + axis("C", c0, bc)
+        last = axis("R", r1, br) + axis("C", c1, bc)
+    return first if first == last else f"{first}:{last}"
+
+
+# ---------------------------------------------------------------------- #
+#  References inside formulas
+# ---------------------------------------------------------------------- #
+
+# A cell reference in formula text; names and function calls are skipped
+_FORMULA_REF_RE = re.compile(
+    r"(?<![A-Za-z0-9_.])(\$?)([A-Z]{1,3})(\$?)(\d+)(?![A-Za-z0-9_(])"
+)
+
+
+def _sub_refs(text: str, convert: Callable[[re.Match], str]) -> str:
+    """Rewrite cell references outside string literals."""
+    parts = text.split('"')
+    for i in range(0, len(parts), 2):
+        parts[i] = _FORMULA_REF_RE.sub(convert, parts[i])
+    return '"'.join(parts)
+
+
+def formula_r1c1(text: str, row: int, col: int) -> str:
+    """``Range.FormulaR1C1`` text of an A1 formula in the cell at (row, col).
+
+    References become relative to the cell; absolute parts (``$``) keep
+    their number. Constants pass through.
+    """
+    if not text.startswith("="):
+        return text
+
+    def axis(tag: str, absolute: str, n: int, origin: int) -> str:
+        if absolute:
+            return f"{tag}{n}"
+        return tag if n == origin else f"{tag}[{n - origin}]"
+
+    def convert(m: re.Match) -> str:
+        c = col_number(m.group(2))
+        r = int(m.group(4))
+        return axis("R", m.group(3), r, row) + axis("C", m.group(1), c, col)
+
+    return _sub_refs(text, convert)
+
+
+def shift_formula(text: str, rows: int, cols: int) -> str:
+    """An A1 formula copied ``rows`` down and ``cols`` right.
+
+    Relative parts move with the copy and absolute parts (``$``) stay, as
+    when Excel fills a formula. References pushed off the sheet are left
+    unchanged rather than turned into ``#REF!``.
+    """
+
+    def convert(m: re.Match) -> str:
+        c = col_number(m.group(2)) + (0 if m.group(1) else cols)
+        r = int(m.group(4)) + (0 if m.group(3) else rows)
+        if not (1 <= r <= MAX_ROWS and 1 <= c <= MAX_COLS):
+            return m.group(0)
+        return f"{m.group(1)}{col_letter(c)}{m.group(3)}{r}"
+
+    return _sub_refs(text, convert)
+
+
+# ---------------------------------------------------------------------- #
+#  Multi-area references
+# ---------------------------------------------------------------------- #
+
+
+def parse(
+    ref: str, r1c1: bool = False, base: tuple[int, int] = (1, 1),
+) -> list[Rect]:
+    """Parse a comma-separated reference into its areas.
+
+    'C2' is valid in both notations, so the caller picks one with ``r1c1``.
+    """
+    if r1c1:
+        return [parse_r1c1(part, base) for part in ref.split(",")]
+    return [parse_a1(part) for part in ref.split(",")]
+
+
+def format_areas(rects: Iterable[Rect], absolute: bool = True) -> str:
+    """Format several rectangles as one comma-separated A1 address."""
+    return ",".join(format_a1(r, absolute) for r in rects)
+
+
+# ---------------------------------------------------------------------- #
+#  Algebra
+# ---------------------------------------------------------------------- #
+
+
+def _check_bounds(rect: Rect, ref: str) -> None:
+    r0, c0, r1, c1 = rect
+    if r0 < 1 or c0 < 1 or r1 > MAX_ROWS or c1 > MAX_COLS:
+        raise ValueError(f"Reference outside the sheet: {ref!r}")
+
+
+def shape(rect: Rect) -> tuple[int, int]:
+    """(rows, columns) of a rectangle."""
+    return rect[2] - rect[0] + 1, rect[3] - rect[1] + 1
+
+
+def area(rect: Rect) -> int:
+    rows, cols = shape(rect)
+    return rows * cols
+
+
+def contains(outer: Rect, row: int, col: int) -> bool:
+    return outer[0] <= row <= outer[2] and outer[1] <= col <= outer[3]
+
+
+def overlaps(a: Rect, b: Rect) -> bool:
+    return a[0] <= b[2] and b[0] <= a[2] and a[1] <= b[3] and b[1] <= a[3]
+
+
+def offset(rect: Rect, rows: int = 0, cols: int = 0) -> Rect:
+    """Shift a rectangle; raises if it leaves the sheet."""
+    moved = (rect[0] + rows, rect[1] + cols, rect[2] + rows, rect[3] + cols)
+    _check_bounds(moved, format_a1(rect))
+    return moved
+
+
+def resize(rect: Rect, rows: int, cols: int) -> Rect:
+    """Keep the top-left corner and set the size, like ``Range.Resize``."""
+    if rows < 1 or cols < 1:
+        raise ValueError("resize needs at least one row and one column")
+    sized = (rect[0], rect[1], rect[0] + rows - 1, rect[1] + cols - 1)
+    _check_bounds(sized, format_a1(rect))
+    return sized
+
+
+def intersect(a: Rect, b: Rect) -> Rect | None:
+    """Common part of two rectangles, or None."""
+    if not overlaps(a, b):
+        return None
+    return max(a[0], b[0]), max(a[1], b[1]), min(a[2], b[2]), min(a[3], b[3])
+
+
+def bounding(rects: Iterable[Rect]) -> Rect:
+    """Smallest rectangle containing all ``rects``."""
+    rects = list(rects)
+    if not rects:
+        raise ValueError("bounding() needs at least one rectangle")
+    return (
+        min(r[0] for r in rects), min(r[1] for r in rects),
+        max(r[2] for r in rects), max(r[3] for r in rects),
+    )
+
+
+def union(rects: Iterable[Rect]) -> list[Rect]:
+    """Cells covered by any of ``rects`` as disjoint, compacted rectangles."""
+    rows: dict[int, set[int]] = {}
+    for r0, c0, r1, c1 in rects:
+        for r in range(r0, r1 + 1):
+            rows.setdefault(r, set()).update(range(c0, c1 + 1))
+    return compact((r, c) for r, cols in rows.items() for c in cols)
+
+
+def split_rows(rect: Rect, size: int) -> list[Rect]:
+    """Cut a rectangle into horizontal bands of at most ``size`` rows."""
+    if size < 1:
+        raise ValueError("band size must be >= 1")
+    r0, c0, r1, c1 = rect
+    return [(r, c0, min(r + size - 1, r1), c1) for r in range(r0, r1 + 1, size)]
+
+
+def split(rect: Rect, rows: bool) -> list[Rect]:
+    """Halve a rectangle across rows (``rows=True``) or columns."""
+    r0, c0, r1, c1 = rect
+    if rows:
+        if r0 == r1:
+            return [rect]
+        mid = (r0 + r1) // 2
+        return [(r0, c0, mid, c1), (mid + 1, c0, r1, c1)]
+    if c0 == c1:
+        return [rect]
+    mid = (c0 + c1) // 2
+    return [(r0, c0, r1, mid), (r0, mid + 1, r1, c1)]
+
+
+def compact(cells: Iterable[tuple[int, int]]) -> list[Rect]:
+    """Cover a set of cells with few disjoint rectangles.
+
+    Cells are grouped into horizontal runs per row, and identical runs on
+    consecutive rows are stacked. The result is exact (no extra cells) and
+    sorted row-major by top-left corner.
+    """
+    by_row: dict[int, list[int]] = {}
+    for r, c in set(cells):
+        by_row.setdefault(r, []).append(c)
+
+    # Runs still growing downward: (c0, c1) -> [r0, r1]
+    open_: dict[tuple[int, int], list[int]] = {}
+    done: list[Rect] = []
+    prev_row = None
+    for r in sorted(by_row):
+        if prev_row is not None and r != prev_row + 1:
+            done.extend((r0, c0, r1, c1) for (c0, c1), (r0, r1) in open_.items())
+            open_ = {}
+        cols = sorted(by_row[r])
+        runs = []
+        start = prev = cols[0]
+        for c in cols[1:]:
+            if c != prev + 1:
+                runs.append((start, prev))
+                start = c
+            prev = c
+        runs.append((start, prev))
+
+        current: dict[tuple[int, int], list[int]] = {}
+        for run in runs:
+            span = open_.pop(run, None) or [r, r]
+            span[1] = r
+            current[run] = span
+        done.extend((r0, c0, r1, c1) for (c0, c1), (r0, r1) in open_.items())
+        open_ = current
+        prev_row = r
+    for (c0, c1), (r0, r1) in open_.items():
+        done.append((r0, c0, r1, c1))
+    return sorted(done)
@@ -0,0 +1,230 @@
+"""Registry of resolved App, Book and Sheet handles.
+
+Attaching to Excel and finding a workbook by name are the fixed costs of
+every tool call: ``xw.apps.active`` walks the running instances, and a
+name lookup reads ``name``/``fullname`` of each open book in turn. The
+registry keeps the objects it resolved and checks a cached handle with a
+single cheap COM read before reusing it. A handle that fails the check
+(Excel restarted, book closed or renamed, sheet deleted or renamed) is
+dropped and resolved again, so callers never see a stale object.
+"""
+
+from __future__ import annotations
+
+import contextlib
+from typing import Any, Iterator
+
+from .backend import AppLike, Backend, BookLike, SheetLike
+
+
+class HandleRegistry:
+    """Cache of live Excel handles keyed by name and full path."""
+
+    def __init__(self, backend: Backend) -> None:
+        self.backend = backend
+        self._app: AppLike | None = None
+        # key -> (book, attribute the key was matched against)
+        self._books: dict[str, tuple[BookLike, str]] = {}
+        # (lower-cased book full path, lower-cased sheet name) -> sheet.
+        # Keyed by path, not the book object: xlwings hands out a new Book
+        # wrapper from ``books.active`` and from every walk over ``books``.
+        # Only books whose path the registry already knows use it; reading
+        # FullName to build the key would cost as much as a fresh lookup.
+        self._sheets: dict[tuple[str, str], SheetLike] = {}
+        self._pinned = 0
+
+    @contextlib.contextmanager
+    def pinned(self) -> Iterator[None]:
+        """Reuse cached handles without the liveness read inside the block.
+
+        For a run of operations issued back to back on the COM thread, where
+        the handler itself forgets the handles it invalidates (sheet delete
+        or rename, workbook close).
+        """
+        self._pinned += 1
+        try:
+            yield
+        finally:
+            self._pinned -= 1
+
+    # -- app ---------------------------------------------------------- #
+
+    def app(self) -> AppLike:
+        """Return the cached Excel instance, reconnecting if it has died."""
+        app = self._app
+        if app is not None:
+            if self._pinned:
+                return app
+            try:
+                app.api.Ready
+                return app
+            except Exception:
+                self.clear()
+        app = self._connect()
+        self._app = app
+        return app
+
+    def _connect(self) -> AppLike:
+        try:
+            app = self.backend.active_app()
+            if app is None:
+                app = self.backend.new_app()
+            return app
+        except Exception:
+            return self.backend.new_app()
+
+    def clear(self) -> None:
+        """Forget every cached handle."""
+        self._app = None
+        self._books.clear()
+        self._sheets.clear()
+
+    # -- books -------------------------------------------------------- #
+
+    def book(self, key: str) -> BookLike | None:
+        """Return the open workbook whose name or full path is ``key``."""
+        entry = self._books.get(key)
+        if entry is not None:
+            wb, attr = entry
+            if self._pinned or _read(wb, attr) == key:
+                return wb
+            self.forget_book(wb)
+
+        for wb in self.app().books:
+            name = wb.name
+            if name == key:
+                self._books[key] = (wb, "name")
+                return wb
+            if wb.fullname == key:
+                self._books[key] = (wb, "fullname")
+                return wb
+        return None
+
+    def known(self, key: str) -> bool:
+        """Whether ``key`` names a cached workbook.
+
+        Costs no COM call, so the entry may be stale; :meth:`book` checks it.
+        """
+        return key in self._books
+
+    def _running(self) -> bool:
+        """Whether an Excel instance is running; never starts one."""
+        if self._app is None:
+            try:
+                app = self.backend.active_app()
+            except Exception:
+                app = None
+            if app is None:
+                return False
+            self._app = app
+        return True
+
+    def running_book(self, fullname: str) -> BookLike | None:
+        """The workbook open at path ``fullname``, without starting Excel.
+
+        Paths compare case-insensitively, as on Windows. Returns None when
+        no Excel instance is running.
+        """
+        if not self._running():
+            return None
+        key = fullname.lower()
+        for wb in self.app().books:
+            found = wb.fullname
+            if found.lower() == key:
+                self._books[found] = (wb, "fullname")
+                return wb
+        return None
+
+    def named_book(self, name: str) -> BookLike | None:
+        """The workbook open under ``name``, without starting Excel.
+
+        Names compare case-insensitively. Returns None when no Excel
+        instance is running.
+        """
+        if not self._running():
+            return None
+        key = name.lower()
+        for wb in self.app().books:
+            if wb.name.lower() == key:
+                return wb
+        return None
+
+    def remember_book(self, key: str, wb: BookLike) -> None:
+        """Cache ``wb`` under its full path ``key`` (already read by the caller)."""
+        self._books[key] = (wb, "fullname")
+
+    def forget_book(self, wb: BookLike) -> None:
+        """Drop a workbook and its sheets from the cache."""
+        paths = {
+            key.lower() for key, (b, attr) in self._books.items()
+            if b is wb and attr == "fullname"
+        }
+        fullname = _read(wb, "fullname")
+        if isinstance(fullname, str):
+            paths.add(fullname.lower())
+        for key in [k for k, (b, _) in self._books.items() if b is wb]:
+            del self._books[key]
+        for key in [k for k in self._sheets if k[0] in paths]:
+            del self._sheets[key]
+
+    def _book_path(self, wb: BookLike) -> str | None:
+        """Lower-cased full path of ``wb``, or None if it is not a cached book.
+
+        A book cached by name has its path read once and cached as well.
+        """
+        known = False
+        for key, (cached, attr) in self._books.items():
+            if cached is wb:
+                if attr == "fullname":
+                    return key.lower()
+                known = True
+        if not known:
+            return None
+        fullname = _read(wb, "fullname")
+        if not isinstance(fullname, str):
+            return None
+        self._books[fullname] = (wb, "fullname")
+        return fullname.lower()
+
+    # -- sheets ------------------------------------------------------- #
+
+    def sheet(self, wb: BookLike, name: str) -> SheetLike:
+        """Return sheet ``name`` of ``wb``; raises if there is none."""
+        path = self._book_path(wb)
+        if path is None:
+            return wb.sheets[name]
+        key = (path, name.lower())
+        ws = self._sheets.get(key)
+        if ws is not None:
+            if self._pinned:
+                return ws
+            found = _read(ws, "name")
+            if isinstance(found, str) and found.lower() == key[1]:
+                return ws
+            del self._sheets[key]
+
+        ws = wb.sheets[name]
+        self._sheets[key] = ws
+        return ws
+
+    def remember_sheet(self, wb: BookLike, name: str, ws: SheetLike) -> None:
+        """Cache ``ws`` of ``wb`` under ``name`` (already read by the caller)."""
+        path = self._book_path(wb)
+        if path is not None:
+            self._sheets[(path, name.lower())] = ws
+
+    def forget_sheet(self, wb: BookLike, name: str) -> None:
+        """Drop one cached sheet of ``wb``."""
+        path = self._book_path(wb)
+        if path is None:
+            fullname = _read(wb, "fullname")
+            path = fullname.lower() if isinstance(fullname, str) else None
+        self._sheets.pop((path, name.lower()), None)
+
+
+def _read(obj: Any, attr: str) -> Any:
+    """Read one attribute, treating any COM failure as a dead handle."""
+    try:
+        return getattr(obj, attr)
+    except Exception:
+        return None
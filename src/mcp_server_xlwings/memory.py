@@ -0,0 +1,1604 @@
+"""In-memory Excel stand-in with per-call COM accounting.
+
+:class:`MemoryBackend` models the part of the xlwings object model that
+:class:`~mcp_server_xlwings.excel.ExcelHandler` touches -- App, Books,
+Book, Sheets, Sheet and Range -- together with the COM objects behind
+their ``.api`` attribute. Values, formulas, merges, fonts, fills, number
+formats, borders and used ranges live in plain Python structures.
+
+Every member access that would cross the process boundary in real Excel
+is recorded on a shared :class:`ComCounter`, which can also sleep for a
+fixed latency per call. Tests use it to assert how many COM round trips a
+tool needs, without Windows or Excel.
+
+Counting follows xlwings on Windows: property reads/writes and method
+calls on COM objects cost one call each, ``.api`` and collection wrappers
+are free, and an xlwings ``Range`` resolves its coordinates once.
+"""
+
+from __future__ import annotations
+
+import collections
+import copy
+import dataclasses
+import datetime
+import fnmatch
+import re
+import time
+from pathlib import Path, PureWindowsPath
+from typing import Any, Callable, Iterator
+
+from .geometry import (
+    MAX_COLS,
+    MAX_ROWS,
+    Rect,
+    area,
+    compact,
+    contains,
+    format_a1,
+    format_areas,
+    formula_r1c1,
+    overlaps,
+    parse,
+    parse_a1,
+)
+
+XL_NONE = -4142
+XL_CALC_AUTOMATIC = -4105
+XL_BY_ROWS = 1
+XL_BY_COLUMNS = 2
+XL_NEXT = 1
+XL_PREVIOUS = 2
+XL_WHOLE = 1
+XL_PART = 2
+XL_CELL_TYPE_FORMULAS = -4123
+
+# End() directions -> (axis, step): xlUp, xlDown, xlToLeft, xlToRight
+_END_STEPS = {-4162: (0, -1), -4121: (0, 1), -4159: (1, -1), -4161: (1, 1)}
+
+# Border edge indices: left, top, bottom, right, inside vertical/horizontal
+_EDGES = (7, 8, 9, 10, 11, 12)
+
+_EXCEL_EPOCH = datetime.datetime(1899, 12, 30)
+
+class ComCounter:
+    """Record simulated COM round trips, optionally with per-call latency."""
+
+    def __init__(self, latency: float = 0.0) -> None:
+        self.latency = latency
+        self.calls = 0
+        self.by_member: collections.Counter[str] = collections.Counter()
+
+    def hit(self, member: str) -> None:
+        self.calls += 1
+        self.by_member[member] += 1
+        if self.latency:
+            time.sleep(self.latency)
+
+    def reset(self) -> None:
+        self.calls = 0
+        self.by_member.clear()
+
+
+
+
+def _uniform(values: Iterator[Any]) -> Any:
+    """Return the common value, or None when values are mixed (COM Null)."""
+    sentinel = object()
+    first = sentinel
+    for v in values:
+        if first is sentinel:
+            first = v
+        elif v != first:
+            return None
+    return None if first is sentinel else first
+
+
+def _to_excel(value: Any) -> Any:
+    """Normalise a Python value the way Excel stores it."""
+    if isinstance(value, bool) or value is None:
+        return value
+    if isinstance(value, int):
+        return float(value)
+    if isinstance(value, datetime.date) and not isinstance(value, datetime.datetime):
+        return datetime.datetime(value.year, value.month, value.day)
+    if isinstance(value, str) and value == "":
+        return None
+    return value
+
+
+def _to_value2(value: Any) -> Any:
+    if isinstance(value, datetime.datetime):
+        return (value - _EXCEL_EPOCH).total_seconds() / 86400
+    return value
+
+
+def _constant_text(value: Any) -> str:
+    """Text Excel shows in ``Range.Formula`` for a constant cell."""
+    if value is None:
+        return ""
+    if isinstance(value, bool):
+        return "TRUE" if value else "FALSE"
+    if isinstance(value, float) and value == int(value):
+        return str(int(value))
+    if isinstance(value, datetime.datetime):
+        return value.isoformat()
+    return str(value)
+
+
+# ---------------------------------------------------------------------- #
+#  Cell storage
+# ---------------------------------------------------------------------- #
+
+
+@dataclasses.dataclass
+class _Cell:
+    value: Any = None
+    formula: str | None = None
+    bold: bool = False
+    italic: bool = False
+    underline: int = XL_NONE
+    font_name: str = "Calibri"
+    font_size: float = 11.0
+    font_color: int = 0
+    fill_color: int = 16777215
+    number_format: str = "General"
+    h_align: int = 1
+    wrap_text: bool = False
+
+
+_DEFAULT_CELL = _Cell()
+
+
+class _Grid:
+    """Sparse cell store for one worksheet."""
+
+    def __init__(self) -> None:
+        self.cells: dict[tuple[int, int], _Cell] = {}
+        self.merges: list[Rect] = []
+        # Border lines: vertical lines keyed (row, col) are the left edge of
+        # that cell; horizontal lines keyed (row, col) are its top edge.
+        self.vlines: dict[tuple[int, int], int] = {}
+        self.hlines: dict[tuple[int, int], int] = {}
+
+    def get(self, r: int, c: int) -> _Cell:
+        return self.cells.get((r, c), _DEFAULT_CELL)
+
+    def mut(self, r: int, c: int) -> _Cell:
+        cell = self.cells.get((r, c))
+        if cell is None:
+            cell = self.cells[(r, c)] = _Cell()
+        return cell
+
+    def iter_rect(self, rect: Rect) -> Iterator[tuple[int, int]]:
+        r0, c0, r1, c1 = rect
+        for r in range(r0, r1 + 1):
+            for c in range(c0, c1 + 1):
+                yield r, c
+
+    def stored_in(self, rect: Rect) -> list[tuple[tuple[int, int], _Cell]]:
+        if area(rect) <= len(self.cells):
+            found = []
+            for key in self.iter_rect(rect):
+                cell = self.cells.get(key)
+                if cell is not None:
+                    found.append((key, cell))
+            return found
+        return [(k, v) for k, v in self.cells.items() if contains(rect, *k)]
+
+    def attr_values(self, rect: Rect, attr: str) -> Iterator[Any]:
+        stored = self.stored_in(rect)
+        for _, cell in stored:
+            yield getattr(cell, attr)
+        if len(stored) < area(rect):
+            yield getattr(_DEFAULT_CELL, attr)
+
+    def is_empty(self, r: int, c: int) -> bool:
+        cell = self.cells.get((r, c))
+        return cell is None or (cell.value is None and cell.formula is None)
+
+    def merge_at(self, r: int, c: int) -> Rect | None:
+        for m in self.merges:
+            if contains(m, r, c):
+                return m
+        return None
+
+    def used_rect(self) -> Rect:
+        keys = [k for k, v in self.cells.items() if v != _DEFAULT_CELL]
+        keys += [k for k, v in self.vlines.items() if v != XL_NONE]
+        keys += [k for k, v in self.hlines.items() if v != XL_NONE]
+        for m in self.merges:
+            keys += [(m[0], m[1]), (m[2], m[3])]
+        if not keys:
+            return (1, 1, 1, 1)
+        rows = [k[0] for k in keys]
+        cols = [k[1] for k in keys]
+        return min(rows), min(cols), max(rows), max(cols)
+
+    def edge_lines(self, rect: Rect, edge: int) -> list[int]:
+        r0, c0, r1, c1 = rect
+        if edge == 7:
+            return [self.vlines.get((r, c0), XL_NONE) for r in range(r0, r1 + 1)]
+        if edge == 10:
+            return [self.vlines.get((r, c1 + 1), XL_NONE) for r in range(r0, r1 + 1)]
+        if edge == 8:
+            return [self.hlines.get((r0, c), XL_NONE) for c in range(c0, c1 + 1)]
+        if edge == 9:
+            return [self.hlines.get((r1 + 1, c), XL_NONE) for c in range(c0, c1 + 1)]
+        if edge == 11:
+            return [
+                self.vlines.get((r, c), XL_NONE)
+                for r in range(r0, r1 + 1) for c in range(c0 + 1, c1 + 1)
+            ]
+        if edge == 12:
+            return [
+                self.hlines.get((r, c), XL_NONE)
+                for r in range(r0 + 1, r1 + 1) for c in range(c0, c1 + 1)
+            ]
+        raise ValueError(f"Unknown border index {edge}")
+
+    def set_edge(self, rect: Rect, edge: int, style: int) -> None:
+        r0, c0, r1, c1 = rect
+        if edge == 7:
+            for r in range(r0, r1 + 1):
+                self.vlines[(r, c0)] = style
+        elif edge == 10:
+            for r in range(r0, r1 + 1):
+                self.vlines[(r, c1 + 1)] = style
+        elif edge == 8:
+            for c in range(c0, c1 + 1):
+                self.hlines[(r0, c)] = style
+        elif edge == 9:
+            for c in range(c0, c1 + 1):
+                self.hlines[(r1 + 1, c)] = style
+        elif edge == 11:
+            for r in range(r0, r1 + 1):
+                for c in range(c0 + 1, c1 + 1):
+                    self.vlines[(r, c)] = style
+        elif edge == 12:
+            for r in range(r0 + 1, r1 + 1):
+                for c in range(c0, c1 + 1):
+                    self.hlines[(r, c)] = style
+
+    def shift(self, axis: int, at: int, count: int) -> None:
+        """Insert (count > 0) or delete (count < 0) rows/columns at ``at``."""
+
+        def move(key: tuple[int, int]) -> tuple[int, int] | None:
+            pos = key[axis]
+            if pos < at:
+                return key
+            if count < 0 and pos < at - count:
+                return None
+            new = list(key)
+            new[axis] = pos + count
+            return (new[0], new[1])
+
+        for store in (self.cells, self.vlines, self.hlines):
+            moved = {}
+            for key, val in store.items():
+                new_key = move(key)
+                if new_key is not None:
+                    moved[new_key] = val
+            store.clear()
+            store.update(moved)
+
+        merges = []
+        for m in self.merges:
+            a = move((m[0], m[1]))
+            b = move((m[2], m[3]))
+            if a is not None and b is not None:
+                merges.append((a[0], a[1], b[0], b[1]))
+        self.merges = merges
+
+    def current_region(self, r: int, c: int) -> Rect:
+        rect = [r, c, r, c]
+        changed = True
+        while changed:
+            changed = False
+            r0, c0, r1, c1 = rect
+            lo_r, lo_c = max(1, r0 - 1), max(1, c0 - 1)
+            hi_r, hi_c = min(MAX_ROWS, r1 + 1), min(MAX_COLS, c1 + 1)
+            for (rr, cc), cell in self.cells.items():
+                if cell.value is None and cell.formula is None:
+                    continue
+                if lo_r <= rr <= hi_r and lo_c <= cc <= hi_c:
+                    if rr < rect[0] or rr > rect[2] or cc < rect[1] or cc > rect[3]:
+                        rect = [
+                            min(rect[0], rr), min(rect[1], cc),
+                            max(rect[2], rr), max(rect[3], cc),
+                        ]
+                        changed = True
+        return rect[0], rect[1], rect[2], rect[3]
+
+
+# ---------------------------------------------------------------------- #
+#  COM-level objects (what ``.api`` returns)
+# ---------------------------------------------------------------------- #
+
+
+class _ComObject:
+    _prefix = ""
+
+    def __init__(self, counter: ComCounter) -> None:
+        object.__setattr__(self, "_counter", counter)
+
+    def _hit(self, member: str) -> None:
+        self._counter.hit(f"{self._prefix}.{member}")
+
+
+class _CountApi(_ComObject):
+    def __init__(self, counter: ComCounter, prefix: str, count: int) -> None:
+        super().__init__(counter)
+        object.__setattr__(self, "_prefix", prefix)
+        object.__setattr__(self, "_count", count)
+
+    @property
+    def Count(self) -> int:
+        self._hit("Count")
+        return self._count
+
+
+class _FontApi(_ComObject):
+    _prefix = "Font"
+    _attrs = {
+        "Bold": "bold", "Italic": "italic", "Underline": "underline",
+        "Name": "font_name", "Size": "font_size", "Color": "font_color",
+    }
+
+    def __init__(self, rng: _RangeApi) -> None:
+        super().__init__(rng._counter)
+        object.__setattr__(self, "_rng", rng)
+
+    def __getattr__(self, name: str) -> Any:
+        attr = self._attrs.get(name)
+        if attr is None:
+            raise AttributeError(name)
+        self._hit(name)
+        return _uniform(self._rng._sheet._grid.attr_values(self._rng._rect, attr))
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        attr = self._attrs.get(name)
+        if attr is None:
+            raise AttributeError(name)
+        self._hit(name)
+        self._rng._set_attr(attr, value)
+
+
+class _InteriorApi(_ComObject):
+    _prefix = "Interior"
+
+    def __init__(self, rng: _RangeApi) -> None:
+        super().__init__(rng._counter)
+        object.__setattr__(self, "_rng", rng)
+
+    @property
+    def Color(self) -> Any:
+        self._hit("Color")
+        return _uniform(self._rng._sheet._grid.attr_values(self._rng._rect, "fill_color"))
+
+    @Color.setter
+    def Color(self, value: int) -> None:
+        self._hit("Color")
+        self._rng._set_attr("fill_color", value)
+
+
+class _BorderApi(_ComObject):
+    _prefix = "Border"
+
+    def __init__(self, rng: _RangeApi, edge: int) -> None:
+        super().__init__(rng._counter)
+        object.__setattr__(self, "_rng", rng)
+        object.__setattr__(self, "_edge", edge)
+
+    @property
+    def LineStyle(self) -> Any:
+        self._hit("LineStyle")
+        lines = self._rng._sheet._grid.edge_lines(self._rng._rect, self._edge)
+        return _uniform(iter(lines)) if lines else XL_NONE
+
+    @LineStyle.setter
+    def LineStyle(self, value: int) -> None:
+        self._hit("LineStyle")
+        self._rng._sheet._grid.set_edge(self._rng._rect, self._edge, value)
+
+    @property
+    def Weight(self) -> int:
+        self._hit("Weight")
+        return 2
+
+    @Weight.setter
+    def Weight(self, value: int) -> None:
+        self._hit("Weight")
+
+
+class _EntireApi(_ComObject):
+    def __init__(self, rng: _RangeApi, axis: int) -> None:
+        super().__init__(rng._counter)
+        object.__setattr__(self, "_rng", rng)
+        object.__setattr__(self, "_axis", axis)
+        object.__setattr__(self, "_prefix", "EntireRow" if axis == 0 else "EntireColumn")
+
+    def _span(self) -> tuple[int, int]:
+        r0, c0, r1, c1 = self._rng._rect
+        return (r0, r1) if self._axis == 0 else (c0, c1)
+
+    def Insert(self, *args: Any, **kwargs: Any) -> bool:
+        self._hit("Insert")
+        first, last = self._span()
+        self._rng._sheet._grid.shift(self._axis, first, last - first + 1)
+        return True
+
+    def Delete(self, *args: Any, **kwargs: Any) -> bool:
+        self._hit("Delete")
+        first, last = self._span()
+        self._rng._sheet._grid.shift(self._axis, first, -(last - first + 1))
+        return True
+
+
+class _RangeApi(_ComObject):
+    """COM ``Range`` over a single rectangular area."""
+
+    _prefix = "Range"
+
+    def __init__(self, sheet: MemorySheet, rect: Rect) -> None:
+        super().__init__(sheet._counter)
+        object.__setattr__(self, "_sheet", sheet)
+        object.__setattr__(self, "_rect", rect)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        prop = getattr(type(self), name, None)
+        if not isinstance(prop, property) or prop.fset is None:
+            raise AttributeError(f"Range.{name} is not writable")
+        prop.fset(self, value)
+
+    def __eq__(self, other: object) -> bool:
+        return (
+            isinstance(other, _RangeApi)
+            and other._sheet is self._sheet
+            and other._rect == self._rect
+        )
+
+    def __hash__(self) -> int:
+        return hash((id(self._sheet), self._rect))
+
+    # -- internal ----------------------------------------------------- #
+
+    def _grid_values(self, convert: Callable[[Any], Any]) -> Any:
+        grid = self._sheet._grid
+        r0, c0, r1, c1 = self._rect
+        rows = tuple(
+            tuple(convert(grid.get(r, c).value) for c in range(c0, c1 + 1))
+            for r in range(r0, r1 + 1)
+        )
+        if len(rows) == 1 and len(rows[0]) == 1:
+            return rows[0][0]
+        return rows
+
+    def _set_attr(self, attr: str, value: Any) -> None:
+        grid = self._sheet._grid
+        for r, c in grid.iter_rect(self._rect):
+            setattr(grid.mut(r, c), attr, value)
+
+    def _write(self, data: Any, formulas: bool) -> None:
+        grid = self._sheet._grid
+        r0, c0, r1, c1 = self._rect
+        if isinstance(data, (list, tuple)):
+            rows = list(data)
+            if rows and not isinstance(rows[0], (list, tuple)):
+                rows = [rows]
+            for i, row in enumerate(rows):
+                for j, v in enumerate(row):
+                    _store(grid.mut(r0 + i, c0 + j), v, formulas)
+            return
+        for r, c in grid.iter_rect(self._rect):
+            _store(grid.mut(r, c), data, formulas)
+
+    # -- values ------------------------------------------------------- #
+
+    @property
+    def Value(self) -> Any:
+        self._hit("Value")
+        return self._grid_values(lambda v: v)
+
+    @Value.setter
+    def Value(self, data: Any) -> None:
+        self._hit("Value")
+        self._write(data, formulas=False)
+
+    @property
+    def Value2(self) -> Any:
+        self._hit("Value2")
+        return self._grid_values(_to_value2)
+
+    @Value2.setter
+    def Value2(self, data: Any) -> None:
+        self._hit("Value2")
+        self._write(data, formulas=False)
+
+    @property
+    def Formula(self) -> Any:
+        self._hit("Formula")
+        grid = self._sheet._grid
+        r0, c0, r1, c1 = self._rect
+        rows = tuple(
+            tuple(_formula_text(grid.get(r, c)) for c in range(c0, c1 + 1))
+            for r in range(r0, r1 + 1)
+        )
+        if len(rows) == 1 and len(rows[0]) == 1:
+            return rows[0][0]
+        return rows
+
+    @Formula.setter
+    def Formula(self, data: Any) -> None:
+        self._hit("Formula")
+        self._write(data, formulas=True)
+
+    @property
+    def HasFormula(self) -> Any:
+        self._hit("HasFormula")
+        stored = self._sheet._grid.stored_in(self._rect)
+        flags = {cell.formula is not None for _, cell in stored}
+        if len(stored) < area(self._rect):
+            flags.add(False)
+        return flags.pop() if len(flags) == 1 else None
+
+    def SpecialCells(self, Type: int, Value: Any = None) -> _AreasRangeApi:
+        self._hit("SpecialCells")
+        if Type != XL_CELL_TYPE_FORMULAS:
+            raise NotImplementedError(f"SpecialCells type {Type} (memory backend)")
+        grid = self._sheet._grid
+        # Like Excel, a single cell stands for the whole used range
+        rect = grid.used_rect() if area(self._rect) == 1 else self._rect
+        cells = [pos for pos, cell in grid.stored_in(rect) if cell.formula is not None]
+        if not cells:
+            raise RuntimeError("No cells were found. (memory backend)")
+        return _AreasRangeApi(self._sheet, compact(cells))
+
+    @property
+    def FormulaR1C1(self) -> Any:
+        self._hit("FormulaR1C1")
+        grid = self._sheet._grid
+        r0, c0, r1, c1 = self._rect
+        rows = tuple(
+            tuple(
+                formula_r1c1(_formula_text(grid.get(r, c)), r, c)
+                for c in range(c0, c1 + 1)
+            )
+            for r in range(r0, r1 + 1)
+        )
+        if len(rows) == 1 and len(rows[0]) == 1:
+            return rows[0][0]
+        return rows
+
+    # -- geometry ----------------------------------------------------- #
+
+    @property
+    def Address(self) -> str:
+        self._hit("Address")
+        return format_a1(self._rect)
+
+    @property
+    def Row(self) -> int:
+        self._hit("Row")
+        return self._rect[0]
+
+    @property
+    def Column(self) -> int:
+        self._hit("Column")
+        return self._rect[1]
+
+    @property
+    def Rows(self) -> _CountApi:
+        self._hit("Rows")
+        return _CountApi(self._counter, "Rows", self._rect[2] - self._rect[0] + 1)
+
+    @property
+    def Columns(self) -> _CountApi:
+        self._hit("Columns")
+        return _CountApi(self._counter, "Columns", self._rect[3] - self._rect[1] + 1)
+
+    @property
+    def Count(self) -> int:
+        self._hit("Count")
+        return area(self._rect)
+
+    @property
+    def Worksheet(self) -> _SheetApi:
+        self._hit("Worksheet")
+        return self._sheet.api
+
+    def Cells(self, row: int, column: int) -> _RangeApi:
+        self._hit("Cells")
+        r, c = self._rect[0] + row - 1, self._rect[1] + column - 1
+        return _RangeApi(self._sheet, (r, c, r, c))
+
+    @property
+    def CurrentRegion(self) -> _RangeApi:
+        self._hit("CurrentRegion")
+        return _RangeApi(self._sheet, self._sheet._grid.current_region(*self._rect[:2]))
+
+    def End(self, Direction: int) -> _RangeApi:
+        """The cell Ctrl+arrow reaches from the top-left cell."""
+        self._hit("End")
+        axis, step = _END_STEPS[Direction]
+        r, c = self._rect[:2]
+        pos, other = (r, c) if axis == 0 else (c, r)
+        limit = (MAX_ROWS if axis == 0 else MAX_COLS) if step > 0 else 1
+        # Only stored cells can be non-empty, so walk those along the line
+        filled = {
+            key[axis] for key, cell in self._sheet._grid.cells.items()
+            if key[1 - axis] == other and (cell.value is not None or cell.formula is not None)
+        }
+        if pos != limit:
+            if pos in filled and pos + step in filled:
+                while pos != limit and pos + step in filled:
+                    pos += step
+            else:
+                ahead = [p for p in filled if (p - pos) * step > 0]
+                pos = min(ahead, key=lambda p: abs(p - pos)) if ahead else limit
+        r, c = (pos, other) if axis == 0 else (other, pos)
+        return _RangeApi(self._sheet, (r, c, r, c))
+
+    @property
+    def EntireRow(self) -> _EntireApi:
+        self._hit("EntireRow")
+        return _EntireApi(self, 0)
+
+    @property
+    def EntireColumn(self) -> _EntireApi:
+        self._hit("EntireColumn")
+        return _EntireApi(self, 1)
+
+    # -- merges ------------------------------------------------------- #
+
+    @property
+    def MergeCells(self) -> Any:
+        self._hit("MergeCells")
+        grid = self._sheet._grid
+        hits = [m for m in grid.merges if overlaps(m, self._rect)]
+        if not hits:
+            return False
+        covered = 0
+        for m in hits:
+            covered += area((
+                max(m[0], self._rect[0]), max(m[1], self._rect[1]),
+                min(m[2], self._rect[2]), min(m[3], self._rect[3]),
+            ))
+        return True if covered == area(self._rect) else None
+
+    @property
+    def MergeArea(self) -> _RangeApi:
+        self._hit("MergeArea")
+        r, c = self._rect[:2]
+        merge = self._sheet._grid.merge_at(r, c)
+        return _RangeApi(self._sheet, merge or (r, c, r, c))
+
+    def Merge(self) -> None:
+        self._hit("Merge")
+        self._sheet._grid.merges.append(self._rect)
+
+    def UnMerge(self) -> None:
+        self._hit("UnMerge")
+        grid = self._sheet._grid
+        grid.merges = [m for m in grid.merges if not overlaps(m, self._rect)]
+
+    # -- formatting --------------------------------------------------- #
+
+    @property
+    def Font(self) -> _FontApi:
+        self._hit("Font")
+        return _FontApi(self)
+
+    @property
+    def Interior(self) -> _InteriorApi:
+        self._hit("Interior")
+        return _InteriorApi(self)
+
+    def Borders(self, edge: int) -> _BorderApi:
+        self._hit("Borders")
+        return _BorderApi(self, edge)
+
+    @property
+    def NumberFormat(self) -> Any:
+        self._hit("NumberFormat")
+        return _uniform(self._sheet._grid.attr_values(self._rect, "number_format"))
+
+    @NumberFormat.setter
+    def NumberFormat(self, value: str) -> None:
+        self._hit("NumberFormat")
+        self._set_attr("number_format", value)
+
+    @property
+    def HorizontalAlignment(self) -> Any:
+        self._hit("HorizontalAlignment")
+        return _uniform(self._sheet._grid.attr_values(self._rect, "h_align"))
+
+    @HorizontalAlignment.setter
+    def HorizontalAlignment(self, value: int) -> None:
+        self._hit("HorizontalAlignment")
+        self._set_attr("h_align", value)
+
+    @property
+    def WrapText(self) -> Any:
+        self._hit("WrapText")
+        return _uniform(self._sheet._grid.attr_values(self._rect, "wrap_text"))
+
+    @WrapText.setter
+    def WrapText(self, value: bool) -> None:
+        self._hit("WrapText")
+        self._set_attr("wrap_text", value)
+
+    # -- search ------------------------------------------------------- #
+
+    def Find(
+        self,
+        What: Any,
+        After: Any = None,
+        LookIn: Any = None,
+        LookAt: int = XL_PART,
+        SearchOrder: int = XL_BY_ROWS,
+        SearchDirection: int = XL_NEXT,
+        MatchCase: bool = False,
+        **kwargs: Any,
+    ) -> _RangeApi | None:
+        self._hit("Find")
+        object.__setattr__(
+            self, "_find_args", (str(What), LookAt, SearchOrder, MatchCase)
+        )
+        start = After._rect[:2] if After is not None else None
+        return self._scan(start, SearchDirection == XL_PREVIOUS)
+
+    def FindNext(self, After: Any = None) -> _RangeApi | None:
+        self._hit("FindNext")
+        start = After._rect[:2] if After is not None else None
+        return self._scan(start, backwards=False)
+
+    def _scan(self, start: tuple[int, int] | None, backwards: bool) -> _RangeApi | None:
+        what, look_at, order, match_case = getattr(
+            self, "_find_args", ("", XL_PART, XL_BY_ROWS, False)
+        )
+        pattern = what if match_case else what.lower()
+        if look_at != XL_WHOLE and "*" not in pattern:
+            pattern = f"*{pattern}*"
+
+        def key(pos: tuple[int, int]) -> tuple[int, int]:
+            return (pos[1], pos[0]) if order == XL_BY_COLUMNS else pos
+
+        # Only stored cells can match, so search them in Excel's order
+        # instead of walking every position of the range.
+        hits = []
+        for pos, cell in self._sheet._grid.stored_in(self._rect):
+            text = _formula_text(cell)
+            if not text:
+                continue
+            if not match_case:
+                text = text.lower()
+            if fnmatch.fnmatchcase(text, pattern):
+                hits.append(key(pos))
+        if not hits:
+            return None
+        hits.sort(reverse=backwards)
+        # Without an After cell (or one outside the range) Excel starts at
+        # the first cell going forwards and wraps to the last going back.
+        if start is not None and contains(self._rect, *start):
+            origin = key(start)
+            split = next(
+                (i for i, k in enumerate(hits)
+                 if (k < origin if backwards else k > origin)),
+                len(hits),
+            )
+            hits = hits[split:] + hits[:split]
+        r, c = hits[0] if order != XL_BY_COLUMNS else hits[0][::-1]
+        return _RangeApi(self._sheet, (r, c, r, c))
+
+    def Replace(
+        self,
+        What: str,
+        Replacement: str,
+        LookAt: int = XL_PART,
+        MatchCase: bool = False,
+        **kwargs: Any,
+    ) -> bool:
+        self._hit("Replace")
+        grid = self._sheet._grid
+        flags = 0 if MatchCase else re.IGNORECASE
+        pattern = re.compile(re.escape(What), flags)
+        for (r, c), cell in grid.stored_in(self._rect):
+            text = cell.formula if cell.formula is not None else cell.value
+            if not isinstance(text, str):
+                continue
+            if LookAt == XL_WHOLE:
+                new = Replacement if pattern.fullmatch(text) else text
+            else:
+                new = pattern.sub(lambda _m: Replacement, text)
+            if new != text:
+                _store(cell, new, formulas=True)
+        return True
+
+    def Calculate(self) -> None:
+        self._hit("Calculate")
+
+
+def _formula_text(cell: _Cell) -> str:
+    if cell.formula is not None:
+        return cell.formula
+    return _constant_text(cell.value)
+
+
+def _store(cell: _Cell, value: Any, formulas: bool) -> None:
+    if isinstance(value, str) and value.startswith("="):
+        cell.formula = value
+        cell.value = None
+        return
+    cell.formula = None
+    cell.value = _to_excel(value)
+    # Excel applies a date format when a date lands in a General cell
+    if isinstance(cell.value, datetime.datetime) and cell.number_format == "General":
+        timed = cell.value.time() != datetime.time()
+        cell.number_format = "m/d/yyyy h:mm" if timed else "m/d/yyyy"
+
+
+class _AreasRangeApi(_ComObject):
+    """COM ``Range`` over several areas, from ``SpecialCells`` or an "A1,C3" address."""
+
+    _prefix = "Range"
+
+    def __init__(self, sheet: MemorySheet, rects: list[Rect]) -> None:
+        super().__init__(sheet._counter)
+        object.__setattr__(self, "_sheet", sheet)
+        object.__setattr__(self, "_rects", rects)
+
+    @property
+    def Address(self) -> str:
+        self._hit("Address")
+        # Excel cuts multi-area addresses off at 255 characters
+        return format_areas(self._rects)[:255]
+
+    @property
+    def Count(self) -> int:
+        self._hit("Count")
+        return sum(area(r) for r in self._rects)
+
+    @property
+    def Areas(self) -> _AreasApi:
+        self._hit("Areas")
+        return _AreasApi(self)
+
+    @property
+    def Value(self) -> Any:
+        # Excel returns the first area's values
+        return _RangeApi(self._sheet, self._rects[0]).Value
+
+    @Value.setter
+    def Value(self, value: Any) -> None:
+        # One value for every cell; arrays do not spread over areas
+        self._hit("Value")
+        for rect in self._rects:
+            _RangeApi(self._sheet, rect)._write(value, formulas=False)
+
+
+class _AreasApi(_ComObject):
+    _prefix = "Areas"
+
+    def __init__(self, owner: _AreasRangeApi) -> None:
+        super().__init__(owner._counter)
+        object.__setattr__(self, "_owner", owner)
+
+    @property
+    def Count(self) -> int:
+        self._hit("Count")
+        return len(self._owner._rects)
+
+    def Item(self, index: int) -> _RangeApi:
+        self._hit("Item")
+        return _RangeApi(self._owner._sheet, self._owner._rects[index - 1])
+
+
+class _SheetApi(_ComObject):
+    _prefix = "Worksheet"
+
+    def __init__(self, sheet: MemorySheet) -> None:
+        super().__init__(sheet._counter)
+        object.__setattr__(self, "_sheet", sheet)
+
+    @property
+    def Name(self) -> str:
+        self._hit("Name")
+        return self._sheet._name
+
+    @property
+    def UsedRange(self) -> _RangeApi:
+        self._hit("UsedRange")
+        return _RangeApi(self._sheet, self._sheet._grid.used_rect())
+
+    @property
+    def Rows(self) -> _CountApi:
+        self._hit("Rows")
+        return _CountApi(self._counter, "Rows", MAX_ROWS)
+
+    def Cells(self, row: int, column: int) -> _RangeApi:
+        self._hit("Cells")
+        return _RangeApi(self._sheet, (row, column, row, column))
+
+    def Range(self, cell1: Any, cell2: Any = None) -> _RangeApi | _AreasRangeApi:
+        self._hit("Range")
+        if cell2 is None and isinstance(cell1, str) and "," in cell1:
+            return _AreasRangeApi(self._sheet, parse(cell1))
+        rect = _api_rect(cell1)
+        if cell2 is not None:
+            other = _api_rect(cell2)
+            rect = (
+                min(rect[0], other[0]), min(rect[1], other[1]),
+                max(rect[2], other[2]), max(rect[3], other[3]),
+            )
+        return _RangeApi(self._sheet, rect)
+
+    def Calculate(self) -> None:
+        self._hit("Calculate")
+
+    def ChartObjects(self) -> list[Any]:
+        self._hit("ChartObjects")
+        return list(self._sheet.charts)
+
+    @property
+    def Shapes(self) -> list[Any]:
+        self._hit("Shapes")
+        return list(self._sheet.shapes)
+
+
+def _api_rect(ref: Any) -> Rect:
+    if isinstance(ref, _RangeApi):
+        return ref._rect
+    return parse_a1(str(ref))
+
+
+class _AppApi(_ComObject):
+    _prefix = "Application"
+
+    def __init__(self, app: MemoryApp) -> None:
+        super().__init__(app._counter)
+        object.__setattr__(self, "_app", app)
+        object.__setattr__(self, "_state", {
+            "ScreenUpdating": True,
+            "EnableEvents": True,
+            "Calculation": XL_CALC_AUTOMATIC,
+            "DisplayAlerts": True,
+        })
+
+    def _hit(self, member: str) -> None:
+        self._app._check_alive()
+        super()._hit(member)
+
+    def __getattr__(self, name: str) -> Any:
+        state = self.__dict__["_state"]
+        if name not in state:
+            raise AttributeError(name)
+        self._hit(name)
+        return state[name]
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        if name not in self._state:
+            raise AttributeError(name)
+        self._hit(name)
+        self._state[name] = value
+
+    @property
+    def Ready(self) -> bool:
+        self._hit("Ready")
+        return True
+
+    def Calculate(self) -> None:
+        self._hit("Calculate")
+
+
+# ---------------------------------------------------------------------- #
+#  xlwings-level objects
+# ---------------------------------------------------------------------- #
+
+
+class _RangeRows:
+    def __init__(self, rng: MemoryRange, axis: int) -> None:
+        self._rng = rng
+        self._axis = axis
+
+    @property
+    def count(self) -> int:
+        shape = self._rng.shape
+        return shape[self._axis]
+
+    def __len__(self) -> int:
+        return self.count
+
+
+class MemoryFont:
+    """xlwings ``Font`` over a memory range."""
+
+    _attrs = {
+        "bold": "bold", "italic": "italic", "size": "font_size",
+        "name": "font_name", "color": "font_color",
+    }
+
+    def __init__(self, rng: MemoryRange) -> None:
+        object.__setattr__(self, "_rng", rng)
+
+    def __getattr__(self, name: str) -> Any:
+        attr = self._attrs.get(name)
+        if attr is None:
+            raise AttributeError(name)
+        api = self._rng.api
+        api._hit(f"Font.{name}")
+        value = _uniform(api._sheet._grid.attr_values(api._rect, attr))
+        if attr == "font_color" and value is not None:
+            return (value & 0xFF, (value >> 8) & 0xFF, (value >> 16) & 0xFF)
+        return value
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        attr = self._attrs.get(name)
+        if attr is None:
+            raise AttributeError(name)
+        api = self._rng.api
+        api._hit(f"Font.{name}")
+        if attr == "font_color":
+            value = _color_to_ole(value)
+        api._set_attr(attr, value)
+
+
+def _color_to_ole(color: Any) -> int:
+    """Convert '#RRGGBB' or an (r, g, b) tuple to an OLE colour."""
+    if isinstance(color, str):
+        color = color.lstrip("#")
+        color = (int(color[0:2], 16), int(color[2:4], 16), int(color[4:6], 16))
+    if isinstance(color, (tuple, list)):
+        r, g, b = color
+        return r + (g << 8) + (b << 16)
+    return int(color)
+
+
+class MemoryRange:
+    """xlwings ``Range`` over a memory sheet."""
+
+    def __init__(self, sheet: MemorySheet, rect: Rect) -> None:
+        self._sheet = sheet
+        self._rect = rect
+        self._coords_resolved = False
+        self.api = _RangeApi(sheet, rect)
+
+    def _resolve(self) -> None:
+        if not self._coords_resolved:
+            for member in ("Row", "Column", "Rows.Count", "Columns.Count"):
+                self._sheet._counter.hit(f"Range.{member}")
+            self._coords_resolved = True
+
+    def __repr__(self) -> str:
+        return f"<MemoryRange {self._sheet._name}!{format_a1(self._rect)}>"
+
+    @property
+    def sheet(self) -> MemorySheet:
+        return self._sheet
+
+    @property
+    def row(self) -> int:
+        self._resolve()
+        return self._rect[0]
+
+    @property
+    def column(self) -> int:
+        self._resolve()
+        return self._rect[1]
+
+    @property
+    def shape(self) -> tuple[int, int]:
+        self._resolve()
+        r0, c0, r1, c1 = self._rect
+        return r1 - r0 + 1, c1 - c0 + 1
+
+    @property
+    def rows(self) -> _RangeRows:
+        return _RangeRows(self, 0)
+
+    @property
+    def columns(self) -> _RangeRows:
+        return _RangeRows(self, 1)
+
+    @property
+    def size(self) -> int:
+        rows, cols = self.shape
+        return rows * cols
+
+    @property
+    def address(self) -> str:
+        return self.api.Address
+
+    @property
+    def value(self) -> Any:
+        raw = self.api.Value
+        if not isinstance(raw, tuple):
+            return raw
+        rows = [list(r) for r in raw]
+        if len(rows) == 1:
+            return rows[0]
+        if len(rows[0]) == 1:
+            return [r[0] for r in rows]
+        return rows
+
+    @value.setter
+    def value(self, data: Any) -> None:
+        self.api.Value = data
+
+    @property
+    def formula(self) -> Any:
+        return self.api.Formula
+
+    @formula.setter
+    def formula(self, data: Any) -> None:
+        self.api.Formula = data
+
+    @property
+    def number_format(self) -> Any:
+        return self.api.NumberFormat
+
+    @number_format.setter
+    def number_format(self, value: str) -> None:
+        self.api.NumberFormat = value
+
+    @property
+    def font(self) -> MemoryFont:
+        return MemoryFont(self)
+
+    @property
+    def color(self) -> Any:
+        color = self.api.Interior.Color
+        if color is None or color == 16777215:
+            return None
+        return (color & 0xFF, (color >> 8) & 0xFF, (color >> 16) & 0xFF)
+
+    @color.setter
+    def color(self, value: Any) -> None:
+        self.api.Interior.Color = _color_to_ole(value)
+
+    @property
+    def wrap_text(self) -> Any:
+        return self.api.WrapText
+
+    @wrap_text.setter
+    def wrap_text(self, value: bool) -> None:
+        self.api.WrapText = value
+
+    def expand(self, mode: str = "table") -> MemoryRange:
+        grid = self._sheet._grid
+        r0, c0 = self._rect[:2]
+        r1, c1 = r0, c0
+        self._sheet._counter.hit("Range.End")
+        while r1 < MAX_ROWS and not grid.is_empty(r1 + 1, c0):
+            r1 += 1
+        self._sheet._counter.hit("Range.End")
+        while c1 < MAX_COLS and not grid.is_empty(r0, c1 + 1):
+            c1 += 1
+        self._sheet._counter.hit("Worksheet.Range")
+        return MemoryRange(self._sheet, (r0, c0, r1, c1))
+
+    def _cell(self, i: int, j: int) -> MemoryRange:
+        self._sheet._counter.hit("Range.Item")
+        r, c = self._rect[0] + i, self._rect[1] + j
+        return MemoryRange(self._sheet, (r, c, r, c))
+
+    def __getitem__(self, key: Any) -> MemoryRange:
+        rows, cols = self.shape
+        if isinstance(key, tuple):
+            i, j = key
+        else:
+            i, j = divmod(key, cols)
+        if not (0 <= i < rows and 0 <= j < cols):
+            raise IndexError(key)
+        return self._cell(i, j)
+
+    def __iter__(self) -> Iterator[MemoryRange]:
+        rows, cols = self.shape
+        for i in range(rows):
+            for j in range(cols):
+                yield self._cell(i, j)
+
+    def __len__(self) -> int:
+        return self.size
+
+
+class _Pictures(list):
+    pass
+
+
+class MemorySheet:
+    """xlwings ``Sheet`` backed by a sparse in-memory grid.
+
+    ``write``, ``write_formula``, ``merge`` and ``style`` populate the sheet
+    without touching the COM counter, so tests can arrange a fixture and
+    then measure only what the handler does.
+    """
+
+    def __init__(self, book: MemoryBook, name: str) -> None:
+        self._book = book
+        self._name = name
+        self._counter = book._counter
+        self._grid = _Grid()
+        self.charts: list[Any] = []
+        self.shapes: list[Any] = []
+        self.pictures_list: list[Any] = []
+        self.api = _SheetApi(self)
+
+    def __repr__(self) -> str:
+        return f"<MemorySheet {self._name}>"
+
+    def _check_live(self) -> None:
+        self._book._check_open()
+        if self not in self._book._sheets:
+            raise RuntimeError("Object has been deleted (memory backend).")
+
+    # -- fixture helpers (not counted) -------------------------------- #
+
+    def write(self, address: str, data: Any) -> None:
+        rect = parse_a1(address)
+        _RangeApi(self, rect)._write(data, formulas=True)
+
+    def write_formula(self, address: str, formula: str, value: Any = None) -> None:
+        r, c = parse_a1(address)[:2]
+        cell = self._grid.mut(r, c)
+        cell.formula = formula
+        cell.value = _to_excel(value)
+
+    def merge(self, address: str) -> None:
+        self._grid.merges.append(parse_a1(address))
+
+    def style(self, address: str, **attrs: Any) -> None:
+        grid = self._grid
+        rect = parse_a1(address)
+        border = attrs.pop("border", None)
+        for r, c in grid.iter_rect(rect):
+            cell = grid.mut(r, c)
+            for attr, value in attrs.items():
+                if not hasattr(cell, attr):
+                    raise AttributeError(attr)
+                setattr(cell, attr, value)
+        if border is not None:
+            for edge in _EDGES:
+                grid.set_edge(rect, edge, border)
+
+    def cell_value(self, address: str) -> Any:
+        r, c = parse_a1(address)[:2]
+        return self._grid.get(r, c).value
+
+    # -- xlwings surface ---------------------------------------------- #
+
+    @property
+    def name(self) -> str:
+        self._check_live()
+        self._counter.hit("Worksheet.Name")
+        return self._name
+
+    @name.setter
+    def name(self, value: str) -> None:
+        self._counter.hit("Worksheet.Name")
+        self._book._rename_sheet(self, value)
+
+    @property
+    def index(self) -> int:
+        self._counter.hit("Worksheet.Index")
+        return self._book._sheets.index(self) + 1
+
+    @property
+    def book(self) -> MemoryBook:
+        return self._book
+
+    @property
+    def used_range(self) -> MemoryRange:
+        self._counter.hit("Worksheet.UsedRange")
+        return MemoryRange(self, self._grid.used_rect())
+
+    @property
+    def pictures(self) -> list[Any]:
+        self._counter.hit("Worksheet.Pictures")
+        return list(self.pictures_list)
+
+    def range(self, cell1: Any, cell2: Any = None) -> MemoryRange:
+        self._counter.hit("Worksheet.Range")
+        rect = _xw_rect(cell1)
+        if cell2 is not None:
+            other = _xw_rect(cell2)
+            rect = (
+                min(rect[0], other[0]), min(rect[1], other[1]),
+                max(rect[2], other[2]), max(rect[3], other[3]),
+            )
+        return MemoryRange(self, rect)
+
+    def activate(self) -> None:
+        self._counter.hit("Worksheet.Activate")
+        self._book._active_sheet = self
+
+    def delete(self) -> None:
+        self._counter.hit("Worksheet.Delete")
+        self._book._remove_sheet(self)
+
+    def copy(self, before: Any = None, after: Any = None) -> None:
+        self._counter.hit("Worksheet.Copy")
+        self._book._copy_sheet(self, after or before)
+
+
+def _xw_rect(ref: Any) -> Rect:
+    if isinstance(ref, MemoryRange):
+        return ref._rect
+    if isinstance(ref, tuple):
+        return (ref[0], ref[1], ref[0], ref[1])
+    return parse_a1(str(ref))
+
+
+class MemorySheets:
+    """xlwings ``Sheets`` collection."""
+
+    def __init__(self, book: MemoryBook) -> None:
+        self._book = book
+
+    @property
+    def active(self) -> MemorySheet:
+        self._book._check_open()
+        self._book._counter.hit("Workbook.ActiveSheet")
+        return self._book._active_sheet
+
+    @property
+    def count(self) -> int:
+        self._book._counter.hit("Worksheets.Count")
+        return len(self._book._sheets)
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __getitem__(self, key: int | str) -> MemorySheet:
+        self._book._check_open()
+        self._book._counter.hit("Worksheets.Item")
+        if isinstance(key, int):
+            return self._book._sheets[key]
+        for s in self._book._sheets:
+            if s._name.lower() == key.lower():
+                return s
+        raise KeyError(key)
+
+    def __iter__(self) -> Iterator[MemorySheet]:
+        self._book._check_open()
+        self._book._counter.hit("Worksheets.Count")
+        for s in list(self._book._sheets):
+            self._book._counter.hit("Worksheets.Item")
+            yield s
+
+    def add(self, name: str | None = None, before: Any = None, after: Any = None) -> MemorySheet:
+        self._book._counter.hit("Worksheets.Add")
+        return self._book._add_sheet(name, after=after)
+
+
+class MemoryBook:
+    """xlwings ``Book`` holding memory sheets."""
+
+    def __init__(self, app: MemoryApp, fullname: str, sheet_names: list[str]) -> None:
+        self._app = app
+        self._counter = app._counter
+        self._fullname = fullname
+        self._closed = False
+        self._sheets = [MemorySheet(self, n) for n in sheet_names]
+        self._active_sheet = self._sheets[0]
+        self.api = self
+
+    def __repr__(self) -> str:
+        return f"<MemoryBook {PureWindowsPath(self._fullname).name}>"
+
+    def _check_open(self) -> None:
+        if self._closed:
+            raise RuntimeError("Object has been closed (memory backend).")
+
+    @property
+    def name(self) -> str:
+        self._check_open()
+        self._counter.hit("Workbook.Name")
+        return PureWindowsPath(self._fullname).name
+
+    @property
+    def fullname(self) -> str:
+        self._check_open()
+        self._counter.hit("Workbook.FullName")
+        return self._fullname
+
+    @property
+    def app(self) -> MemoryApp:
+        return self._app
+
+    @property
+    def sheets(self) -> MemorySheets:
+        return MemorySheets(self)
+
+    def sheet(self, name: str) -> MemorySheet:
+        """Return a sheet by name without counting (fixture helper)."""
+        for s in self._sheets:
+            if s._name == name:
+                return s
+        raise KeyError(name)
+
+    def save(self, path: str | None = None) -> None:
+        self._check_open()
+        self._counter.hit("Workbook.Save")
+        if path:
+            self._fullname = str(path)
+
+    def close(self) -> None:
+        self._check_open()
+        self._counter.hit("Workbook.Close")
+        self._closed = True
+        self._app._books.remove(self)
+        if self._app._active_book is self:
+            self._app._active_book = self._app._books[-1] if self._app._books else None
+
+    def _add_sheet(self, name: str | None, after: Any = None) -> MemorySheet:
+        n = len(self._sheets) + 1
+        existing = {s._name for s in self._sheets}
+        while name is None or name in existing:
+            name = f"Sheet{n}"
+            n += 1
+        sheet = MemorySheet(self, name)
+        pos = self._sheets.index(after) + 1 if after in self._sheets else len(self._sheets)
+        self._sheets.insert(pos, sheet)
+        self._active_sheet = sheet
+        return sheet
+
+    def _rename_sheet(self, sheet: MemorySheet, name: str) -> None:
+        if any(s is not sheet and s._name.lower() == name.lower() for s in self._sheets):
+            raise ValueError(f"A sheet named '{name}' already exists.")
+        sheet._name = name
+
+    def _remove_sheet(self, sheet: MemorySheet) -> None:
+        if len(self._sheets) == 1:
+            raise ValueError("A workbook must contain at least one sheet.")
+        self._sheets.remove(sheet)
+        if self._active_sheet is sheet:
+            self._active_sheet = self._sheets[0]
+
+    def _copy_sheet(self, sheet: MemorySheet, after: Any) -> MemorySheet:
+        base = sheet._name
+        n = 2
+        existing = {s._name for s in self._sheets}
+        while f"{base} ({n})" in existing:
+            n += 1
+        clone = MemorySheet(self, f"{base} ({n})")
+        clone._grid = copy.deepcopy(sheet._grid)
+        anchor = after if after in self._sheets else sheet
+        self._sheets.insert(self._sheets.index(anchor) + 1, clone)
+        return clone
+
+
+class MemoryBooks:
+    """xlwings ``Books`` collection."""
+
+    def __init__(self, app: MemoryApp) -> None:
+        self._app = app
+
+    @property
+    def active(self) -> MemoryBook | None:
+        self._app._check_alive()
+        self._app._counter.hit("Application.ActiveWorkbook")
+        return self._app._active_book
+
+    def __iter__(self) -> Iterator[MemoryBook]:
+        self._app._check_alive()
+        self._app._counter.hit("Workbooks.Count")
+        for b in list(self._app._books):
+            self._app._counter.hit("Workbooks.Item")
+            yield b
+
+    def __len__(self) -> int:
+        self._app._counter.hit("Workbooks.Count")
+        return len(self._app._books)
+
+    def add(self) -> MemoryBook:
+        self._app._counter.hit("Workbooks.Add")
+        self._app._new_count += 1
+        return self._app.add_book(f"Book{self._app._new_count}")
+
+    def open(self, fullname: str, read_only: bool = False, **kwargs: Any) -> MemoryBook:
+        self._app._counter.hit("Workbooks.Open")
+        path = str(Path(fullname).resolve())
+        for b in self._app._books:
+            if b._fullname == path:
+                return b
+        return self._app.add_book(path)
+
+
+class MemoryApp:
+    """xlwings ``App`` holding memory workbooks."""
+
+    def __init__(self, counter: ComCounter) -> None:
+        self._counter = counter
+        self._alive = True
+        self._books: list[MemoryBook] = []
+        self._active_book: MemoryBook | None = None
+        self._new_count = 0
+        self._selection: tuple[MemorySheet, Rect] | None = None
+        self.macros: dict[str, Callable[..., Any]] = {}
+        self.api = _AppApi(self)
+
+    # -- fixture helpers (not counted) -------------------------------- #
+
+    def add_book(self, fullname: str, sheets: list[str] | None = None) -> MemoryBook:
+        book = MemoryBook(self, fullname, sheets or ["Sheet1"])
+        self._books.append(book)
+        self._active_book = book
+        return book
+
+    def select(self, sheet: MemorySheet, address: str) -> None:
+        self._selection = (sheet, parse_a1(address))
+
+    def quit(self) -> None:
+        """Simulate Excel exiting: the app and all its books go dead."""
+        self._alive = False
+        for book in self._books:
+            book._closed = True
+        self._books = []
+        self._active_book = None
+
+    def _check_alive(self) -> None:
+        if not self._alive:
+            raise RuntimeError("The RPC server is unavailable (memory backend).")
+
+    # -- xlwings surface ---------------------------------------------- #
+
+    @property
+    def books(self) -> MemoryBooks:
+        return MemoryBooks(self)
+
+    @property
+    def selection(self) -> MemoryRange | None:
+        self._counter.hit("Application.Selection")
+        if self._selection is None:
+            return None
+        sheet, rect = self._selection
+        return MemoryRange(sheet, rect)
+
+    @property
+    def display_alerts(self) -> bool:
+        return self.api.DisplayAlerts
+
+    @display_alerts.setter
+    def display_alerts(self, value: bool) -> None:
+        self.api.DisplayAlerts = value
+
+    def calculate(self) -> None:
+        self.api.Calculate()
+
+    def macro(self, name: str) -> Callable[..., Any]:
+        def run(*args: Any) -> Any:
+            self._counter.hit("Application.Run")
+            key = name.split("!")[-1]
+            if key not in self.macros:
+                raise RuntimeError(f"Cannot run the macro '{name}'.")
+            return self.macros[key](*args)
+
+        return run
+
+
+class MemoryBackend:
+    """Backend serving a single in-memory Excel instance.
+
+    Args:
+        latency: Seconds to sleep per simulated COM call.
+    """
+
+    def __init__(self, latency: float = 0.0) -> None:
+        self.counter = ComCounter(latency)
+        self.app = MemoryApp(self.counter)
+
+    def active_app(self) -> MemoryApp | None:
+        self.counter.hit("Application.GetActiveObject")
+        return self.app if self.app._alive else None
+
+    def new_app(self) -> MemoryApp:
+        if not self.app._alive:
+            self.app = MemoryApp(self.counter)
+        return self.app
+
+    def restart(self) -> MemoryApp:
+        """Quit the current instance and start a fresh, empty one."""
+        self.app.quit()
+        self.app = MemoryApp(self.counter)
+        return self.app
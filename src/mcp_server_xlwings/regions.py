@@ -0,0 +1,148 @@
+"""Table detection from a sheet's occupancy matrix.
+
+The sheet summary reads its data range once (``Value2``) and finds every
+block of non-empty cells here, instead of probing ``CurrentRegion`` at a
+few guessed cells. As with CurrentRegion, cells touching horizontally,
+vertically or diagonally belong to the same block, and blocks whose
+bounding boxes overlap or touch are merged into one rectangle.
+
+Labelling runs a union-find over horizontal runs of occupied cells, so
+its cost follows the number of runs rather than the number of cells.
+For sheets too large to read whole, the caller passes sampled rows with
+their real row numbers; consecutive sampled rows count as adjacent.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Sequence
+
+from . import geometry
+from .geometry import Rect
+
+# Rows from the top of a table searched for a header row
+HEADER_SCAN_ROWS = 3
+
+
+def _filled(value: Any) -> bool:
+    return value is not None and value != ""
+
+
+def _runs(row: Sequence[Any]) -> list[tuple[int, int]]:
+    """(first, last) column indexes of each run of non-empty cells."""
+    runs = []
+    start = None
+    for j, value in enumerate(row):
+        if _filled(value):
+            if start is None:
+                start = j
+        elif start is not None:
+            runs.append((start, j - 1))
+            start = None
+    if start is not None:
+        runs.append((start, len(row) - 1))
+    return runs
+
+
+def _components(grid: Sequence[Sequence[Any]]) -> list[list[int]]:
+    """Bounding boxes ``[i0, j0, i1, j1]`` (grid indexes) of connected blocks."""
+    parent: list[int] = []
+    boxes: list[list[int]] = []
+
+    def find(x: int) -> int:
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]
+            x = parent[x]
+        return x
+
+    def union(a: int, b: int) -> None:
+        ra, rb = find(a), find(b)
+        if ra != rb:
+            parent[rb] = ra
+            box, other = boxes[ra], boxes[rb]
+            box[0], box[1] = min(box[0], other[0]), min(box[1], other[1])
+            box[2], box[3] = max(box[2], other[2]), max(box[3], other[3])
+
+    prev: list[tuple[int, int, int]] = []
+    for i, row in enumerate(grid):
+        current = []
+        k = 0
+        for a, b in _runs(row):
+            rid = len(parent)
+            parent.append(rid)
+            boxes.append([i, a, i, b])
+            # Runs on the previous row touching [a - 1, b + 1] (diagonals too)
+            while k < len(prev) and prev[k][1] < a - 1:
+                k += 1
+            m = k
+            while m < len(prev) and prev[m][0] <= b + 1:
+                union(prev[m][2], rid)
+                m += 1
+            current.append((a, b, rid))
+        prev = current
+    return [boxes[i] for i in range(len(parent)) if find(i) == i]
+
+
+def _touching(a: list[int], b: list[int]) -> bool:
+    return a[0] <= b[2] + 1 and b[0] <= a[2] + 1 and a[1] <= b[3] + 1 and b[1] <= a[3] + 1
+
+
+def _merge_boxes(boxes: list[list[int]]) -> list[list[int]]:
+    """Merge overlapping or adjacent boxes until none touch."""
+    merged = True
+    while merged:
+        merged = False
+        out: list[list[int]] = []
+        for box in sorted(boxes):
+            for other in out:
+                if _touching(box, other):
+                    other[0], other[1] = min(other[0], box[0]), min(other[1], box[1])
+                    other[2], other[3] = max(other[2], box[2]), max(other[3], box[3])
+                    merged = True
+                    break
+            else:
+                out.append(list(box))
+        boxes = out
+    return boxes
+
+
+def _header_index(grid: Sequence[Sequence[Any]], box: list[int]) -> int | None:
+    """Grid row of the likely header: text only, at least half filled.
+
+    Only the first few rows of a multi-row table are considered, so a
+    title line above the header is skipped.
+    """
+    i0, j0, i1, j1 = box
+    if i1 == i0:
+        return None
+    for i in range(i0, min(i1, i0 + HEADER_SCAN_ROWS)):
+        cells = grid[i][j0:j1 + 1]
+        filled = [v for v in cells if _filled(v)]
+        if filled and len(filled) * 2 >= len(cells) and all(
+            isinstance(v, str) for v in filled
+        ):
+            return i
+    return None
+
+
+def find_tables(
+    grid: Sequence[Sequence[Any]], row_numbers: Sequence[int], left: int,
+) -> list[dict[str, Any]]:
+    """Every table in ``grid`` with its range, size and header row guess.
+
+    ``grid`` holds raw values whose first column is sheet column ``left``;
+    ``row_numbers[i]`` is the sheet row of ``grid[i]``. Tables are sorted
+    top to bottom, then left to right.
+    """
+    tables = []
+    for box in _merge_boxes(_components(grid)):
+        i0, j0, i1, j1 = box
+        rect: Rect = (row_numbers[i0], left + j0, row_numbers[i1], left + j1)
+        rows, cols = geometry.shape(rect)
+        header = _header_index(grid, box)
+        tables.append({
+            "range": geometry.format_a1(rect),
+            "rows": rows,
+            "columns": cols,
+            "header_row": row_numbers[header] if header is not None else None,
+        })
+    return tables
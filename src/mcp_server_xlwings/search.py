@@ -0,0 +1,152 @@
+"""Cell matching for bulk search over value snapshots.
+
+``find_replace`` reads each sheet's data range in one bulk call and
+matches cells here, instead of one ``Find``/``FindNext`` round trip per
+match. Cell addresses come from the grid position, so a search costs the
+same few COM calls whether it finds one cell or fifty thousand.
+
+Match modes:
+
+- ``contains``: the text appears anywhere in the cell (Excel's default)
+- ``whole``: the cell's text equals the search text
+- ``regex``: :func:`re.search` finds the pattern in the cell's text
+- ``range``: the cell is a number within ``"low..high"`` (either end may
+  be omitted, e.g. ``"100.."``)
+
+Replacements are computed here too (:func:`replacer`), so a replace
+writes back only the cells whose text changes.
+
+A cell's text is its value as shown in JSON: whole floats lose their
+``.0``, dates are ISO strings, booleans are ``TRUE``/``FALSE``.
+"""
+
+from __future__ import annotations
+
+import re
+from typing import Any, Callable, Iterator, Sequence
+
+MATCH_MODES = ("contains", "whole", "regex", "range")
+
+
+def cell_text(value: Any) -> str | None:
+    """Text a search compares against, or None for an empty cell."""
+    if value is None or value == "":
+        return None
+    if isinstance(value, bool):
+        return "TRUE" if value else "FALSE"
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value)
+
+
+def _parse_bounds(text: str) -> tuple[float | None, float | None]:
+    low, sep, high = text.partition("..")
+    if not sep:
+        raise ValueError(
+            "Numeric range must look like 'low..high', e.g. '10..20' or '100..'."
+        )
+    try:
+        return (
+            float(low) if low.strip() else None,
+            float(high) if high.strip() else None,
+        )
+    except ValueError:
+        raise ValueError(f"Invalid numeric range '{text}'.") from None
+
+
+def matcher(find: str, match: str, match_case: bool) -> Callable[[Any], bool]:
+    """Predicate over raw cell values. Raises ValueError on bad input."""
+    if match not in MATCH_MODES:
+        raise ValueError(f"Unknown match '{match}'. Use: {', '.join(MATCH_MODES)}.")
+
+    if match == "range":
+        low, high = _parse_bounds(find)
+
+        def in_range(value: Any) -> bool:
+            if isinstance(value, bool) or not isinstance(value, (int, float)):
+                return False
+            return (low is None or value >= low) and (high is None or value <= high)
+
+        return in_range
+
+    if match == "regex":
+        try:
+            pattern = re.compile(find, 0 if match_case else re.IGNORECASE)
+        except re.error as exc:
+            raise ValueError(f"Invalid regular expression: {exc}") from None
+
+        def search(value: Any) -> bool:
+            text = cell_text(value)
+            return text is not None and pattern.search(text) is not None
+
+        return search
+
+    needle = find if match_case else find.casefold()
+    whole = match == "whole"
+
+    def compare(value: Any) -> bool:
+        text = cell_text(value)
+        if text is None:
+            return False
+        if not match_case:
+            text = text.casefold()
+        return text == needle if whole else needle in text
+
+    return compare
+
+
+def scan(
+    grid: Sequence[Sequence[Any]], predicate: Callable[[Any], bool],
+) -> Iterator[tuple[int, int, Any]]:
+    """``(i, j, value)`` of matching cells, row by row."""
+    for i, row in enumerate(grid):
+        for j, value in enumerate(row):
+            if value is not None and predicate(value):
+                yield i, j, value
+
+
+def replacer(
+    find: str, replace: str, match: str, match_case: bool,
+) -> Callable[[Any], str | None]:
+    """New text for a cell, or None when the cell stays as it is.
+
+    ``contains`` replaces every occurrence of the text, ``whole`` and
+    ``range`` replace the entire cell, and ``regex`` substitutes each
+    match, so ``\\1`` or ``\\g<name>`` in ``replace`` insert a group.
+    Raises ValueError on bad input.
+    """
+    if not find:
+        raise ValueError("Cannot replace an empty search text.")
+    test = matcher(find, match, match_case)
+
+    if match in ("whole", "range"):
+
+        def whole(value: Any) -> str | None:
+            if not test(value) or cell_text(value) == replace:
+                return None
+            return replace
+
+        return whole
+
+    flags = 0 if match_case else re.IGNORECASE
+    if match == "regex":
+        pattern = re.compile(find, flags)
+        template: Any = replace
+    else:
+        pattern = re.compile(re.escape(find), flags)
+
+        # A function, so backslashes in plain replacement text stay literal
+        def template(_: re.Match) -> str:
+            return replace
+
+    def substitute(value: Any) -> str | None:
+        text = cell_text(value)
+        if text is None:
+            return None
+        try:
+            new = pattern.sub(template, text)
+        except (re.error, IndexError) as exc:
+            raise ValueError(f"Invalid replacement '{replace}': {exc}") from None
+        return new if new != text else None
+
+    return substitute
@@ -2,10 +2,13 @@
 
 from __future__ import annotations
 
+import os
+
 from mcp.server.fastmcp import FastMCP
 from mcp.types import ToolAnnotations
 
 from .excel import ExcelError, ExcelHandler
+from .worker import Cancelled, ComWorker, WorkerTimeout
 
 mcp = FastMCP(
     "mcp-server-xlwings",
@@ -15,15 +18,49 @@ mcp = FastMCP(
     ),
 )
 
-_handler = ExcelHandler()
+# Seconds a tool call may take before it is abandoned; 0 disables the limit.
+DEFAULT_TIMEOUT = float(os.environ.get("MCP_XLWINGS_TIMEOUT", "120"))
+
+# Default for the write tools' 'bulk' parameter.
+BULK_WRITE = os.environ.get("MCP_XLWINGS_BULK_WRITE", "").lower() in (
+    "1", "true", "yes", "on",
+)
+
+# Blocks larger than this many cells are transferred in row bands; 0 disables.
+CHUNK_CELLS = int(os.environ.get("MCP_XLWINGS_CHUNK_CELLS", "1000000"))
+
+# Memory cap of the range snapshot cache in megabytes; 0 (default) disables it.
+CACHE_MB = float(os.environ.get("MCP_XLWINGS_CACHE_MB", "0"))
+
+# Read closed .xlsx files from disk instead of opening them in Excel, and
+# write new .xlsx files without Excel.
+OFFLINE = os.environ.get("MCP_XLWINGS_OFFLINE", "1").lower() not in (
+    "0", "false", "no", "off",
+)
+
+_handler = ExcelHandler(
+    bulk_write=BULK_WRITE,
+    chunk_cells=CHUNK_CELLS,
+    cache_bytes=int(CACHE_MB * 1024 * 1024),
+    offline=OFFLINE,
+)
+_worker = ComWorker()
+
 
+async def _call(fn, *args, timeout: float | None = None, **kwargs):
+    """Run an ExcelHandler method on the COM worker with uniform error handling.
 
-def _call(fn, *args, **kwargs):
-    """Invoke an ExcelHandler method with uniform error handling."""
+    The event loop only awaits the result, so protocol traffic is served
+    while Excel is busy. ``timeout`` overrides ``DEFAULT_TIMEOUT``.
+    """
+    if timeout is None:
+        timeout = DEFAULT_TIMEOUT
     try:
-        return fn(*args, **kwargs)
+        return await _worker.run(fn, *args, timeout=timeout or None, **kwargs)
     except ExcelError:
         raise
+    except (WorkerTimeout, Cancelled) as exc:
+        raise ExcelError(str(exc)) from exc
     except Exception as exc:
         raise ExcelError(f"Excel COM error: {exc}") from exc
 
@@ -39,10 +76,16 @@ def _call(fn, *args, **kwargs):
         readOnlyHint=True,
     ),
 )
-def get_active_workbook() -> dict:
+async def get_active_workbook(metadata: str = "full") -> dict:
     """Get the currently active workbook info including sheets,
-    active sheet, and current selection address with its data."""
-    return _call(_handler.get_active_workbook)
+    active sheet, and current selection address with its data.
+
+    Args:
+        metadata: 'names' (workbook and sheet names only, cheapest),
+                  'active' (adds active sheet and selection), or
+                  'full' (adds used range and row/column counts per sheet).
+    """
+    return await _call(_handler.get_active_workbook, metadata)
 
 
 # ================================================================== #
@@ -56,14 +99,20 @@ def get_active_workbook() -> dict:
         destructiveHint=True,
     ),
 )
-def manage_workbooks(
+async def manage_workbooks(
     action: str,
     workbook: str | None = None,
     filepath: str | None = None,
     read_only: bool = True,
     save: bool = False,
+    metadata: str = "full",
+    create: bool = False,
 ) -> dict:
     """Manage Excel workbooks: list, open, save, close, or recalculate.
+    Opening a path to an .xlsx file that does not exist yet with
+    create=True creates it without Excel: write_data and format_range fill
+    it (and write to it when workbook is omitted), and save or close
+    (save=True) writes the file.
 
     Args:
         action: One of 'list', 'open', 'save', 'close', 'recalculate'.
@@ -71,9 +120,15 @@ def manage_workbooks(
         filepath: For 'open': file path (use 'new' for blank). For 'save': Save As path.
         read_only: For 'open': open in read-only mode.
         save: For 'close': save before closing.
+        metadata: For 'list': 'names' (workbook and sheet names only, cheapest),
+                  'active' (adds active workbook flag and active sheet), or
+                  'full' (adds used range and row/column counts per sheet).
+        create: For 'open': create filepath if it does not exist, instead of
+                reporting it as not found.
     """
-    return _call(
-        _handler.manage_workbooks, action, workbook, filepath, read_only, save
+    return await _call(
+        _handler.manage_workbooks, action, workbook, filepath, read_only, save,
+        metadata, create,
     )
 
 
@@ -88,7 +143,7 @@ def manage_workbooks(
         readOnlyHint=True,
     ),
 )
-def read_data(
+async def read_data(
     workbook: str | None = None,
     sheet: str | None = None,
     cell_range: str | None = None,
@@ -96,6 +151,12 @@ def read_data(
     detail: bool = False,
     merge_info: bool = False,
     header_row: int | None = None,
+    max_rows: int | None = None,
+    max_cells: int | None = None,
+    max_bytes: int | None = None,
+    cursor: str | None = None,
+    fast: bool = False,
+    encoding: str = "rows",
 ) -> dict:
     """Read data from an Excel range.
     When cell_range is omitted, returns a sheet summary (used range address,
@@ -103,6 +164,11 @@ def read_data(
     a specific cell_range to fetch the actual data.
     Set detail=True on a single cell to get formula, type, and formatting info.
     Use sheet="*" to batch-read all sheets in one call.
+    A path to an .xlsx file that is not open in Excel is read straight from
+    the file (values as last saved; result has offline=true).
+    For large ranges, set max_rows, max_cells or max_bytes to read page by
+    page: each page includes the headers and a next_cursor; pass it back as
+    cursor (alone) to get the next page until next_cursor is null.
 
     Args:
         workbook: Workbook name or path. Defaults to active workbook.
@@ -112,10 +178,22 @@ def read_data(
         detail: For single cells, include formula, type, number format, and font info.
         merge_info: Fill merged cells with the merge area's value instead of null.
         header_row: 1-based row number to use as headers (e.g. 3 means row 3 is headers).
+        max_rows: Page budget: maximum data rows per page.
+        max_cells: Page budget: maximum cells per page.
+        max_bytes: Page budget: maximum serialized bytes of data per page.
+        cursor: next_cursor from a previous page. Other arguments are ignored.
+        fast: Read raw values in one call and convert them column-wise.
+              Dates become ISO strings only in columns with a date format
+              (date-only formats give 'YYYY-MM-DD').
+        encoding: 'rows' (default row-major lists), 'columnar' (per-column
+                  arrays with dictionary-encoded strings and null runs),
+                  'sparse' ([row, col, value] for non-empty cells) or 'auto'
+                  (smallest). Non-default encodings report byte sizes.
     """
-    return _call(
+    return await _call(
         _handler.read_data, workbook, sheet, cell_range, headers, detail,
-        merge_info, header_row,
+        merge_info, header_row, max_rows, max_cells, max_bytes, cursor, fast,
+        encoding,
     )
 
 
@@ -130,15 +208,19 @@ def read_data(
         destructiveHint=True,
     ),
 )
-def write_data(
+async def write_data(
     start_cell: str,
     data: list[list] | None = None,
     formula: str | None = None,
     workbook: str | None = None,
     sheet: str | None = None,
+    bulk: bool | None = None,
+    mode: str = "full",
 ) -> dict:
     """Write data or a formula to Excel cells.
     Provide 'data' for a 2D array, or 'formula' for a single-cell formula.
+    Workbooks created by opening a new .xlsx path are written without Excel;
+    formulas there are calculated when the file is first opened.
 
     Args:
         start_cell: Top-left cell (e.g. 'A1').
@@ -146,9 +228,17 @@ def write_data(
         formula: Excel formula like '=SUM(A1:A10)'. Mutually exclusive with data.
         workbook: Workbook name or path. Defaults to active workbook.
         sheet: Sheet name. Defaults to active sheet.
+        bulk: Suspend calculation, events and screen updating while writing,
+              then recalculate once (the sheet for data, the cell for a
+              formula) and report the time in 'recalc'.
+              Defaults to the server setting.
+        mode: 'full' (default) writes the whole block. 'diff' reads the
+              target block first and writes only the cells that differ,
+              merged into rectangles; the result reports 'changed_cells'.
     """
-    return _call(
-        _handler.write_data, start_cell, data, formula, workbook, sheet
+    return await _call(
+        _handler.write_data, start_cell, data, formula, workbook, sheet, bulk,
+        mode,
     )
 
 
@@ -163,13 +253,14 @@ def write_data(
         destructiveHint=True,
     ),
 )
-def manage_sheets(
+async def manage_sheets(
     action: str,
     workbook: str | None = None,
     sheet: str | None = None,
     new_name: str | None = None,
     position: int = 1,
     count: int = 1,
+    bulk: bool | None = None,
 ) -> dict:
     """Manage sheets and structure.
 
@@ -181,10 +272,13 @@ def manage_sheets(
         new_name: New name (for rename; optional for add/copy).
         position: Row/column number (1-based) for insert/delete actions.
         count: Number of rows/columns to insert or delete.
+        bulk: For row/column insert/delete: suspend calculation, events and
+              screen updating, then recalculate the sheet once and report
+              the time in 'recalc'. Defaults to the server setting.
     """
-    return _call(
+    return await _call(
         _handler.manage_sheets,
-        action, workbook, sheet, new_name, position, count,
+        action, workbook, sheet, new_name, position, count, bulk,
     )
 
 
@@ -199,24 +293,42 @@ def manage_sheets(
         destructiveHint=False,
     ),
 )
-def find_replace(
+async def find_replace(
     find: str,
     workbook: str | None = None,
     sheet: str | None = None,
     replace: str | None = None,
     match_case: bool = False,
+    match: str = "contains",
+    look_in: str = "values",
+    limit: int | None = None,
+    cell_range: str | None = None,
+    include_formulas: bool = False,
 ) -> dict:
     """Search for text in a sheet, optionally replacing it.
+    Searches read each sheet's data in one bulk call and match locally,
+    so the cost does not grow with the number of matches. Replacements
+    write back only the changed cells and report each one.
 
     Args:
-        find: Text to search for.
+        find: Text to search for, a regular expression (match='regex'), or
+              a numeric range like '10..20' or '100..' (match='range').
         workbook: Workbook name or path. Defaults to active workbook.
-        sheet: Sheet name. Defaults to active sheet.
+                  Use '*' to search all open workbooks.
+        sheet: Sheet name. Defaults to active sheet. Use '*' for all sheets.
         replace: Replacement text. If omitted, search only.
         match_case: Case-sensitive matching.
+        match: 'contains' (default), 'whole' (entire cell), 'regex' or 'range'.
+        look_in: 'values' (default) or 'formulas' (formula text).
+        limit: Maximum matches (or listed changes) returned (default 1000);
+               more sets 'truncated'.
+        cell_range: Limit to a range or columns, like 'B2:D50' or 'B:B,D:D'.
+        include_formulas: Replace inside formula text too. By default
+                          formula cells are left alone.
     """
-    return _call(
-        _handler.find_replace, find, workbook, sheet, replace, match_case
+    return await _call(
+        _handler.find_replace, find, workbook, sheet, replace, match_case,
+        match, look_in, limit, cell_range, include_formulas,
     )
 
 
@@ -231,7 +343,7 @@ def find_replace(
         destructiveHint=True,
     ),
 )
-def format_range(
+async def format_range(
     cell_range: str,
     workbook: str | None = None,
     sheet: str | None = None,
@@ -245,6 +357,7 @@ def format_range(
     alignment: str | None = None,
     wrap_text: bool | None = None,
     border: bool | None = None,
+    bulk: bool | None = None,
 ) -> dict:
     """Apply formatting to a cell range.
 
@@ -262,12 +375,14 @@ def format_range(
         alignment: 'left', 'center', 'right', 'justify'.
         wrap_text: Enable text wrapping.
         border: Apply thin borders.
+        bulk: Suspend events and screen updating while formatting.
+              Defaults to the server setting.
     """
-    return _call(
+    return await _call(
         _handler.format_range,
         cell_range, workbook, sheet,
         bold, italic, underline, font_size, font_color,
-        bg_color, number_format, alignment, wrap_text, border,
+        bg_color, number_format, alignment, wrap_text, border, bulk,
     )
 
 
@@ -282,10 +397,11 @@ def format_range(
         destructiveHint=True,
     ),
 )
-def run_macro(
+async def run_macro(
     macro_name: str,
     workbook: str | None = None,
     args: list | None = None,
+    timeout: float | None = None,
 ) -> dict:
     """Run a VBA macro in Excel and return its result.
 
@@ -293,8 +409,11 @@ def run_macro(
         macro_name: Macro name (e.g. 'MyMacro' or 'Module1.MyMacro').
         workbook: Workbook name. If omitted, Excel resolves globally.
         args: Optional arguments to pass to the macro.
+        timeout: Seconds to wait for the macro. Defaults to the server timeout.
     """
-    return _call(_handler.run_macro, macro_name, workbook, args)
+    return await _call(
+        _handler.run_macro, macro_name, workbook, args, timeout=timeout
+    )
 
 
 # ================================================================== #
@@ -308,22 +427,28 @@ def run_macro(
         readOnlyHint=True,
     ),
 )
-def get_formulas(
+async def get_formulas(
     cell_range: str,
     workbook: str | None = None,
     sheet: str | None = None,
     values_too: bool = False,
+    mode: str = "cells",
 ) -> dict:
     """Get all formulas in a range. Returns only cells that contain formulas.
+    A path to an .xlsx file that is not open in Excel is read straight from
+    the file.
 
     Args:
         cell_range: Range like 'A1:U99'.
         workbook: Workbook name or path. Defaults to active workbook.
         sheet: Sheet name. Defaults to active sheet.
         values_too: Include calculated values alongside formulas.
+        mode: 'cells' (default) lists every formula cell. 'grouped' returns
+              one entry per block of cells sharing a formula (filled down
+              or across), with the formula of its top-left cell.
     """
-    return _call(
-        _handler.get_formulas, cell_range, workbook, sheet, values_too
+    return await _call(
+        _handler.get_formulas, cell_range, workbook, sheet, values_too, mode
     )
 
 
@@ -338,7 +463,7 @@ def get_formulas(
         readOnlyHint=True,
     ),
 )
-def get_cell_styles(
+async def get_cell_styles(
     cell_range: str,
     workbook: str | None = None,
     sheet: str | None = None,
@@ -356,7 +481,7 @@ def get_cell_styles(
                     font_name, font_size, font_color, bg_color,
                     number_format, alignment, border).
     """
-    return _call(
+    return await _call(
         _handler.get_cell_styles, cell_range, workbook, sheet, properties
     )
 
@@ -372,7 +497,7 @@ def get_cell_styles(
         readOnlyHint=True,
     ),
 )
-def get_objects(
+async def get_objects(
     workbook: str | None = None,
     sheet: str | None = None,
 ) -> dict:
@@ -382,4 +507,118 @@ def get_objects(
         workbook: Workbook name or path. Defaults to active workbook.
         sheet: Sheet name. Defaults to active sheet.
     """
-    return _call(_handler.get_objects, workbook, sheet)
+    return await _call(_handler.get_objects, workbook, sheet)
+
+
+# ================================================================== #
+#  Tool 12: batch
+# ================================================================== #
+
+
+@mcp.tool(
+    annotations=ToolAnnotations(
+        title="Batch",
+        destructiveHint=True,
+    ),
+)
+async def batch(
+    operations: list[dict],
+    workbook: str | None = None,
+    sheet: str | None = None,
+    stop_on_error: bool = True,
+) -> dict:
+    """Run several operations in one call with screen updating, events and
+    automatic calculation suspended. Returns per-operation results and timings.
+
+    Args:
+        operations: Ordered list like [{"tool": "write_data", "start_cell": "A1",
+                    "data": [[1, 2]]}, {"tool": "format_range", "cell_range": "A1:B1",
+                    "bold": true}]. Allowed tools: read_data, write_data,
+                    manage_sheets, find_replace, format_range, get_formulas,
+                    get_cell_styles, get_objects.
+        workbook: Default workbook for operations. Defaults to active workbook.
+        sheet: Default sheet for operations. Defaults to active sheet.
+        stop_on_error: Stop at the first failed operation (later ones are skipped).
+    """
+    return await _call(_handler.batch, operations, workbook, sheet, stop_on_error)
+
+
+# ================================================================== #
+#  Tool 13: export_range
+# ================================================================== #
+
+
+@mcp.tool(
+    annotations=ToolAnnotations(
+        title="Export Range",
+        destructiveHint=True,
+    ),
+)
+async def export_range(
+    path: str,
+    workbook: str | None = None,
+    sheet: str | None = None,
+    cell_range: str | None = None,
+    format: str | None = None,
+    headers: bool = True,
+    overwrite: bool = False,
+) -> dict:
+    """Write a range or a whole sheet to a local CSV, JSON Lines or Parquet file
+    instead of returning it. Rows are read in bands, so memory stays bounded;
+    the result holds only the path, row count, byte size and column schema.
+
+    Args:
+        path: Output file. Its suffix (.csv, .jsonl, .parquet) picks the format.
+        workbook: Workbook name or path. Defaults to active workbook.
+        sheet: Sheet name. Defaults to active sheet.
+        cell_range: Range like 'A1:F100000' or 'A:F'. Defaults to the sheet's data.
+        format: 'csv', 'jsonl' or 'parquet', overriding the suffix. Parquet
+                needs pyarrow.
+        headers: Use the first row as column names (default true).
+        overwrite: Replace an existing file.
+    """
+    return await _call(
+        _handler.export_range, path, workbook, sheet, cell_range, format, headers,
+        overwrite,
+    )
+
+
+# ================================================================== #
+#  Tool 14: import_file
+# ================================================================== #
+
+
+@mcp.tool(
+    annotations=ToolAnnotations(
+        title="Import File",
+        destructiveHint=True,
+    ),
+)
+async def import_file(
+    path: str,
+    workbook: str | None = None,
+    sheet: str | None = None,
+    start_cell: str = "A1",
+    append: bool = False,
+    format: str | None = None,
+    headers: bool = True,
+) -> dict:
+    """Load a local CSV, TSV or JSON Lines file into a sheet without sending
+    its rows through the conversation. Rows are written in large bands with
+    screen updating, events and calculation suspended; the result reports
+    the written range and the transfer rate.
+
+    Args:
+        path: Input file. Its suffix (.csv, .tsv, .jsonl) picks the format.
+        workbook: Workbook name or path. Defaults to active workbook.
+        sheet: Sheet name. Defaults to active sheet.
+        start_cell: Top-left cell of the import (default 'A1').
+        append: Write below the last value in start_cell's column instead,
+                leaving out the file's header row when there is data above.
+        format: 'csv', 'tsv' or 'jsonl', overriding the suffix.
+        headers: The file's first CSV row is a header; for JSON Lines, write
+                 the keys as a header row (default true).
+    """
+    return await _call(
+        _handler.import_file, path, workbook, sheet, start_cell, append, format, headers,
+    )
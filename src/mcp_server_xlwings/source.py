@@ -0,0 +1,155 @@
+"""File sources for ``import_file``: CSV, TSV and JSON Lines.
+
+Inlining a table into ``write_data`` sends every cell through the MCP
+message channel first, which caps practical loads at a few thousand rows.
+``import_file`` instead reads a local file here and writes it to the
+sheet in row bands, so memory holds one band at a time.
+
+A source is read twice: :meth:`Source.scan` counts the rows and columns
+so the target range is known (and checked against the sheet's edges)
+before anything is written, and :meth:`Source.rows` then yields the rows
+one at a time.
+
+CSV fields are text; those that read as numbers or TRUE/FALSE become
+numbers and booleans, empty fields become empty cells, and numbers with
+leading zeros (codes such as ``007``) stay text. JSON Lines values keep
+their JSON types, with nested objects and arrays written as JSON text.
+"""
+
+from __future__ import annotations
+
+import csv
+import json
+import re
+from pathlib import Path
+from typing import Any, Iterator
+
+FORMATS = ("csv", "tsv", "jsonl")
+
+_SUFFIXES = {".csv": "csv", ".tsv": "tsv", ".jsonl": "jsonl", ".ndjson": "jsonl"}
+
+_NUMBER_RE = re.compile(r"-?(?:0|[1-9]\d*)(?:\.\d+)?(?:[eE][+-]?\d+)?")
+
+_BOOLEANS = {"TRUE": True, "FALSE": False}
+
+
+def file_format(path: str, format: str | None = None) -> str:
+    """``format``, or the one the file suffix implies. Raises ValueError."""
+    if format is not None:
+        kind = format.lower()
+        if kind not in FORMATS:
+            raise ValueError(f"Unknown format '{format}'. Use: {', '.join(FORMATS)}.")
+        return kind
+    kind = _SUFFIXES.get(Path(path).suffix.lower())
+    if kind is None:
+        raise ValueError(
+            f"Cannot tell the format from '{Path(path).name}'. Use a .csv, .tsv or "
+            ".jsonl file, or pass format."
+        )
+    return kind
+
+
+def cell(text: str) -> Any:
+    """A CSV field as the value to write."""
+    if not text:
+        return None
+    if _NUMBER_RE.fullmatch(text):
+        number = float(text)
+        return int(number) if number.is_integer() and abs(number) < 2 ** 53 else number
+    return _BOOLEANS.get(text.upper(), text)
+
+
+def _json_cell(value: Any) -> Any:
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, ensure_ascii=False)
+    if value == "":
+        return None
+    return value
+
+
+class Source:
+    """Rows of a CSV, TSV or JSON Lines file.
+
+    Args:
+        path: File to read.
+        format: One of :data:`FORMATS`.
+        headers: The first CSV row is a header row. For JSON Lines the
+            keys are the header.
+    """
+
+    def __init__(self, path: Path, format: str, headers: bool = True) -> None:
+        self.path = path
+        self.format = format
+        self.headers = headers
+        self.header: list[Any] | None = None
+        self.rows_count = 0
+        self.width = 0
+        # JSON Lines keys in the order they first appear
+        self._keys: dict[str, int] = {}
+
+    def scan(self) -> None:
+        """Count the data rows and columns and read the header.
+
+        Raises ValueError for a malformed CSV file or JSON line, or OSError.
+        """
+        count = width = 0
+        if self.format == "jsonl":
+            for record in self._records():
+                count += 1
+                for key in record:
+                    self._keys.setdefault(key, len(self._keys))
+            width = len(self._keys)
+            self.header = list(self._keys) if self.headers else None
+        else:
+            records = self._fields()
+            if self.headers:
+                self.header = [cell(text) for text in next(records, [])]
+                width = len(self.header)
+            for fields in records:
+                count += 1
+                width = max(width, len(fields))
+        self.rows_count, self.width = count, width
+
+    def rows(self) -> Iterator[list[Any]]:
+        """Data rows, each padded to :attr:`width`; call :meth:`scan` first."""
+        width = self.width
+        if self.format == "jsonl":
+            keys = self._keys
+            for record in self._records():
+                row: list[Any] = [None] * width
+                for key, value in record.items():
+                    row[keys[key]] = _json_cell(value)
+                yield row
+            return
+        records = self._fields()
+        if self.headers:
+            next(records, None)
+        for fields in records:
+            row = [cell(text) for text in fields]
+            row.extend([None] * (width - len(row)))
+            yield row
+
+    def _fields(self) -> Iterator[list[str]]:
+        # utf-8-sig drops the byte order mark Excel puts on CSV files
+        with open(self.path, encoding="utf-8-sig", newline="") as f:
+            try:
+                yield from csv.reader(f, delimiter="\t" if self.format == "tsv" else ",")
+            except csv.Error as exc:
+                raise ValueError(f"'{self.path.name}' is not valid CSV: {exc}.") from None
+
+    def _records(self) -> Iterator[dict[str, Any]]:
+        with open(self.path, encoding="utf-8-sig") as f:
+            for number, line in enumerate(f, 1):
+                if not line.strip():
+                    continue
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError as exc:
+                    raise ValueError(
+                        f"Line {number} of '{self.path.name}' is not valid JSON: {exc.msg}."
+                    ) from None
+                if not isinstance(record, dict):
+                    raise ValueError(
+                        f"Line {number} of '{self.path.name}' is not a JSON object."
+                    )
+                yield record
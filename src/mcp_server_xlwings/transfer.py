@@ -0,0 +1,130 @@
+"""Chunked bulk transfers for blocks too large for one COM call.
+
+A single ``Range.Value`` read or write of a multi-million-cell block
+marshals the whole block as one SAFEARRAY. It can fail outright, and
+even when it succeeds Excel is unresponsive until it finishes. Blocks
+above ``chunk_cells`` are therefore moved in horizontal row bands:
+
+- the first band holds at most ``chunk_cells`` cells (the payload cap);
+- every later band is sized from the measured cells/second so that it
+  takes about ``target_ms``, growing at most 2x per band;
+- a band that raises is retried at half its height, and the cap drops to
+  that height for the rest of the transfer. A single row that still fails
+  re-raises.
+
+Cancellation is checked between bands, so a deadline stops a long
+transfer at the next band instead of after the whole block.
+"""
+
+from __future__ import annotations
+
+import time
+from typing import Any, Callable
+
+from . import geometry
+from .geometry import Rect
+from .worker import Cancelled, check_cancelled
+
+# Blocks up to this many cells move in one call
+DEFAULT_CHUNK_CELLS = 1_000_000
+
+# Time one band should take once the transfer rate is known
+DEFAULT_TARGET_MS = 1000.0
+
+
+class Transfer:
+    """Row-band reader and writer with adaptive band sizes.
+
+    Args:
+        chunk_cells: Largest block moved in one call; 0 disables chunking.
+        target_ms: Time one band should take once the rate is measured.
+    """
+
+    def __init__(
+        self,
+        chunk_cells: int = DEFAULT_CHUNK_CELLS,
+        target_ms: float = DEFAULT_TARGET_MS,
+    ) -> None:
+        self.chunk_cells = chunk_cells
+        self.target_ms = target_ms
+
+    def needed(self, rect: Rect) -> bool:
+        """Whether ``rect`` is too large for a single call."""
+        return self.chunk_cells > 0 and geometry.area(rect) > self.chunk_cells
+
+    def read(
+        self, rect: Rect, fetch: Callable[[Rect], list[list[Any]]],
+    ) -> tuple[list[list[Any]], dict[str, Any]]:
+        """Read ``rect`` band by band; ``fetch`` returns one band's rows.
+
+        Band rows are appended to one output list as they arrive.
+        """
+        rows: list[list[Any]] = []
+        stats = self.run(rect, lambda band: rows.extend(fetch(band)))
+        return rows, stats
+
+    def write(
+        self,
+        rect: Rect,
+        data: list[list[Any]],
+        store: Callable[[Rect, list[list[Any]]], None],
+    ) -> dict[str, Any]:
+        """Write ``data`` (anchored at ``rect``) band by band via ``store``."""
+        top = rect[0]
+        return self.run(
+            rect, lambda band: store(band, data[band[0] - top:band[2] - top + 1]),
+        )
+
+    def run(self, rect: Rect, step: Callable[[Rect], Any]) -> dict[str, Any]:
+        """Call ``step`` on consecutive row bands covering ``rect``."""
+        r0, c0, r1, c1 = rect
+        cols = c1 - c0 + 1
+        cap = max(1, self.chunk_cells // cols) if self.chunk_cells > 0 else r1 - r0 + 1
+        height = cap
+        chunks = retries = cells = 0
+        t_start = time.perf_counter()
+        row = r0
+        while row <= r1:
+            check_cancelled()
+            band = (row, c0, min(row + height - 1, r1), c1)
+            band_rows = band[2] - band[0] + 1
+            t0 = time.perf_counter()
+            try:
+                step(band)
+            except Cancelled:
+                raise
+            except Exception:
+                if band_rows == 1:
+                    raise
+                height = cap = band_rows // 2
+                retries += 1
+                continue
+            elapsed = time.perf_counter() - t0
+            chunks += 1
+            cells += band_rows * cols
+            row = band[2] + 1
+            if elapsed > 0:
+                rate = band_rows * cols / elapsed
+                want = int(rate * self.target_ms / 1000 / cols)
+            else:
+                want = cap
+            height = max(1, min(cap, want, band_rows * 2))
+        total = time.perf_counter() - t_start
+        return {
+            "chunks": chunks,
+            "retries": retries,
+            "cells": cells,
+            "ms": round(total * 1000, 1),
+            "cells_per_sec": int(cells / total) if total > 0 else None,
+        }
+
+
+def combine(stats: list[dict[str, Any]]) -> dict[str, Any]:
+    """One summary for several transfers made by the same call."""
+    if len(stats) == 1:
+        return stats[0]
+    total = {key: sum(s[key] for s in stats) for key in ("chunks", "retries", "cells")}
+    ms = round(sum(s["ms"] for s in stats), 1)
+    total["ms"] = ms
+    total["cells_per_sec"] = int(total["cells"] / ms * 1000) if ms > 0 else None
+    return total
@@ -0,0 +1,151 @@
+"""Conversion of raw ``Range.Value2`` reads into JSON-ready rows.
+
+``Value2`` is the cheapest way to pull a block out of Excel: numbers and
+dates arrive as plain floats, with no per-cell pywintypes/datetime
+conversion in xlwings. The cost is that dates are indistinguishable from
+numbers, so callers pass one *kind* per column, derived from that column's
+``NumberFormat`` with :func:`date_kind`:
+
+- ``None``: plain values; whole floats collapse to ``int``
+- ``"date"``: serial -> ``YYYY-MM-DD``
+- ``"datetime"``: serial -> ``YYYY-MM-DDTHH:MM:SS``
+- ``"time"``: fraction of a day -> ``HH:MM:SS``
+
+Numeric columns are converted with NumPy when it is installed (the
+``fast`` extra); otherwise the same rules run in pure Python.
+"""
+
+from __future__ import annotations
+
+import datetime
+import itertools
+import re
+from typing import Any
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - exercised without the extra
+    np = None
+
+_EXCEL_EPOCH = datetime.datetime(1899, 12, 30)
+_INT_LIMIT = 2 ** 53
+
+# Quoted literals, escaped characters and bracketed sections such as
+# colours ([Red]), conditions ([>100]) and locales ([$-409])
+_FORMAT_NOISE_RE = re.compile(r'"[^"]*"|\\.|_.|\*.|\[(?![hms]+\])[^\]]*\]', re.I)
+
+
+def date_kind(number_format: Any) -> str | None:
+    """Classify an Excel number format as date, datetime, time or None."""
+    if not isinstance(number_format, str) or not number_format:
+        return None
+    # Only the first section (positive numbers) matters
+    fmt = _FORMAT_NOISE_RE.sub("", number_format.split(";")[0]).lower()
+    if fmt == "general" or "0" in fmt or "#" in fmt:
+        return None
+    has_time = "h" in fmt or "s" in fmt
+    # 'm' next to h/s means minutes, otherwise month
+    has_date = "d" in fmt or "y" in fmt or ("m" in fmt and not has_time)
+    if has_date and has_time:
+        return "datetime"
+    if has_date:
+        return "date"
+    if has_time:
+        return "time"
+    return None
+
+
+def _serial_text(serial: float, kind: str) -> str:
+    stamp = _EXCEL_EPOCH + datetime.timedelta(seconds=round(serial * 86400))
+    if kind == "date":
+        return stamp.date().isoformat()
+    if kind == "time":
+        return stamp.time().isoformat()
+    return stamp.isoformat()
+
+
+def convert_scalar(value: Any, kind: str | None = None) -> Any:
+    """Convert one ``Value2`` cell (pure-Python reference implementation)."""
+    if value is None or isinstance(value, (bool, str)):
+        return value
+    if isinstance(value, (int, float)):
+        if kind is not None and value == value:
+            return _serial_text(float(value), kind)
+        if isinstance(value, float) and value.is_integer() and abs(value) < _INT_LIMIT:
+            return int(value)
+    return value
+
+
+def convert(
+    grid: list[list[Any]],
+    kinds: list[str | None],
+    plain_rows: int = 0,
+) -> list[list[Any]]:
+    """Convert a 2D ``Value2`` grid column by column.
+
+    Args:
+        grid: Rows of raw ``Value2`` cells, all the same length.
+        kinds: Date kind per column (see module docstring).
+        plain_rows: Leading rows (e.g. headers) converted without dates.
+    """
+    if not grid:
+        return []
+    rows = grid[plain_rows:]
+    if not rows:
+        out: list[list[Any]] = []
+    elif np is None:
+        out = [[convert_scalar(v, k) for v, k in zip(row, kinds)] for row in rows]
+    else:
+        if _is_numeric(itertools.chain.from_iterable(rows)):
+            # Numbers and blanks only: one float array for the whole block
+            arr = _convert_numeric(np.array(rows, dtype=np.float64), kinds)
+        else:
+            arr = np.array(rows, dtype=object)
+            for j, kind in enumerate(kinds):
+                col = arr[:, j]
+                if _is_numeric(col):
+                    f = np.array(col.tolist(), dtype=np.float64)[:, None]
+                    arr[:, j] = _convert_numeric(f, [kind])[:, 0]
+                elif kind is not None or not _is_text(col):
+                    arr[:, j] = [convert_scalar(v, kind) for v in col]
+        out = arr.tolist()
+    head = [[convert_scalar(v) for v in row] for row in grid[:plain_rows]]
+    return head + out
+
+
+_NUMERIC_TYPES = {float, int, type(None)}
+
+
+def _is_numeric(cells: Any) -> bool:
+    return set(map(type, cells)) <= _NUMERIC_TYPES
+
+
+def _is_text(cells: Any) -> bool:
+    return set(map(type, cells)) <= {str, type(None)}
+
+
+def _convert_numeric(f: Any, kinds: list[str | None]) -> Any:
+    """Convert a float block (blanks as NaN) to an object array."""
+    out = f.astype(object)
+    whole = np.isfinite(f) & (f == np.trunc(f)) & (np.abs(f) < _INT_LIMIT)
+    if whole.any():
+        out[whole] = f[whole].astype(np.int64).astype(object)
+    empty = np.isnan(f)
+    for j, kind in enumerate(kinds):
+        if kind is not None:
+            ok = ~empty[:, j]
+            out[ok, j] = _serial_texts(f[ok, j], kind)
+    if empty.any():
+        out[empty] = None
+    return out
+
+
+def _serial_texts(serials: Any, kind: str) -> Any:
+    seconds = np.round(serials * 86400).astype("timedelta64[s]")
+    stamps = np.datetime64(_EXCEL_EPOCH, "s") + seconds
+    if kind == "date":
+        return np.datetime_as_string(stamps, unit="D")
+    text = np.datetime_as_string(stamps, unit="s")
+    if kind == "time":
+        return np.array([t[11:] for t in text.tolist()], dtype=object)
+    return text
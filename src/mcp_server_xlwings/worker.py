@@ -0,0 +1,150 @@
+"""Dedicated COM worker thread for Excel calls.
+
+COM objects belong to the apartment of the thread that created them, and a
+blocking COM call stalls whatever thread makes it. All ExcelHandler work is
+therefore funnelled through one long-lived single-threaded-apartment (STA)
+thread fed by a queue. The asyncio event loop that serves the MCP protocol
+only awaits results, so it keeps answering while Excel is busy.
+
+Each job carries a cancellation token. A job that has not started yet is
+dropped when cancelled; a running job is asked to stop through
+:func:`check_cancelled`, which long loops in ExcelHandler call between COM
+round trips. A COM call that hangs inside Excel cannot be interrupted; the
+caller gets a timeout while the worker stays blocked until Excel returns.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import concurrent.futures
+import queue
+import threading
+from typing import Any, Callable
+
+try:  # pywin32 is only present on Windows
+    import pythoncom
+except ImportError:  # pragma: no cover - exercised on non-Windows only
+    pythoncom = None
+
+
+class WorkerTimeout(Exception):
+    """An Excel call did not finish within its deadline."""
+
+
+class Cancelled(Exception):
+    """The running Excel call was cancelled by its caller."""
+
+
+_local = threading.local()
+
+
+def check_cancelled() -> None:
+    """Raise :class:`Cancelled` if the current worker job was cancelled.
+
+    Safe to call from any thread; outside a worker job it does nothing.
+    """
+    token = getattr(_local, "token", None)
+    if token is not None and token.is_set():
+        raise Cancelled("Operation cancelled.")
+
+
+class _Job:
+    __slots__ = ("fn", "args", "kwargs", "future", "token")
+
+    def __init__(self, fn: Callable[..., Any], args: tuple, kwargs: dict) -> None:
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+        self.future: concurrent.futures.Future = concurrent.futures.Future()
+        self.token = threading.Event()
+
+    def cancel(self) -> None:
+        self.token.set()
+        self.future.cancel()
+
+
+class ComWorker:
+    """Single COM-apartment thread that executes submitted calls in order."""
+
+    def __init__(self, name: str = "xlwings-com") -> None:
+        self._name = name
+        self._queue: queue.Queue[_Job | None] = queue.Queue()
+        self._thread: threading.Thread | None = None
+        self._lock = threading.Lock()
+
+    @property
+    def thread(self) -> threading.Thread | None:
+        return self._thread
+
+    def _ensure_started(self) -> None:
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(
+                    target=self._run, name=self._name, daemon=True,
+                )
+                self._thread.start()
+
+    def _run(self) -> None:
+        if pythoncom is not None:
+            pythoncom.CoInitialize()
+        try:
+            while True:
+                job = self._queue.get()
+                if job is None:
+                    return
+                if not job.future.set_running_or_notify_cancel():
+                    continue
+                _local.token = job.token
+                try:
+                    result = job.fn(*job.args, **job.kwargs)
+                except BaseException as exc:
+                    job.future.set_exception(exc)
+                else:
+                    job.future.set_result(result)
+                finally:
+                    _local.token = None
+        finally:
+            if pythoncom is not None:
+                pythoncom.CoUninitialize()
+
+    def submit(self, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> _Job:
+        """Queue ``fn(*args, **kwargs)`` for the worker thread."""
+        self._ensure_started()
+        job = _Job(fn, args, kwargs)
+        self._queue.put(job)
+        return job
+
+    async def run(
+        self,
+        fn: Callable[..., Any],
+        *args: Any,
+        timeout: float | None = None,
+        **kwargs: Any,
+    ) -> Any:
+        """Run ``fn`` on the worker and await its result.
+
+        Raises :class:`WorkerTimeout` when ``timeout`` seconds pass first.
+        Cancelling the awaiting task cancels the job as well.
+        """
+        job = self.submit(fn, *args, **kwargs)
+        try:
+            return await asyncio.wait_for(asyncio.wrap_future(job.future), timeout)
+        except asyncio.TimeoutError:
+            job.cancel()
+            raise WorkerTimeout(
+                f"Excel did not respond within {timeout:g}s. "
+                "The operation was cancelled; Excel may still be busy."
+            ) from None
+        except asyncio.CancelledError:
+            job.cancel()
+            raise
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Stop the worker after the jobs already queued."""
+        with self._lock:
+            thread = self._thread
+            self._thread = None
+        if thread is not None and thread.is_alive():
+            self._queue.put(None)
+            if wait:
+                thread.join()
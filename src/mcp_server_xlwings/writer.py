@@ -0,0 +1,611 @@
+"""Streaming writer for new .xlsx files, without Excel.
+
+Creating a report through COM sends every block of cells through the
+Excel process. When the target is a new file that nothing has open,
+``write_data`` and ``format_range`` record into an :class:`XlsxWriter`
+instead, and ``manage_workbooks`` save/close writes the package.
+
+Rows never pile up in memory. Each write is rendered to cell XML at once
+and appended to a temporary spool file per sheet; writes that go back
+above rows already spooled start a new run, and saving merges the runs
+row by row (later writes win). Strings go to the shared strings table
+until it holds :attr:`XlsxWriter.SHARED_STRING_LIMIT` entries, then
+inline. Formatting is kept as (range, spec) pairs and resolved to cell
+styles while the rows are written out, so it may come before or after
+the values it applies to; it applies to cells that hold a value.
+
+Formulas are stored without results; the workbook asks Excel to
+calculate everything when it is first opened.
+"""
+
+from __future__ import annotations
+
+import functools
+import heapq
+import io
+import itertools
+import math
+import re
+import tempfile
+import zipfile
+from pathlib import Path
+from typing import IO, Any, Iterator, Sequence
+
+from . import geometry
+from .geometry import MAX_COLS, MAX_ROWS, Rect
+from .worker import check_cancelled
+
+_MAIN = "http://schemas.openxmlformats.org/spreadsheetml/2006/main"
+_REL = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+_PKG = "http://schemas.openxmlformats.org/package/2006/relationships"
+_CT = "http://schemas.openxmlformats.org/package/2006/content-types"
+_SHEET_CT = "application/vnd.openxmlformats-officedocument.spreadsheetml"
+
+# Formatting keys accepted by :meth:`XlsxWriter.format`, as format_range names them
+FORMAT_KEYS = (
+    "bold", "italic", "underline", "font_size", "font_color", "bg_color",
+    "number_format", "alignment", "wrap_text", "border",
+)
+_ALIGNMENTS = ("left", "center", "right", "justify")
+
+# Number formats Excel has built in, so they need no numFmt entry
+_BUILTIN_FORMATS = {
+    "General": 0, "0": 1, "0.00": 2, "#,##0": 3, "#,##0.00": 4, "0%": 9,
+    "0.00%": 10, "0.00E+00": 11, "@": 49,
+}
+_FIRST_CUSTOM_FORMAT = 164
+
+_SHEET_NAME_RE = re.compile(r"[\[\]:*?/\\]")
+_ENTITIES = {
+    "&": "&amp;", "<": "&lt;", ">": "&gt;", '"': "&quot;",
+    # Tabs and line breaks are encoded so a spooled row stays on one line
+    "\t": "&#9;", "\n": "&#10;", "\r": "&#13;",
+}
+# Characters XML cannot hold are written as _xHHHH_, and text that
+# already looks like such an escape gets its underscore escaped
+_SPECIAL_RE = re.compile(
+    r'[&<>"\t\n\r]|[\x00-\x08\x0b\x0c\x0e-\x1f\ufffe\uffff]|_x[0-9A-Fa-f]{4}_'
+)
+
+
+def _escape_match(match: re.Match) -> str:
+    text = match.group()
+    if text in _ENTITIES:
+        return _ENTITIES[text]
+    if len(text) > 1:
+        return "_x005F" + text
+    return f"_x{ord(text):04X}_"
+
+
+def _xml(text: str) -> str:
+    """``text`` escaped for element content and attribute values."""
+    if _SPECIAL_RE.search(text) is None:
+        return text
+    return _SPECIAL_RE.sub(_escape_match, text)
+
+
+def _text_element(text: str) -> str:
+    """A ``<t>`` element, keeping leading and trailing spaces."""
+    if text[:1].isspace() or text[-1:].isspace():
+        return f'<t xml:space="preserve">{_xml(text)}</t>'
+    return f"<t>{_xml(text)}</t>"
+
+
+@functools.lru_cache(maxsize=None)
+def _letters(col: int) -> str:
+    return geometry.col_letter(col)
+
+
+def _argb(color: str) -> str:
+    """'#RRGGBB' as the ARGB hex the styles part uses."""
+    hex_ = color.strip().lstrip("#")
+    if len(hex_) != 6 or any(ch not in "0123456789abcdefABCDEF" for ch in hex_):
+        raise ValueError(f"Invalid colour '{color}'. Use a hex colour like '#FF0000'.")
+    return "FF" + hex_.upper()
+
+
+def check_sheet_name(name: str) -> str:
+    """``name`` if Excel accepts it as a sheet name; raises ValueError otherwise."""
+    if not name or len(name) > 31 or _SHEET_NAME_RE.search(name) or name[0] == "'":
+        raise ValueError(
+            f"Invalid sheet name '{name}': use 1-31 characters, none of [ ] : * ? / \\."
+        )
+    return name
+
+
+class _Sheet:
+    """Spooled rows and formatting of one sheet."""
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        # Runs of rows in ascending order; a write above the last spooled
+        # row starts a new one
+        self.runs: list[IO[str]] = []
+        self.last_row = 0
+        self.extent: Rect | None = None
+        # (rect, spec index) in the order they were applied
+        self.formats: list[tuple[Rect, int]] = []
+
+    def spool(self, top: int) -> IO[str]:
+        if not self.runs or top <= self.last_row:
+            self.runs.append(
+                tempfile.SpooledTemporaryFile(
+                    max_size=1 << 20, mode="w+", encoding="utf-8", newline="\n",
+                )
+            )
+        run = self.runs[-1]
+        # A save may have left the position anywhere
+        run.seek(0, io.SEEK_END)
+        return run
+
+    def rows(self) -> Iterator[tuple[int, int, list[str]]]:
+        """``(row, first column, cell XML tails)`` in row order, runs merged.
+
+        An empty tail is an empty cell. A later run overrides earlier ones
+        cell by cell, and clears a cell with an empty tail.
+        """
+        if len(self.runs) == 1:
+            run = self.runs[0]
+            run.seek(0)
+            for line in run:
+                parts = line[:-1].split("\t")
+                yield int(parts[0]), int(parts[1]), parts[2:]
+            return
+
+        def lines(run: IO[str], k: int) -> Iterator[tuple[int, int, str]]:
+            run.seek(0)
+            for line in run:
+                yield int(line[:line.index("\t")]), k, line[:-1]
+
+        merged = heapq.merge(*(lines(run, k) for k, run in enumerate(self.runs)))
+        for row, group in itertools.groupby(merged, key=lambda item: item[0]):
+            by_col: dict[int, str] = {}
+            for _, _, line in group:
+                parts = line.split("\t")
+                for col, tail in enumerate(parts[2:], int(parts[1])):
+                    by_col[col] = tail
+            filled = [col for col, tail in by_col.items() if tail]
+            if filled:
+                c0 = min(filled)
+                yield row, c0, [by_col.get(col, "") for col in range(c0, max(filled) + 1)]
+
+    def compact(self) -> None:
+        """Merge all runs into one."""
+        merged = tempfile.SpooledTemporaryFile(
+            max_size=1 << 20, mode="w+", encoding="utf-8", newline="\n",
+        )
+        for row, c0, tails in self.rows():
+            merged.write(f"{row}\t{c0}\t" + "\t".join(tails) + "\n")
+        self.close()
+        self.runs = [merged]
+
+    def close(self) -> None:
+        for run in self.runs:
+            run.close()
+        self.runs = []
+
+
+class XlsxWriter:
+    """A new .xlsx workbook written without Excel.
+
+    The file only appears on disk when :meth:`save` is called; until then
+    the rows live in temporary files. Call :meth:`close` to drop them.
+
+    Args:
+        path: Where the workbook will be saved.
+        sheet: Name of the first sheet.
+    """
+
+    # Distinct strings kept in the shared strings table; later ones are
+    # stored inline so the table's memory stays bounded
+    SHARED_STRING_LIMIT = 100_000
+
+    # Runs a sheet may accumulate before they are merged into one
+    RUN_LIMIT = 32
+
+    # Deflate level of the package: the fastest level costs a few percent
+    # of file size and saves most of the compression time
+    COMPRESS_LEVEL = 1
+
+    def __init__(self, path: str | Path, sheet: str = "Sheet1") -> None:
+        self.path = Path(path)
+        self.name = self.path.name
+        self.fullname = str(self.path.resolve())
+        self._sheets: dict[str, _Sheet] = {}
+        # Text -> cell XML tail referencing its shared string
+        self._strings: dict[str, str] = {}
+        self._specs: list[dict[str, Any]] = []
+        self.add_sheet(sheet)
+
+    def __enter__(self) -> XlsxWriter:
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+    @property
+    def sheet_names(self) -> list[str]:
+        return [ws.name for ws in self._sheets.values()]
+
+    def sheet(self, name: str | None = None) -> str:
+        """The exact name of sheet ``name`` (case-insensitive), or of the first.
+
+        Raises:
+            KeyError: No such sheet.
+        """
+        if name is None:
+            return next(iter(self._sheets.values())).name
+        return self._sheets[name.lower()].name
+
+    def extent(self, sheet: str) -> Rect | None:
+        """Bounding box of everything written to ``sheet`` so far."""
+        return self._sheets[sheet.lower()].extent
+
+    def add_sheet(self, name: str) -> str:
+        check_sheet_name(name)
+        if name.lower() in self._sheets:
+            raise ValueError(f"A sheet named '{name}' already exists.")
+        self._sheets[name.lower()] = _Sheet(name)
+        return name
+
+    # -- cells --------------------------------------------------------- #
+
+    def _cell(self, value: Any) -> str:
+        """The XML of a cell after its reference and style: type and value."""
+        kind = type(value)
+        if kind is str:
+            tail = self._strings.get(value)
+            if tail is not None:
+                return tail
+            if value.startswith("=") and len(value) > 1:
+                return f"><f>{_xml(value[1:])}</f>"
+            if value == "":
+                return ""
+            if len(self._strings) < self.SHARED_STRING_LIMIT:
+                tail = f' t="s"><v>{len(self._strings)}</v>'
+                self._strings[value] = tail
+                return tail
+            return f' t="inlineStr"><is>{_text_element(value)}</is>'
+        if kind is int:
+            return f"><v>{value}</v>"
+        if kind is float:
+            if math.isfinite(value):
+                return f"><v>{value!r}</v>"
+            return ' t="e"><v>#NUM!</v>'
+        if kind is bool:
+            return f' t="b"><v>{int(value)}</v>'
+        if value is None:
+            return ""
+        return self._cell(str(value))
+
+    def write(self, sheet: str, row: int, col: int, data: Sequence[Sequence[Any]]) -> Rect:
+        """Store ``data`` with its top-left cell at (row, col); returns the block.
+
+        None clears a cell. Strings starting with '=' are formulas.
+        """
+        ws = self._sheets[sheet.lower()]
+        width = max((len(values) for values in data), default=0)
+        if not data or not width:
+            return (row, col, row, col)
+        rect = (row, col, row + len(data) - 1, col + width - 1)
+        if rect[2] > MAX_ROWS or rect[3] > MAX_COLS:
+            raise ValueError(
+                f"Data starting at {_letters(col)}{row} runs past the last cell of a sheet."
+            )
+        run = ws.spool(row)
+        cell = self._cell
+        lines = []
+        for r, values in enumerate(data, row):
+            lines.append(f"{r}\t{col}\t" + "\t".join([cell(v) for v in values]) + "\n")
+            if len(lines) == 10_000:
+                check_cancelled()
+                run.writelines(lines)
+                lines = []
+        run.writelines(lines)
+        ws.last_row = max(ws.last_row, rect[2])
+        ws.extent = rect if ws.extent is None else geometry.bounding([ws.extent, rect])
+        if len(ws.runs) > self.RUN_LIMIT:
+            ws.compact()
+        return rect
+
+    def format(self, sheet: str, rect: Rect, spec: dict[str, Any]) -> None:
+        """Apply formatting (keys of :data:`FORMAT_KEYS`) to ``rect``.
+
+        Raises:
+            ValueError: An unknown key, colour or alignment.
+        """
+        unknown = set(spec) - set(FORMAT_KEYS)
+        if unknown:
+            raise ValueError(f"Unknown format keys: {sorted(unknown)}.")
+        spec = dict(spec)
+        for key in ("font_color", "bg_color"):
+            if key in spec:
+                spec[key] = _argb(spec[key])
+        if "alignment" in spec:
+            spec["alignment"] = spec["alignment"].lower()
+            if spec["alignment"] not in _ALIGNMENTS:
+                raise ValueError(
+                    f"Unknown alignment '{spec['alignment']}'. "
+                    f"Use: {', '.join(_ALIGNMENTS)}."
+                )
+        self._specs.append(spec)
+        self._sheets[sheet.lower()].formats.append((rect, len(self._specs) - 1))
+
+    # -- saving --------------------------------------------------------- #
+
+    def save(self, path: str | Path | None = None) -> str:
+        """Write the package to ``path`` (default: the path it was created for).
+
+        The spooled rows are kept, so writes may continue and the file be
+        saved again. Returns the full path written.
+        """
+        target = Path(path) if path is not None else self.path
+        styles = _Styles(self._specs)
+        with zipfile.ZipFile(
+            target, "w", zipfile.ZIP_DEFLATED, compresslevel=self.COMPRESS_LEVEL,
+        ) as z:
+            for i, ws in enumerate(self._sheets.values(), 1):
+                with z.open(f"xl/worksheets/sheet{i}.xml", "w") as part:
+                    self._write_sheet(ws, part, styles, selected=i == 1)
+            with z.open("xl/sharedStrings.xml", "w") as part:
+                self._write_strings(part)
+            z.writestr("xl/styles.xml", styles.xml())
+            z.writestr("xl/workbook.xml", self._workbook_xml())
+            z.writestr("xl/_rels/workbook.xml.rels", self._workbook_rels())
+            z.writestr("_rels/.rels", (
+                f'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+                f'<Relationships xmlns="{_PKG}"><Relationship Id="rId1" '
+                f'Type="{_REL}/officeDocument" Target="xl/workbook.xml"/></Relationships>'
+            ))
+            z.writestr("[Content_Types].xml", self._content_types())
+        return str(target.resolve())
+
+    def _write_sheet(
+        self, ws: _Sheet, part: IO[bytes], styles: _Styles, selected: bool,
+    ) -> None:
+        out = io.TextIOWrapper(part, encoding="utf-8", newline="\n")
+        dimension = geometry.format_a1(ws.extent, absolute=False) if ws.extent else "A1"
+        view = ' tabSelected="1"' if selected else ""
+        out.write(
+            f'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+            f'<worksheet xmlns="{_MAIN}" xmlns:r="{_REL}"><dimension ref="{dimension}"/>'
+            f'<sheetViews><sheetView{view} workbookViewId="0"/></sheetViews><sheetData>'
+        )
+        # Formatting sweeps down the rows: specs start applying at their
+        # first row and drop out after their last
+        pending = sorted(ws.formats, key=lambda item: item[0][0])
+        next_format = 0
+        active: list[tuple[Rect, int]] = []
+        lines: list[str] = []
+        attributes: dict[int, str] = {}
+        letters = [""] + [_letters(col) for col in range(1, (ws.extent or (1, 1, 1, 1))[3] + 1)]
+        for row, c0, tails in ws.rows():
+            if next_format < len(pending) or active:
+                changed = False
+                while next_format < len(pending) and pending[next_format][0][0] <= row:
+                    active.append(pending[next_format])
+                    next_format += 1
+                    changed = True
+                kept = [item for item in active if item[0][2] >= row]
+                if changed or len(kept) != len(active):
+                    active = kept
+                    # Style attributes per column, for as long as the
+                    # same specs apply
+                    attributes = {}
+            if active:
+                body = []
+                for col, tail in enumerate(tails, c0):
+                    if not tail:
+                        continue
+                    attribute = attributes.get(col)
+                    if attribute is None:
+                        # Specs apply in the order format_range was called
+                        attribute = attributes[col] = styles.attribute(tuple(sorted(
+                            spec for rect, spec in active if rect[1] <= col <= rect[3]
+                        )))
+                    body.append(f'<c r="{letters[col]}{row}"{attribute}{tail}</c>')
+                body = "".join(body)
+            else:
+                body = "".join([
+                    f'<c r="{letters[col]}{row}"{tail}</c>'
+                    for col, tail in enumerate(tails, c0) if tail
+                ])
+            if body:
+                lines.append(f'<row r="{row}">{body}</row>')
+            if len(lines) == 10_000:
+                check_cancelled()
+                out.write("".join(lines))
+                lines = []
+        out.write("".join(lines))
+        out.write("</sheetData></worksheet>")
+        out.flush()
+        out.detach()
+
+    def _write_strings(self, part: IO[bytes]) -> None:
+        out = io.TextIOWrapper(part, encoding="utf-8", newline="\n")
+        out.write(
+            f'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+            f'<sst xmlns="{_MAIN}" uniqueCount="{len(self._strings)}">'
+        )
+        for i, text in enumerate(self._strings):
+            out.write(f"<si>{_text_element(text)}</si>")
+            if i % 10_000 == 9_999:
+                check_cancelled()
+        out.write("</sst>")
+        out.flush()
+        out.detach()
+
+    def _workbook_xml(self) -> str:
+        sheets = "".join(
+            f'<sheet name="{_xml(ws.name)}" sheetId="{i}" r:id="rId{i}"/>'
+            for i, ws in enumerate(self._sheets.values(), 1)
+        )
+        return (
+            f'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+            f'<workbook xmlns="{_MAIN}" xmlns:r="{_REL}">'
+            f'<bookViews><workbookView activeTab="0"/></bookViews>'
+            f'<sheets>{sheets}</sheets><calcPr fullCalcOnLoad="1"/></workbook>'
+        )
+
+    def _workbook_rels(self) -> str:
+        count = len(self._sheets)
+        rels = [
+            (f"rId{i}", "worksheet", f"worksheets/sheet{i}.xml") for i in range(1, count + 1)
+        ]
+        rels += [
+            (f"rId{count + 1}", "styles", "styles.xml"),
+            (f"rId{count + 2}", "sharedStrings", "sharedStrings.xml"),
+        ]
+        return (
+            f'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+            f'<Relationships xmlns="{_PKG}">'
+            + "".join(
+                f'<Relationship Id="{rid}" Type="{_REL}/{kind}" Target="{target}"/>'
+                for rid, kind, target in rels
+            )
+            + "</Relationships>"
+        )
+
+    def _content_types(self) -> str:
+        sheets = "".join(
+            f'<Override PartName="/xl/worksheets/sheet{i}.xml" '
+            f'ContentType="{_SHEET_CT}.worksheet+xml"/>'
+            for i in range(1, len(self._sheets) + 1)
+        )
+        return (
+            f'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+            f'<Types xmlns="{_CT}">'
+            '<Default Extension="rels" '
+            'ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+            '<Default Extension="xml" ContentType="application/xml"/>'
+            f'<Override PartName="/xl/workbook.xml" ContentType="{_SHEET_CT}.sheet.main+xml"/>'
+            f"{sheets}"
+            f'<Override PartName="/xl/styles.xml" ContentType="{_SHEET_CT}.styles+xml"/>'
+            f'<Override PartName="/xl/sharedStrings.xml" '
+            f'ContentType="{_SHEET_CT}.sharedStrings+xml"/>'
+            "</Types>"
+        )
+
+    def close(self) -> None:
+        """Drop the spooled rows without saving."""
+        for ws in self._sheets.values():
+            ws.close()
+
+
+class _Styles:
+    """Cell formats for the combinations of specs cells end up with."""
+
+    def __init__(self, specs: list[dict[str, Any]]) -> None:
+        self._specs = specs
+        # Spec indexes -> ' s="N"'
+        self._attributes: dict[tuple[int, ...], str] = {(): ""}
+        self._fonts = [(None, None, None, None, None)]
+        self._fills = [None]
+        self._borders = [False]
+        self._formats: dict[str, int] = {}
+        # (numFmtId, font, fill, border, alignment, wrap)
+        self._xfs = [(0, 0, 0, 0, None, None)]
+
+    def attribute(self, combination: tuple[int, ...]) -> str:
+        """The style attribute of a cell the specs ``combination`` apply to."""
+        attribute = self._attributes.get(combination)
+        if attribute is None:
+            merged: dict[str, Any] = {}
+            for index in combination:
+                merged.update(self._specs[index])
+            xf = (
+                self._number_format(merged.get("number_format")),
+                self._index(self._fonts, (
+                    merged.get("bold"), merged.get("italic"), merged.get("underline"),
+                    merged.get("font_size"), merged.get("font_color"),
+                )),
+                self._index(self._fills, merged.get("bg_color")),
+                self._index(self._borders, bool(merged.get("border"))),
+                merged.get("alignment"),
+                merged.get("wrap_text"),
+            )
+            index = self._index(self._xfs, xf)
+            attribute = f' s="{index}"' if index else ""
+            self._attributes[combination] = attribute
+        return attribute
+
+    @staticmethod
+    def _index(items: list, item: Any) -> int:
+        try:
+            return items.index(item)
+        except ValueError:
+            items.append(item)
+            return len(items) - 1
+
+    def _number_format(self, code: str | None) -> int:
+        if code is None:
+            return 0
+        if code in _BUILTIN_FORMATS:
+            return _BUILTIN_FORMATS[code]
+        return self._formats.setdefault(code, _FIRST_CUSTOM_FORMAT + len(self._formats))
+
+    def xml(self) -> str:
+        formats = "".join(
+            f'<numFmt numFmtId="{id_}" formatCode="{_xml(code)}"/>'
+            for code, id_ in self._formats.items()
+        )
+        fonts = []
+        for bold, italic, underline, size, color in self._fonts:
+            fonts.append(
+                "<font>"
+                + ("<b/>" if bold else "")
+                + ("<i/>" if italic else "")
+                + ("<u/>" if underline else "")
+                + f'<sz val="{size or 11}"/>'
+                + (f'<color rgb="{color}"/>' if color else "")
+                + '<name val="Calibri"/><family val="2"/></font>'
+            )
+        fills = ['<fill><patternFill patternType="none"/></fill>',
+                 '<fill><patternFill patternType="gray125"/></fill>']
+        fills += [
+            f'<fill><patternFill patternType="solid"><fgColor rgb="{color}"/>'
+            f'<bgColor indexed="64"/></patternFill></fill>'
+            for color in self._fills[1:]
+        ]
+        thin = "".join(
+            f'<{edge} style="thin"><color auto="1"/></{edge}>'
+            for edge in ("left", "right", "top", "bottom")
+        )
+        borders = [
+            f"<border>{thin}<diagonal/></border>" if on
+            else "<border><left/><right/><top/><bottom/><diagonal/></border>"
+            for on in self._borders
+        ]
+        xfs = []
+        for number, font, fill, border, alignment, wrap in self._xfs:
+            # Fill 1 is the reserved gray125 pattern
+            fill_id = fill + 1 if fill else 0
+            attrs = (
+                f'numFmtId="{number}" fontId="{font}" fillId="{fill_id}" '
+                f'borderId="{border}" xfId="0"'
+                + (' applyNumberFormat="1"' if number else "")
+                + (' applyFont="1"' if font else "")
+                + (' applyFill="1"' if fill else "")
+                + (' applyBorder="1"' if border else "")
+            )
+            if alignment or wrap:
+                align = (
+                    (f' horizontal="{alignment}"' if alignment else "")
+                    + (' wrapText="1"' if wrap else "")
+                )
+                xfs.append(f'<xf {attrs} applyAlignment="1"><alignment{align}/></xf>')
+            else:
+                xfs.append(f"<xf {attrs}/>")
+        return (
+            f'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+            f'<styleSheet xmlns="{_MAIN}">'
+            + (f'<numFmts count="{len(self._formats)}">{formats}</numFmts>' if formats else "")
+            + f'<fonts count="{len(fonts)}">{"".join(fonts)}</fonts>'
+            + f'<fills count="{len(fills)}">{"".join(fills)}</fills>'
+            + f'<borders count="{len(borders)}">{"".join(borders)}</borders>'
+            + '<cellStyleXfs count="1"><xf numFmtId="0" fontId="0" fillId="0" borderId="0"/>'
+            + "</cellStyleXfs>"
+            + f'<cellXfs count="{len(xfs)}">{"".join(xfs)}</cellXfs>'
+            + '<cellStyles count="1"><cellStyle name="Normal" xfId="0" builtinId="0"/>'
+            + "</cellStyles></styleSheet>"
+        )
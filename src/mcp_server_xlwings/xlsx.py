@@ -0,0 +1,572 @@
+"""Streaming reader for .xlsx files that are not open in Excel.
+
+Reading a closed workbook through COM means starting Excel if it is not
+running, opening the file and marshalling every cell across the process
+boundary. A plain .xlsx keeps the same data in a zip package, so
+``read_data``, ``get_formulas`` and the sheet summary read it from there
+instead.
+
+Parts are streamed, never loaded whole. Sheet XML goes through
+``iterparse`` row by row; each row is dropped once its cells are taken,
+and a pass stops after the last row the request needs. The summary only
+needs where the cells are, so it scans the XML text for cell tags
+instead of building an element per cell. Shared strings
+are resolved in a second streamed pass that keeps only the strings the
+requested cells use. Memory therefore follows the size of the answer,
+not the size of the file.
+
+Values are the ones Excel saved; formulas are not recalculated. Numbers
+with a date format become ISO datetimes, as xlwings returns them. Files
+that are not zip packages -- encrypted or DRM-protected workbooks, legacy
+.xls -- raise :class:`XlsxError`, and the caller falls back to COM.
+"""
+
+from __future__ import annotations
+
+import functools
+import posixpath
+import re
+import xml.etree.ElementTree as ET
+import zipfile
+from pathlib import Path
+from typing import Any, Iterator
+
+from . import geometry
+from .geometry import MAX_ROWS, Rect
+from .value2 import convert_scalar, date_kind
+from .worker import check_cancelled
+
+# Extensions of the zip-based workbook formats
+SUFFIXES = (".xlsx", ".xlsm", ".xltx", ".xltm")
+
+_REL_TYPE = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+_RELS_NS = "{http://schemas.openxmlformats.org/package/2006/relationships}"
+
+# Built-in number formats that show dates or times (27-36 and 50-58 are
+# the East Asian date formats)
+_DATE_FORMAT_IDS = frozenset(
+    [*range(14, 23), *range(27, 37), *range(45, 48), *range(50, 59)]
+)
+_1904_OFFSET = 1462
+_INT_LIMIT = 2 ** 53
+
+_MAIN_NS = "{http://schemas.openxmlformats.org/spreadsheetml/2006/main}"
+_DIGITS = "0123456789"
+# Characters Excel cannot store in XML are written as _xHHHH_
+_ESCAPE_RE = re.compile(r"_x([0-9A-Fa-f]{4})_")
+# Prefixes saved on newer functions; Range.Formula does not show them
+_FUNCTION_PREFIX_RE = re.compile(r"_xl(?:fn|ws|udf)\.")
+
+# A cell tag as (column letters, row, b"<" when it holds a value or
+# formula): an element, not an end tag, follows its start tag
+_CELL_TAG_RE = re.compile(
+    rb'<(?:[\w.-]+:)?c\b(?:[^>]*?\sr="([A-Za-z]+)(\d+)")?[^>]*?(?:/>|>\s*(<(?!/))?)'
+)
+_EXTRA_TAG_RE = re.compile(rb'<(?:[\w.-]+:)?(dimension|mergeCell)\b[^>]*?\sref="([^"]*)"')
+_SCAN_BYTES = 1 << 16
+
+
+class XlsxError(Exception):
+    """The file cannot be read as an .xlsx package."""
+
+
+class _Shared:
+    """Placeholder for a shared string until the strings pass resolves it."""
+
+    __slots__ = ("index",)
+
+    def __init__(self, index: int) -> None:
+        self.index = index
+
+
+_UNREAD = object()
+
+
+def _local(tag: str) -> str:
+    return tag.rpartition("}")[2]
+
+
+def _unescape(text: str) -> str:
+    if "_x" not in text:
+        return text
+    return _ESCAPE_RE.sub(lambda m: chr(int(m.group(1), 16)), text)
+
+
+def _rich_text(elem: ET.Element) -> str:
+    """Text of a string item or inline string, without phonetic runs."""
+    parts = []
+    for child in elem:
+        tag = _local(child.tag)
+        if tag == "t":
+            parts.append(child.text or "")
+        elif tag == "r":
+            parts.extend(t.text or "" for t in child if _local(t.tag) == "t")
+    return _unescape("".join(parts))
+
+
+@functools.lru_cache(maxsize=None)
+def _column(letters: str) -> int:
+    return geometry.col_number(letters)
+
+
+class XlsxBook:
+    """A closed .xlsx workbook opened for streaming reads.
+
+    Only the package's small parts (relationships, workbook, styles) are
+    parsed up front. Use as a context manager to close the zip.
+
+    Raises:
+        XlsxError: The file is not a readable .xlsx package.
+    """
+
+    def __init__(self, path: str | Path) -> None:
+        self.path = Path(path)
+        self.name = self.path.name
+        self.fullname = str(self.path.resolve())
+        try:
+            self._zip = zipfile.ZipFile(self.path)
+        except (OSError, zipfile.BadZipFile) as exc:
+            raise XlsxError(f"'{self.name}' is not an .xlsx package: {exc}") from None
+        self._names = set(self._zip.namelist())
+        try:
+            self._load()
+        except (KeyError, ValueError, ET.ParseError) as exc:
+            self.close()
+            raise XlsxError(f"'{self.name}' is not a readable workbook: {exc}") from None
+
+    def __enter__(self) -> XlsxBook:
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self._zip.close()
+
+    # -- package parts ------------------------------------------------ #
+
+    def _parse(self, part: str) -> ET.Element:
+        with self._zip.open(part) as stream:
+            return ET.parse(stream).getroot()
+
+    def _rels(self, part: str) -> dict[str, tuple[str, str]]:
+        """Relationship id -> (type suffix, target part) of ``part``."""
+        folder, name = posixpath.split(part)
+        rels_part = posixpath.join(folder, "_rels", name + ".rels")
+        if rels_part not in self._names:
+            return {}
+        rels = {}
+        for rel in self._parse(rels_part).iter(f"{_RELS_NS}Relationship"):
+            target = rel.get("Target", "")
+            if target.startswith("/"):
+                target = target[1:]
+            else:
+                target = posixpath.normpath(posixpath.join(folder, target))
+            rels[rel.get("Id")] = (rel.get("Type", "").rpartition("/")[2], target)
+        return rels
+
+    def _load(self) -> None:
+        main = next(
+            (t for kind, t in self._rels("").values() if kind == "officeDocument"),
+            "xl/workbook.xml",
+        )
+        rels = self._rels(main)
+        parts = {kind: target for kind, target in rels.values()}
+        root = self._parse(main)
+
+        self.date1904 = False
+        active_tab = None
+        # (name, part) per tab; chart sheets have no part to read
+        tabs: list[tuple[str, str | None]] = []
+        for elem in root.iter():
+            tag = _local(elem.tag)
+            if tag == "workbookPr":
+                self.date1904 = elem.get("date1904") in ("1", "true")
+            elif tag == "workbookView" and active_tab is None:
+                active_tab = int(elem.get("activeTab", 0))
+            elif tag == "sheet":
+                kind, target = rels.get(elem.get(f"{{{_REL_TYPE}}}id"), ("", ""))
+                tabs.append((elem.get("name", ""), target if kind == "worksheet" else None))
+        self._sheets = {name: part for name, part in tabs if part is not None}
+        if not self._sheets:
+            raise ValueError("no worksheets")
+        self.sheet_names = list(self._sheets)
+        active_tab = active_tab or 0
+        active = tabs[active_tab][0] if active_tab < len(tabs) else ""
+        self.active_name = active if active in self._sheets else self.sheet_names[0]
+
+        self._strings_part = parts.get("sharedStrings")
+        self._date_styles: list[bool] = []
+        if parts.get("styles") in self._names:
+            self._load_styles(self._parse(parts["styles"]))
+
+    def _load_styles(self, root: ET.Element) -> None:
+        """Which cell formats (``s`` attribute) show a date or time."""
+        codes: dict[int, str] = {}
+        for elem in root:
+            tag = _local(elem.tag)
+            if tag == "numFmts":
+                for fmt in elem:
+                    codes[int(fmt.get("numFmtId", -1))] = fmt.get("formatCode", "")
+            elif tag == "cellXfs":
+                for xf in elem:
+                    fmt_id = int(xf.get("numFmtId", 0))
+                    code = codes.get(fmt_id)
+                    self._date_styles.append(
+                        date_kind(code) is not None if code is not None
+                        else fmt_id in _DATE_FORMAT_IDS
+                    )
+
+    def is_date(self, style: int) -> bool:
+        return 0 <= style < len(self._date_styles) and self._date_styles[style]
+
+    # -- sheets and strings ------------------------------------------- #
+
+    def sheet(self, name: str | None = None) -> XlsxSheet | None:
+        """Sheet ``name`` (case-insensitive), the active sheet for None."""
+        if name is None:
+            name = self.active_name
+        for key, part in self._sheets.items():
+            if key.lower() == name.lower():
+                return XlsxSheet(self, key, part)
+        return None
+
+    def resolve(self, pending: dict[int, list[tuple[list[Any], int]]]) -> None:
+        """Fill shared-string slots, one streamed pass over the strings part.
+
+        ``pending`` maps a string index to the (row list, position) slots
+        that show it. Only those strings are kept, and the pass stops at
+        the highest index needed.
+        """
+        if not pending:
+            return
+        last = max(pending)
+        index = -1
+        if self._strings_part is not None:
+            with self._zip.open(self._strings_part) as stream:
+                root = None
+                for event, elem in ET.iterparse(stream, ("start", "end")):
+                    if root is None:
+                        root = elem
+                    if event != "end" or _local(elem.tag) != "si":
+                        continue
+                    index += 1
+                    slots = pending.get(index)
+                    if slots:
+                        text = _rich_text(elem)
+                        for row, j in slots:
+                            row[j] = text
+                    root.clear()
+                    if index >= last:
+                        break
+        if index < last:
+            raise XlsxError(f"Shared string {last} is missing from '{self.name}'.")
+
+
+class XlsxSheet:
+    """One worksheet of an :class:`XlsxBook`, read in streamed passes."""
+
+    def __init__(self, book: XlsxBook, name: str, part: str) -> None:
+        self.book = book
+        self.name = name
+        self.part = part
+        self._tags(_MAIN_NS)
+
+    def _tags(self, ns: str) -> None:
+        """Qualified tag names, compared as-is on the hot path."""
+        self._ns = ns
+        self._v, self._is, self._f = ns + "v", ns + "is", ns + "f"
+
+    def _rows(
+        self, last_row: int = MAX_ROWS, extras: list[tuple[str, str]] | None = None,
+    ) -> Iterator[tuple[int, ET.Element]]:
+        """(row number, row element) in sheet order, up to ``last_row``.
+
+        A row is cleared from the tree once the consumer moves on, so
+        memory stays flat. ``extras`` collects the ``dimension`` and
+        ``mergeCell`` references met on the way, as (tag, ref) pairs.
+        """
+        with self.book._zip.open(self.part) as stream:
+            events = ET.iterparse(stream, ("start", "end"))
+            _, root = next(events)
+            # Transitional and strict packages use different namespaces
+            self._tags(root.tag[:root.tag.find("}") + 1])
+            row_tag, data_tag, dimension, merge = (
+                self._ns + tag for tag in ("row", "sheetData", "dimension", "mergeCell")
+            )
+            parent = None
+            r = 0
+            try:
+                for event, elem in events:
+                    tag = elem.tag
+                    if event == "start":
+                        if tag == data_tag:
+                            parent = elem
+                        continue
+                    if tag == row_tag:
+                        check_cancelled()
+                        r = int(elem.get("r") or r + 1)
+                        if r > last_row:
+                            return
+                        yield r, elem
+                        if parent is not None:
+                            parent.clear()
+                    elif extras is not None and tag in (dimension, merge):
+                        extras.append((_local(tag), elem.get("ref", "")))
+            except ET.ParseError as exc:
+                raise XlsxError(
+                    f"Sheet '{self.name}' of '{self.book.name}' is damaged: {exc}"
+                ) from None
+
+    @staticmethod
+    def _cells(row: ET.Element, r: int) -> Iterator[tuple[int, ET.Element]]:
+        """(column, cell element); cells may omit ``r`` and follow the previous one."""
+        c = 0
+        for cell in row:
+            ref = cell.get("r")
+            c = _column(ref.rstrip(_DIGITS)) if ref else c + 1
+            yield c, cell
+
+    def _value(self, cell: ET.Element) -> Any:
+        """JSON-ready value of a cell; shared strings come back as placeholders."""
+        kind = cell.get("t", "n")
+        text = None
+        for child in cell:
+            if child.tag == self._v:
+                text = child.text
+            elif child.tag == self._is:
+                return _rich_text(child)
+        if text is None:
+            return None
+        if kind == "s":
+            return _Shared(int(text))
+        if kind == "b":
+            return text == "1"
+        if kind in ("str", "e", "d"):
+            return _unescape(text)
+        number = float(text)
+        style = cell.get("s")
+        if style is not None and self.book.is_date(int(style)):
+            if self.book.date1904:
+                number += _1904_OFFSET
+            return convert_scalar(number, "datetime")
+        if number.is_integer() and abs(number) < _INT_LIMIT:
+            return int(number)
+        return number
+
+    def survey(self) -> tuple[Rect | None, Rect | None, list[Rect]]:
+        """Used range, data extent and merge areas in one pass.
+
+        The used range is the sheet's saved ``dimension`` (the bounding box
+        of every cell element when it is missing); the data extent covers
+        cells holding a value or formula, None for an empty sheet.
+
+        The pass scans the XML text: rows come in order, so the first and
+        last cells found give the rows, and the columns are the distinct
+        letters seen. Sheets with cells that omit their ``r`` reference
+        are surveyed element by element instead.
+        """
+        extras: list[tuple[str, str]] = []
+        # Column letters of every cell, and of the cells holding something
+        letters: set[bytes] = set()
+        filled: set[bytes] = set()
+        used_rows: list[bytes] = []
+        data_rows: list[bytes] = []
+        for text in self._texts():
+            if b"dimension" in text or b"mergeCell" in text:
+                extras += [
+                    (tag.decode("ascii"), ref.decode("ascii"))
+                    for tag, ref in _EXTRA_TAG_RE.findall(text)
+                ]
+            cells = _CELL_TAG_RE.findall(text)
+            if not cells:
+                continue
+            letters.update(cell[0] for cell in cells)
+            if b"" in letters:
+                return self._survey_elements()
+            used_rows += [cells[0][1], cells[-1][1]]
+            first = next((cell for cell in cells if cell[2]), None)
+            if first is not None:
+                last = next(cell for cell in reversed(cells) if cell[2])
+                data_rows += [first[1], last[1]]
+                filled.update(cell[0] for cell in cells if cell[2])
+        dimension = next((ref for tag, ref in extras if tag == "dimension"), None)
+        merges = [geometry.parse_a1(ref) for tag, ref in extras if tag == "mergeCell"]
+        extent = None
+        if filled:
+            cols = [_column(name.decode("ascii").upper()) for name in filled]
+            extent = (int(data_rows[0]), min(cols), int(data_rows[-1]), max(cols))
+        if dimension:
+            used_rect = geometry.parse_a1(dimension)
+        elif letters:
+            cols = [_column(name.decode("ascii").upper()) for name in letters]
+            used_rect = (int(used_rows[0]), min(cols), int(used_rows[-1]), max(cols))
+        else:
+            used_rect = (1, 1, 1, 1)
+        return used_rect, extent, merges
+
+    def _texts(self) -> Iterator[bytes]:
+        """The sheet XML as bytes, in pieces cut before an end tag.
+
+        A cut there never falls inside a tag, nor between a cell's start
+        tag and its first child, which tells whether the cell is empty.
+        """
+        with self.book._zip.open(self.part) as stream:
+            carry = b""
+            while True:
+                check_cancelled()
+                chunk = stream.read(_SCAN_BYTES)
+                if not chunk:
+                    if carry:
+                        yield carry
+                    return
+                text = carry + chunk
+                cut = text.rfind(b"</")
+                if cut <= 0:
+                    carry = text
+                    continue
+                carry = text[cut:]
+                yield text[:cut]
+
+    def _survey_elements(self) -> tuple[Rect | None, Rect | None, list[Rect]]:
+        """:meth:`survey` counting each cell's position from the elements."""
+        extras: list[tuple[str, str]] = []
+        used = [MAX_ROWS + 1, geometry.MAX_COLS + 1, 0, 0]
+        data = [MAX_ROWS + 1, geometry.MAX_COLS + 1, 0, 0]
+        for r, elem in self._rows(extras=extras):
+            cells = list(elem)
+            if not cells:
+                continue
+            # Only the first and last cells, and the first and last holding
+            # something, move the boxes
+            ends = [cells[0], cells[-1]]
+            filled = [cell for cell in cells if len(cell)]
+            if filled:
+                ends += [filled[0], filled[-1]]
+            refs = [cell.get("r") for cell in ends]
+            if all(refs):
+                cols = [_column(ref.rstrip(_DIGITS)) for ref in refs]
+            else:
+                where = {id(cell): c for c, cell in self._cells(elem, r)}
+                cols = [where[id(cell)] for cell in ends]
+            boxes = [(used, cols[0], cols[1])]
+            if filled:
+                boxes.append((data, cols[2], cols[3]))
+            for box, c0, c1 in boxes:
+                box[0], box[1] = min(box[0], r), min(box[1], c0)
+                box[2], box[3] = max(box[2], r), max(box[3], c1)
+        dimension = next((ref for tag, ref in extras if tag == "dimension"), None)
+        merges = [geometry.parse_a1(ref) for tag, ref in extras if tag == "mergeCell"]
+        extent = tuple(data) if data[2] else None
+        if dimension:
+            used_rect = geometry.parse_a1(dimension)
+        elif used[2]:
+            used_rect = tuple(used)
+        else:
+            used_rect = (1, 1, 1, 1)
+        return used_rect, extent, merges
+
+    def read(self, rects: list[Rect]) -> list[list[list[Any]]]:
+        """Value grids of several rectangles, in one pass over the sheet."""
+        grids = [
+            [[None] * (c1 - c0 + 1) for _ in range(r1 - r0 + 1)]
+            for r0, c0, r1, c1 in rects
+        ]
+        order = sorted(range(len(rects)), key=lambda k: rects[k][0])
+        pending: dict[int, list[tuple[list[Any], int]]] = {}
+        active: list[int] = []
+        nxt = 0
+        last = max((rect[2] for rect in rects), default=0)
+        for r, row in self._rows(last):
+            while nxt < len(order) and rects[order[nxt]][0] <= r:
+                active.append(order[nxt])
+                nxt += 1
+            active = [k for k in active if rects[k][2] >= r]
+            if not active:
+                continue
+            c = 0
+            for cell in row:
+                ref = cell.get("r")
+                c = _column(ref.rstrip(_DIGITS)) if ref else c + 1
+                value = _UNREAD
+                for k in active:
+                    r0, c0, _, c1 = rects[k]
+                    if not c0 <= c <= c1:
+                        continue
+                    if value is _UNREAD:
+                        value = self._value(cell)
+                    line = grids[k][r - r0]
+                    if isinstance(value, _Shared):
+                        pending.setdefault(value.index, []).append((line, c - c0))
+                    else:
+                        line[c - c0] = value
+        self.book.resolve(pending)
+        return grids
+
+    def formulas(
+        self, rect: Rect, values_too: bool = False,
+    ) -> list[tuple[int, int, str, Any]]:
+        """``(row, col, formula, value)`` of the formula cells in ``rect``.
+
+        Formulas are A1 text with a leading ``=``, as ``Range.Formula``
+        shows them; cells of a shared formula get the anchor's formula
+        shifted to their position, and every cell of an array formula gets
+        its text. The pass reads from the top of the sheet, since a shared
+        formula's anchor may lie above ``rect``.
+        """
+        r0, c0, r1, c1 = rect
+        found: list[list[Any]] = []
+        shared: dict[str, tuple[int, int, str]] = {}
+        arrays: list[tuple[Rect, str]] = []
+        pending: dict[int, list[tuple[list[Any], int]]] = {}
+        for r, row in self._rows(r1):
+            for c, cell in self._cells(row, r):
+                formula = None
+                for child in cell:
+                    if child.tag == self._f:
+                        formula = self._formula(child, r, c, shared, arrays)
+                        break
+                else:
+                    if arrays:
+                        formula = next((
+                            text for area, text in arrays
+                            if geometry.contains(area, r, c)
+                        ), None)
+                if formula is None or not (r0 <= r and c0 <= c <= c1):
+                    continue
+                entry: list[Any] = [r, c, formula, None]
+                if values_too:
+                    value = self._value(cell)
+                    if isinstance(value, _Shared):
+                        pending.setdefault(value.index, []).append((entry, 3))
+                    else:
+                        entry[3] = value
+                found.append(entry)
+        self.book.resolve(pending)
+        return [tuple(entry) for entry in found]
+
+    @staticmethod
+    def _formula(
+        elem: ET.Element,
+        r: int,
+        c: int,
+        shared: dict[str, tuple[int, int, str]],
+        arrays: list[tuple[Rect, str]],
+    ) -> str | None:
+        kind = elem.get("t")
+        text = _FUNCTION_PREFIX_RE.sub("", _unescape(elem.text or ""))
+        if kind == "shared":
+            index = elem.get("si", "")
+            if text:
+                shared[index] = (r, c, "=" + text)
+                return "=" + text
+            anchor = shared.get(index)
+            if anchor is None:
+                return None
+            return geometry.shift_formula(anchor[2], r - anchor[0], c - anchor[1])
+        if not text:
+            return None
+        if kind == "array" and elem.get("ref"):
+            arrays.append((geometry.parse_a1(elem.get("ref")), "=" + text))
+        return "=" + text
+
@@ -0,0 +1,31 @@
+"""Shared fixtures: an ExcelHandler wired to the in-memory backend."""
+
+from __future__ import annotations
+
+import pytest
+
+from mcp_server_xlwings.excel import ExcelHandler
+from mcp_server_xlwings.memory import MemoryBackend
+
+
+@pytest.fixture
+def backend() -> MemoryBackend:
+    return MemoryBackend()
+
+
+@pytest.fixture
+def handler(backend: MemoryBackend) -> ExcelHandler:
+    return ExcelHandler(backend)
+
+
+@pytest.fixture
+def book(backend: MemoryBackend):
+    """Active workbook with a 'Data' sheet (header + 1000 rows) and 'Summary'."""
+    wb = backend.app.add_book(r"C:\reports\report.xlsx", ["Data", "Summary"])
+    ws = wb.sheet("Data")
+    ws.write("A1", [["ID", "Name", "Amount"]] + [
+        [i, f"name{i}", i * 1.5] for i in range(1, 1001)
+    ])
+    wb.sheet("Summary").write("A1", [["Metric", "Value"], ["Total", 42]])
+    backend.counter.reset()
+    return wb
@@ -0,0 +1,126 @@
+"""batch: shared resolution, suspended application state, per-op results."""
+
+from __future__ import annotations
+
+import pytest
+
+from mcp_server_xlwings.excel import XL_CALCULATION_MANUAL, ExcelError
+from mcp_server_xlwings.memory import XL_CALC_AUTOMATIC
+
+EDITS = [
+    {"tool": "write_data", "start_cell": "E1", "data": [["Total"], [1], [2]]},
+    {"tool": "format_range", "cell_range": "E1", "bold": True},
+    {"tool": "write_data", "start_cell": "E4", "formula": "=SUM(E2:E3)"},
+    {"tool": "read_data", "cell_range": "E1:E4", "headers": False},
+]
+
+
+def _app_state(backend):
+    return dict(backend.app.api._state)
+
+
+def test_runs_operations_in_order(handler, book):
+    result = handler.batch(EDITS)
+    assert [r["tool"] for r in result["results"]] == [op["tool"] for op in EDITS]
+    assert all(r["ok"] for r in result["results"])
+    assert result["completed"] == 4 and result["failed"] == 0
+    assert result["results"][3]["result"]["data"][:3] == [["Total"], [1], [2]]
+    assert all(r["ms"] >= 0 for r in result["results"])
+    assert book.sheet("Data").range("E1").font.bold is True
+
+
+def test_resolves_once(handler, book, backend):
+    ops = [
+        {"tool": "write_data", "start_cell": f"E{i}", "data": [[i]]}
+        for i in range(1, 11)
+    ]
+    handler.read_data(cell_range="A1")
+    backend.counter.reset()
+    for op in ops:
+        handler.write_data(op["start_cell"], op["data"])
+    separate = backend.counter.calls
+    backend.counter.reset()
+    handler.batch(ops)
+    assert backend.counter.calls < separate
+    assert backend.counter.by_member["Application.Ready"] == 1
+    assert backend.counter.by_member["Application.ActiveWorkbook"] == 1
+    assert backend.counter.by_member["Workbook.ActiveSheet"] == 1
+
+
+def test_state_suspended_and_restored(handler, book, backend):
+    seen = []
+    original = handler.write_data
+
+    def spy(*args, **kwargs):
+        seen.append(_app_state(backend))
+        return original(*args, **kwargs)
+
+    handler.write_data = spy
+    handler.batch([EDITS[0]])
+    assert seen[0]["ScreenUpdating"] is False
+    assert seen[0]["EnableEvents"] is False
+    assert seen[0]["Calculation"] == XL_CALCULATION_MANUAL
+    state = _app_state(backend)
+    assert state["ScreenUpdating"] is True
+    assert state["EnableEvents"] is True
+    assert state["Calculation"] == XL_CALC_AUTOMATIC
+
+
+def test_state_restored_when_operation_raises(handler, book, backend):
+    def boom(**kwargs):
+        raise KeyboardInterrupt
+
+    handler.format_range = boom
+    with pytest.raises(KeyboardInterrupt):
+        handler.batch([{"tool": "format_range", "cell_range": "A1"}])
+    assert _app_state(backend)["ScreenUpdating"] is True
+    assert _app_state(backend)["Calculation"] == XL_CALC_AUTOMATIC
+
+
+def test_stop_on_error(handler, book):
+    ops = [
+        EDITS[0],
+        {"tool": "read_data", "sheet": "Missing", "cell_range": "A1"},
+        EDITS[1],
+    ]
+    result = handler.batch(ops)
+    assert [r["ok"] for r in result["results"]] == [True, False]
+    assert "not found" in result["results"][1]["error"]
+    assert (result["failed"], result["skipped"]) == (1, 1)
+
+    result = handler.batch(ops, stop_on_error=False)
+    assert [r["ok"] for r in result["results"]] == [True, False, True]
+    assert result["skipped"] == 0
+
+
+def test_batch_defaults(handler, book):
+    result = handler.batch(
+        [{"tool": "write_data", "start_cell": "A3", "data": [["x"]]}],
+        sheet="Summary",
+    )
+    assert result["results"][0]["ok"]
+    assert book.sheet("Summary").range("A3").value == "x"
+    # manage_sheets does not inherit the batch sheet as its target
+    listed = handler.batch([{"tool": "manage_sheets", "action": "list"}], sheet="Summary")
+    assert listed["results"][0]["result"]["sheets"] == ["Data", "Summary"]
+
+
+def test_deleted_sheet_is_not_reused_within_batch(handler, book):
+    result = handler.batch([
+        {"tool": "read_data", "sheet": "Summary", "cell_range": "A1"},
+        {"tool": "manage_sheets", "action": "delete", "sheet": "Summary"},
+        {"tool": "read_data", "sheet": "Summary", "cell_range": "A1"},
+    ], stop_on_error=False)
+    assert [r["ok"] for r in result["results"]] == [True, True, False]
+
+
+@pytest.mark.parametrize("ops, match", [
+    ([], "at least one"),
+    ([{"tool": "run_macro", "macro_name": "X"}], "unknown tool"),
+    ([{"start_cell": "A1"}], "unknown tool"),
+    ([{"tool": "write_data", "cell": "A1"}], r"Operation 0 \(write_data\)"),
+])
+def test_rejects_invalid_operations_before_running(handler, book, backend, ops, match):
+    with pytest.raises(ExcelError, match=match):
+        handler.batch(ops)
+    assert backend.counter.calls == 0
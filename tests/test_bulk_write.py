@@ -0,0 +1,92 @@
+"""Bulk-write policy: suspended calculation with one targeted recalc."""
+
+from __future__ import annotations
+
+from mcp_server_xlwings.excel import XL_CALCULATION_MANUAL, ExcelHandler
+from mcp_server_xlwings.memory import XL_CALC_AUTOMATIC
+
+
+def _state(backend):
+    return dict(backend.app.api._state)
+
+
+def test_off_by_default(handler, book, backend):
+    result = handler.write_data("E1", [[1, 2]])
+    assert "recalc" not in result
+    assert backend.counter.by_member["Application.Calculation"] == 0
+
+
+def test_data_write_recalculates_sheet_once(handler, book, backend, monkeypatch):
+    during = []
+    sheet_api = type(book.sheet("Data").api)
+    original = sheet_api.Calculate
+
+    def calculate(self):
+        during.append(_state(backend))
+        original(self)
+
+    monkeypatch.setattr(sheet_api, "Calculate", calculate)
+    result = handler.write_data("E1", [[1, 2], [3, 4]], bulk=True)
+    assert result["recalc"]["scope"] == "sheet"
+    assert result["recalc"]["ms"] >= 0
+    assert during == [{
+        "ScreenUpdating": False, "EnableEvents": False,
+        "Calculation": XL_CALCULATION_MANUAL, "DisplayAlerts": True,
+    }]
+    assert _state(backend)["Calculation"] == XL_CALC_AUTOMATIC
+    assert _state(backend)["ScreenUpdating"] is True
+
+
+def test_calculation_is_restored_last(handler, book, backend, monkeypatch):
+    sets = []
+    app_api = type(backend.app.api)
+    original = app_api.__setattr__
+
+    def record(self, name, value):
+        sets.append((name, value))
+        original(self, name, value)
+
+    monkeypatch.setattr(app_api, "__setattr__", record)
+    handler.write_data("E1", [[1]], bulk=True)
+    assert sets[3:] == [
+        ("ScreenUpdating", True), ("EnableEvents", True), ("Calculation", XL_CALC_AUTOMATIC),
+    ]
+
+
+def test_formula_recalculates_only_the_cell(handler, book, backend):
+    result = handler.write_data("E1", formula="=A2*2", bulk=True)
+    assert result["recalc"]["scope"] == "range"
+    assert backend.counter.by_member["Range.Calculate"] == 1
+    assert backend.counter.by_member["Worksheet.Calculate"] == 0
+
+
+def test_server_default_and_override(backend, book):
+    handler = ExcelHandler(backend, bulk_write=True)
+    assert "recalc" in handler.write_data("E1", [[1]])
+    assert "recalc" not in handler.write_data("E1", [[1]], bulk=False)
+
+
+def test_manual_calculation_is_left_alone(handler, book, backend):
+    backend.app.api._state["Calculation"] = XL_CALCULATION_MANUAL
+    result = handler.write_data("E1", [[1]], bulk=True)
+    assert "recalc" not in result
+    assert _state(backend)["Calculation"] == XL_CALCULATION_MANUAL
+    assert _state(backend)["ScreenUpdating"] is True
+
+
+def test_structure_change_and_formatting(handler, book, backend):
+    result = handler.manage_sheets("insert_rows", sheet="Data", position=2, bulk=True)
+    assert result["recalc"]["scope"] == "sheet"
+    result = handler.format_range("A1:C1", bold=True, bulk=True)
+    assert "recalc" not in result
+    assert _state(backend)["ScreenUpdating"] is True
+
+
+def test_no_per_operation_recalc_inside_batch(backend, book):
+    handler = ExcelHandler(backend, bulk_write=True)
+    result = handler.batch([
+        {"tool": "write_data", "start_cell": f"E{i}", "data": [[i]]}
+        for i in range(1, 4)
+    ])
+    assert all("recalc" not in r["result"] for r in result["results"])
+    assert backend.counter.by_member["Worksheet.Calculate"] == 0
@@ -0,0 +1,140 @@
+"""Range snapshot cache: hits, eviction and write-through invalidation."""
+
+from __future__ import annotations
+
+import pytest
+
+from mcp_server_xlwings.cache import ExcelEvents, RangeCache
+from mcp_server_xlwings.excel import ExcelHandler
+
+PATH = r"C:\reports\report.xlsx"
+
+
+@pytest.fixture
+def cached(backend):
+    return ExcelHandler(backend, cache_bytes=1_000_000)
+
+
+def test_lru_eviction_and_containment():
+    cache = RangeCache(max_bytes=60)
+    cache.put(PATH, "Data", "values", (1, 1, 2, 2), [[1, 2], [3, 4]])
+    assert cache.get(PATH, "data", "values", (2, 1, 2, 2)) == [[3, 4]]
+    assert cache.get(PATH, "Data", "values", (1, 1, 3, 2)) is None
+    cache.put(PATH, "Data", "values", (5, 1, 5, 1), [["x" * 30]])
+    cache.put(PATH, "Data", "values", (6, 1, 6, 1), [["y" * 30]])
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["evictions"]) == (1, 1, 2)
+    assert stats["entries"] == 1 and stats["bytes"] <= 60
+    # A snapshot larger than the whole cache is not stored
+    cache.put(PATH, "Data", "values", (7, 1, 7, 1), [["z" * 100]])
+    assert cache.stats()["entries"] == 1
+
+
+def test_invalidation_scopes():
+    cache = RangeCache(max_bytes=10_000)
+    cache.put(PATH, "Data", "values", (1, 1, 10, 3), [[0]], formulas=False)
+    cache.put(PATH, "Data", "values", (20, 1, 30, 3), [[0]], formulas=False)
+    cache.put(PATH, "Summary", "values", (1, 1, 2, 2), [[0]], formulas=True)
+    cache.put(r"C:\other.xlsx", "Data", "values", (1, 1, 1, 1), [[0]])
+
+    cache.invalidate(PATH, "Data", (5, 2, 5, 2))
+    assert cache.stats()["entries"] == 3
+    cache.invalidate(PATH, "Data", (25, 1, 25, 1), recalc=True)
+    assert cache.stats()["entries"] == 1  # the other workbook only
+    cache.invalidate()
+    assert cache.stats()["entries"] == 0
+
+
+def test_repeated_reads_are_served_from_the_cache(cached, book, backend):
+    first = cached.read_data(cell_range="A1:C1001")
+    backend.counter.reset()
+    again = cached.read_data(cell_range="A1:C1001")
+    header = cached.read_data(cell_range="A1:C1")
+    assert again["data"] == first["data"] and again["cached"] is True
+    assert header["data"] == [["ID", "Name", "Amount"]]
+    assert backend.counter.by_member["Range.Value"] == 0
+    assert "cached" not in first
+
+
+def test_summary_and_formulas_are_cached(cached, book, backend):
+    book.sheet("Summary").write("C2", [["=Value*2"]])
+    summary = cached.read_data(sheet="Summary")
+    formulas = cached.get_formulas("A1:C2", sheet="Summary")
+    backend.counter.reset()
+    assert cached.read_data(sheet="Summary") == {**summary, "cached": True}
+    assert cached.get_formulas("A1:C2", sheet="Summary")["formulas"] == formulas["formulas"]
+    assert backend.counter.by_member["Range.Find"] == 0
+    assert backend.counter.by_member["Range.Formula"] == 0
+    stats = cached.get_active_workbook()["cache"]
+    assert stats["hits"] == 2 and stats["entries"] == 2
+
+
+def test_writes_invalidate_what_they_touch(cached, book):
+    cached.read_data(cell_range="A1:C10")
+    cached.read_data(cell_range="A500:C510")
+    cached.write_data("B5", [["renamed"]])
+    assert cached.read_data(cell_range="A1:C10")["data"][3][1] == "renamed"
+    assert cached.read_data(cell_range="A500:C510")["cached"] is True
+
+    cached.format_range("A500", bold=True)
+    assert "cached" not in cached.read_data(cell_range="A500:C510")
+
+    cached.find_replace("name501", sheet="Data", replace="x", match="whole")
+    assert cached.read_data(cell_range="A500:C510")["data"][1][1] == "x"
+
+    cached.manage_sheets("insert_rows", sheet="Data", position=1)
+    # Row 1 is now blank; the header moved to row 2
+    assert cached.read_data(cell_range="A1:C2")["data"] == [["ID", "Name", "Amount"]]
+
+
+def test_value_writes_drop_formula_results_elsewhere(cached, book):
+    summary = book.sheet("Summary")
+    summary.write("C1", [["=Data!C2*2"]])
+    cached.read_data(sheet="Summary", cell_range="A1:C2")
+    cached.read_data(cell_range="A1:C3")  # constants only
+    cached.write_data("C2", [[99]])
+    assert "cached" not in cached.read_data(sheet="Summary", cell_range="A1:C2")
+    assert "cached" not in cached.read_data(cell_range="A1:C3")
+    cached.read_data(cell_range="E1:F2")
+    cached.write_data("A1", [["id"]], sheet="Summary")
+    assert cached.read_data(cell_range="E1:F2")["cached"] is True
+
+
+def test_recalculate_drops_cached_results(cached, book):
+    cached.read_data(sheet="Summary", cell_range="A1:B2")
+    cached.manage_workbooks("recalculate", workbook="report.xlsx")
+    assert "cached" not in cached.read_data(sheet="Summary", cell_range="A1:B2")
+    cached.manage_workbooks("recalculate")
+    assert "cached" not in cached.read_data(sheet="Summary", cell_range="A1:B2")
+
+
+def test_disabled_cache_costs_nothing(handler, book, backend):
+    handler.read_data(cell_range="A1:C3")
+    backend.counter.reset()
+    handler.read_data(cell_range="A1:C3")
+    assert backend.counter.by_member["Range.HasFormula"] == 0
+    assert "cache" not in handler.get_active_workbook()
+
+
+class _Named:
+    def __init__(self, **attrs):
+        self.__dict__.update(attrs)
+
+
+def test_event_sink_invalidates_edits_made_in_excel():
+    cache = RangeCache(max_bytes=10_000)
+    cache.put(PATH, "Data", "values", (1, 1, 5, 5), [[0]], formulas=False)
+    cache.put(PATH, "Data", "values", (8, 1, 9, 1), [[0]], formulas=True)
+    cache.put(PATH, "Data", "values", (20, 1, 20, 1), [[0]], formulas=False)
+    sink = ExcelEvents()
+    sink.cache = cache
+    sheet = _Named(Name="Data", Parent=_Named(FullName=PATH))
+
+    sink.OnSheetChange(sheet, _Named(Address="$B$2,$Z$100"))
+    assert cache.stats()["entries"] == 1
+    cache.put(PATH, "Data", "values", (1, 1, 5, 5), [[0]], formulas=True)
+    sink.OnSheetCalculate(sheet)
+    assert cache.stats()["entries"] == 1
+    # A malformed event clears everything rather than risk stale data
+    sink.OnSheetChange(sheet, _Named(Address="#REF!"))
+    assert cache.stats()["entries"] == 0
@@ -0,0 +1,110 @@
+"""write_data(mode="diff"): one bulk read, then only the changed rectangles."""
+
+from __future__ import annotations
+
+import pytest
+
+from mcp_server_xlwings.excel import ExcelError
+
+# Rows 2-4 of the fixture's Data sheet
+ROWS = [[1, "name1", 1.5], [2, "name2", 3.0], [3, "name3", 4.5]]
+
+
+def _copy(rows):
+    return [list(row) for row in rows]
+
+
+def test_unchanged_block_writes_nothing(handler, book, backend):
+    result = handler.write_data("A2", _copy(ROWS), mode="diff")
+    assert result["changed_cells"] == 0
+    assert result["blocks_written"] == 0
+    assert result["written_range"] == "$A$2:$C$4"
+    # The comparison read is the only Value access
+    assert backend.counter.by_member["Range.Value"] == 1
+
+
+def test_changed_cells_merge_into_rectangles(handler, book, backend):
+    rows = _copy(ROWS)
+    rows[0][1], rows[1][1], rows[1][2] = "x", "y", 9
+    result = handler.write_data("A2", rows, mode="diff")
+    assert result["changed_cells"] == 3
+    # B2 + B3:C3 -> two blocks
+    assert result["blocks_written"] == 2
+    assert backend.counter.by_member["Range.Value"] == 1 + 2
+    ws = book.sheet("Data")
+    assert ws.range("A2:C3").value == [[1, "x", 1.5], [2, "y", 9]]
+    assert ws.range("A4:C4").value == [3, "name3", 4.5]
+
+
+@pytest.mark.parametrize("old, new, changed", [
+    (1, 1.0, 0),
+    (1, True, 1),
+    (None, "", 0),
+    ("1", 1, 1),
+    (2, "=1+1", 1),
+])
+def test_cell_comparison(handler, book, old, new, changed):
+    book.sheet("Summary").write("D1", [[old]])
+    result = handler.write_data("D1", [[new]], sheet="Summary", mode="diff")
+    assert result["changed_cells"] == changed
+
+
+def test_formula_cells_compare_by_formula(handler, book):
+    ws = book.sheet("Summary")
+    ws.write("D1", [["=B2*2"]])
+    assert handler.write_data("D1", [["=B2*2"]], sheet="Summary", mode="diff")[
+        "changed_cells"
+    ] == 0
+    # A constant over a formula replaces it, even if the values match
+    assert handler.write_data("D1", [[None]], sheet="Summary", mode="diff")[
+        "changed_cells"
+    ] == 1
+    result = handler.write_data("E1", formula="=B2", sheet="Summary", mode="diff")
+    assert result["changed_cells"] == 1
+    result = handler.write_data("E1", formula="=B2", sheet="Summary", mode="diff")
+    assert result["changed_cells"] == 0
+
+
+def test_scattered_changes_write_only_changed_cells(handler, book, backend):
+    rows = [[i, f"name{i}", i * 1.5] for i in range(1, 301)]
+    for i in range(0, 300, 2):
+        rows[i][1] = "changed"
+    rows[1][2] = 0
+    backend.counter.reset()
+    result = handler.write_data("A2", rows, mode="diff")
+    assert result["changed_cells"] == 151
+    assert result["blocks_written"] == 151
+    # Cells taking the same value share multi-area writes
+    writes = backend.counter.by_member["Range.Value"] - 1
+    assert writes <= 6
+    ws = book.sheet("Data")
+    assert ws.range("B300:B301").value == ["changed", "name300"]
+    assert ws.range("C3").value == 0
+    # Nothing between the changed cells was written back
+    assert ws.range("A2:A301").value == list(range(1, 301))
+
+
+def test_true_and_one_are_not_written_together(handler, book, backend):
+    book.sheet("Summary").write("D1", [[0, "x", 0, "x", 0]])
+    backend.counter.reset()
+    result = handler.write_data("D1", [[True, "x", 1, "x", True]], sheet="Summary", mode="diff")
+    assert result["blocks_written"] == 3
+    # One multi-area write for the two True cells, one for the 1
+    assert backend.counter.by_member["Range.Value"] == 1 + 2
+    assert book.sheet("Summary").range("D1:H1").value == [True, "x", 1, "x", True]
+
+
+def test_bulk_recalc_only_when_something_changed(handler, book, backend):
+    result = handler.write_data("A2", _copy(ROWS), mode="diff", bulk=True)
+    assert "recalc" not in result
+    rows = _copy(ROWS)
+    rows[2][0] = 99
+    result = handler.write_data("A2", rows, mode="diff", bulk=True)
+    assert result["recalc"]["scope"] == "sheet"
+
+
+def test_rejects_bad_input(handler, book):
+    with pytest.raises(ExcelError, match="Unknown mode"):
+        handler.write_data("A1", [[1]], mode="merge")
+    with pytest.raises(ExcelError, match="same length"):
+        handler.write_data("A1", [[1, 2], [3]], mode="diff")
@@ -0,0 +1,96 @@
+"""Compact read_data encodings: columnar/dictionary/null runs and sparse."""
+
+from __future__ import annotations
+
+import pytest
+
+from mcp_server_xlwings.encoding import encode, json_size
+from mcp_server_xlwings.excel import ExcelError
+
+
+def _decode(payload, rows, columns):
+    """Reference decoder mirroring the documented formats."""
+    if isinstance(payload, list):
+        return payload
+    if "cells" in payload:
+        data = [[None] * columns for _ in range(rows)]
+        for i, j, v in payload["cells"]:
+            data[i][j] = v
+        return data
+    cols = []
+    for col in payload["columns"]:
+        if isinstance(col, list):
+            cols.append(col)
+            continue
+        values = col["values"]
+        if "dict" in col:
+            values = [col["dict"][k] for k in values]
+        if "nulls" in col:
+            values = list(values)
+            for start, length in col["nulls"]:
+                values[start:start] = [None] * length
+        cols.append(values)
+    return [list(r) for r in zip(*cols)]
+
+
+CATEGORICAL = [
+    [i, ["north", "south", "east"][i % 3], None if 10 <= i < 40 else i * 2.5]
+    for i in range(100)
+]
+
+
+@pytest.mark.parametrize("encoding", ["rows", "columnar", "sparse", "auto"])
+def test_round_trip(encoding):
+    payload, info = encode(CATEGORICAL, encoding)
+    assert _decode(payload, 100, 3) == CATEGORICAL
+    assert info["bytes"] == json_size(payload)
+    assert info["plain_bytes"] == json_size(CATEGORICAL)
+
+
+def test_columnar_picks_dictionary_and_null_runs():
+    payload, info = encode(CATEGORICAL, "columnar")
+    ids, region, amount = payload["columns"]
+    assert ids == list(range(100))
+    assert region["dict"] == ["north", "south", "east"]
+    assert amount["nulls"] == [[10, 30]]
+    assert info["bytes"] < info["plain_bytes"]
+
+
+def test_high_cardinality_strings_stay_plain():
+    data = [[f"id-{i}"] for i in range(50)]
+    payload, _ = encode(data, "columnar")
+    assert payload["columns"][0] == [f"id-{i}" for i in range(50)]
+
+
+def test_auto_prefers_sparse_for_mostly_empty():
+    data = [[None] * 20 for _ in range(50)]
+    data[3][7] = "x"
+    data[42][0] = 1
+    payload, info = encode(data, "auto")
+    assert info["type"] == "sparse"
+    assert payload == {"cells": [[3, 7, "x"], [42, 0, 1]]}
+
+
+def test_read_data_reports_sizes(handler, book):
+    ws = book.sheet("Data")
+    ws.write("B2", [[["red", "green"][i % 2]] for i in range(1000)])
+    result = handler.read_data(sheet="Data", cell_range="A1:C1001", encoding="auto")
+    assert result["headers"] == ["ID", "Name", "Amount"]
+    assert result["encoding"]["type"] == "columnar"
+    assert result["encoding"]["bytes"] < result["encoding"]["plain_bytes"]
+    data = _decode(result["data"], result["rows"] - 1, 3)
+    assert data[:2] == [[1, "red", 1.5], [2, "green", 3]]
+
+
+def test_pages_keep_encoding(handler, book):
+    page = handler.read_data(
+        sheet="Data", cell_range="A1:C1001", max_rows=300, encoding="columnar",
+    )
+    page = handler.read_data(cursor=page["next_cursor"])
+    assert page["encoding"]["type"] == "columnar"
+    assert _decode(page["data"], page["rows"], 3)[0] == [301, "name301", 451.5]
+
+
+def test_unknown_encoding(handler, book):
+    with pytest.raises(ExcelError, match="Unknown encoding"):
+        handler.read_data(sheet="Data", cell_range="A1:B2", encoding="gzip")
@@ -0,0 +1,95 @@
+"""export_range: row bands streamed to CSV, JSON Lines or Parquet files."""
+
+from __future__ import annotations
+
+import csv
+import datetime
+import json
+
+import pytest
+
+from mcp_server_xlwings import export
+from mcp_server_xlwings.excel import ExcelError
+
+
+def test_sheet_to_csv_in_bands(handler, book, backend, tmp_path):
+    target = tmp_path / "data.csv"
+    handler.EXPORT_CHUNK_CELLS = 300
+    backend.counter.reset()
+    result = handler.export_range(str(target), sheet="Data")
+    assert result["rows"] == 1000 and result["columns"] == 3
+    assert result["range"] == "$A$1:$C$1001"
+    assert result["bytes"] == target.stat().st_size
+    assert result["schema"] == [
+        {"name": "ID", "type": "number"},
+        {"name": "Name", "type": "string"},
+        {"name": "Amount", "type": "number"},
+    ]
+    assert result["transfer"]["chunks"] > 1
+    assert backend.counter.by_member["Range.Value"] == result["transfer"]["chunks"]
+    with open(target, newline="", encoding="utf-8") as f:
+        rows = list(csv.reader(f))
+    assert rows[:3] == [["ID", "Name", "Amount"], ["1", "name1", "1.5"], ["2", "name2", "3"]]
+    assert len(rows) == 1001
+    assert "data" not in result
+
+
+def test_range_to_jsonl(handler, book, tmp_path):
+    ws = book.sheet("Summary")
+    ws.write("A3", [[None, datetime.datetime(2024, 1, 15)], ["Flag", True]])
+    target = tmp_path / "summary.ndjson"
+    result = handler.export_range(str(target), sheet="Summary", cell_range="A:C")
+    # Columns and rows past the data are dropped
+    assert result["range"] == "$A$1:$B$4" and result["rows"] == 3
+    assert [c["type"] for c in result["schema"]] == ["string", "mixed"]
+    lines = [json.loads(line) for line in target.read_text(encoding="utf-8").splitlines()]
+    assert lines == [
+        {"Metric": "Total", "Value": 42},
+        {"Metric": None, "Value": "2024-01-15T00:00:00"},
+        {"Metric": "Flag", "Value": True},
+    ]
+
+    result = handler.export_range(
+        str(target), sheet="Summary", cell_range="A2:B2", headers=False, overwrite=True,
+    )
+    assert result["rows"] == 1
+    assert json.loads(target.read_text(encoding="utf-8")) == {"A": "Total", "B": 42}
+
+
+def test_column_names():
+    assert export.column_names(["id", None, "ID", " x ", 2.0], 3, 6) == [
+        "id", "D", "ID_2", "x", "2", "H",
+    ]
+
+
+def test_refusals(handler, book, tmp_path, monkeypatch):
+    existing = tmp_path / "out.csv"
+    existing.write_text("keep")
+    with pytest.raises(ExcelError, match="already exists"):
+        handler.export_range(str(existing), sheet="Data")
+    assert existing.read_text() == "keep"
+    with pytest.raises(ExcelError, match="Cannot tell the format"):
+        handler.export_range(str(tmp_path / "out.txt"))
+    with pytest.raises(ExcelError, match="Unknown format"):
+        handler.export_range(str(tmp_path / "out.txt"), format="xml")
+    with pytest.raises(ExcelError, match="Folder not found"):
+        handler.export_range(str(tmp_path / "missing" / "out.csv"))
+    monkeypatch.setattr(export, "pa", None)
+    with pytest.raises(ExcelError, match="pyarrow"):
+        handler.export_range(str(tmp_path / "out.parquet"))
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["out.csv"]
+
+
+def test_parquet_keeps_types(handler, book, tmp_path):
+    pq = pytest.importorskip("pyarrow.parquet")
+    target = tmp_path / "data.parquet"
+    handler.EXPORT_CHUNK_CELLS = 300
+    result = handler.export_range(str(target), sheet="Data")
+    table = pq.read_table(target)
+    assert table.num_rows == result["rows"] == 1000
+    assert table.column("Amount").to_pylist()[:2] == [1.5, 3.0]
+    assert [c["type"] for c in result["schema"]] == ["number", "string", "number"]
+
+    book.sheet("Data").write("C900", [["n/a"]])
+    with pytest.raises(ExcelError, match="row 900"):
+        handler.export_range(str(target), sheet="Data", overwrite=True)
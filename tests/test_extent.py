@@ -0,0 +1,56 @@
+"""Data extent: last non-empty row/column instead of the formatted UsedRange."""
+
+from __future__ import annotations
+
+import pytest
+
+
+@pytest.fixture
+def stray_format(book):
+    """Someone once formatted the sheet's last row."""
+    book.sheet("Data").range("A1048576:C1048576").number_format = "0.00"
+    return book
+
+
+def test_summary_reports_both_ranges(handler, stray_format, backend):
+    result = handler.read_data()
+    assert result["used_range"] == "$A:$C"
+    assert result["data_range"] == "$A$1:$C$1001"
+    assert (result["total_rows"], result["total_columns"]) == (1001, 3)
+    assert result["headers"] == ["ID", "Name", "Amount"]
+    assert backend.counter.by_member["Range.Find"] == 2
+
+
+def test_extent_counts_formulas_and_far_columns(handler, book):
+    book.sheet("Summary").write("F9", [["=B2"]])
+    result = handler.read_data(sheet="Summary")
+    assert result["data_range"] == "$A$1:$F$9"
+
+
+def test_empty_sheet_has_no_data_range(handler, book):
+    handler.manage_sheets("add", new_name="Blank")
+    result = handler.read_data(sheet="Blank")
+    assert result["data_range"] is None
+    assert result["total_rows"] == 0
+    assert "headers" not in result
+    assert handler.find_replace("x", sheet="Blank") == {"matches": [], "count": 0}
+
+
+def test_listing_uses_data_extent(handler, stray_format):
+    sheet = handler.get_active_workbook()["sheets"][0]
+    assert sheet["used_range"] == "$A:$C"
+    assert sheet["data_range"] == "$A$1:$C$1001"
+    assert sheet["rows"] == 1001
+
+
+def test_whole_column_pages_stop_at_data(handler, stray_format):
+    page = handler.read_data(cell_range="A:C", max_rows=600)
+    assert page["total_rows"] == 1000
+    last = handler.read_data(cursor=page["next_cursor"])
+    assert last["rows"] == 400
+    assert last["next_cursor"] is None
+
+
+def test_find_searches_only_the_data(handler, stray_format):
+    result = handler.find_replace("name100", sheet="Data")
+    assert [m["cell"] for m in result["matches"]][:2] == ["$B$101", "$B$1001"]
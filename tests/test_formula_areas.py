@@ -0,0 +1,90 @@
+"""get_formulas reads only the formula areas of large, mostly-constant ranges."""
+
+from __future__ import annotations
+
+import pytest
+
+from mcp_server_xlwings.excel import ExcelHandler
+from mcp_server_xlwings.memory import _RangeApi
+
+
+@pytest.fixture
+def sparse(book):
+    """Data!A1:C1001 constants, formulas in D2:D1001 and F5."""
+    ws = book.sheet("Data")
+    ws.write("D2", [[f"=C{r}*2"] for r in range(2, 1002)])
+    ws.write("F5", [["=SUM(D2:D1001)"]])
+    return ws
+
+
+def test_only_formula_areas_are_read(handler, sparse, backend):
+    backend.counter.reset()
+    result = handler.get_formulas("A:Z", values_too=True)
+    assert result["total_formula_cells"] == 1001
+    assert result["areas_read"] == 2
+    # Row by row, as for a plain read
+    assert result["formulas"][:4] == [
+        {"cell": "D2", "formula": "=C2*2", "value": None},
+        {"cell": "D3", "formula": "=C3*2", "value": None},
+        {"cell": "D4", "formula": "=C4*2", "value": None},
+        {"cell": "D5", "formula": "=C5*2", "value": None},
+    ]
+    assert result["formulas"][4]["cell"] == "F5"
+    assert backend.counter.by_member["Range.SpecialCells"] == 1
+    assert backend.counter.by_member["Range.Formula"] == 2
+    assert backend.counter.by_member["Range.Value"] == 2
+    assert backend.counter.calls <= 14
+
+
+def test_no_formulas_reads_nothing(handler, book, backend):
+    backend.counter.reset()
+    result = handler.get_formulas("A1:Z20000")
+    assert result["formulas"] == [] and result["areas_read"] == 0
+    assert backend.counter.by_member["Range.SpecialCells"] == 0
+    assert backend.counter.by_member["Range.Formula"] == 0
+
+
+def test_all_formulas_read_in_one_call(backend, sparse):
+    handler = ExcelHandler(backend)
+    handler.FORMULA_PROBE_CELLS = 0
+    backend.counter.reset()
+    result = handler.get_formulas("D2:D1001", mode="grouped")
+    assert result["groups"] == 1
+    assert "areas_read" not in result
+    assert backend.counter.by_member["Range.SpecialCells"] == 0
+    assert backend.counter.by_member["Range.Formula"] == 1
+
+
+def test_long_area_lists_and_scattered_formulas(backend, book):
+    ws = book.sheet("Data")
+    for r in range(2, 122, 2):
+        ws.write(f"E{r}", [[f"=A{r}"]])
+    handler = ExcelHandler(backend)
+    handler.FORMULA_PROBE_CELLS = 0
+    expected = ExcelHandler(backend).get_formulas("A1:E1001")["formulas"]
+
+    # 60 areas: the address is cut short, so the areas are listed one by one
+    backend.counter.reset()
+    result = handler.get_formulas("A1:E1001")
+    assert result["formulas"] == expected
+    assert result["areas_read"] == 60
+    assert backend.counter.by_member["Areas.Item"] == 60
+
+    # Past the area limit one read of the whole range is cheaper
+    handler.FORMULA_AREA_LIMIT = 10
+    backend.counter.reset()
+    result = handler.get_formulas("A1:E1001")
+    assert result["formulas"] == expected
+    assert "areas_read" not in result
+    assert backend.counter.by_member["Areas.Item"] == 0
+    assert backend.counter.by_member["Range.Formula"] == 1
+
+
+def test_special_cells_failure_falls_back(handler, sparse, monkeypatch):
+    def refuse(self, Type, Value=None):
+        raise RuntimeError("SpecialCells method of Range class failed")
+
+    monkeypatch.setattr(_RangeApi, "SpecialCells", refuse)
+    result = handler.get_formulas("A1:Z20000")
+    assert result["total_formula_cells"] == 1001
+    assert "areas_read" not in result
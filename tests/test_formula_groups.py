@@ -0,0 +1,66 @@
+"""get_formulas grouped mode: cells sharing an R1C1 formula as one entry."""
+
+from __future__ import annotations
+
+import pytest
+
+from mcp_server_xlwings.excel import ExcelError, ExcelHandler
+
+
+@pytest.fixture
+def model(book):
+    """Data!D2:E1001 computed from columns A and C, plus a total row."""
+    ws = book.sheet("Data")
+    ws.write("D1", [["Net", "Gross"]] + [
+        [f"=C{r}*0.9", f"=D{r}+A{r}"] for r in range(2, 1002)
+    ])
+    ws.write("D1002", [["=SUM(D2:D1001)", "=SUM(E2:E1001)"]])
+    ws.write("E500", [["=D500"]])  # one cell breaks the fill
+    return ws
+
+
+def test_filled_columns_collapse_to_few_entries(handler, model, backend):
+    cells = handler.get_formulas("A1:E1002")
+    backend.counter.reset()
+    result = handler.get_formulas("A1:E1002", mode="grouped")
+    assert result["total_formula_cells"] == cells["total_formula_cells"] == 2002
+    assert result["groups"] == 5
+    assert result["formulas"][:2] == [
+        {"range": "D2:D1001", "formula": "=C2*0.9", "r1c1": "=RC[-1]*0.9", "cells": 1000},
+        {"range": "E2:E499", "formula": "=D2+A2", "r1c1": "=RC[-1]+RC[-4]", "cells": 498},
+    ]
+    # The two totals are the same R1C1 formula, so they share an entry
+    assert [g["range"] for g in result["formulas"][2:]] == [
+        "E500", "E501:E1001", "D1002:E1002",
+    ]
+    assert backend.counter.by_member["Range.Formula"] == 1
+    assert backend.counter.by_member["Range.FormulaR1C1"] == 1
+
+
+def test_block_filled_down_and_across_is_one_entry(handler, book):
+    book.sheet("Summary").write("D1", [
+        [f"=$B$2*{c}{r}" for c in "AB"] for r in (1, 2)
+    ])
+    (group,) = handler.get_formulas("D1:E2", sheet="Summary", mode="grouped")["formulas"]
+    assert group == {
+        "range": "D1:E2", "formula": "=$B$2*A1", "r1c1": "=R2C2*RC[-3]", "cells": 4,
+    }
+
+
+def test_grouped_values_follow_the_block(handler, book):
+    book.sheet("Data").write("D2", [[f"=A{r}*2"] for r in range(2, 5)])
+    (group,) = handler.get_formulas("D2:D4", values_too=True, mode="grouped")["formulas"]
+    assert group["values"] == [[None], [None], [None]]  # nothing calculates in memory
+
+
+def test_grouping_spans_transfer_bands(backend, model):
+    chunked = ExcelHandler(backend, chunk_cells=500)
+    result = chunked.get_formulas("D1:E1002", mode="grouped")
+    assert result["transfer"]["chunks"] > 1
+    assert result["groups"] == 5
+    assert result["formulas"][0]["range"] == "D2:D1001"
+
+
+def test_unknown_mode(handler, book):
+    with pytest.raises(ExcelError, match="Unknown mode"):
+        handler.get_formulas("A1:B2", mode="rows")
@@ -0,0 +1,107 @@
+"""Local A1/R1C1 range algebra."""
+
+from __future__ import annotations
+
+import pytest
+
+from mcp_server_xlwings import geometry
+from mcp_server_xlwings.geometry import MAX_COLS, MAX_ROWS
+
+
+@pytest.mark.parametrize("ref, rect", [
+    ("B5", (5, 2, 5, 2)),
+    ("$A$1:$C$3", (1, 1, 3, 3)),
+    ("c3:a1", (1, 1, 3, 3)),
+    ("Sheet1!B2:D4", (2, 2, 4, 4)),
+    ("'My Sheet'!XFD1048576", (MAX_ROWS, MAX_COLS, MAX_ROWS, MAX_COLS)),
+    ("A:C", (1, 1, MAX_ROWS, 3)),
+    ("$2:$4", (2, 1, 4, MAX_COLS)),
+])
+def test_parse_a1(ref, rect):
+    assert geometry.parse_a1(ref) == rect
+
+
+@pytest.mark.parametrize("ref", ["", "A", "5", "A1:B", "A0", "XFE1", "A1:B2:C3", "Total"])
+def test_parse_a1_rejects(ref):
+    with pytest.raises(ValueError):
+        geometry.parse_a1(ref)
+
+
+@pytest.mark.parametrize("rect, absolute, text", [
+    ((5, 2, 5, 2), True, "$B$5"),
+    ((1, 1, 1000, 3), True, "$A$1:$C$1000"),
+    ((1, 1, 1000, 3), False, "A1:C1000"),
+    ((1, 27, MAX_ROWS, 28), True, "$AA:$AB"),
+    ((3, 1, 3, MAX_COLS), True, "$3:$3"),
+])
+def test_format_a1(rect, absolute, text):
+    assert geometry.format_a1(rect, absolute) == text
+    assert geometry.parse_a1(text) == rect
+
+
+def test_r1c1_round_trip():
+    assert geometry.parse_r1c1("R2C3") == (2, 3, 2, 3)
+    assert geometry.parse_r1c1("R1C1:R10C4") == (1, 1, 10, 4)
+    assert geometry.parse_r1c1("R[1]C[-1]", base=(5, 5)) == (6, 4, 6, 4)
+    assert geometry.parse_r1c1("RC", base=(5, 5)) == (5, 5, 5, 5)
+    assert geometry.parse_r1c1("C2:C4") == (1, 2, MAX_ROWS, 4)
+    assert geometry.parse_r1c1("R5") == (5, 1, 5, MAX_COLS)
+    assert geometry.format_r1c1((1, 1, 10, 4)) == "R1C1:R10C4"
+    assert geometry.format_r1c1((6, 4, 6, 4), base=(5, 5)) == "R[1]C[-1]"
+    assert geometry.format_r1c1((5, 5, 5, 5), base=(5, 5)) == "RC"
+    with pytest.raises(ValueError):
+        geometry.parse_r1c1("R[-1]C1", base=(1, 1))
+
+
+def test_references_inside_formulas():
+    text = '=SUM(A1:B2)*$C$1+D$3&"A1"+LOG10(E5)'
+    assert geometry.formula_r1c1(text, 2, 2) == (
+        '=SUM(R[-1]C[-1]:RC)*R1C3+R3C[2]&"A1"+LOG10(R[3]C[3])'
+    )
+    assert geometry.shift_formula(text, 2, 1) == (
+        '=SUM(B3:C4)*$C$1+E$3&"A1"+LOG10(F7)'
+    )
+    # Copies pushed off the sheet keep the reference as it was
+    assert geometry.shift_formula("=A1+$B2", -1, 0) == "=A1+$B1"
+    assert geometry.formula_r1c1("42", 1, 1) == "42"
+
+
+def test_multi_area():
+    rects = geometry.parse("A1:B2,D4")
+    assert rects == [(1, 1, 2, 2), (4, 4, 4, 4)]
+    assert geometry.format_areas(rects) == "$A$1:$B$2,$D$4"
+    # Same text, different notation: column 2 vs cell C2
+    assert geometry.parse("C2", r1c1=True) == [(1, 2, MAX_ROWS, 2)]
+    assert geometry.parse("C2") == [(2, 3, 2, 3)]
+
+
+def test_algebra():
+    rect = (2, 2, 5, 4)
+    assert geometry.shape(rect) == (4, 3)
+    assert geometry.area(rect) == 12
+    assert geometry.offset(rect, 1, -1) == (3, 1, 6, 3)
+    assert geometry.resize(rect, 1, 1) == (2, 2, 2, 2)
+    assert geometry.intersect(rect, (4, 1, 9, 2)) == (4, 2, 5, 2)
+    assert geometry.intersect(rect, (6, 1, 9, 9)) is None
+    assert geometry.bounding([(1, 1, 1, 1), (3, 5, 4, 5)]) == (1, 1, 4, 5)
+    assert geometry.split_rows((1, 1, 10, 2), 4) == [
+        (1, 1, 4, 2), (5, 1, 8, 2), (9, 1, 10, 2),
+    ]
+    assert geometry.split((1, 1, 4, 4), rows=False) == [(1, 1, 4, 2), (1, 3, 4, 4)]
+    with pytest.raises(ValueError):
+        geometry.offset(rect, -2)
+
+
+def test_compact_is_exact():
+    cells = {(r, c) for r in range(1, 4) for c in range(1, 4)}
+    cells |= {(5, 1), (5, 2), (5, 7), (6, 7)}
+    rects = geometry.compact(cells)
+    assert rects == [(1, 1, 3, 3), (5, 1, 5, 2), (5, 7, 6, 7)]
+    covered = {
+        (r, c) for r0, c0, r1, c1 in rects
+        for r in range(r0, r1 + 1) for c in range(c0, c1 + 1)
+    }
+    assert covered == cells
+    assert geometry.union([(1, 1, 2, 2), (2, 2, 3, 3)]) == [
+        (1, 1, 1, 2), (2, 1, 2, 3), (3, 2, 3, 3),
+    ]
@@ -0,0 +1,118 @@
+"""Handle registry: reuse of resolved App/Book/Sheet objects and reconnects."""
+
+from __future__ import annotations
+
+import pytest
+
+from mcp_server_xlwings.excel import ExcelError
+
+
+def _small_read(handler):
+    return handler.read_data(
+        workbook="report.xlsx", sheet="Summary", cell_range="A1:B2",
+    )
+
+
+def test_app_attached_once(handler, book, backend):
+    for _ in range(3):
+        handler.read_data(cell_range="A1:C2")
+    assert backend.counter.by_member["Application.GetActiveObject"] == 1
+    assert backend.counter.by_member["Application.Ready"] == 2
+
+
+def test_named_lookup_is_cached(handler, book, backend):
+    for i in range(3):
+        backend.app.add_book(rf"C:\other\book{i}.xlsx")
+    backend.app._active_book = book
+
+    _small_read(handler)
+    first = backend.counter.calls
+    backend.counter.reset()
+    _small_read(handler)
+    assert backend.counter.calls < first
+    assert backend.counter.by_member["Workbooks.Item"] == 0
+    assert backend.counter.by_member["Worksheets.Item"] == 0
+
+
+def test_all_sheets_resolve_workbook_once(handler, book, backend):
+    for i in range(5):
+        backend.app.add_book(rf"C:\other\book{i}.xlsx")
+    handler.read_data(workbook="report.xlsx", sheet="*")
+    # One walk over the open books; per-sheet lookups hit the cache.
+    assert backend.counter.by_member["Workbooks.Count"] == 1
+
+
+def test_reconnects_after_excel_restart(handler, book, backend):
+    _small_read(handler)
+    app = backend.restart()
+    wb = app.add_book(r"C:\reports\report.xlsx", ["Summary"])
+    wb.sheet("Summary").write("A1", [["Metric", "Value"], ["Total", 7]])
+
+    result = _small_read(handler)
+    assert result["data"] == [["Total", 7]]
+
+
+def test_closed_book_is_not_reused(handler, book, backend):
+    _small_read(handler)
+    book.close()
+    with pytest.raises(ExcelError, match="not open"):
+        _small_read(handler)
+
+
+def test_renamed_book_is_not_reused(handler, book, backend):
+    _small_read(handler)
+    book._fullname = r"C:\reports\renamed.xlsx"
+    with pytest.raises(ExcelError, match="not open"):
+        _small_read(handler)
+    assert handler.read_data(
+        workbook="renamed.xlsx", sheet="Summary", cell_range="A1:B2",
+    )["data"] == [["Total", 42]]
+
+
+def test_renamed_sheet_is_not_reused(handler, book):
+    _small_read(handler)
+    book._rename_sheet(book.sheet("Summary"), "Old")
+    book._rename_sheet(book.sheet("Data"), "Summary")
+    result = _small_read(handler)
+    assert result["headers"] == ["ID", "Name"]
+
+
+def test_deleted_sheet_reports_available(handler, book):
+    _small_read(handler)
+    handler.manage_sheets("delete", sheet="Summary")
+    with pytest.raises(ExcelError, match="Available sheets"):
+        _small_read(handler)
+
+
+def test_running_book_never_starts_excel(handler, book, backend):
+    assert handler.handles.running_book(r"c:\REPORTS\report.xlsx") is book
+    backend.app.quit()
+    handler.handles.clear()
+    assert handler.handles.running_book(r"C:\reports\report.xlsx") is None
+    assert not backend.app._alive
+
+
+class _Wrapper:
+    """A fresh Book wrapper per lookup, as real xlwings returns."""
+
+    def __init__(self, book):
+        self._book = book
+
+    def __getattr__(self, name):
+        return getattr(self._book, name)
+
+
+def test_sheets_are_keyed_by_workbook_path(handler, book, backend):
+    handles = handler.handles
+    for _ in range(3):
+        wrapper = _Wrapper(book)
+        handles.remember_book(book.fullname, wrapper)
+        handles.sheet(wrapper, "SUMMARY")
+    assert backend.counter.by_member["Worksheets.Item"] == 1
+    assert list(handles._sheets) == [(r"c:\reports\report.xlsx", "summary")]
+
+    # Books the registry did not resolve are looked up, not cached
+    handles.sheet(_Wrapper(book), "Data")
+    assert len(handles._sheets) == 1
+    handles.forget_book(_Wrapper(book))
+    assert handles._sheets == {}
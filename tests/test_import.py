@@ -0,0 +1,121 @@
+"""import_file: CSV and JSON Lines files written to a sheet in row bands."""
+
+from __future__ import annotations
+
+import itertools
+import json
+
+import pytest
+
+from mcp_server_xlwings import source
+from mcp_server_xlwings.excel import ExcelError
+from mcp_server_xlwings.memory import XL_CALC_AUTOMATIC
+from mcp_server_xlwings.xlsx import XlsxBook
+
+
+def write_csv(path, rows):
+    path.write_text("\n".join(",".join(row) for row in rows) + "\n", encoding="utf-8-sig")
+    return str(path)
+
+
+def test_csv_in_bands(handler, book, backend, tmp_path):
+    rows = [["Code", "Qty", "Paid", "Note"]] + [
+        [f"{i:03}", str(i), "TRUE" if i % 2 else "false", ""] for i in range(1, 2001)
+    ]
+    rows[5] = ["x", "1.5e3"]
+    path = write_csv(tmp_path / "orders.csv", rows)
+    handler.IMPORT_CHUNK_CELLS = 800
+    backend.counter.reset()
+    result = handler.import_file(path, sheet="Summary", start_cell="D2")
+    assert result["written_range"] == "$D$2:$G$2002"
+    assert result["rows"] == 2000 and result["columns"] == 4 and result["header"] is True
+    stats = result["transfer"]
+    assert stats["chunks"] > 1 and stats["cells"] == 2001 * 4
+    assert backend.counter.by_member["Range.Value"] == stats["chunks"]
+    # Read, suspended and restored once for the whole import
+    assert backend.counter.by_member["Application.Calculation"] == 3
+    assert backend.app.api.Calculation == XL_CALC_AUTOMATIC
+
+    data = handler.read_data(sheet="Summary", cell_range="D2:G7")["data"]
+    assert data[:2] == [["001", 1, True, None], ["002", 2, False, None]]
+    assert data[4] == ["x", 1500, None, None]
+
+
+def test_append_below_the_last_row(handler, book, backend, tmp_path):
+    path = write_csv(tmp_path / "more.csv", [["ID", "Name", "Amount"], ["1001", "x", "2"]])
+    backend.counter.reset()
+    result = handler.import_file(path, sheet="Data", append=True)
+    assert result["written_range"] == "$A$1002:$C$1002" and result["header"] is False
+    # The append point is one End(xlUp), not a read of the column
+    assert backend.counter.by_member["Range.End"] == 1
+    assert backend.counter.by_member["Range.Value"] == 1
+    assert handler.read_data(sheet="Data", cell_range="A1001:C1002")["data"] == [
+        [1001, "x", 2],
+    ]
+
+    # An empty column starts at start_cell, header included
+    result = handler.import_file(path, sheet="Summary", start_cell="E3", append=True)
+    assert result["written_range"] == "$E$3:$G$4" and result["header"] is True
+    result = handler.import_file(path, sheet="Summary", start_cell="E3", append=True)
+    assert result["written_range"] == "$E$5:$G$5"
+
+
+def test_jsonl_keys_become_columns(handler, book, tmp_path):
+    path = tmp_path / "events.jsonl"
+    lines = [{"id": 1, "tags": ["a", "b"]}, {"id": 2, "ok": True}, {"ok": False, "id": 3.5}]
+    path.write_text("\n".join(json.dumps(line) for line in lines) + "\n\n", encoding="utf-8")
+    result = handler.import_file(str(path), sheet="Summary", start_cell="A5")
+    assert result["written_range"] == "$A$5:$C$8" and result["rows"] == 3
+    data = handler.read_data(sheet="Summary", cell_range="A5:C8", headers=False)["data"]
+    assert data == [["id", "tags", "ok"], [1, '["a", "b"]', None], [2, None, True],
+                    [3.5, None, False]]
+
+    result = handler.import_file(str(path), sheet="Summary", start_cell="A5", headers=False)
+    assert result["written_range"] == "$A$5:$C$7" and result["header"] is False
+
+
+def test_refusals(handler, book, tmp_path):
+    with pytest.raises(ExcelError, match="Cannot tell the format"):
+        handler.import_file(str(tmp_path / "data.xml"))
+    with pytest.raises(ExcelError, match="File not found"):
+        handler.import_file(str(tmp_path / "missing.csv"))
+    bad = tmp_path / "bad.jsonl"
+    bad.write_text('{"a": 1}\n[1, 2]\n', encoding="utf-8")
+    with pytest.raises(ExcelError, match="Line 2 of 'bad.jsonl' is not a JSON object"):
+        handler.import_file(str(bad))
+    path = write_csv(tmp_path / "two.csv", [["a"], ["1"]])
+    with pytest.raises(ExcelError, match="run past the last cell"):
+        handler.import_file(path, start_cell="A1048576")
+    assert source.cell("-0.5") == -0.5 and source.cell("1e999") == float("inf")
+    assert source.cell("01") == "01" and source.cell("True") is True
+
+
+def test_a_file_that_changes_ends_the_import(handler, book, backend, tmp_path, monkeypatch):
+    path = write_csv(tmp_path / "short.csv", [["n"]] + [[str(i)] for i in range(100)])
+    rows = source.Source.rows
+
+    def fewer(self):
+        yield from itertools.islice(rows(self), 50)
+
+    monkeypatch.setattr(source.Source, "rows", fewer)
+    handler.IMPORT_CHUNK_CELLS = 20
+    backend.counter.reset()
+    with pytest.raises(ExcelError, match="'short.csv' changed while it was imported"):
+        handler.import_file(path, sheet="Summary")
+    # The band that ran short is not retried in halves
+    assert backend.counter.by_member["Range.Value"] == 2
+    assert backend.app.api.Calculation == XL_CALC_AUTOMATIC
+
+
+def test_into_a_new_file(handler, backend, tmp_path):
+    target = str(tmp_path / "new.xlsx")
+    path = write_csv(tmp_path / "rows.csv", [["n"]] + [[str(i)] for i in range(5)])
+    handler.manage_workbooks("open", filepath=target, create=True)
+    result = handler.import_file(path, workbook=target)
+    assert result["offline"] is True and result["written_range"] == "$A$1:$A$6"
+    result = handler.import_file(path, workbook=target, append=True)
+    assert result["written_range"] == "$A$7:$A$11"
+    handler.manage_workbooks("close", workbook=target, save=True)
+    assert backend.counter.calls == 0
+    with XlsxBook(target) as wb:
+        assert wb.sheet().read([(1, 1, 11, 1)])[0][-1] == [4]
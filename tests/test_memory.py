@@ -0,0 +1,112 @@
+"""Tests for the in-memory Excel backend."""
+
+from __future__ import annotations
+
+import pytest
+
+from mcp_server_xlwings.memory import ComCounter, MemoryBackend
+
+
+def test_counter_records_members():
+    counter = ComCounter()
+    counter.hit("Range.Value")
+    counter.hit("Range.Value")
+    assert counter.calls == 2
+    assert counter.by_member["Range.Value"] == 2
+    counter.reset()
+    assert counter.calls == 0
+
+
+def test_counter_latency(monkeypatch):
+    slept: list[float] = []
+    monkeypatch.setattr("mcp_server_xlwings.memory.time.sleep", slept.append)
+    ComCounter(latency=0.02).hit("Range.Value")
+    assert slept == [0.02]
+
+
+def test_value_shapes(book):
+    ws = book.sheet("Data")
+    assert ws.range("A2").value == 1.0
+    assert ws.range("A1:C1").value == ["ID", "Name", "Amount"]
+    assert ws.range("A2:A4").value == [1.0, 2.0, 3.0]
+    assert ws.range("A1:B2").api.Value == (("ID", "Name"), (1.0, "name1"))
+
+
+def test_used_range_includes_formatting(backend, book):
+    ws = book.sheet("Summary")
+    assert ws.used_range.address == "$A$1:$B$2"
+    ws.style("D100", bold=True)
+    assert ws.used_range.address == "$A$1:$D$100"
+
+
+def test_tri_state_properties(book):
+    ws = book.sheet("Data")
+    ws.style("A1:C1", bold=True)
+    ws.merge("E1:F1")
+    assert ws.api.Range("A1:C1").Font.Bold is True
+    assert ws.api.Range("A1:C2").Font.Bold is None
+    assert ws.api.Range("A2:C9").Font.Bold is False
+    assert ws.api.Range("E1:F1").MergeCells is True
+    assert ws.api.Range("D1:F1").MergeCells is None
+    assert ws.api.Range("A1:C9").MergeCells is False
+    assert ws.api.Range("F1").MergeArea.Address == "$E$1:$F$1"
+
+
+def test_borders_are_shared_between_neighbours(book):
+    ws = book.sheet("Summary")
+    ws.api.Range("A1").Borders(10).LineStyle = 1
+    assert ws.api.Range("B1").Borders(7).LineStyle == 1
+    assert ws.api.Range("A1:B1").Borders(11).LineStyle == 1
+    assert ws.api.Range("A1:B1").Borders(7).LineStyle == -4142
+
+
+def test_insert_rows_shifts_cells_and_merges(book):
+    ws = book.sheet("Summary")
+    ws.merge("A2:B2")
+    ws.api.Range("1:1").EntireRow.Insert()
+    assert ws.cell_value("A2") == "Metric"
+    assert ws.api.Range("A3").MergeArea.Address == "$A$3:$B$3"
+
+
+def test_find_wraps_and_respects_case(book):
+    ws = book.sheet("Data")
+    used = ws.api.UsedRange
+    first = used.Find(What="NAME1", MatchCase=False)
+    assert first.Address == "$B$2"
+    assert used.Find(What="NAME1", MatchCase=True) is None
+    last = used.Find(What="*", SearchOrder=1, SearchDirection=2)
+    assert last.Address == "$C$1001"
+
+
+def test_closed_book_raises(backend, book):
+    book.close()
+    with pytest.raises(RuntimeError):
+        book.name
+    assert backend.app.books.active is None
+
+
+def test_memory_backend_app_is_stable():
+    backend = MemoryBackend()
+    assert backend.active_app() is backend.new_app()
+
+
+def test_formula_r1c1_is_relative_to_each_cell(book):
+    ws = book.sheet("Summary")
+    ws.write("C2", [['=A2*$B$1+Data!C2&"A1"', "=LOG10(B2)"]])
+    assert ws.range("C2:D2").api.FormulaR1C1 == (
+        ('=RC[-2]*R1C2+Data!RC&"A1"', "=LOG10(RC[-2])"),
+    )
+    assert ws.range("A2").api.FormulaR1C1 == "Total"
+
+
+def test_has_formula_and_special_cells(book):
+    ws = book.sheet("Summary")
+    ws.write("C1", [["=1"], ["=2"], [3]])
+    assert ws.range("C1:C2").api.HasFormula is True
+    assert ws.range("C1:C3").api.HasFormula is None
+    assert ws.range("A1:B2").api.HasFormula is False
+    assert ws.range("A1:C3").api.SpecialCells(-4123).Address == "$C$1:$C$2"
+    # A single cell stands for the used range
+    assert ws.range("A1").api.SpecialCells(-4123).Areas.Count == 1
+    with pytest.raises(RuntimeError, match="No cells"):
+        ws.range("A1:B2").api.SpecialCells(-4123)
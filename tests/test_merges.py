@@ -0,0 +1,69 @@
+"""Tests for merged-cell discovery in read_data."""
+
+from __future__ import annotations
+
+from mcp_server_xlwings.excel import _find_merge_areas
+
+
+def _merged_sheet(book):
+    ws = book.sheet("Data")
+    ws.write("E1", "Header block")
+    ws.merge("E1:G1")
+    ws.write("A5", "Group A")
+    ws.merge("A5:A9")
+    ws.write("B40", "Late merge")
+    ws.merge("B40:C41")
+    return ws
+
+
+def test_finder_returns_row_major_areas(book):
+    ws = _merged_sheet(book)
+    areas = _find_merge_areas(ws.api, (1, 1, 1001, 7))
+    assert [addr for addr, _, _ in areas] == ["$E$1:$G$1", "$A$5:$A$9", "$B$40:$C$41"]
+
+
+def test_finder_reports_areas_crossing_the_boundary(book):
+    ws = _merged_sheet(book)
+    areas = _find_merge_areas(ws.api, (7, 1, 20, 3))
+    assert [m for _, m, _ in areas] == [(5, 1, 9, 1)]
+
+
+def test_merge_info_fills_values(handler, book):
+    _merged_sheet(book)
+    result = handler.read_data(cell_range="A4:C10", merge_info=True, headers=False)
+    assert [row[0] for row in result["data"][1:6]] == ["Group A"] * 5
+    assert result["merged_ranges"] == [{"range": "$A$5:$A$9", "value": "Group A"}]
+
+
+def test_merge_info_resolves_value_outside_range(handler, book):
+    _merged_sheet(book)
+    result = handler.read_data(cell_range="A7:A8", merge_info=True, headers=False)
+    assert result["data"] == [["Group A"], ["Group A"]]
+
+
+def test_merge_info_cost_is_sublinear(backend, handler, book):
+    _merged_sheet(book)
+    backend.counter.reset()
+    handler.read_data(cell_range="A1:G1000", merge_info=True)
+    # 7,000 cells with three merges: a few probes per merge per bisection
+    # level, instead of ~2 calls per cell.
+    assert backend.counter.calls < 300
+    assert backend.counter.by_member["Range.MergeCells"] < 100
+
+
+def test_summary_reports_merges_beyond_row_20(handler, book):
+    _merged_sheet(book)
+    summary = handler.read_data()
+    ranges = [m["range"] for m in summary["merged_cells"]]
+    assert "$B$40:$C$41" in ranges
+    late = summary["merged_cells"][ranges.index("$B$40:$C$41")]
+    assert late == {"range": "$B$40:$C$41", "value": "Late merge", "rows": 2, "columns": 2}
+
+
+def test_summary_caps_merge_list(handler, book):
+    ws = book.sheet("Summary")
+    for r in range(1, 121):
+        ws.merge(f"D{r}:E{r}")
+    summary = handler.read_data(sheet="Summary")
+    assert len(summary["merged_cells"]) == handler.SUMMARY_MERGE_LIMIT
+    assert summary["merged_cells_total"] == 120
@@ -0,0 +1,86 @@
+"""Metadata levels for get_active_workbook / manage_workbooks(list)."""
+
+from __future__ import annotations
+
+import pytest
+
+from mcp_server_xlwings.excel import ExcelError
+
+
+@pytest.fixture
+def many_books(backend, book):
+    for i in range(3):
+        wb = backend.app.add_book(rf"C:\other\book{i}.xlsx", [f"S{j}" for j in range(10)])
+        wb.sheet("S0").write("A1", [[1, 2], [3, 4]])
+    backend.app._active_book = book
+    backend.counter.reset()
+    return book
+
+
+def test_names_level_skips_used_range(handler, many_books, backend):
+    result = handler.manage_workbooks("list", metadata="names")
+    assert [wb["name"] for wb in result] == [
+        "report.xlsx", "book0.xlsx", "book1.xlsx", "book2.xlsx",
+    ]
+    assert result[1]["sheets"][0] == {"name": "S0"}
+    assert backend.counter.by_member["Worksheet.UsedRange"] == 0
+    names = backend.counter.calls
+    backend.counter.reset()
+    handler._dimensions.clear()
+    handler.manage_workbooks("list", metadata="full")
+    assert names < backend.counter.calls
+    # One used-range address per sheet: 2 in report.xlsx + 3 books x 10
+    assert backend.counter.by_member["Worksheet.UsedRange"] == 32
+    assert backend.counter.by_member["Range.Rows.Count"] == 0
+
+
+def test_active_level(handler, many_books):
+    result = handler.manage_workbooks("list", metadata="active")
+    assert [wb["active"] for wb in result] == [True, False, False, False]
+    assert result[0]["active_sheet"] == "Data"
+    assert "used_range" not in result[0]["sheets"][0]
+
+    info = handler.get_active_workbook(metadata="active")
+    assert info["active_sheet"] == "Data"
+    assert info["sheets"] == [{"name": "Data"}, {"name": "Summary"}]
+
+
+def test_names_level_omits_selection(handler, book, backend):
+    backend.app.select(book.sheet("Data"), "A1:B2")
+    info = handler.get_active_workbook(metadata="names")
+    assert set(info) == {"name", "path", "sheets"}
+    assert "selection" in handler.get_active_workbook(metadata="active")
+
+
+def test_full_dimensions_memoized(handler, book, backend):
+    first = handler.get_active_workbook()
+    assert first["sheets"][0] == {
+        "name": "Data", "used_range": "$A$1:$C$1001", "data_range": "$A$1:$C$1001",
+        "rows": 1001, "columns": 3,
+    }
+    backend.counter.reset()
+    assert handler.get_active_workbook() == first
+    assert backend.counter.by_member["Worksheet.UsedRange"] == 0
+
+
+def test_write_invalidates_only_that_sheet(handler, book, backend):
+    handler.get_active_workbook()
+    handler.write_data("A1003", [[1, 2, 3, 4]], sheet="Data")
+    backend.counter.reset()
+    sheets = handler.get_active_workbook()["sheets"]
+    assert sheets[0]["used_range"] == "$A$1:$D$1003"
+    assert backend.counter.by_member["Worksheet.UsedRange"] == 1
+
+
+def test_structure_change_invalidates_workbook(handler, book):
+    handler.get_active_workbook()
+    handler.manage_sheets("insert_rows", sheet="Summary", position=1, count=2)
+    sheets = handler.get_active_workbook()["sheets"]
+    assert sheets[1]["used_range"] == "$A$3:$B$4"
+
+
+def test_unknown_level(handler, book):
+    with pytest.raises(ExcelError, match="metadata level"):
+        handler.get_active_workbook(metadata="everything")
+    with pytest.raises(ExcelError, match="metadata level"):
+        handler.manage_workbooks("list", metadata="")
@@ -0,0 +1,103 @@
+"""Tests for cursor-based paginated reads in read_data."""
+
+from __future__ import annotations
+
+import base64
+import json
+
+import pytest
+
+from mcp_server_xlwings.excel import ExcelError
+
+
+def _all_pages(handler, first: dict) -> list[dict]:
+    pages = [first]
+    while pages[-1]["next_cursor"]:
+        pages.append(handler.read_data(cursor=pages[-1]["next_cursor"]))
+    return pages
+
+
+def test_pages_cover_range_exactly_once(handler, book):
+    first = handler.read_data(cell_range="A1:C1001", max_rows=300)
+    pages = _all_pages(handler, first)
+    assert [p["rows"] for p in pages] == [300, 300, 300, 100]
+    rows = [row for p in pages for row in p["data"]]
+    assert [r[0] for r in rows] == list(range(1, 1001))
+    assert all(p["headers"] == ["ID", "Name", "Amount"] for p in pages)
+    assert pages[1]["range"] == "$A$302:$C$601"
+    assert pages[1]["row_offset"] == 300
+    assert pages[0]["total_rows"] == 1000
+
+
+def test_follow_up_page_is_one_bulk_read(backend, handler, book):
+    first = handler.read_data(cell_range="A1:C1001", max_rows=100)
+    backend.counter.reset()
+    handler.read_data(cursor=first["next_cursor"])
+    assert backend.counter.by_member["Range.Value"] == 1
+    assert backend.counter.calls <= 12
+
+
+def test_max_cells_budget(handler, book):
+    page = handler.read_data(cell_range="A1:C1001", max_cells=30)
+    assert page["rows"] == 10
+
+
+def test_max_bytes_budget(handler, book):
+    pages = _all_pages(
+        handler, handler.read_data(cell_range="A1:C1001", max_bytes=2000)
+    )
+    for p in pages:
+        assert len(json.dumps(p["data"], separators=(",", ":"))) <= 2000
+    assert sum(p["rows"] for p in pages) == 1000
+
+
+def test_whole_column_range_is_clipped_to_used_range(handler, book):
+    page = handler.read_data(cell_range="A:C", max_rows=5000)
+    assert page["rows"] == 1000
+    assert page["next_cursor"] is None
+
+
+def test_explicit_range_is_not_clipped(handler, book):
+    page = handler.read_data(sheet="Summary", cell_range="A1:C4", max_rows=10)
+    assert page["range"] == "$A$2:$C$4"
+    assert page["data"] == [["Total", 42, None], [None, None, None], [None, None, None]]
+
+    page = handler.read_data(sheet="Summary", cell_range="2:3", max_rows=10, headers=False)
+    assert page["range"] == "$A$2:$B$3"
+
+
+def test_header_row_and_no_headers(handler, book):
+    page = handler.read_data(cell_range="A1:C20", max_rows=5, header_row=3)
+    assert page["headers"] == [2, "name2", 3]
+    assert page["data"][0][0] == 3
+    page = handler.read_data(cell_range="A1:C20", max_rows=5, headers=False)
+    assert "headers" not in page
+    assert page["data"][0] == ["ID", "Name", "Amount"]
+
+
+def test_invalid_cursor(handler, book):
+    with pytest.raises(ExcelError, match="Invalid cursor"):
+        handler.read_data(cursor="not-a-cursor")
+
+    # Well-formed tokens with missing or mistyped fields
+    first = handler.read_data(cell_range="A1:C20", max_rows=5)
+    state = json.loads(base64.urlsafe_b64decode(first["next_cursor"] + "=="))
+    for broken in (
+        {"v": 1},
+        {**state, "wb": None},
+        {**state, "rect": [1, 1, 20]},
+        {**state, "rect": [True, 1, 20, 3]},
+        {**state, "next": "6"},
+        {**state, "next": 21},
+        {**state, "budget": {"rows": -5}},
+        {**state, "encoding": "xml"},
+    ):
+        token = base64.urlsafe_b64encode(json.dumps(broken).encode()).decode()
+        with pytest.raises(ExcelError, match="Invalid cursor"):
+            handler.read_data(cursor=token)
+    assert handler.read_data(cursor=first["next_cursor"])["rows"] == 5
+
+
+def test_invalid_budget(handler, book):
+    with pytest.raises(ExcelError, match="max_rows"):
+        handler.read_data(cell_range="A1:C10", max_rows=0)
@@ -0,0 +1,145 @@
+"""COM round-trip budgets per tool, measured on the in-memory backend.
+
+These mirror the "COM Calls" column in docs/guide/performance.md. A
+regression that adds per-cell COM traffic shows up here as a failed
+budget on Linux CI, without needing Excel.
+"""
+
+from __future__ import annotations
+
+import time
+
+from mcp_server_xlwings.excel import ExcelHandler
+from mcp_server_xlwings.memory import MemoryBackend
+
+from .test_xlsx import DATA, STRINGS, write_xlsx
+
+
+def _calls(backend, fn, *args, **kwargs) -> int:
+    backend.counter.reset()
+    fn(*args, **kwargs)
+    return backend.counter.calls
+
+
+def test_bulk_read_cost_is_independent_of_size(backend, handler, book):
+    small = _calls(backend, handler.read_data, cell_range="A1:C100")
+    large = _calls(backend, handler.read_data, cell_range="A1:C1000")
+    assert small == large
+    assert large <= 6
+    assert backend.counter.by_member["Range.Value"] == 1
+
+
+def test_sheet_summary_budget(backend, handler, book):
+    assert _calls(backend, handler.read_data) <= 16
+
+
+def test_merge_info_without_merges_is_one_probe(backend, handler, book):
+    calls = _calls(
+        backend, handler.read_data, cell_range="A1:J10", merge_info=True
+    )
+    assert backend.counter.by_member["Range.MergeCells"] == 1
+    assert calls <= 7
+
+
+def test_get_formulas_is_one_bulk_read(backend, handler, book):
+    assert _calls(backend, handler.get_formulas, "A1:C1000") <= 6
+    assert backend.counter.by_member["Range.Formula"] == 1
+
+
+def test_grouped_formulas_add_one_read(backend, handler, book):
+    assert _calls(backend, handler.get_formulas, "A1:C1000", mode="grouped") <= 7
+    assert backend.counter.by_member["Range.FormulaR1C1"] == 1
+
+
+def test_get_objects_budget(backend, handler, book):
+    assert _calls(backend, handler.get_objects) <= 8
+
+
+def test_write_data_budget(backend, handler, book):
+    assert _calls(
+        backend, handler.write_data, "E1", [[1, 2], [3, 4]]
+    ) <= 6
+
+
+def test_diff_write_budget(backend, handler, book):
+    rows = [[i, f"name{i}", i * 1.5] for i in range(1, 1001)]
+    rows[500][1] = "edited"
+    assert _calls(backend, handler.write_data, "A2", rows, mode="diff") <= 10
+
+
+def test_range_geometry_is_computed_locally(backend, handler, book):
+    handler.read_data(cell_range="A1:C1000")
+    handler.get_formulas("B2:C5")
+    handler.write_data("E1", [[1, 2], [3, 4]])
+    for member in (
+        "Range.Row", "Range.Column", "Range.Rows.Count",
+        "Range.Columns.Count", "Range.Address", "Range.End",
+    ):
+        assert backend.counter.by_member[member] == 0, member
+
+
+def test_latency_scales_with_calls():
+    backend = MemoryBackend(latency=0.001)
+    backend.app.add_book(r"C:\reports\x.xlsx").sheet("Sheet1").write("A1", [[1, 2]])
+    handler = ExcelHandler(backend)
+    start = time.perf_counter()
+    handler.read_data(cell_range="A1:B1")
+    elapsed = time.perf_counter() - start
+    assert elapsed >= backend.counter.calls * 0.001
+
+
+def test_search_cost_is_independent_of_matches(backend, handler, book):
+    few = _calls(backend, handler.find_replace, "name999", sheet="Data")
+    many = _calls(backend, handler.find_replace, "name", sheet="Data", limit=5000)
+    assert few == many <= 12
+
+
+def test_replace_cost_is_bounded(backend, handler, book):
+    # 500 scattered cells taking one new value share multi-area writes
+    book.sheet("Data").write("D1", [["Status"]] + [
+        ["open" if i % 2 else "done"] for i in range(1, 1001)
+    ])
+    calls = _calls(
+        backend, handler.find_replace, "open", sheet="Data", replace="closed", match="whole",
+    )
+    assert calls <= 36
+    assert backend.counter.by_member["Range.Value"] <= 12
+
+
+def test_cached_summary_skips_the_sheet(backend, book):
+    handler = ExcelHandler(backend, cache_bytes=1_000_000)
+    handler.read_data(sheet="Data")
+    assert _calls(backend, handler.read_data, sheet="Data") <= 7
+    assert backend.counter.by_member["Range.Value2"] == 0
+
+
+def test_closed_file_reads_skip_excel(backend, handler, book, tmp_path):
+    path = write_xlsx(tmp_path / "closed.xlsx", {"Data": DATA}, STRINGS)
+    # Only the check whether Excel has the file open
+    assert _calls(backend, handler.read_data, workbook=path) <= 5
+    assert _calls(backend, handler.read_data, workbook=path, cell_range="A1:D4") <= 5
+    assert backend.counter.by_member["Workbooks.Open"] == 0
+
+
+def test_new_file_writes_skip_excel(backend, handler, tmp_path):
+    path = str(tmp_path / "new.xlsx")
+    data = [[i, f"name{i % 100}", i * 1.5] for i in range(50_000)]
+    assert _calls(backend, handler.manage_workbooks, "open", filepath=path, create=True) == 0
+    assert _calls(backend, handler.write_data, "A1", data, workbook=path) == 0
+    assert _calls(backend, handler.format_range, "A1:C1", workbook=path, bold=True) == 0
+    assert _calls(backend, handler.manage_workbooks, "close", workbook=path, save=True) == 0
+
+
+def test_export_reads_one_value_call_per_band(backend, handler, book, tmp_path):
+    calls = _calls(backend, handler.export_range, str(tmp_path / "out.csv"))
+    assert calls <= 14
+    assert backend.counter.by_member["Range.Value"] == 1
+
+
+def test_import_writes_one_value_call_per_band(backend, handler, book, tmp_path):
+    path = tmp_path / "more.csv"
+    path.write_text("ID,Name,Amount\n" + "".join(f"{i},n,1\n" for i in range(5000)))
+    calls = _calls(backend, handler.import_file, str(path), sheet="Data", append=True)
+    # Lookup, one End(xlUp), the suspend/restore round trips and one write
+    assert calls <= 22
+    assert backend.counter.by_member["Range.Value"] == 1
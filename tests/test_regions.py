@@ -0,0 +1,79 @@
+"""Table detection: occupancy labelling and the sheet summary's regions."""
+
+from __future__ import annotations
+
+from mcp_server_xlwings.excel import ExcelHandler
+from mcp_server_xlwings.regions import find_tables
+
+
+def _tables(grid, top=1, left=1):
+    return find_tables(grid, range(top, top + len(grid)), left)
+
+
+def test_side_by_side_and_stacked_blocks():
+    x = "x"
+    grid = [
+        ["A", "B", None, "C", "D"],
+        [1, 2, None, 3, 4],
+        [None] * 5,
+        ["E", None, None, None, None],
+        [5, None, None, None, None],
+    ]
+    assert [t["range"] for t in _tables(grid, top=3, left=2)] == [
+        "$B$3:$C$4", "$E$3:$F$4", "$B$6:$B$7",
+    ]
+    # Diagonal neighbours join, as with CurrentRegion
+    assert [t["range"] for t in _tables([[x, None], [None, x]])] == ["$A$1:$B$2"]
+
+
+def test_touching_bounding_boxes_merge():
+    x = "x"
+    # An L-shaped block and a cell inside its bounding box
+    grid = [
+        [x, None, None],
+        [x, None, x],
+        [x, x, x],
+    ]
+    assert [t["range"] for t in _tables(grid)] == ["$A$1:$C$3"]
+
+
+def test_header_row_guess():
+    grid = [
+        ["Quarterly report", None, None],
+        ["Region", "Q1", "Q2"],
+        ["North", 10, 12],
+    ]
+    (table,) = _tables(grid, top=5)
+    assert table["header_row"] == 6
+    assert table["rows"] == 3 and table["columns"] == 3
+    assert _tables([[1, 2], [3, 4]])[0]["header_row"] is None
+    assert _tables([["only"]])[0]["header_row"] is None
+
+
+def test_sampled_rows_keep_real_row_numbers():
+    grid = [["h"], [1], [2], [3]]
+    (table,) = find_tables(grid, [1, 2, 500, 1000], 1)
+    assert table["range"] == "$A$1:$A$1000"
+
+
+def test_summary_lists_every_table(handler, book, backend):
+    ws = book.sheet("Summary")
+    ws.write("E1", [["Item", "Qty"], ["a", 1], ["b", 2]])
+    ws.write("B10", [["Note", "Owner"], ["x", "y"]])
+    backend.counter.reset()
+    result = handler.read_data(sheet="Summary")
+    assert [(r["range"], r["header_row"]) for r in result["regions"]] == [
+        ("$A$1:$B$2", 1), ("$E$1:$F$3", 1), ("$B$10:$C$11", 10),
+    ]
+    assert backend.counter.by_member["Range.Value2"] == 1
+    assert backend.counter.by_member["Range.CurrentRegion"] == 0
+
+
+def test_huge_sheet_is_sampled_with_bounded_reads(backend, book):
+    handler = ExcelHandler(backend)
+    handler.REGION_SCAN_CELLS = 300
+    backend.counter.reset()
+    result = handler.read_data(sheet="Data")
+    assert result["regions_sampled"] is True
+    assert result["regions"][0]["range"] == "$A$1:$C$1001"
+    assert backend.counter.by_member["Range.Value2"] == handler.REGION_SCAN_BANDS
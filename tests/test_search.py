@@ -0,0 +1,187 @@
+"""find_replace search: one bulk read per sheet, matching in Python."""
+
+from __future__ import annotations
+
+import datetime
+
+import pytest
+
+from mcp_server_xlwings import search
+from mcp_server_xlwings.excel import ExcelError
+
+
+@pytest.mark.parametrize("find, match, case, value, hit", [
+    ("AME1", "contains", False, "name1", True),
+    ("AME1", "contains", True, "name1", False),
+    ("name1", "whole", False, "name10", False),
+    ("15", "whole", False, 15.0, True),
+    (r"^name\d{2}$", "regex", False, "name42", True),
+    (r"^name\d{2}$", "regex", False, "name420", False),
+    ("10..20", "range", False, 12.5, True),
+    ("10..20", "range", False, "12", False),
+    ("100..", "range", False, 1e9, True),
+    ("..0", "range", False, True, False),
+    ("true", "whole", False, True, True),
+])
+def test_matcher(find, match, case, value, hit):
+    assert search.matcher(find, match, case)(value) is hit
+
+
+@pytest.mark.parametrize("find, match", [("x", "fuzzy"), ("(", "regex"), ("10", "range")])
+def test_matcher_rejects(find, match):
+    with pytest.raises(ValueError):
+        search.matcher(find, match, False)
+
+
+def test_many_matches_cost_one_read(handler, book, backend):
+    backend.counter.reset()
+    result = handler.find_replace("name", sheet="Data", match_case=True, limit=5000)
+    assert result["count"] == 1000
+    assert result["matches"][0] == {"cell": "$B$2", "value": "name1", "sheet": "Data"}
+    assert result["matches"][-1]["cell"] == "$B$1001"
+    assert backend.counter.by_member["Range.Find"] == 2  # data extent only
+    assert backend.counter.by_member["Range.FindNext"] == 0
+    assert backend.counter.by_member["Range.Value"] == 1
+    assert backend.counter.calls <= 12
+
+
+def test_limit_truncates(handler, book):
+    result = handler.find_replace("name", sheet="Data", limit=3)
+    assert [m["cell"] for m in result["matches"]] == ["$B$1", "$B$2", "$B$3"]
+    assert result["truncated"] is True
+    assert "truncated" not in handler.find_replace("name999", sheet="Data")
+
+
+def test_numeric_range_and_regex(handler, book):
+    result = handler.find_replace("1497..1500", sheet="Data", match="range")
+    assert [(m["cell"], m["value"]) for m in result["matches"]] == [
+        ("$C$999", 1497), ("$C$1000", 1498.5), ("$C$1001", 1500),
+    ]
+    result = handler.find_replace(r"^name99\d$", sheet="Data", match="regex")
+    assert result["count"] == 10
+
+
+def test_formulas(handler, book):
+    book.sheet("Summary").write("C2", [["=SUM(Data!C2:C1001)"]])
+    result = handler.find_replace("sum(", sheet="Summary", look_in="formulas")
+    assert result["matches"] == [
+        {"cell": "$C$2", "formula": "=SUM(Data!C2:C1001)", "sheet": "Summary"},
+    ]
+    assert handler.find_replace("sum(", sheet="Summary")["count"] == 0
+
+
+def test_all_sheets_and_workbooks(handler, book, backend):
+    other = backend.app.add_book(r"C:\other\b.xlsx", ["Data", "Notes"])
+    other.sheet("Notes").write("D4", [["Total due"]])
+    backend.app._active_book = book
+
+    result = handler.find_replace("total", sheet="*")
+    assert [(m["sheet"], m["cell"]) for m in result["matches"]] == [("Summary", "$A$2")]
+
+    result = handler.find_replace("total", workbook="*", sheet="*")
+    assert [(m["workbook"], m["sheet"], m["cell"]) for m in result["matches"]] == [
+        ("report.xlsx", "Summary", "$A$2"), ("b.xlsx", "Notes", "$D$4"),
+    ]
+    # A named sheet is searched where it exists
+    result = handler.find_replace("total", workbook="*", sheet="Notes")
+    assert [m["workbook"] for m in result["matches"]] == ["b.xlsx"]
+
+
+def test_invalid_arguments(handler, book):
+    with pytest.raises(ExcelError, match="Unknown match"):
+        handler.find_replace("x", match="fuzzy")
+    with pytest.raises(ExcelError, match="look_in"):
+        handler.find_replace("x", look_in="comments")
+    with pytest.raises(ExcelError, match="empty"):
+        handler.find_replace("", replace="y")
+    with pytest.raises(ExcelError, match="Invalid A1"):
+        handler.find_replace("x", cell_range="B2:??")
+
+
+@pytest.mark.parametrize("find, replace, match, case, value, new", [
+    ("a", "o", "contains", False, "Banana", "Bonono"),
+    ("A", "o", "contains", True, "Banana", None),
+    ("x", "y", "contains", False, "abc", None),
+    ("15", "X", "contains", False, 1500.0, "X00"),
+    ("n", r"\1", "contains", False, "n", r"\1"),
+    (r"(\w+)@old\.com", r"\1@new.com", "regex", False, "bo@old.com", "bo@new.com"),
+    ("10..20", "0", "range", False, 12, "0"),
+    ("ab", "x", "whole", False, "abc", None),
+])
+def test_replacer(find, replace, match, case, value, new):
+    assert search.replacer(find, replace, match, case)(value) == new
+
+
+def test_replace_counts_and_lists_every_cell(handler, book, backend):
+    backend.counter.reset()
+    result = handler.find_replace("name99", sheet="Data", replace="item99")
+    assert result["replaced"] == 11
+    assert result["changes"][0] == {
+        "cell": "$B$100", "old": "name99", "new": "item99", "sheet": "Data",
+    }
+    assert result["blocks_written"] == 2  # B100 and B991:B1000
+    assert backend.counter.by_member["Range.Replace"] == 0
+    ws = book.sheet("Data")
+    assert ws.range("B996").value == "item995"
+    assert ws.range("B101").value == "name100"
+
+
+def test_replace_within_a_range_or_columns(handler, book):
+    result = handler.find_replace(
+        "name1", sheet="Data", replace="x", match="whole", cell_range="B1:B5",
+    )
+    assert [c["cell"] for c in result["changes"]] == ["$B$2"]
+    # Amounts in column C only; column A holds the same numbers
+    result = handler.find_replace(
+        "1..3", sheet="Data", replace="0", match="range", cell_range="C:C",
+    )
+    assert [c["cell"] for c in result["changes"]] == ["$C$2", "$C$3"]
+    assert book.sheet("Data").range("A2:A3").value == [1, 2]
+
+
+def test_replace_skips_formulas_unless_asked(handler, book):
+    ws = book.sheet("Summary")
+    ws.write("C2", [["=SUM(Data!C2:C1001)", "SUM of C"]])
+    result = handler.find_replace("SUM", sheet="Summary", replace="AVERAGE")
+    assert result["replaced"] == 1 and result["skipped_formulas"] == 1
+    assert ws.range("C2").formula == "=SUM(Data!C2:C1001)"
+
+    result = handler.find_replace(
+        "SUM", sheet="Summary", replace="AVERAGE", include_formulas=True,
+    )
+    assert result["changes"] == [{
+        "cell": "$C$2", "old": "=SUM(Data!C2:C1001)",
+        "new": "=AVERAGE(Data!C2:C1001)", "sheet": "Summary",
+    }]
+    assert ws.range("C2").formula == "=AVERAGE(Data!C2:C1001)"
+
+
+def test_replace_on_every_sheet(handler, book):
+    book.sheet("Data").write("E1", [["Total"]])
+    result = handler.find_replace("total", sheet="*", replace="Sum", limit=1)
+    assert result["replaced"] == 2
+    assert result["changes"] == [
+        {"cell": "$E$1", "old": "Total", "new": "Sum", "sheet": "Data"},
+    ]
+    assert result["truncated"] is True
+    assert book.sheet("Summary").range("A2").value == "Sum"
+
+
+def test_scattered_changes_write_only_changed_cells(handler, book, backend):
+    result = handler.find_replace("5", sheet="Data", replace="5", match="whole")
+    assert result["replaced"] == 0 and result["blocks_written"] == 0
+    data = book.sheet("Data")
+    data.write("E2", [[datetime.datetime(2024, 1, 15)], ["2024 plan"], ["x"]])
+    backend.counter.reset()
+    result = handler.find_replace("0", sheet="Data", cell_range="A:A", replace="9")
+    assert result["replaced"] == 181  # IDs 1..1000 containing a zero
+    assert result["blocks_written"] == 91  # runs such as A101:A110 merge
+    # Numbers stay numbers; cells in between are not written
+    assert data.range("A11:C11").value == [19, "name10", 15]
+    assert data.range("A12").value == 11
+
+    result = handler.find_replace("2024", sheet="Data", cell_range="E:E", replace="2025")
+    assert [c["new"] for c in result["changes"]] == ["2025-01-15T00:00:00", "2025 plan"]
+    assert data.range("E2:E4").value == [
+        datetime.datetime(2025, 1, 15), "2025 plan", "x",
+    ]
@@ -14,8 +14,8 @@ def test_import_server():
     from mcp_server_xlwings.server import mcp  # noqa: F401
 
 
-def test_server_has_11_tools():
-    """Verify all 11 tools are registered."""
+def test_server_has_14_tools():
+    """Verify all 14 tools are registered."""
     from mcp_server_xlwings.server import mcp
 
     tool_names = {name for name in mcp._tool_manager._tools}
@@ -31,6 +31,9 @@ def test_server_has_11_tools():
         "get_formulas",
         "get_cell_styles",
         "get_objects",
+        "batch",
+        "export_range",
+        "import_file",
     }
     assert expected == tool_names, (
         f"Missing: {expected - tool_names}, Extra: {tool_names - expected}"
@@ -77,6 +80,7 @@ def test_get_formulas_params():
     sig = inspect.signature(get_formulas)
     assert sig.parameters["cell_range"].default is inspect.Parameter.empty
     assert sig.parameters["values_too"].default is False
+    assert sig.parameters["mode"].default == "cells"
 
 
 def test_get_cell_styles_params():
@@ -95,3 +99,64 @@ def test_get_objects_params():
     sig = inspect.signature(get_objects)
     assert sig.parameters["workbook"].default is None
     assert sig.parameters["sheet"].default is None
+
+
+def test_read_data_pagination_params():
+    """read_data page budgets and cursor should all default to None."""
+    from mcp_server_xlwings.server import read_data
+
+    sig = inspect.signature(read_data)
+    for name in ("max_rows", "max_cells", "max_bytes", "cursor"):
+        assert sig.parameters[name].default is None
+
+
+def test_tools_are_coroutines():
+    """Tools await the COM worker instead of blocking the event loop."""
+    from mcp_server_xlwings import server
+
+    for name in server.mcp._tool_manager._tools:
+        assert inspect.iscoroutinefunction(getattr(server, name)), name
+
+
+def test_run_macro_timeout_param():
+    """run_macro accepts a per-call timeout override."""
+    from mcp_server_xlwings.server import run_macro
+
+    param = inspect.signature(run_macro).parameters["timeout"]
+    assert param.default is None
+
+
+def test_metadata_params():
+    """Workbook listings accept a metadata level defaulting to 'full'."""
+    from mcp_server_xlwings.server import get_active_workbook, manage_workbooks
+
+    for tool in (get_active_workbook, manage_workbooks):
+        assert inspect.signature(tool).parameters["metadata"].default == "full"
+
+
+def test_read_data_fast_param():
+    """read_data offers an opt-in Value2 fast path."""
+    from mcp_server_xlwings.server import read_data
+
+    assert inspect.signature(read_data).parameters["fast"].default is False
+
+
+def test_read_data_encoding_param():
+    """read_data defaults to the row-major encoding."""
+    from mcp_server_xlwings.server import read_data
+
+    assert inspect.signature(read_data).parameters["encoding"].default == "rows"
+
+
+def test_write_tools_bulk_param():
+    """write_data, format_range and manage_sheets take bulk (default None)."""
+    from mcp_server_xlwings.server import format_range, manage_sheets, write_data
+
+    for tool in (write_data, format_range, manage_sheets):
+        assert inspect.signature(tool).parameters["bulk"].default is None
+
+
+def test_write_data_mode_param():
+    from mcp_server_xlwings.server import write_data
+
+    assert inspect.signature(write_data).parameters["mode"].default == "full"
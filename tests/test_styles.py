@@ -0,0 +1,93 @@
+"""Tests for range-level style extraction in get_cell_styles."""
+
+from __future__ import annotations
+
+from mcp_server_xlwings.excel import ExcelHandler, _col_letter, _ole_color_to_hex
+
+
+def _per_cell_styles(ws, cell_range: str) -> list[dict]:
+    """Reference: the original one-probe-per-cell algorithm."""
+    rng = ws.range(cell_range)
+    styles = []
+    for i in range(rng.rows.count):
+        for j in range(rng.columns.count):
+            cell_api = rng[i, j].api
+            if cell_api.Value is None and cell_api.Formula == "":
+                continue
+            info: dict = {}
+            if cell_api.Font.Bold:
+                info["bold"] = True
+            if cell_api.Font.Italic:
+                info["italic"] = True
+            v = cell_api.Font.Underline
+            if v and v != -4142:
+                info["underline"] = True
+            info["font_name"] = cell_api.Font.Name
+            info["font_size"] = cell_api.Font.Size
+            c = _ole_color_to_hex(cell_api.Font.Color)
+            if c and c != "#000000":
+                info["font_color"] = c
+            c = _ole_color_to_hex(cell_api.Interior.Color)
+            if c and c != "#000000":
+                info["bg_color"] = c
+            nf = cell_api.NumberFormat
+            if nf and nf != "General":
+                info["number_format"] = nf
+            label = ExcelHandler._ALIGN_REVERSE.get(cell_api.HorizontalAlignment)
+            if label and label != "general":
+                info["alignment"] = label
+            if any(cell_api.Borders(e).LineStyle == 1 for e in range(7, 13)):
+                info["border"] = True
+            if info:
+                info["cell"] = f"{_col_letter(rng.column + j)}{rng.row + i}"
+                styles.append(info)
+    return styles
+
+
+def _styled_sheet(book):
+    ws = book.sheet("Data")
+    ws.style("A1:C1", bold=True, fill_color=0x5C3A1B, font_color=0xFFFFFF, border=1)
+    ws.style("B5:B9", italic=True, number_format="#,##0.00")
+    ws.style("C7", h_align=-4108, underline=2, font_size=14.0)
+    ws.style("A20:C22", border=1)
+    ws.write("E3", "note")
+    ws.style("E3", font_name="Arial")
+    return ws
+
+
+def test_matches_per_cell_result(handler, book):
+    ws = _styled_sheet(book)
+    expected = _per_cell_styles(ws, "A1:E30")
+    assert handler.get_cell_styles("A1:E30")["styles"] == expected
+
+
+def test_property_filter_matches_per_cell(handler, book):
+    ws = _styled_sheet(book)
+    wanted = {"bold", "border"}
+    expected = []
+    for info in _per_cell_styles(ws, "A1:C25"):
+        kept = {k: v for k, v in info.items() if k in wanted}
+        if kept:
+            kept["cell"] = info["cell"]
+            expected.append(kept)
+    result = handler.get_cell_styles("A1:C25", properties=["bold", "border"])
+    assert result["styles"] == expected
+
+
+def test_uniform_block_cost_is_flat(backend, handler, book):
+    ws = book.sheet("Summary")
+    ws.write("A1", [[f"h{r}{c}" for c in range(20)] for r in range(50)])
+    ws.style("A1:T50", bold=True, fill_color=0xEEEEEE)
+    backend.counter.reset()
+    result = handler.get_cell_styles("A1:T50", sheet="Summary")
+    assert len(result["styles"]) == 1000
+    # 1,000 cells, one block: ~25 calls instead of ~15 per cell.
+    assert backend.counter.calls < 40
+
+
+def test_cost_follows_style_boundaries(backend, handler, book):
+    ws = book.sheet("Data")
+    ws.style("A1:C1", bold=True)
+    backend.counter.reset()
+    handler.get_cell_styles("A1:C200", properties=["bold"])
+    assert backend.counter.by_member["Font.Bold"] < 30
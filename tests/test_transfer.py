@@ -0,0 +1,111 @@
+"""Chunked transfers: adaptive row bands, retries and stitched results."""
+
+from __future__ import annotations
+
+import pytest
+
+from mcp_server_xlwings.excel import ExcelHandler
+from mcp_server_xlwings.memory import MemoryRange
+from mcp_server_xlwings.transfer import Transfer
+from mcp_server_xlwings.worker import Cancelled
+
+
+def _bands(transfer, rect, fail_above=None):
+    seen = []
+
+    def step(band):
+        rows = band[2] - band[0] + 1
+        if fail_above is not None and rows > fail_above:
+            raise RuntimeError("marshalling failed")
+        seen.append(band)
+
+    return seen, transfer.run(rect, step)
+
+
+def test_small_blocks_move_in_one_call():
+    transfer = Transfer(chunk_cells=100)
+    assert not transfer.needed((1, 1, 10, 10))
+    assert transfer.needed((1, 1, 11, 10))
+    assert not Transfer(chunk_cells=0).needed((1, 1, 10_000, 100))
+
+
+def test_first_band_is_capped_by_payload_then_sized_by_rate():
+    # A zero time budget sizes every band after the first to one row
+    seen, stats = _bands(Transfer(chunk_cells=100, target_ms=0), (1, 1, 40, 10))
+    assert seen[0] == (1, 1, 10, 10)
+    assert all(b[0] == b[2] for b in seen[1:])
+    assert stats["chunks"] == 31 and stats["cells"] == 400
+    # A generous one stays at the cap
+    seen, _ = _bands(Transfer(chunk_cells=100, target_ms=60_000), (1, 1, 40, 10))
+    assert [b[0] for b in seen] == [1, 11, 21, 31]
+
+
+def test_failed_band_is_retried_smaller():
+    seen, stats = _bands(
+        Transfer(chunk_cells=1000, target_ms=60_000), (1, 1, 100, 10), fail_above=30,
+    )
+    # 100 -> 50 -> 25 rows, and bands stay at 25
+    assert stats["retries"] == 2
+    assert [b[0] for b in seen] == [1, 26, 51, 76]
+    assert stats["cells"] == 1000
+
+
+def test_single_row_failure_and_cancellation_propagate():
+    with pytest.raises(RuntimeError):
+        _bands(Transfer(chunk_cells=10), (1, 1, 5, 10), fail_above=0)
+
+    def cancelled(band):
+        raise Cancelled("Operation cancelled.")
+
+    with pytest.raises(Cancelled):
+        Transfer(chunk_cells=10).run((1, 1, 5, 10), cancelled)
+
+
+@pytest.fixture
+def chunked(backend):
+    return ExcelHandler(backend, chunk_cells=300)
+
+
+def test_read_data_stitches_bands(chunked, handler, book, backend):
+    expected = handler.read_data(cell_range="A1:C1001")
+    result = chunked.read_data(cell_range="A1:C1001")
+    assert result["data"] == expected["data"]
+    assert result["headers"] == ["ID", "Name", "Amount"]
+    assert result["transfer"]["chunks"] > 1
+    assert result["transfer"]["cells"] == 3003
+    assert "transfer" not in expected
+
+
+def test_fast_read_converts_per_band(chunked, handler, book):
+    expected = handler.read_data(cell_range="A1:C1001", fast=True)
+    result = chunked.read_data(cell_range="A1:C1001", fast=True)
+    assert result["data"] == expected["data"]
+    assert result["headers"] == expected["headers"]
+
+
+def test_write_and_formulas_in_bands(chunked, book):
+    rows = [[i, i * 2, f"=A{i}+B{i}"] for i in range(1, 501)]
+    result = chunked.write_data("E1", rows)
+    assert result["written_range"] == "$E$1:$G$500"
+    assert result["transfer"]["chunks"] > 1
+    assert book.sheet("Data").range("E500:F500").value == [500, 1000]
+
+    formulas = chunked.get_formulas("E1:G500")
+    assert formulas["total_formula_cells"] == 500
+    assert formulas["formulas"][-1] == {"cell": "G500", "formula": "=A500+B500"}
+    assert formulas["transfer"]["chunks"] > 1
+
+
+def test_read_recovers_from_marshalling_failures(chunked, handler, book, monkeypatch):
+    original = MemoryRange.value.fget
+
+    def limited(self):
+        if self.size > 150:
+            raise RuntimeError("Not enough storage is available")
+        return original(self)
+
+    monkeypatch.setattr(MemoryRange, "value", property(limited, MemoryRange.value.fset))
+    result = chunked.read_data(cell_range="A2:C1001", headers=False)
+    assert result["transfer"]["retries"] >= 1
+    assert len(result["data"]) == 1000
+    assert result["data"][-1] == [1000, "name1000", 1500]
@@ -0,0 +1,104 @@
+"""Value2 fast path: column-wise conversion and format-driven dates."""
+
+from __future__ import annotations
+
+import datetime
+
+import pytest
+
+from mcp_server_xlwings import value2
+from mcp_server_xlwings.value2 import convert, date_kind
+
+
+@pytest.mark.parametrize("fmt, kind", [
+    ("General", None),
+    ("#,##0.00", None),
+    ("0%", None),
+    ("@", None),
+    ("[Red]0.00", None),
+    ("m/d/yyyy", "date"),
+    ("yyyy-mm-dd", "date"),
+    ("[$-409]mmm-yy", "date"),
+    ('"Due "d-mmm', "date"),
+    ("m/d/yyyy h:mm", "datetime"),
+    ("h:mm:ss", "time"),
+    ("mm:ss", "time"),
+    ("[h]:mm", "time"),
+    (None, None),
+])
+def test_date_kind(fmt, kind):
+    assert date_kind(fmt) == kind
+
+
+@pytest.fixture(params=["numpy", "python"])
+def engine(request, monkeypatch):
+    if request.param == "python":
+        monkeypatch.setattr(value2, "np", None)
+    return request.param
+
+
+def test_convert_collapses_whole_floats(engine):
+    grid = [[1.0, 2.5, None, "x", True], [3.0, None, 4.0, None, False]]
+    out = convert(grid, [None] * 5)
+    assert out == [[1, 2.5, None, "x", True], [3, None, 4, None, False]]
+    assert type(out[0][0]) is int and type(out[0][4]) is bool
+
+
+def test_convert_dates_by_kind(engine):
+    grid = [["When", "At", "Time"], [45000.5, 45000.5, 0.75], [None, 45001.0, None]]
+    out = convert(grid, ["date", "datetime", "time"], plain_rows=1)
+    assert out == [
+        ["When", "At", "Time"],
+        ["2023-03-15", "2023-03-15T12:00:00", "18:00:00"],
+        [None, "2023-03-16T00:00:00", None],
+    ]
+
+
+def test_numeric_header_stays_plain(engine):
+    assert convert([[2024.0], [45000.0]], ["date"], plain_rows=1) == [
+        [2024], ["2023-03-15"],
+    ]
+
+
+def test_fast_read_matches_plain_read(handler, book):
+    plain = handler.read_data(sheet="Data", cell_range="A1:C1001")
+    fast = handler.read_data(sheet="Data", cell_range="A1:C1001", fast=True)
+    assert fast == plain
+
+
+def test_fast_read_cost(handler, book, backend):
+    handler.read_data(sheet="Data", cell_range="A1:C1001", fast=True)
+    by = backend.counter.by_member
+    assert by["Range.Value2"] == 1
+    assert by["Range.Value"] == 0
+    # One format probe covers all uniformly formatted columns
+    assert by["Range.NumberFormat"] == 1
+
+
+def test_fast_read_converts_date_columns(handler, book):
+    ws = book.sheet("Summary")
+    ws.write("D1", [["Due", "Qty"]] + [
+        [datetime.datetime(2024, 1, i), i] for i in range(1, 4)
+    ])
+    result = handler.read_data(sheet="Summary", cell_range="D1:E4", fast=True)
+    assert result["headers"] == ["Due", "Qty"]
+    assert result["data"] == [
+        ["2024-01-01", 1], ["2024-01-02", 2], ["2024-01-03", 3],
+    ]
+
+
+def test_fast_pages_sample_formats_once(handler, book, backend):
+    ws = book.sheet("Data")
+    ws.style("C2:C1001", number_format="yyyy-mm-dd")
+    page = handler.read_data(
+        sheet="Data", cell_range="A1:C1001", max_rows=400, fast=True,
+    )
+    assert page["headers"] == ["ID", "Name", "Amount"]
+    # Serials past 60 (1900-02-28) match Excel's own calendar
+    assert page["data"][99] == [100, "name100", "1900-05-29"]
+    backend.counter.reset()
+    page = handler.read_data(cursor=page["next_cursor"])
+    assert page["data"][0][0] == 401
+    assert isinstance(page["data"][0][2], str)
+    assert backend.counter.by_member["Range.NumberFormat"] == 0
+    assert backend.counter.by_member["Range.Value2"] == 1
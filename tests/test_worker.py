@@ -0,0 +1,129 @@
+"""COM worker thread: ordering, deadlines, cancellation and async tools."""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from mcp_server_xlwings import server
+from mcp_server_xlwings.excel import ExcelError
+from mcp_server_xlwings.worker import (
+    Cancelled, ComWorker, WorkerTimeout, check_cancelled,
+)
+
+
+@pytest.fixture
+def worker():
+    w = ComWorker(name="test-com")
+    yield w
+    w.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_jobs_share_one_thread(worker):
+    idents = await asyncio.gather(*[
+        worker.run(threading.get_ident) for _ in range(5)
+    ])
+    assert len(set(idents)) == 1
+    assert idents[0] != threading.get_ident()
+
+
+@pytest.mark.asyncio
+async def test_event_loop_stays_responsive(worker):
+    ticks = 0
+
+    async def ticker():
+        nonlocal ticks
+        while True:
+            await asyncio.sleep(0.01)
+            ticks += 1
+
+    task = asyncio.create_task(ticker())
+    await worker.run(time.sleep, 0.2)
+    task.cancel()
+    assert ticks >= 5
+
+
+@pytest.mark.asyncio
+async def test_timeout_cancels_running_job(worker):
+    stopped = threading.Event()
+
+    def spin():
+        while True:
+            try:
+                check_cancelled()
+            except Cancelled:
+                stopped.set()
+                raise
+            time.sleep(0.005)
+
+    with pytest.raises(WorkerTimeout, match="0.05s"):
+        await worker.run(spin, timeout=0.05)
+    assert stopped.wait(1)
+    # The worker is free again for the next call.
+    assert await worker.run(lambda: 7, timeout=1) == 7
+
+
+@pytest.mark.asyncio
+async def test_cancelled_queued_job_never_runs(worker):
+    ran: list[str] = []
+    gate = threading.Event()
+    blocker = worker.submit(gate.wait)
+    queued = worker.submit(ran.append, "queued")
+    queued.cancel()
+    gate.set()
+    blocker.future.result(timeout=1)
+    await worker.run(lambda: None)
+    assert ran == []
+
+
+@pytest.mark.asyncio
+async def test_task_cancellation_reaches_job(worker):
+    started, stopped = threading.Event(), threading.Event()
+
+    def spin():
+        started.set()
+        while True:
+            try:
+                check_cancelled()
+            except Cancelled:
+                stopped.set()
+                raise
+            time.sleep(0.005)
+
+    task = asyncio.create_task(worker.run(spin))
+    await asyncio.get_running_loop().run_in_executor(None, started.wait, 1)
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+    assert stopped.wait(1)
+
+
+def test_check_cancelled_outside_worker_is_noop():
+    check_cancelled()
+
+
+@pytest.mark.asyncio
+async def test_tools_run_on_worker(monkeypatch, handler, book):
+    monkeypatch.setattr(server, "_handler", handler)
+    result = await server.read_data(sheet="Summary", cell_range="A1:B2")
+    assert result["headers"] == ["Metric", "Value"]
+    assert result["data"] == [["Total", 42]]
+
+
+@pytest.mark.asyncio
+async def test_call_timeout_surfaces_as_excel_error():
+    with pytest.raises(ExcelError, match="did not respond"):
+        await server._call(time.sleep, 0.5, timeout=0.05)
+
+
+@pytest.mark.asyncio
+async def test_call_wraps_com_errors():
+    def boom():
+        raise RuntimeError("RPC server unavailable")
+
+    with pytest.raises(ExcelError, match="Excel COM error: RPC"):
+        await server._call(boom)
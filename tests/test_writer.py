@@ -0,0 +1,139 @@
+"""New .xlsx files written without Excel, read back with the streaming reader."""
+
+from __future__ import annotations
+
+import re
+import zipfile
+
+import pytest
+
+from mcp_server_xlwings.excel import ExcelError, ExcelHandler
+from mcp_server_xlwings.writer import XlsxWriter
+from mcp_server_xlwings.xlsx import XlsxBook
+
+
+@pytest.fixture
+def path(tmp_path):
+    return str(tmp_path / "report.xlsx")
+
+
+def test_report_without_excel(handler, backend, path):
+    opened = handler.manage_workbooks("open", filepath=path, create=True)
+    assert opened == {
+        "name": "report.xlsx", "path": path, "sheets": ["Sheet1"], "offline": True,
+    }
+    handler.manage_sheets("add", workbook=path, sheet="Totals")
+    handler.write_data("A1", [["ID", "Due", "Amount"]], workbook=path)
+    result = handler.write_data(
+        "A2", [[i, 45306 + i, i * 1.5] for i in range(1, 101)], workbook=path,
+    )
+    assert result["written_range"] == "$A$2:$C$101" and result["offline"] is True
+    handler.write_data("B1", formula="=SUM(Sheet1!C2:C101)", workbook=path, sheet="Totals")
+    handler.format_range("A1:C1", workbook=path, bold=True, bg_color="#DDEEFF")
+    handler.format_range("B:B", workbook=path, number_format="yyyy-mm-dd")
+    result = handler.format_range("C2:C101", workbook=path, number_format="#,##0.00")
+    assert result["applied"] == ["number_format=#,##0.00"]
+    assert handler.manage_workbooks("list")[-1]["offline"] is True
+
+    handler.manage_workbooks("close", workbook="report.xlsx", save=True)
+    assert backend.counter.by_member["Workbooks.Add"] == 0
+    assert backend.counter.by_member["Range.Value"] == 0
+
+    result = handler.read_data(workbook=path, cell_range="A1:C3")
+    assert result["offline"] is True
+    assert result["data"] == [[1, "2024-01-16T00:00:00", 1.5], [2, "2024-01-17T00:00:00", 3]]
+    formulas = handler.get_formulas("B1", workbook=path, sheet="Totals")
+    assert formulas["formulas"] == [{"cell": "B1", "formula": "=SUM(Sheet1!C2:C101)"}]
+    with zipfile.ZipFile(path) as z:
+        styles = z.read("xl/styles.xml").decode()
+        sheet = z.read("xl/worksheets/sheet1.xml").decode()
+    assert '<numFmt numFmtId="164" formatCode="yyyy-mm-dd"/>' in styles
+    assert "<b/>" in styles and 'rgb="FFDDEEFF"' in styles
+    assert re.search(r'<c r="A1" s="\d+" t="s">', sheet)
+    assert '<c r="A2"><v>1</v></c>' in sheet
+
+
+def test_later_writes_win_in_any_order(path):
+    with XlsxWriter(path, "Data") as writer:
+        writer.RUN_LIMIT = 2
+        writer.write("Data", 10, 1, [["x", "y"], [1, 2]])
+        writer.write("Data", 1, 1, [["a", "b"], ["c", "d"]])
+        writer.write("Data", 1, 2, [["B1"], [None]])
+        writer.write("Data", 11, 3, [[3]])
+        writer.write("data", 2, 1, [[None, None, "C2"]])
+        writer.save()
+    with XlsxBook(path) as book:
+        ws = book.sheet("Data")
+        assert ws.read([(1, 1, 2, 3), (10, 1, 11, 3)]) == [
+            [["a", "B1", None], [None, None, "C2"]],
+            [["x", "y", None], [1, 2, 3]],
+        ]
+        assert ws.survey()[0] == (1, 1, 11, 3)
+
+
+def test_text_survives_escaping(path):
+    texts = ["a & <b>", "tab\there", "two\nlines\r", "  padded ", "_x0041_", "bell\x07", "Z"]
+    with XlsxWriter(path) as writer:
+        writer.SHARED_STRING_LIMIT = 3
+        writer.write("Sheet1", 1, 1, [texts, [True, 1e300, 2 ** 40, float("nan"), "=1<2"]])
+        writer.save()
+    with zipfile.ZipFile(path) as z:
+        assert z.read("xl/worksheets/sheet1.xml").count(b't="inlineStr"') == 4
+    with XlsxBook(path) as book:
+        rows = book.sheet().read([(1, 1, 2, 7)])[0]
+    assert rows[0] == texts
+    assert rows[1][:4] == [True, 1e300, 2 ** 40, "#NUM!"]
+
+
+def test_new_files_only(handler, backend, path, tmp_path):
+    handler.manage_workbooks("open", filepath=path, create=True)
+    with pytest.raises(ExcelError, match="written without Excel"):
+        handler.read_data(workbook=path)
+    with pytest.raises(ExcelError, match=r"Available sheets: \['Sheet1'\]"):
+        handler.write_data("A1", [[1]], workbook=path, sheet="Missing")
+    with pytest.raises(ExcelError, match="Invalid colour"):
+        handler.format_range("A1", workbook=path, font_color="red")
+    with pytest.raises(ExcelError, match="Invalid sheet name"):
+        handler.manage_sheets("add", workbook=path, sheet="a/b")
+    handler.manage_workbooks("close", workbook=path)
+    assert not (tmp_path / "report.xlsx").exists()
+
+    # A mistyped path is not created
+    with pytest.raises(ExcelError, match="File not found"):
+        handler.manage_workbooks("open", filepath=path)
+    with pytest.raises(ExcelError, match="Folder not found"):
+        handler.manage_workbooks("open", filepath=str(tmp_path / "missing" / "a.xlsx"),
+                                 create=True)
+    assert handler.manage_workbooks("list") == []
+
+    # Other suffixes and offline=False create the file in Excel
+    for each, target in ((handler, tmp_path / "macro.xlsm"),
+                         (ExcelHandler(backend, offline=False), path)):
+        opened = each.manage_workbooks("open", filepath=str(target), create=True)
+        assert "offline" not in opened
+    assert backend.counter.by_member["Workbooks.Add"] == 2
+
+
+def test_new_file_is_the_default_target(handler, backend, book, path):
+    handler.manage_workbooks("open", filepath=path, create=True)
+    result = handler.write_data("A1", [["draft"]])
+    assert result["offline"] is True
+    assert book.sheets["Data"].range("A1").value == "ID"
+    listed = handler.manage_workbooks("list", metadata="active")
+    assert [entry["active"] for entry in listed] == [False, True]
+    with pytest.raises(ExcelError, match="written without Excel"):
+        handler.read_data(cell_range="A1")
+
+    # A draft named like an open workbook leaves that name to Excel
+    other = handler.manage_workbooks("open", filepath=path.replace("report", "Book1"),
+                                     create=True)
+    backend.app.add_book(r"C:\live\Book1.xlsx", ["Data"])
+    handler.write_data("A1", [["live"]], workbook="Book1.xlsx", sheet="Data")
+    assert handler.read_data(workbook="Book1.xlsx", sheet="Data", cell_range="A1",
+                             headers=False)["data"] == [["live"]]
+    handler.manage_workbooks("close", workbook=other["path"])
+
+    # Opening a workbook in Excel makes it the target again
+    handler.manage_workbooks("open", filepath="new")
+    assert "offline" not in handler.write_data("A1", [["excel"]])
+    handler.manage_workbooks("close", workbook=path)
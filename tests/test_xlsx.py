@@ -0,0 +1,273 @@
+"""Offline reads of closed .xlsx files, streamed from the zip package."""
+
+from __future__ import annotations
+
+import tracemalloc
+import zipfile
+
+import pytest
+
+from mcp_server_xlwings import xlsx
+from mcp_server_xlwings.excel import ExcelError, ExcelHandler
+from mcp_server_xlwings.xlsx import XlsxBook, XlsxError
+
+MAIN = "http://schemas.openxmlformats.org/spreadsheetml/2006/main"
+REL = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+PKG = "http://schemas.openxmlformats.org/package/2006/relationships"
+
+STYLES = (
+    f'<styleSheet xmlns="{MAIN}">'
+    '<numFmts count="1"><numFmt numFmtId="164" formatCode="yyyy\\-mm\\-dd hh:mm"/></numFmts>'
+    '<cellXfs count="4"><xf numFmtId="0"/><xf numFmtId="14"/><xf numFmtId="164"/>'
+    '<xf numFmtId="4"/></cellXfs></styleSheet>'
+)
+
+
+def write_xlsx(path, sheets, strings=(), active=0):
+    """A minimal package: ``sheets`` maps names to the worksheet's inner XML."""
+    rels = [(f"rId{i}", "worksheet", f"worksheets/sheet{i}.xml") for i in range(1, len(sheets) + 1)]
+    rels += [("rIdS", "sharedStrings", "sharedStrings.xml"), ("rIdT", "styles", "styles.xml")]
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as z:
+        z.writestr("_rels/.rels", (
+            f'<Relationships xmlns="{PKG}"><Relationship Id="rId1" '
+            f'Type="{REL}/officeDocument" Target="xl/workbook.xml"/></Relationships>'
+        ))
+        z.writestr("xl/_rels/workbook.xml.rels", f'<Relationships xmlns="{PKG}">' + "".join(
+            f'<Relationship Id="{rid}" Type="{REL}/{kind}" Target="{target}"/>'
+            for rid, kind, target in rels
+        ) + "</Relationships>")
+        z.writestr("xl/workbook.xml", (
+            f'<workbook xmlns="{MAIN}" xmlns:r="{REL}">'
+            f'<bookViews><workbookView activeTab="{active}"/></bookViews><sheets>'
+            + "".join(
+                f'<sheet name="{name}" sheetId="{i}" r:id="rId{i}"/>'
+                for i, name in enumerate(sheets, 1)
+            ) + "</sheets></workbook>"
+        ))
+        for i, body in enumerate(sheets.values(), 1):
+            z.writestr(
+                f"xl/worksheets/sheet{i}.xml", f'<worksheet xmlns="{MAIN}">{body}</worksheet>',
+            )
+        z.writestr("xl/sharedStrings.xml", f'<sst xmlns="{MAIN}">' + "".join(
+            s if s.startswith("<") else f"<si><t>{s}</t></si>" for s in strings
+        ) + "</sst>")
+        z.writestr("xl/styles.xml", STYLES)
+    return str(path)
+
+
+DATA = (
+    '<dimension ref="A1:D5"/><sheetData>'
+    '<row r="1"><c r="A1" t="s"><v>0</v></c><c r="B1" t="s"><v>1</v></c>'
+    '<c r="C1" t="s"><v>2</v></c><c r="D1" t="s"><v>3</v></c></row>'
+    '<row r="2"><c r="A2"><v>1</v></c><c r="B2" t="s"><v>4</v></c>'
+    '<c r="C2" s="3"><v>1.5</v></c><c r="D2" s="1"><v>45306</v></c></row>'
+    '<row r="3"><c r="A3"><v>2</v></c><c r="B3" t="inlineStr"><is><t>line_x000D_</t></is></c>'
+    '<c r="C3"><f>C2*2</f><v>3</v></c><c r="D3" s="2"><v>45306.5</v></c></row>'
+    '<row r="4"><c r="A4" t="b"><v>1</v></c><c t="e"><v>#DIV/0!</v></c>'
+    '<c r="C4"><f>C3*2</f><v>6</v></c></row>'
+    '<row r="5"><c r="A5" s="3"/></row>'
+    '</sheetData>'
+)
+STRINGS = [
+    "ID", "Name", "Amount", "Due",
+    "<si><r><t>bold </t></r><r><t>run</t></r><rPh><t>phonetic</t></rPh></si>",
+]
+
+
+@pytest.fixture
+def path(tmp_path):
+    return write_xlsx(tmp_path / "closed.xlsx", {"Data": DATA, "Notes": ""}, STRINGS)
+
+
+def test_read_range_without_excel(handler, backend, path):
+    backend.counter.reset()
+    result = handler.read_data(workbook=path, sheet="data", cell_range="A1:D4")
+    assert result["offline"] is True
+    assert result["range"] == "$A$1:$D$4" and result["sheet"] == "Data"
+    assert result["headers"] == ["ID", "Name", "Amount", "Due"]
+    assert result["data"] == [
+        [1, "bold run", 1.5, "2024-01-15T00:00:00"],
+        [2, "line\r", 3, "2024-01-15T12:00:00"],
+        [True, "#DIV/0!", 6, None],
+    ]
+    assert backend.counter.by_member["Workbooks.Open"] == 0
+    assert backend.counter.by_member["Range.Value"] == 0
+
+
+def test_summary_of_a_closed_file(handler, tmp_path):
+    body = (
+        '<dimension ref="A1:F9"/><sheetData>'
+        '<row r="1"><c r="A1" t="s"><v>0</v></c></row>'
+        '<row r="2"><c r="A2" t="s"><v>1</v></c><c r="B2" t="s"><v>2</v></c></row>'
+        '<row r="3"><c r="A3"><v>1</v></c><c r="B3"><v>2</v></c></row>'
+        '<row r="6"><c r="E6" t="s"><v>3</v></c></row>'
+        '<row r="7"><c r="E7"><v>5</v></c></row><row r="9"><c r="F9" s="3"/></row>'
+        '</sheetData><mergeCells count="1"><mergeCell ref="A1:B1"/></mergeCells>'
+    )
+    path = write_xlsx(tmp_path / "s.xlsx", {"Report": body}, ["Title", "Key", "Value", "Note"])
+    result = handler.read_data(workbook=path)
+    assert result == {
+        "sheet": "Report",
+        "used_range": "$A$1:$F$9",
+        "data_range": "$A$1:$E$7",
+        "total_rows": 7,
+        "total_columns": 5,
+        "headers": ["Title", None, None, None, None],
+        "merged_cells": [{"range": "$A$1:$B$1", "value": "Title", "rows": 1, "columns": 2}],
+        "regions": [
+            {"range": "$A$1:$B$3", "rows": 3, "columns": 2, "header_row": 1},
+            {"range": "$E$6:$E$7", "rows": 2, "columns": 1, "header_row": 6},
+        ],
+        "offline": True,
+    }
+
+
+def test_every_sheet_and_unknown_sheet(handler, path):
+    result = handler.read_data(workbook=path, sheet="*", cell_range="A1")
+    assert result["sheet_count"] == 2
+    assert result["sheets"]["Data"]["data"] == [["ID"]]
+    assert result["sheets"]["Notes"]["rows"] == 0
+    with pytest.raises(ExcelError, match=r"Available sheets: \['Data', 'Notes'\]"):
+        handler.read_data(workbook=path, sheet="Missing")
+
+
+def test_formulas_shared_and_array(handler, tmp_path):
+    body = (
+        '<sheetData>'
+        '<row r="1"><c r="A1"><v>1</v></c><c r="B1"><f t="shared" ref="B1:B3" si="0">A1*$A$1</f>'
+        '<v>1</v></c><c r="C1"><f t="array" ref="C1:C2">_xlfn.SEQUENCE(2)</f><v>1</v></c></row>'
+        '<row r="2"><c r="A2"><v>2</v></c><c r="B2"><f t="shared" si="0"/><v>2</v></c>'
+        '<c r="C2"><v>2</v></c></row>'
+        '<row r="3"><c r="A3"><v>3</v></c><c r="B3"><f t="shared" si="0"/><v>3</v></c>'
+        '<c r="C3" t="str"><f>"a"&amp;A3</f><v>a3</v></c></row>'
+        '</sheetData>'
+    )
+    path = write_xlsx(tmp_path / "f.xlsx", {"Calc": body})
+    result = handler.get_formulas("B2:C3", workbook=path, values_too=True)
+    assert result["formulas"] == [
+        {"cell": "B2", "formula": "=A2*$A$1", "value": 2},
+        {"cell": "C2", "formula": "=SEQUENCE(2)", "value": 2},
+        {"cell": "B3", "formula": "=A3*$A$1", "value": 3},
+        {"cell": "C3", "formula": '="a"&A3', "value": "a3"},
+    ]
+    assert result["offline"] is True
+
+    grouped = handler.get_formulas("A1:C3", workbook=path, mode="grouped")
+    assert [(g["range"], g["formula"], g["cells"]) for g in grouped["formulas"]] == [
+        ("B1:B3", "=A1*$A$1", 3), ("C1:C2", "=SEQUENCE(2)", 2), ("C3", '="a"&A3', 1),
+    ]
+    assert grouped["total_formula_cells"] == 6
+
+
+def test_excel_is_used_when_the_file_cannot_be_streamed(handler, backend, path, tmp_path):
+    # Cell details need Excel
+    handler.read_data(workbook=path, cell_range="A1", detail=True)
+    assert backend.counter.by_member["Workbooks.Open"] == 1
+
+    # Once the file is open in Excel, reads see the live workbook
+    backend.counter.reset()
+    result = handler.read_data(workbook=path, cell_range="A1")
+    assert "offline" not in result
+
+    # Encrypted packages are OLE files, not zips
+    locked = tmp_path / "locked.xlsx"
+    locked.write_bytes(b"\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1" + b"\0" * 504)
+    with pytest.raises(XlsxError):
+        XlsxBook(locked)
+    backend.counter.reset()
+    handler.read_data(workbook=str(locked), cell_range="A1")
+    assert backend.counter.by_member["Workbooks.Open"] == 1
+
+    other = write_xlsx(tmp_path / "other.xlsx", {"Data": DATA}, STRINGS)
+    backend.counter.reset()
+    ExcelHandler(backend, offline=False).read_data(workbook=other, cell_range="A1")
+    assert backend.counter.by_member["Workbooks.Open"] == 1
+
+
+def test_open_workbooks_skip_the_file_check(handler, backend, path, tmp_path, monkeypatch):
+    for i in range(10):
+        backend.app.add_book(rf"C:\other\book{i}.xlsx")
+    handler.read_data(workbook=path, cell_range="A1", detail=True)
+    excel_only = ExcelHandler(backend, offline=False)
+    excel_only.read_data(workbook=path, cell_range="A1")
+
+    # A resolved workbook costs what it does with offline reads off
+    counts = []
+    for each in (handler, excel_only):
+        backend.counter.reset()
+        each.read_data(workbook=path, cell_range="A1")
+        counts.append(backend.counter.calls)
+    assert counts[0] == counts[1]
+
+    # A bare name is the open workbook, not a file in the working directory
+    monkeypatch.chdir(tmp_path)
+    write_xlsx(tmp_path / "live.xlsx", {"Data": DATA}, STRINGS)
+    live = backend.app.add_book(r"C:\reports\live.xlsx", ["Data"])
+    live.sheets["Data"].range("A1").value = "open"
+    result = handler.read_data(workbook="live.xlsx", cell_range="A1", headers=False)
+    assert result["data"] == [["open"]] and "offline" not in result
+
+
+def test_a_read_stops_after_its_last_row(handler, tmp_path):
+    # Everything after row 2 is unreadable; the pass never gets there
+    body = (
+        '<sheetData><row r="1"><c r="A1"><v>1</v></c></row>'
+        '<row r="2"><c r="A2"><v>2</v></c></row><row r="3"><c r="A3"><v>3</v></c></row>'
+        '<row r="4"><bogus></sheetData>'
+    )
+    path = write_xlsx(tmp_path / "cut.xlsx", {"Data": body})
+    result = handler.read_data(workbook=path, cell_range="A1:A2", headers=False)
+    assert result["data"] == [[1], [2]]
+    with pytest.raises(ExcelError, match="damaged"):
+        handler.read_data(workbook=path, cell_range="A1:A9")
+
+
+def test_survey_scan_matches_the_element_pass(tmp_path, monkeypatch):
+    body = (
+        '<dimension ref="A1:H9"/><sheetData>'
+        '<row r="2" spans="2:8"><c r="B2" s="1"/><c r="C2" s="1"></c><c r="D2" t="s">'
+        '<v>0</v></c><c r="H2" s="1"/></row>'
+        '<row r="4"><c r="C4" t="inlineStr"><is><t>x</t></is></c>'
+        '<c r="F4"><f>1+1</f><v>2</v></c></row>'
+        '<row r="7"><c r="A7" s="1"/></row><row r="9"/>'
+        '</sheetData><mergeCells count="1"><mergeCell ref="C4:D5"/></mergeCells>'
+    )
+    path = write_xlsx(tmp_path / "scan.xlsx", {"Data": body}, ["ID"])
+    # The scan does not resolve namespaces, so a prefix is only text
+    prefixed = body.replace("<", "<x:").replace("<x:/", "</x:")
+    prefixed = write_xlsx(tmp_path / "prefixed.xlsx", {"Data": prefixed}, ["ID"])
+    expected = ((1, 1, 9, 8), (2, 3, 4, 6), [(4, 3, 5, 4)])
+    # Pieces of a few bytes put cuts next to every tag
+    monkeypatch.setattr(xlsx, "_SCAN_BYTES", 7)
+    with XlsxBook(path) as book:
+        assert book.sheet().survey() == book.sheet()._survey_elements() == expected
+    with XlsxBook(prefixed) as book:
+        assert book.sheet().survey() == expected
+
+    # Cells without a reference are placed by counting
+    body = '<sheetData><row><c/><c><v>1</v></c><c s="1"/></row></sheetData>'
+    with XlsxBook(write_xlsx(tmp_path / "norefs.xlsx", {"Data": body})) as book:
+        assert book.sheet().survey() == ((1, 1, 1, 3), (1, 2, 1, 2), [])
+
+
+def test_summary_memory_stays_flat(backend, tmp_path):
+    rows = 20_000
+    body = '<sheetData>' + "".join(
+        f'<row r="{r}"><c r="A{r}"><v>{r}</v></c><c r="B{r}" t="s"><v>{r % 50}</v></c>'
+        f'<c r="C{r}"><v>{r * 1.25}</v></c></row>'
+        for r in range(1, rows + 1)
+    ) + '</sheetData>'
+    path = write_xlsx(tmp_path / "big.xlsx", {"Big": body}, [f"s{i}" for i in range(50)])
+    handler = ExcelHandler(backend)
+    handler.REGION_SCAN_CELLS = 3_000
+    tracemalloc.start()
+    try:
+        result = handler.read_data(workbook=path)
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    assert result["data_range"] == f"$A$1:$C${rows}"
+    assert result["regions_sampled"] is True
+    # A streamed pass holds one row of the sheet XML at a time
+    assert len(body) > 2_000_000
+    assert peak < len(body) // 2